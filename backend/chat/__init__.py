@@ -1,10 +1,25 @@
 """
 Chat module for multi-turn conversation support.
 
-Provides in-memory session management with sliding window context
-for use with the RAG chain's ``query_with_history`` method.
+Provides session management with sliding window context for use with
+the RAG chain's ``query_with_history`` method, stored in process memory
+or in a shared state backend.
 """
 
-from .session import Message, Session, SessionManager
+from .session import (
+    InMemorySessionStore,
+    Message,
+    Session,
+    SessionManager,
+    SharedSessionStore,
+    session_store_for,
+)
 
-__all__ = ["Message", "Session", "SessionManager"]
+__all__ = [
+    "Message",
+    "Session",
+    "SessionManager",
+    "InMemorySessionStore",
+    "SharedSessionStore",
+    "session_store_for",
+]
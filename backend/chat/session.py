@@ -1,17 +1,35 @@
 """
-In-memory chat session manager with auto-expiry.
+Chat session manager with auto-expiry and pluggable storage.
 
 Provides session creation, message storage with a sliding window,
-and automatic cleanup of inactive sessions.
+and automatic cleanup of inactive sessions. Sessions live in a
+process-local store by default, capped in count and bytes with LRU
+eviction so session churn cannot grow memory without bound; with a
+shared ``StateBackend`` (see ``shared_state``) every worker process on
+the node sees the same sessions, so a follow-up may land on any worker.
+The shared store is capped in count the same way.
 """
 
 from __future__ import annotations
 
+import os
+import sys
+import threading
 import time
 import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable
 
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    from shared_state import StateBackend
+
+# Sessions kept (in memory, or in a shared backend) before the least recently active is evicted
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "10000"))
+# Approximate bytes of session history kept in memory before LRU eviction
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+
 
 class Message(BaseModel):
     """A single chat message."""
@@ -30,8 +48,242 @@ class Session(BaseModel):
     last_active: float = Field(default_factory=time.time)
 
 
+SessionUpdate = Callable[[Session | None], Session | None]
+
+
+# Approximate resident bytes of a stored session / message beyond its text
+_SESSION_OVERHEAD_BYTES = 400
+_MESSAGE_OVERHEAD_BYTES = 120
+
+
+class _StoredSession:
+    """Compact in-memory form of a :class:`Session`.
+
+    Messages are ``(role, content, timestamp)`` tuples with interned role
+    strings instead of pydantic models, which cuts the per-message
+    overhead to the content string itself plus a small tuple.
+    """
+
+    __slots__ = ("id", "created_at", "last_active", "messages", "nbytes")
+
+    def __init__(self, session: Session) -> None:
+        self.id = session.id
+        self.created_at = session.created_at
+        self.last_active = session.last_active
+        self.messages = [
+            (sys.intern(m.role), m.content, m.timestamp) for m in session.messages
+        ]
+        self.nbytes = _SESSION_OVERHEAD_BYTES + sum(
+            _MESSAGE_OVERHEAD_BYTES + sys.getsizeof(content) for _, content, _ in self.messages
+        )
+
+    def to_session(self) -> Session:
+        return Session.model_construct(
+            id=self.id,
+            messages=[
+                Message.model_construct(role=role, content=content, timestamp=timestamp)
+                for role, content, timestamp in self.messages
+            ],
+            created_at=self.created_at,
+            last_active=self.last_active,
+        )
+
+
+class InMemorySessionStore:
+    """Process-local session storage (the default), bounded in count and bytes.
+
+    Sessions are kept in an ``OrderedDict`` ordered by last activity, so
+    the front is both the least recently used session and the next one to
+    expire: LRU eviction and expiry pop from the front in O(1) per session
+    instead of scanning every session.
+
+    Parameters
+    ----------
+    max_sessions:
+        Sessions kept before the least recently active is evicted.
+    max_bytes:
+        Approximate total size of stored sessions before LRU eviction.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SESSION_MAX_COUNT,
+        max_bytes: int = SESSION_MAX_BYTES,
+    ) -> None:
+        self._sessions: OrderedDict[str, _StoredSession] = OrderedDict()
+        self.max_sessions = max(1, max_sessions)
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.evicted = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Session | None:
+        with self._lock:
+            stored = self._sessions.get(session_id)
+            return stored.to_session() if stored is not None else None
+
+    def put(self, session: Session) -> None:
+        with self._lock:
+            self._store(session)
+
+    def update(self, session_id: str, fn: SessionUpdate) -> Session | None:
+        """Replace a session with ``fn(session)``; None removes it."""
+        with self._lock:
+            stored = self._sessions.get(session_id)
+            session = fn(stored.to_session() if stored is not None else None)
+            if session is None:
+                self._remove(session_id)
+            else:
+                self._store(session)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._remove(session_id)
+
+    def sessions(self) -> list[Session]:
+        with self._lock:
+            return [stored.to_session() for stored in self._sessions.values()]
+
+    def pop_expired(self, cutoff: float) -> int:
+        """Remove sessions last active before ``cutoff``; returns how many."""
+        removed = 0
+        with self._lock:
+            while self._sessions:
+                oldest = next(iter(self._sessions.values()))
+                if oldest.last_active >= cutoff:
+                    break
+                self._remove(oldest.id)
+                removed += 1
+            self.expired += removed
+        return removed
+
+    def stats(self) -> dict[str, int]:
+        """Current size and eviction / expiry totals."""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes": self.nbytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "evicted": self.evicted,
+                "expired": self.expired,
+            }
+
+    def _store(self, session: Session) -> None:
+        self._remove(session.id)
+        stored = _StoredSession(session)
+        self._sessions[stored.id] = stored
+        self.nbytes += stored.nbytes
+        # Evict least recently active sessions, never the one just written.
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or self.nbytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._sessions)))
+            self.evicted += 1
+
+    def _remove(self, session_id: str) -> bool:
+        stored = self._sessions.pop(session_id, None)
+        if stored is None:
+            return False
+        self.nbytes -= stored.nbytes
+        return True
+
+
+class SharedSessionStore:
+    """Session storage on a ``StateBackend``, one JSON document per session.
+
+    ``update`` is atomic across workers, so two workers appending to the
+    same session never drop each other's messages. Every write stores the
+    session with a ``ttl`` (set by :class:`SessionManager` to its
+    ``expiry_seconds``), so the backend itself drops idle sessions even if
+    no worker ever runs a cleanup.
+
+    Each session's ``last_active`` is also kept as its score in a scored
+    set, so the backend hands back the session count and the least recently
+    active sessions directly: enforcing the ``max_sessions`` cap and finding
+    expired sessions never loads every session. Sizes are not tracked: the
+    backend's storage is on disk, not worker memory.
+    """
+
+    NAMESPACE = "chat_sessions"
+    ACTIVITY_NAMESPACE = "chat_session_activity"
+
+    def __init__(
+        self,
+        backend: StateBackend,
+        ttl: float | None = None,
+        max_sessions: int = SESSION_MAX_COUNT,
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.max_sessions = max(1, max_sessions)
+        self.evicted = 0
+
+    def get(self, session_id: str) -> Session | None:
+        payload = self.backend.get(self.NAMESPACE, session_id)
+        return Session.model_validate_json(payload) if payload else None
+
+    def put(self, session: Session) -> None:
+        self.backend.set(self.NAMESPACE, session.id, session.model_dump_json(), ttl=self.ttl)
+        self._touch(session)
+        self._evict(keep=session.id)
+
+    def update(self, session_id: str, fn: SessionUpdate) -> Session | None:
+        result: list[Session | None] = [None]
+
+        def apply(payload: str | None) -> str | None:
+            session = fn(Session.model_validate_json(payload) if payload else None)
+            result[0] = session
+            return session.model_dump_json() if session is not None else None
+
+        self.backend.update(self.NAMESPACE, session_id, apply, ttl=self.ttl)
+        if result[0] is not None:
+            self._touch(result[0])
+        else:
+            self.backend.delete_score(self.ACTIVITY_NAMESPACE, session_id)
+        return result[0]
+
+    def delete(self, session_id: str) -> bool:
+        self.backend.delete_score(self.ACTIVITY_NAMESPACE, session_id)
+        return self.backend.delete(self.NAMESPACE, session_id)
+
+    def sessions(self) -> list[Session]:
+        return [
+            Session.model_validate_json(payload)
+            for _, payload in self.backend.items(self.NAMESPACE)
+        ]
+
+    def pop_expired(self, cutoff: float) -> int:
+        """Remove sessions last active before ``cutoff``; returns how many."""
+        expired = self.backend.lowest_scores(self.ACTIVITY_NAMESPACE, below=cutoff)
+        return sum(self.delete(sid) for sid, _ in expired)
+
+    def _touch(self, session: Session) -> None:
+        self.backend.set_score(
+            self.ACTIVITY_NAMESPACE, session.id, session.last_active, ttl=self.ttl
+        )
+
+    def _evict(self, keep: str) -> None:
+        """Delete the least recently active sessions beyond ``max_sessions``."""
+        surplus = self.backend.count_scores(self.ACTIVITY_NAMESPACE) - self.max_sessions
+        if surplus <= 0:
+            return
+        # One extra in case ``keep`` itself is among the oldest.
+        oldest = self.backend.lowest_scores(self.ACTIVITY_NAMESPACE, limit=surplus + 1)
+        for sid, _ in [entry for entry in oldest if entry[0] != keep][:surplus]:
+            self.delete(sid)
+            self.evicted += 1
+
+
+def session_store_for(backend: StateBackend) -> InMemorySessionStore | SharedSessionStore:
+    """Shared store for a cross-process backend, otherwise the in-memory store."""
+    return SharedSessionStore(backend) if backend.shared else InMemorySessionStore()
+
+
 class SessionManager:
-    """In-memory chat session storage with sliding window and auto-expiry.
+    """Chat session storage with sliding window and auto-expiry.
 
     Parameters
     ----------
@@ -39,32 +291,46 @@ class SessionManager:
         Maximum number of messages retained per session (sliding window).
     expiry_seconds:
         Seconds of inactivity after which a session is considered expired.
+    store:
+        Where sessions live; defaults to a process-local
+        :class:`InMemorySessionStore`.
     """
 
     def __init__(
         self,
         max_messages: int = 10,
         expiry_seconds: float = 1800,
+        store: InMemorySessionStore | SharedSessionStore | None = None,
     ) -> None:
-        self._sessions: dict[str, Session] = {}
+        self._store = store if store is not None else InMemorySessionStore()
         self.max_messages = max_messages
         self.expiry_seconds = expiry_seconds
+        if isinstance(self._store, SharedSessionStore):
+            self._store.ttl = expiry_seconds
 
     def create_session(self) -> str:
         """Create a new session and return its UUID."""
+        if isinstance(self._store, InMemorySessionStore):
+            # Expired sessions leave before new ones arrive, so churn stays flat.
+            self._store.pop_expired(time.time() - self.expiry_seconds)
         session = Session()
-        self._sessions[session.id] = session
+        self._store.put(session)
         return session.id
 
     def add_message(self, session_id: str, role: str, content: str) -> None:
         """Append a message to the session, trimming to the sliding window."""
-        session = self._get_session(session_id)
-        if session is None:
+
+        def append(session: Session | None) -> Session | None:
+            if session is None or self._is_expired(session):
+                return None
+            session.messages.append(Message(role=role, content=content))
+            if len(session.messages) > self.max_messages:
+                session.messages = session.messages[-self.max_messages :]
+            session.last_active = time.time()
+            return session
+
+        if self._store.update(session_id, append) is None:
             raise KeyError(f"Session {session_id} not found or expired")
-        session.messages.append(Message(role=role, content=content))
-        if len(session.messages) > self.max_messages:
-            session.messages = session.messages[-self.max_messages :]
-        session.last_active = time.time()
 
     def get_history(self, session_id: str) -> list[Message]:
         """Return all messages in the session, or empty list if not found."""
@@ -95,25 +361,26 @@ class SessionManager:
 
     def clear_session(self, session_id: str) -> bool:
         """Remove a session. Returns True if it existed."""
-        return self._sessions.pop(session_id, None) is not None
+        return self._store.delete(session_id)
 
     def cleanup_expired(self) -> int:
         """Remove all expired sessions. Returns count removed."""
-        now = time.time()
-        expired = [
-            sid
-            for sid, s in self._sessions.items()
-            if now - s.last_active > self.expiry_seconds
-        ]
-        for sid in expired:
-            del self._sessions[sid]
-        return len(expired)
+        return self._store.pop_expired(time.time() - self.expiry_seconds)
+
+    def stats(self) -> dict[str, int] | None:
+        """Size and eviction totals of the in-memory store (None for a shared store)."""
+        if isinstance(self._store, InMemorySessionStore):
+            return self._store.stats()
+        return None
+
+    def _is_expired(self, session: Session) -> bool:
+        return time.time() - session.last_active > self.expiry_seconds
 
     def _get_session(self, session_id: str) -> Session | None:
-        session = self._sessions.get(session_id)
+        session = self._store.get(session_id)
         if session is None:
             return None
-        if time.time() - session.last_active > self.expiry_seconds:
-            del self._sessions[session_id]
+        if self._is_expired(session):
+            self._store.delete(session_id)
             return None
         return session
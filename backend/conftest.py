@@ -176,7 +176,10 @@ def test_client(mock_qdrant_client, mock_nvidia_llm):
     with patch("rag_chain.HybridRetriever", return_value=mock_retriever), \
          patch("rag_chain.create_llm_client", return_value=mock_nvidia_llm):
         # Import app after patching so lifespan uses mocks
-        from main import app
+        from main import app, startup
 
         with TestClient(app) as client:
+            # Startup components load in the background; finish before tests
+            # patch the globals they assign.
+            client.portal.call(startup.wait_all)
             yield client
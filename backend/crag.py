@@ -20,12 +20,16 @@ Example:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from llm_cache import LLMCache
     from llm_client import LLMClient
 
+from llm_client import async_generate
+
 # Import SearchResult at runtime for creating merged results
 from retriever import SearchResult
 
@@ -35,6 +39,9 @@ logger = logging.getLogger(__name__)
 # RRF constant (standard value from information retrieval literature)
 RRF_K = 60
 
+# Bump when the rephrase prompt changes (invalidates cached generations)
+REPHRASE_PROMPT_VERSION = "1"
+
 
 class CRAG:
     """
@@ -62,6 +69,7 @@ class CRAG:
     def __init__(
         self,
         llm_client: LLMClient | None = None,
+        cache: LLMCache | None = None,
     ):
         """
         Initialize CRAG with an optional LLM client.
@@ -69,8 +77,10 @@ class CRAG:
         Args:
             llm_client: Optional LLM client for query rephrasing.
                         If None, rephrasing falls back to returning original query.
+            cache: Optional persistent cache of rephrased queries
         """
         self.llm_client = llm_client
+        self.cache = cache
         logger.info(
             "Initialized CRAG %s",
             "with LLM client" if llm_client else "without LLM client (no rephrasing)",
@@ -123,6 +133,16 @@ class CRAG:
         logger.info("Grade: incorrect (avg %.3f < %.1f)", avg_score, self.AMBIGUOUS_THRESHOLD)
         return "incorrect"
 
+    @staticmethod
+    def _rephrase_prompt(question: str) -> str:
+        """Prompt asking the LLM to reword a legal question."""
+        return (
+            "Ulangi pertanyaan hukum berikut dengan kata-kata berbeda untuk "
+            "menemukan dokumen yang lebih relevan:\n\n"
+            f"{question}\n\n"
+            "Pertanyaan yang diulang:"
+        )
+
     def rephrase_query(self, question: str) -> str:
         """
         Rephrase the query using the LLM to improve retrieval.
@@ -146,17 +166,52 @@ class CRAG:
             logger.warning("No LLM client available, returning original question")
             return question
 
-        prompt = (
-            "Ulangi pertanyaan hukum berikut dengan kata-kata berbeda untuk "
-            "menemukan dokumen yang lebih relevan:\n\n"
-            f"{question}\n\n"
-            "Pertanyaan yang diulang:"
-        )
+        prompt = self._rephrase_prompt(question)
 
         logger.info("Rephrasing query: '%s'...", question[:50])
 
         try:
-            rephrased = self.llm_client.generate(user_message=prompt)
+            llm_client = self.llm_client
+            if self.cache is not None:
+                rephrased = self.cache.get_or_generate(
+                    "rephrase", REPHRASE_PROMPT_VERSION, llm_client, question,
+                    lambda: llm_client.generate(user_message=prompt),
+                )
+            else:
+                rephrased = llm_client.generate(user_message=prompt)
+            logger.info("Rephrased query: '%s'", rephrased[:50])
+            return rephrased.strip()
+        except Exception as e:
+            logger.error("Failed to rephrase query: %s", e)
+            logger.warning("Falling back to original question")
+            return question
+
+    async def arephrase_query(self, question: str) -> str:
+        """
+        Async :meth:`rephrase_query` (same prompt, cache and fallback).
+
+        Args:
+            question: The original user question to rephrase
+
+        Returns:
+            Rephrased question string, or original if no LLM available
+        """
+        if self.llm_client is None:
+            logger.warning("No LLM client available, returning original question")
+            return question
+
+        prompt = self._rephrase_prompt(question)
+        logger.info("Rephrasing query (async): '%s'...", question[:50])
+
+        try:
+            llm_client = self.llm_client
+            if self.cache is not None:
+                rephrased = await self.cache.aget_or_generate(
+                    "rephrase", REPHRASE_PROMPT_VERSION, llm_client, question,
+                    lambda: async_generate(llm_client, prompt),
+                )
+            else:
+                rephrased = await async_generate(llm_client, prompt)
             logger.info("Rephrased query: '%s'", rephrased[:50])
             return rephrased.strip()
         except Exception as e:
@@ -169,12 +224,14 @@ class CRAG:
         question: str,
         retriever,
         top_k: int = 5,
+        initial_results: list[SearchResult] | None = None,
     ) -> list[SearchResult]:
         """
         Search with corrective retrieval: grade quality and self-correct if needed.
 
         Process:
-        1. Initial search: retriever.hybrid_search(question, top_k)
+        1. Initial search: retriever.hybrid_search(question, top_k), unless
+           ``initial_results`` are given
         2. Grade retrieval quality based on average score
         3. Take corrective action:
            - correct (≥ 0.7): return original results
@@ -185,6 +242,8 @@ class CRAG:
             question: User's original question
             retriever: HybridRetriever instance (must have .hybrid_search() method)
             top_k: Number of results to retrieve (default: 5)
+            initial_results: Results already retrieved for ``question``; when
+                given, the initial search is skipped
 
         Returns:
             List of SearchResult objects (potentially corrected)
@@ -205,23 +264,104 @@ class CRAG:
         """
         logger.info("CRAG enhanced search: '%s'...", question[:50])
 
-        # Step 1: Initial search
-        results = retriever.hybrid_search(question, top_k=top_k)
-        logger.info("Initial search returned %d results", len(results))
+        # Step 1: Initial search (skipped when the caller already retrieved)
+        if initial_results is None:
+            results = retriever.hybrid_search(question, top_k=top_k)
+            logger.info("Initial search returned %d results", len(results))
+        else:
+            results = initial_results
+
+        return self.correct(question, results, retriever, top_k=top_k)
+
+    def correct(
+        self,
+        question: str,
+        results: list[SearchResult],
+        retriever,
+        top_k: int = 5,
+        grade: str | None = None,
+    ) -> list[SearchResult]:
+        """
+        Grade already-retrieved results and take corrective action.
+
+        Only the rephrased search is run, so the quality gate adds one
+        retrieval (and one LLM rephrase) instead of repeating the initial one.
+
+        Args:
+            question: User's original question
+            results: Results already retrieved for ``question``
+            retriever: HybridRetriever instance (must have .hybrid_search() method)
+            top_k: Number of results for the rephrased search (default: 5)
+            grade: Precomputed grade from grade_retrieval(), if available
 
+        Returns:
+            ``results`` when correct, otherwise merged or replaced results
+        """
         # Step 2: Grade retrieval quality
-        grade = self.grade_retrieval(question, results)
+        if grade is None:
+            grade = self.grade_retrieval(question, results)
 
         # Step 3: Corrective action
         if grade == "correct":
             logger.info("Grade correct — returning original results")
             return results
 
-        if grade == "ambiguous":
-            logger.info("Grade ambiguous — rephrasing and merging with RRF")
-            rephrased = self.rephrase_query(question)
-            rephrased_results = retriever.hybrid_search(rephrased, top_k=top_k)
+        logger.info(
+            "Grade %s — rephrasing and %s",
+            grade,
+            "merging with RRF" if grade == "ambiguous" else "replacing entirely",
+        )
+        rephrased = self.rephrase_query(question)
+        rephrased_results = retriever.hybrid_search(rephrased, top_k=top_k)
+        return self._combine(grade, results, rephrased_results)
+
+    async def acorrect(
+        self,
+        question: str,
+        results: list[SearchResult],
+        retriever,
+        top_k: int = 5,
+        grade: str | None = None,
+    ) -> list[SearchResult]:
+        """
+        Async :meth:`correct`: the rephrase is awaited and the rephrased
+        search runs in a worker thread.
+
+        Args:
+            question: User's original question
+            results: Results already retrieved for ``question``
+            retriever: HybridRetriever instance (must have .hybrid_search() method)
+            top_k: Number of results for the rephrased search (default: 5)
+            grade: Precomputed grade from grade_retrieval(), if available
+
+        Returns:
+            ``results`` when correct, otherwise merged or replaced results
+        """
+        if grade is None:
+            grade = self.grade_retrieval(question, results)
+        if grade == "correct":
+            logger.info("Grade correct — returning original results")
+            return results
+
+        logger.info(
+            "Grade %s — rephrasing and %s",
+            grade,
+            "merging with RRF" if grade == "ambiguous" else "replacing entirely",
+        )
+        rephrased = await self.arephrase_query(question)
+        rephrased_results = await asyncio.to_thread(
+            retriever.hybrid_search, rephrased, top_k=top_k
+        )
+        return self._combine(grade, results, rephrased_results)
 
+    @staticmethod
+    def _combine(
+        grade: str,
+        results: list[SearchResult],
+        rephrased_results: list[SearchResult],
+    ) -> list[SearchResult]:
+        """Ambiguous: RRF-merge both lists. Incorrect: keep only the rephrased results."""
+        if grade == "ambiguous":
             merged = _rrf_merge([results, rephrased_results], k=RRF_K)
             logger.info(
                 "CRAG ambiguous merge: %d + %d → %d unique documents",
@@ -232,10 +372,6 @@ class CRAG:
             return merged
 
         # grade == "incorrect"
-        logger.info("Grade incorrect — rephrasing and replacing entirely")
-        rephrased = self.rephrase_query(question)
-        rephrased_results = retriever.hybrid_search(rephrased, top_k=top_k)
-
         logger.info(
             "CRAG incorrect replacement: %d original → %d rephrased results",
             len(results),
@@ -8,13 +8,15 @@ coverage percentages per law and per legal domain.
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, Field
 
-from knowledge_graph.graph import LegalKnowledgeGraph
 from knowledge_graph.schema import EdgeType
 
+if TYPE_CHECKING:
+    from knowledge_graph.graph import LegalKnowledgeGraph
+
 
 # ── Domain classification ────────────────────────────────────────────────────
 
@@ -8,13 +8,15 @@ a single summary for the frontend stats cards.
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 
 from pydantic import BaseModel, Field
 
-from knowledge_graph.graph import LegalKnowledgeGraph
-
 from .coverage import CoverageComputer, DomainCoverage
 
+if TYPE_CHECKING:
+    from knowledge_graph.graph import LegalKnowledgeGraph
+
 
 class DashboardStats(BaseModel):
     """Aggregate dashboard statistics."""
@@ -0,0 +1,619 @@
+"""
+Grounding verification: cheap local check first, LLM-as-judge only when unsure.
+
+The LLM judge sends the whole answer plus sources back to the model for a
+second full round trip, about 30% of query time, on every answer. Most
+answers are clearly grounded (they restate the cited Pasal almost word for
+word) or clearly not (they cite sources that do not exist, or quote numbers
+that appear in no source). A lexical check settles those cases in
+microseconds. The judge runs only for answers whose local score falls in
+the uncertain band, and always within a hard timeout.
+
+Intuition:
+    A legal answer sentence that cites ``[2]`` should reuse the content
+    words of source 2 (subjects, obligations, amounts, article numbers).
+    The share of a sentence's content tokens found in the sources it cites
+    is a cheap but useful proxy for "supported by"; numbers (amounts,
+    years, deadlines) must match exactly, and a citation number that does
+    not exist is a hard failure.
+
+Local score:
+    1. Split the answer into sentences and drop non-claims (< 3 content tokens)
+    2. For each sentence, collect its ``[n]`` references. Unknown numbers
+       → support 0. Otherwise compare against the cited sources (or all
+       sources for uncited sentences, which count half as much)
+    3. support = min(1, overlap / GROUNDING_FULL_OVERLAP), scaled by the
+       fraction of the sentence's numbers found in those sources
+    4. score = weighted mean support; sentences with support < 0.5 are
+       reported as ungrounded claims
+
+Background mode:
+    ``verify_deferred`` returns the local score at once. When the LLM judge
+    is still needed, it also returns a verification id: the judge runs on a
+    background pool, free of the synchronous ``llm_timeout`` (nobody is
+    waiting on it), and its result is read later with ``get_result`` (the
+    ``/grounding/{verification_id}`` endpoint) or ``wait_result`` (the late
+    ``grounding`` SSE event). Results are kept for GROUNDING_RESULT_TTL
+    seconds.
+
+Example:
+    >>> verifier = GroundingVerifier()
+    >>> score, ungrounded = verifier.verify(answer, citations, llm_client, source_texts)
+    >>> score, ungrounded = await verifier.averify(answer, citations, llm_client, source_texts)
+    >>> score, ungrounded, verification_id = verifier.verify_deferred(answer, citations, llm_client)
+    >>> verifier.wait_result(verification_id, timeout=10)
+    {'verification_id': '...', 'status': 'done', 'grounding_score': 0.8, ...}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from llm_client import async_generate
+
+if TYPE_CHECKING:
+    from llm_client import LLMClient
+
+logger = logging.getLogger(__name__)
+
+# "hybrid" (local, LLM judge in the uncertain band), "local" or "llm"
+GROUNDING_MODE = os.getenv("GROUNDING_MODE", "hybrid").lower()
+# Local scores inside [LOW, HIGH) are escalated to the LLM judge
+GROUNDING_UNCERTAIN_LOW = float(os.getenv("GROUNDING_UNCERTAIN_LOW", "0.35"))
+GROUNDING_UNCERTAIN_HIGH = float(os.getenv("GROUNDING_UNCERTAIN_HIGH", "0.75"))
+# Hard limit on the LLM judge call (seconds); the local result is used after it
+GROUNDING_LLM_TIMEOUT = float(os.getenv("GROUNDING_LLM_TIMEOUT", "5"))
+GROUNDING_MAX_WORKERS = int(os.getenv("GROUNDING_MAX_WORKERS", "4"))
+# Return answers before the LLM judge finishes (per request override in the API)
+GROUNDING_BACKGROUND = os.getenv("GROUNDING_BACKGROUND", "false").lower() == "true"
+# Seconds a background verification result stays retrievable, and how many are kept
+GROUNDING_RESULT_TTL = int(os.getenv("GROUNDING_RESULT_TTL", "600"))
+GROUNDING_MAX_RESULTS = int(os.getenv("GROUNDING_MAX_RESULTS", "1000"))
+
+# Token overlap at which a sentence counts as fully supported (paraphrases
+# rarely reuse every content word)
+GROUNDING_FULL_OVERLAP = 0.6
+# Sentences with support below this are reported as ungrounded claims
+UNGROUNDED_SUPPORT = 0.5
+# Weight of sentences without [n] references (summaries, transitions)
+UNCITED_WEIGHT = 0.5
+MIN_CLAIM_TOKENS = 3
+
+JUDGE_SYSTEM_MESSAGE = (
+    "Anda adalah evaluasi jawaban hukum yang objektif. Selalu respond dengan JSON yang valid."
+)
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;:])\s+|\n+")
+_REFERENCE_RE = re.compile(r"\[(\d+)\]")
+_DIGIT_GROUP_RE = re.compile(r"(?<=\d)[.,](?=\d{3}\b)")
+_LETTER_DIGIT_RE = re.compile(r"(?<=[^\W\d])(?=\d)")
+_TOKEN_RE = re.compile(r"\w+")
+
+# Function words that carry no claim content (Indonesian answers)
+STOPWORDS = frozenset({
+    "yang", "dan", "di", "ke", "dari", "dalam", "untuk", "dengan", "pada",
+    "atau", "ini", "itu", "adalah", "ialah", "oleh", "sebagai", "tersebut",
+    "dapat", "akan", "juga", "para", "bahwa", "karena", "serta", "agar",
+    "bagi", "atas", "secara", "suatu", "setiap", "tentang", "sesuai",
+    "berdasarkan", "menurut", "sebagaimana", "dimaksud", "hal", "ada",
+    "telah", "sudah", "masih", "lebih", "antara", "yaitu", "yakni", "jika",
+    "apabila", "maka", "namun", "tetapi", "sehingga", "merupakan", "the",
+    "and", "jawaban", "sumber", "dokumen",
+})
+
+
+@dataclass
+class LocalGroundingResult:
+    """Outcome of the lexical grounding check."""
+
+    score: float | None  # None when the answer has no checkable claims
+    ungrounded_claims: list[str] = field(default_factory=list)
+    sentences_checked: int = 0
+    invalid_references: list[int] = field(default_factory=list)
+
+
+@dataclass
+class _BackgroundVerification:
+    """A deferred LLM judge run and the local result it may replace."""
+
+    future: Future
+    local: LocalGroundingResult
+    created_at: float
+
+
+def _content_tokens(text: str) -> set[str]:
+    """Lowercased content tokens; amounts are normalized (Rp50.000.000 → rp, 50000000)."""
+    text = _LETTER_DIGIT_RE.sub(" ", _DIGIT_GROUP_RE.sub("", text.lower()))
+    return {
+        tok for tok in _TOKEN_RE.findall(text)
+        if tok.isdigit() or (len(tok) > 2 and tok not in STOPWORDS)
+    }
+
+
+def split_claims(answer: str) -> list[str]:
+    """Split an answer into sentence-level claims."""
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(answer) if s and s.strip()]
+
+
+class GroundingVerifier:
+    """
+    Local lexical grounding check with LLM-as-judge escalation.
+
+    Usage:
+        verifier = GroundingVerifier(mode="hybrid")
+        score, ungrounded = verifier.verify(answer, citations, llm_client)
+        verifier.stats()  # how often the LLM judge was needed
+    """
+
+    def __init__(
+        self,
+        mode: str = GROUNDING_MODE,
+        uncertain_low: float = GROUNDING_UNCERTAIN_LOW,
+        uncertain_high: float = GROUNDING_UNCERTAIN_HIGH,
+        llm_timeout: float = GROUNDING_LLM_TIMEOUT,
+        max_workers: int = GROUNDING_MAX_WORKERS,
+    ):
+        """
+        Configure the verifier.
+
+        Args:
+            mode: "hybrid", "local" (never call the LLM) or "llm" (always)
+            uncertain_low: Local scores below this are confidently ungrounded
+            uncertain_high: Local scores at or above this are confidently grounded
+            llm_timeout: Seconds the LLM judge may take (0 = no limit)
+            max_workers: Size of the LLM judge thread pool
+        """
+        if mode not in ("hybrid", "local", "llm"):
+            logger.warning(f"Unknown GROUNDING_MODE '{mode}', using 'hybrid'")
+            mode = "hybrid"
+        self.mode = mode
+        self.uncertain_low = uncertain_low
+        self.uncertain_high = uncertain_high
+        self.llm_timeout = llm_timeout
+        self.max_workers = max(1, max_workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._counts = {"local": 0, "llm": 0, "llm_timeout": 0, "llm_error": 0}
+        self._counts_lock = threading.Lock()
+        self._background_executor: ThreadPoolExecutor | None = None
+        self._results: OrderedDict[str, _BackgroundVerification] = OrderedDict()
+        self._results_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the bounded LLM judge pool."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="grounding",
+                    )
+        return self._executor
+
+    def _get_background_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the pool that runs deferred verifications."""
+        if self._background_executor is None:
+            with self._executor_lock:
+                if self._background_executor is None:
+                    self._background_executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="grounding-bg",
+                    )
+        return self._background_executor
+
+    def _count(self, key: str) -> None:
+        with self._counts_lock:
+            self._counts[key] += 1
+
+    def stats(self) -> dict[str, int]:
+        """How many verifications were settled locally vs by the LLM judge."""
+        with self._counts_lock:
+            return dict(self._counts)
+
+    @staticmethod
+    def _source_texts(
+        citations: list[dict[str, Any]],
+        source_texts: list[str] | None,
+    ) -> dict[int, str]:
+        """Map citation number → text to check against (full text when given)."""
+        sources: dict[int, str] = {}
+        for i, c in enumerate(citations):
+            number = c.get("number", i + 1)
+            if source_texts is not None and i < len(source_texts):
+                text = source_texts[i]
+            else:
+                text = (c.get("metadata") or {}).get("text", "")
+            sources[number] = f"{c.get('citation', '')}\n{text}"
+        return sources
+
+    def verify_local(
+        self,
+        answer: str,
+        citations: list[dict[str, Any]],
+        source_texts: list[str] | None = None,
+    ) -> LocalGroundingResult:
+        """
+        Score how well each answer sentence is supported by its cited sources.
+
+        Args:
+            answer: Generated answer with [n] references
+            citations: Citation dicts with 'number', 'citation', 'metadata'
+            source_texts: Full source texts in citation order (defaults to
+                the citation text snippets)
+
+        Returns:
+            LocalGroundingResult (score None if nothing was checkable)
+        """
+        sources = {
+            number: _content_tokens(text)
+            for number, text in self._source_texts(citations, source_texts).items()
+        }
+        all_tokens = set().union(*sources.values()) if sources else set()
+
+        weighted_support = 0.0
+        total_weight = 0.0
+        checked = 0
+        ungrounded: list[str] = []
+        invalid: set[int] = set()
+
+        for sentence in split_claims(answer):
+            refs = [int(n) for n in _REFERENCE_RE.findall(sentence)]
+            tokens = _content_tokens(_REFERENCE_RE.sub(" ", sentence))
+            if len(tokens) < MIN_CLAIM_TOKENS:
+                continue
+            checked += 1
+
+            unknown = [n for n in refs if n not in sources]
+            if unknown:
+                invalid.update(unknown)
+                support = 0.0
+                weight = 1.0
+            else:
+                if refs:
+                    reference = set().union(*(sources[n] for n in refs))
+                    weight = 1.0
+                else:
+                    reference = all_tokens
+                    weight = UNCITED_WEIGHT
+                overlap = len(tokens & reference) / len(tokens)
+                support = min(1.0, overlap / GROUNDING_FULL_OVERLAP)
+                numbers = {t for t in tokens if t.isdigit()}
+                if numbers:
+                    support *= len(numbers & reference) / len(numbers)
+
+            weighted_support += support * weight
+            total_weight += weight
+            if support < UNGROUNDED_SUPPORT:
+                ungrounded.append(sentence[:200])
+
+        score = round(weighted_support / total_weight, 4) if total_weight else None
+        return LocalGroundingResult(
+            score=score,
+            ungrounded_claims=ungrounded,
+            sentences_checked=checked,
+            invalid_references=sorted(invalid),
+        )
+
+    def _needs_llm(self, local: LocalGroundingResult) -> bool:
+        if self.mode == "llm":
+            return True
+        if self.mode == "local":
+            return False
+        if local.score is None:
+            return True
+        return self.uncertain_low <= local.score < self.uncertain_high
+
+    def verify(
+        self,
+        answer: str,
+        citations: list[dict[str, Any]],
+        llm_client: LLMClient | None,
+        source_texts: list[str] | None = None,
+    ) -> tuple[float | None, list[str]]:
+        """
+        Grounding score and ungrounded claims for an answer.
+
+        Runs the local check; escalates to the LLM judge only in the
+        uncertain band (or always / never, per mode). A judge that fails or
+        exceeds ``llm_timeout`` falls back to the local result.
+
+        Returns:
+            Tuple of (grounding_score, ungrounded_claims)
+        """
+        if not citations:
+            return None, ["Tidak ada sumber untuk diverifikasi"]
+
+        local = self.verify_local(answer, citations, source_texts)
+        if llm_client is None or not self._needs_llm(local):
+            self._count("local")
+            logger.info(
+                f"Local grounding score: {local.score}, "
+                f"ungrounded claims: {len(local.ungrounded_claims)}"
+            )
+            return local.score, local.ungrounded_claims
+
+        self._count("llm")
+        judged = self._judge_with_timeout(answer, citations, llm_client)
+        if judged is None:
+            return local.score, local.ungrounded_claims
+        return judged
+
+    async def averify(
+        self,
+        answer: str,
+        citations: list[dict[str, Any]],
+        llm_client: LLMClient | None,
+        source_texts: list[str] | None = None,
+    ) -> tuple[float | None, list[str]]:
+        """
+        Async :meth:`verify`: the LLM judge is awaited (and cancelled after
+        ``llm_timeout``) instead of occupying a judge-pool thread.
+
+        Returns:
+            Tuple of (grounding_score, ungrounded_claims)
+        """
+        if not citations:
+            return None, ["Tidak ada sumber untuk diverifikasi"]
+
+        local = self.verify_local(answer, citations, source_texts)
+        if llm_client is None or not self._needs_llm(local):
+            self._count("local")
+            return local.score, local.ungrounded_claims
+
+        self._count("llm")
+        start_time = time.time()
+        try:
+            judged = await asyncio.wait_for(
+                self.allm_judge(answer, citations, llm_client),
+                timeout=self.llm_timeout or None,
+            )
+        except asyncio.TimeoutError:
+            self._count("llm_timeout")
+            logger.warning(
+                f"Grounding LLM judge exceeded {self.llm_timeout:.1f}s, using local score"
+            )
+            return local.score, local.ungrounded_claims
+        except Exception as e:
+            self._count("llm_error")
+            logger.warning(f"Grounding verification failed ({type(e).__name__}): {e}")
+            return local.score, local.ungrounded_claims
+        logger.info(f"Grounding verification took {time.time() - start_time:.2f}s")
+        if judged is None:
+            return local.score, local.ungrounded_claims
+        return judged
+
+    def verify_deferred(
+        self,
+        answer: str,
+        citations: list[dict[str, Any]],
+        llm_client: LLMClient | None,
+        source_texts: list[str] | None = None,
+    ) -> tuple[float | None, list[str], str | None]:
+        """
+        Like :meth:`verify`, but never waits for the LLM judge.
+
+        Returns:
+            Tuple of (local grounding_score, ungrounded_claims,
+            verification_id). The id is None when the local result is final;
+            otherwise the judge is running in the background.
+        """
+        if not citations:
+            return None, ["Tidak ada sumber untuk diverifikasi"], None
+
+        local = self.verify_local(answer, citations, source_texts)
+        if llm_client is None or not self._needs_llm(local):
+            self._count("local")
+            return local.score, local.ungrounded_claims, None
+
+        self._count("llm")
+        verification_id = uuid.uuid4().hex
+        ctx = contextvars.copy_context()
+        future = self._get_background_executor().submit(
+            ctx.run, self._judge_in_background, answer, citations, llm_client
+        )
+        with self._results_lock:
+            self._evict_results()
+            self._results[verification_id] = _BackgroundVerification(future, local, time.time())
+        logger.info(f"Grounding verification {verification_id} running in background")
+        return local.score, local.ungrounded_claims, verification_id
+
+    def _evict_results(self) -> None:
+        """Drop expired results and the oldest beyond GROUNDING_MAX_RESULTS (lock held)."""
+        cutoff = time.time() - GROUNDING_RESULT_TTL
+        while self._results:
+            oldest_id, oldest = next(iter(self._results.items()))
+            if oldest.created_at >= cutoff and len(self._results) < GROUNDING_MAX_RESULTS:
+                break
+            del self._results[oldest_id]
+
+    @staticmethod
+    def _result_dict(verification_id: str, job: _BackgroundVerification) -> dict[str, Any]:
+        if not job.future.done():
+            return {
+                "verification_id": verification_id,
+                "status": "pending",
+                "grounding_score": job.local.score,
+                "ungrounded_claims": job.local.ungrounded_claims,
+                "source": "local",
+            }
+        judged = None if job.future.exception() else job.future.result()
+        if judged is None:
+            score, claims, source = job.local.score, job.local.ungrounded_claims, "local"
+        else:
+            (score, claims), source = judged, "llm"
+        return {
+            "verification_id": verification_id,
+            "status": "done",
+            "grounding_score": score,
+            "ungrounded_claims": claims,
+            "source": source,
+        }
+
+    def get_result(self, verification_id: str) -> dict[str, Any] | None:
+        """
+        Current state of a background verification.
+
+        Returns:
+            Dict with verification_id, status ("pending" | "done"),
+            grounding_score, ungrounded_claims and source ("local" | "llm"),
+            or None for unknown or expired ids
+        """
+        with self._results_lock:
+            job = self._results.get(verification_id)
+            if job is None or job.created_at < time.time() - GROUNDING_RESULT_TTL:
+                return None
+        return self._result_dict(verification_id, job)
+
+    def wait_result(self, verification_id: str, timeout: float | None = None) -> dict[str, Any] | None:
+        """Block until a background verification finishes (or ``timeout``), then return it."""
+        with self._results_lock:
+            job = self._results.get(verification_id)
+        if job is None:
+            return None
+        try:
+            job.future.result(timeout=timeout)
+        except Exception:
+            pass  # timeouts report "pending"; failures fall back to the local result
+        return self._result_dict(verification_id, job)
+
+    def _judge_in_background(
+        self,
+        answer: str,
+        citations: list[dict[str, Any]],
+        llm_client: LLMClient,
+    ) -> tuple[float, list[str]] | None:
+        """Run the LLM judge on the calling (background) thread, without ``llm_timeout``.
+
+        Nobody is waiting on a deferred verification, so the synchronous
+        budget does not apply and a second pool would only add queueing.
+        """
+        start_time = time.time()
+        try:
+            result = self.llm_judge(answer, citations, llm_client)
+        except Exception as e:
+            self._count("llm_error")
+            logger.warning(f"Background grounding verification failed ({type(e).__name__}): {e}")
+            return None
+        logger.info(f"Background grounding verification took {time.time() - start_time:.2f}s")
+        return result
+
+    def _judge_with_timeout(
+        self,
+        answer: str,
+        citations: list[dict[str, Any]],
+        llm_client: LLMClient,
+    ) -> tuple[float, list[str]] | None:
+        """Run the LLM judge on the pool, giving up after ``llm_timeout``."""
+        start_time = time.time()
+        ctx = contextvars.copy_context()
+        future = self._get_executor().submit(ctx.run, self.llm_judge, answer, citations, llm_client)
+        try:
+            result = future.result(timeout=self.llm_timeout or None)
+        except FutureTimeoutError:
+            future.cancel()
+            self._count("llm_timeout")
+            logger.warning(
+                f"Grounding LLM judge exceeded {self.llm_timeout:.1f}s, using local score"
+            )
+            return None
+        except Exception as e:
+            self._count("llm_error")
+            logger.warning(f"Grounding verification failed ({type(e).__name__}): {e}")
+            return None
+        logger.info(f"Grounding verification took {time.time() - start_time:.2f}s")
+        return result
+
+    @staticmethod
+    def _judge_prompt(answer: str, citations: list[dict[str, Any]]) -> str:
+        """LLM-as-judge prompt for an answer and its (top 5) cited sources."""
+        # Format sources for grounding prompt
+        sources_text = "\n\n".join([
+            f"[{c.get('number', i+1)}] {c.get('citation', c.get('text', ''))[:500]}"
+            for i, c in enumerate(citations[:5])  # Limit to top 5 sources
+        ])
+
+        return f"""Anda adalah hakim yang mengevaluasi kualitas jawaban hukum.
+
+Sumber hukum:
+{sources_text}
+
+Jawaban yang akan dievaluasi:
+{answer}
+
+Tugas Anda: Evaluasi setiap klaim dalam jawaban apakah didukung oleh sumber hukum di atas.
+
+Instruksi:
+1. Identifikasi klaim-klaim utama dalam jawaban
+2. Untuk setiap klaim, tentukan apakah didukung oleh sumber yang diberikan
+3. Jika ada klaim yang TIDAK didukung oleh sumber,cantumkan
+
+Respons dalam format JSON:
+{{
+  "grounding_score": <skor 0.0-1.0 indicating percentage of claims fully supported>,
+  "ungrounded_claims": [<list of claim descriptions that are not supported by sources>],
+  "grounded_claims": [<list of claim descriptions that ARE supported>]
+}}
+
+JSON:"""
+
+    @staticmethod
+    def _parse_judgement(response: str) -> tuple[float, list[str]] | None:
+        """Score and ungrounded claims from the judge's JSON, or None if unparseable."""
+        # Find JSON in response (in case there's extra text)
+        json_start = response.find('{')
+        json_end = response.rfind('}') + 1
+        if json_start < 0 or json_end <= json_start:
+            logger.warning("Could not parse JSON from grounding response")
+            return None
+
+        result = json.loads(response[json_start:json_end])
+        # Clamp score to 0-1
+        grounding_score = max(0.0, min(1.0, float(result.get('grounding_score', 0.5))))
+        ungrounded = result.get('ungrounded_claims', [])
+        logger.info(f"Grounding score: {grounding_score:.2f}, ungrounded claims: {len(ungrounded)}")
+        return grounding_score, ungrounded
+
+    @staticmethod
+    def llm_judge(
+        answer: str,
+        citations: list[dict[str, Any]],
+        llm_client: LLMClient,
+    ) -> tuple[float, list[str]] | None:
+        """
+        Use LLM-as-judge to verify that answer claims are grounded in cited sources.
+
+        Returns:
+            Tuple of (grounding_score, ungrounded_claims), or None if the
+            response could not be parsed
+        """
+        response = llm_client.generate(
+            user_message=GroundingVerifier._judge_prompt(answer, citations),
+            system_message=JUDGE_SYSTEM_MESSAGE,
+        )
+        return GroundingVerifier._parse_judgement(response)
+
+    @staticmethod
+    async def allm_judge(
+        answer: str,
+        citations: list[dict[str, Any]],
+        llm_client: LLMClient,
+    ) -> tuple[float, list[str]] | None:
+        """Async :meth:`llm_judge`."""
+        response = await async_generate(
+            llm_client,
+            GroundingVerifier._judge_prompt(answer, citations),
+            JUDGE_SYSTEM_MESSAGE,
+        )
+        return GroundingVerifier._parse_judgement(response)
@@ -0,0 +1,193 @@
+"""
+Cached, non-invasive health probes.
+
+``GET /health`` used to issue a real LLM completion and a Qdrant
+``get_collection`` on every probe. A load balancer polling every few
+seconds per instance turns that into steady paid LLM traffic and extra
+Qdrant load. This module separates the two questions a probe can ask:
+
+- **Liveness** — is the process up? Answered without touching anything.
+- **Readiness** — can it serve questions? Answered from cached dependency
+  checks that ``HealthMonitor`` refreshes on a background schedule, plus
+  the LLM state observed by real traffic.
+
+Intuition:
+    Probes read; the schedule writes. However often the load balancer
+    polls, Qdrant sees one cheap call per ``HEALTH_CHECK_INTERVAL`` and the
+    LLM provider sees none — its health is the circuit-breaker state and
+    the last success/failure of real answer generation (``llm_health``).
+    A cached result older than ``HEALTH_CHECK_TTL`` (e.g. the background
+    task died) is refreshed on read instead of being trusted.
+
+Example:
+    >>> monitor = HealthMonitor(interval=15, ttl=60)
+    >>> monitor.register("vector_store", check_vector_store)
+    >>> monitor.start()                         # in the app lifespan
+    >>> results = await monitor.results()       # cached, refreshed if stale
+    >>> llm_probe(rag_chain.llm_client)["status"]
+    'ok'
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from llm_client import llm_health
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background dependency checks
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "15"))
+# Seconds a cached check result is trusted before it is refreshed on read
+HEALTH_CHECK_TTL = float(os.getenv("HEALTH_CHECK_TTL", "60"))
+# Consecutive real-traffic generation failures that mark the LLM as failing
+LLM_HEALTH_FAILURE_THRESHOLD = int(os.getenv("LLM_HEALTH_FAILURE_THRESHOLD", "3"))
+# Seconds after the last failure that a failing LLM stays failing without new traffic
+LLM_HEALTH_FAILURE_WINDOW = float(os.getenv("LLM_HEALTH_FAILURE_WINDOW", "300"))
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one dependency check."""
+
+    ok: bool
+    checked_at: float
+    latency_ms: float
+    details: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "checked_at": self.checked_at,
+            "age_s": round(time.time() - self.checked_at, 1),
+            "latency_ms": round(self.latency_ms, 2),
+            "details": self.details,
+            "error": self.error,
+        }
+
+
+class HealthMonitor:
+    """
+    Runs registered dependency checks in the background and caches results.
+
+    A check is a blocking zero-argument callable returning a details dict
+    (success) or raising (failure); it runs in a worker thread.
+
+    Usage:
+        monitor = HealthMonitor()
+        monitor.register("vector_store", check)
+        monitor.start(); ...; await monitor.stop()
+        await monitor.results()
+    """
+
+    def __init__(
+        self,
+        interval: float = HEALTH_CHECK_INTERVAL,
+        ttl: float = HEALTH_CHECK_TTL,
+    ):
+        self.interval = interval
+        self.ttl = ttl
+        self._checks: dict[str, Callable[[], dict[str, Any]]] = {}
+        self._results: dict[str, CheckResult] = {}
+        self._task: asyncio.Task | None = None
+        self._refreshing: asyncio.Task | None = None
+
+    def register(self, name: str, check: Callable[[], dict[str, Any]]) -> None:
+        """Add (or replace) a named dependency check."""
+        self._checks[name] = check
+        self._results.pop(name, None)
+
+    async def _run_check(self, name: str, check: Callable[[], dict[str, Any]]) -> None:
+        start = time.perf_counter()
+        try:
+            details = await asyncio.to_thread(check)
+            result = CheckResult(True, time.time(), (time.perf_counter() - start) * 1000, details or {})
+        except Exception as e:
+            logger.warning(f"Health check '{name}' failed: {e}")
+            result = CheckResult(
+                False, time.time(), (time.perf_counter() - start) * 1000, error=str(e)[:200]
+            )
+        self._results[name] = result
+
+    async def refresh(self) -> None:
+        """Run every check now; concurrent callers share one refresh."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(asyncio.gather(
+                *(self._run_check(name, check) for name, check in list(self._checks.items()))
+            ))
+        await asyncio.shield(self._refreshing)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # never let the schedule die
+                logger.error(f"Health check loop error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background schedule (first run immediately)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel the background schedule."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _is_fresh(self, name: str) -> bool:
+        result = self._results.get(name)
+        return result is not None and time.time() - result.checked_at <= self.ttl
+
+    async def results(self) -> dict[str, CheckResult]:
+        """Cached results, refreshing first if any is missing or older than the TTL."""
+        if not all(self._is_fresh(name) for name in self._checks):
+            await self.refresh()
+        return dict(self._results)
+
+
+def llm_probe(llm_client: Any) -> dict[str, Any]:
+    """
+    LLM health from real traffic — never issues a completion.
+
+    ``failing`` when every FallbackChain circuit breaker is open or real
+    answer generation failed ``LLM_HEALTH_FAILURE_THRESHOLD`` times in a
+    row, the last within ``LLM_HEALTH_FAILURE_WINDOW`` seconds; ``unknown``
+    before the first answer; ``ok`` otherwise. The window lets readiness
+    recover once the failures age out, since a not-ready instance gets no
+    traffic that could record a success.
+    """
+    if llm_client is None:
+        return {"configured": False, "status": "unconfigured", "open_circuits": []}
+
+    breakers = getattr(llm_client, "circuit_breakers", None)
+    open_circuits: list[str] = []
+    if isinstance(breakers, dict):
+        open_circuits = [name for name, breaker in breakers.items() if breaker.is_open()]
+
+    traffic = llm_health.snapshot()
+    if isinstance(breakers, dict) and breakers and len(open_circuits) == len(breakers):
+        status = "failing"
+    elif (
+        traffic["consecutive_failures"] >= LLM_HEALTH_FAILURE_THRESHOLD
+        and time.time() - traffic["last_failure"] < LLM_HEALTH_FAILURE_WINDOW
+    ):
+        status = "failing"
+    elif traffic["last_success"] is None:
+        status = "unknown"
+    else:
+        status = "ok"
+    return {"configured": True, "status": status, "open_circuits": open_circuits, **traffic}
@@ -9,6 +9,13 @@ Intuition: The hypothetical answer is semantically closer to actual legal docume
 than the user's raw question, bridging the vocabulary gap between natural queries
 and formal legal text.
 
+Speculative retrieval: the original-question search does not depend on the
+LLM, so it runs while the hypothetical is still being generated. Generation
+gets a latency budget (HYDE_LATENCY_BUDGET); when it runs out, the plain
+original-question results are returned instead of waiting.
+``aenhanced_search`` is the asyncio variant: generation is a coroutine and
+an over-budget call is cancelled instead of abandoned on a thread.
+
 Example:
     User question: "Bagaimana cara mendirikan PT?"
     Hypothetical answer: "Untuk mendirikan Perseroan Terbatas (PT), diperlukan..."
@@ -17,12 +24,21 @@ Example:
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import logging
-from typing import TYPE_CHECKING
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Awaitable
 
 if TYPE_CHECKING:
+    from llm_cache import LLMCache
     from llm_client import LLMClient
 
+from llm_client import async_generate
+
 # Import SearchResult at runtime for creating merged results
 from retriever import SearchResult
 
@@ -32,6 +48,17 @@ logger = logging.getLogger(__name__)
 # RRF constant (standard value from information retrieval literature)
 RRF_K = 60
 
+# Seconds the hypothetical generation may take, counted from the start of
+# enhanced_search (0 = wait indefinitely)
+HYDE_LATENCY_BUDGET = float(os.getenv("HYDE_LATENCY_BUDGET", "8"))
+# Concurrent hypothetical generations (bounds abandoned, over-budget calls too)
+HYDE_MAX_WORKERS = int(os.getenv("HYDE_MAX_WORKERS", "4"))
+
+# Bump when the hypothetical prompt changes (invalidates cached generations)
+HYDE_PROMPT_VERSION = "1"
+
+HYDE_SYSTEM_MESSAGE = "Anda adalah ahli hukum Indonesia yang menulis dengan bahasa formal hukum."
+
 
 class HyDE:
     """
@@ -52,16 +79,53 @@ class HyDE:
         ...     print(f"{result.citation}: {result.score:.3f}")
     """
     
-    def __init__(self, llm_client: LLMClient):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        latency_budget: float = HYDE_LATENCY_BUDGET,
+        max_workers: int = HYDE_MAX_WORKERS,
+        cache: LLMCache | None = None,
+    ):
         """
         Initialize HyDE with an LLM client.
         
         Args:
             llm_client: LLM client for generating hypothetical answers
+            latency_budget: Seconds to wait for the hypothetical before
+                returning plain results (0 disables the budget)
+            max_workers: Size of the hypothetical-generation thread pool
+            cache: Optional persistent cache of hypothetical answers
         """
         self.llm_client = llm_client
+        self.cache = cache
+        self.latency_budget = latency_budget
+        self.max_workers = max(1, max_workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
         logger.info("Initialized HyDE with LLM client")
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the bounded hypothetical-generation pool."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="hyde",
+                    )
+        return self._executor
+    
+    @staticmethod
+    def _prompt(question: str) -> str:
+        """Prompt asking for a hypothetical legal-style answer."""
+        return f"""Bayangkan Anda menulis jawaban ideal untuk pertanyaan hukum ini.
+Tulis paragraf singkat (100-200 kata) yang menjawab pertanyaan seolah-olah Anda adalah ahli hukum Indonesia.
+Jangan sebutkan bahwa Anda tidak tahu atau butuh konteks lebih. Langsung tulis jawabannya menggunakan bahasa formal hukum.
+
+Pertanyaan: {question}
+
+Jawaban ideal (100-200 kata):"""
+    
     def generate_hypothetical(self, question: str) -> str:
         """
         Generate a hypothetical answer to the user's question.
@@ -82,21 +146,23 @@ class HyDE:
             >>> print(hyp)
             "Untuk mendirikan Perseroan Terbatas (PT), diperlukan akta pendirian..."
         """
-        prompt = f"""Bayangkan Anda menulis jawaban ideal untuk pertanyaan hukum ini.
-Tulis paragraf singkat (100-200 kata) yang menjawab pertanyaan seolah-olah Anda adalah ahli hukum Indonesia.
-Jangan sebutkan bahwa Anda tidak tahu atau butuh konteks lebih. Langsung tulis jawabannya menggunakan bahasa formal hukum.
-
-Pertanyaan: {question}
-
-Jawaban ideal (100-200 kata):"""
+        prompt = self._prompt(question)
         
         logger.info(f"Generating hypothetical answer for: {question[:50]}...")
         
-        try:
-            hypothetical = self.llm_client.generate(
+        def call_llm() -> str:
+            return self.llm_client.generate(
                 user_message=prompt,
-                system_message="Anda adalah ahli hukum Indonesia yang menulis dengan bahasa formal hukum.",
+                system_message=HYDE_SYSTEM_MESSAGE,
             )
+        
+        try:
+            if self.cache is not None:
+                hypothetical = self.cache.get_or_generate(
+                    "hyde", HYDE_PROMPT_VERSION, self.llm_client, question, call_llm
+                )
+            else:
+                hypothetical = call_llm()
             
             logger.info(f"Generated hypothetical answer ({len(hypothetical)} chars)")
             return hypothetical.strip()
@@ -107,6 +173,38 @@ Jawaban ideal (100-200 kata):"""
             logger.warning("Falling back to original question")
             return question
     
+    async def agenerate_hypothetical(self, question: str) -> str:
+        """
+        Async :meth:`generate_hypothetical` (same prompt, cache and fallback).
+        
+        Args:
+            question: User's question in natural language
+        
+        Returns:
+            Hypothetical answer, or the question itself if generation fails
+        """
+        prompt = self._prompt(question)
+        logger.info(f"Generating hypothetical answer (async) for: {question[:50]}...")
+        
+        def call_llm() -> Awaitable[str]:
+            return async_generate(self.llm_client, prompt, HYDE_SYSTEM_MESSAGE)
+        
+        try:
+            if self.cache is not None:
+                hypothetical = await self.cache.aget_or_generate(
+                    "hyde", HYDE_PROMPT_VERSION, self.llm_client, question, call_llm
+                )
+            else:
+                hypothetical = await call_llm()
+            
+            logger.info(f"Generated hypothetical answer ({len(hypothetical)} chars)")
+            return hypothetical.strip()
+        
+        except Exception as e:
+            logger.error(f"Failed to generate hypothetical answer: {e}")
+            logger.warning("Falling back to original question")
+            return question
+    
     def enhanced_search(
         self,
         question: str,
@@ -117,12 +215,14 @@ Jawaban ideal (100-200 kata):"""
         Search with both original question and hypothetical answer, merge with RRF.
         
         Process:
-        1. Generate hypothetical answer via LLM
-        2. Search with original question: retriever.search(question, top_k)
-        3. Search with hypothetical: retriever.search(hypothetical, top_k)
-        4. Merge results using Reciprocal Rank Fusion (RRF):
+        1. Start generating the hypothetical answer via LLM (background)
+        2. Meanwhile, search with original question: retriever.search(question, top_k)
+        3. Wait for the hypothetical within the latency budget; on timeout
+           return the original-question results
+        4. Search with hypothetical: retriever.search(hypothetical, top_k)
+        5. Merge results using Reciprocal Rank Fusion (RRF):
            score = sum(1 / (k + rank)) for each list where doc appears
-        5. Return deduplicated list sorted by RRF score
+        6. Return deduplicated list sorted by RRF score
         
         Args:
             question: User's original question
@@ -151,19 +251,93 @@ Jawaban ideal (100-200 kata):"""
             - Empty results from either search → uses results from the other
             - Duplicate documents → merged with combined RRF score
             - Generation failure → falls back to single search with original question
+            - Generation over budget → original-question results only
         """
         logger.info(f"HyDE enhanced search: {question[:50]}...")
+        start = time.perf_counter()
         
-        # Generate hypothetical answer
-        hypothetical = self.generate_hypothetical(question)
+        # Generate hypothetical answer in the background
+        hypothetical_future = self._get_executor().submit(
+            contextvars.copy_context().run, self.generate_hypothetical, question
+        )
         
-        # Search with both question and hypothetical
+        # Speculatively search with the original question meanwhile
         logger.info(f"Searching with original question (top_k={top_k})...")
         results_question = retriever.search(question, top_k=top_k)
         
+        remaining: float | None = None
+        if self.latency_budget > 0:
+            remaining = max(0.0, self.latency_budget - (time.perf_counter() - start))
+        try:
+            hypothetical = hypothetical_future.result(timeout=remaining)
+        except FutureTimeoutError:
+            # Drops the call if it is still queued; a running LLM call cannot be
+            # interrupted, so its result is discarded
+            hypothetical_future.cancel()
+            logger.warning(
+                f"Hypothetical generation exceeded {self.latency_budget:.1f}s budget, "
+                "using original question results only"
+            )
+            return results_question
+        
         logger.info(f"Searching with hypothetical answer (top_k={top_k})...")
         results_hypothetical = retriever.search(hypothetical, top_k=top_k)
         
+        return self._fuse(results_question, results_hypothetical)
+    
+    async def aenhanced_search(
+        self,
+        question: str,
+        retriever,
+        top_k: int = 5,
+    ) -> list[SearchResult]:
+        """
+        Async :meth:`enhanced_search`.
+        
+        The hypothetical is generated as a coroutine while the
+        original-question search runs in a worker thread. When the latency
+        budget runs out the generation is cancelled (not just abandoned),
+        so an over-budget LLM call stops holding a connection.
+        
+        Args:
+            question: User's original question
+            retriever: HybridRetriever instance (must have .search() method)
+            top_k: Number of results to retrieve from each search (default: 5)
+        
+        Returns:
+            Deduplicated list of SearchResult objects sorted by RRF score (descending)
+        """
+        logger.info(f"HyDE enhanced search (async): {question[:50]}...")
+        start = time.perf_counter()
+        
+        hypothetical_task = asyncio.ensure_future(self.agenerate_hypothetical(question))
+        try:
+            results_question = await asyncio.to_thread(retriever.search, question, top_k=top_k)
+        except BaseException:
+            hypothetical_task.cancel()
+            raise
+        
+        remaining: float | None = None
+        if self.latency_budget > 0:
+            remaining = max(0.0, self.latency_budget - (time.perf_counter() - start))
+        try:
+            hypothetical = await asyncio.wait_for(hypothetical_task, timeout=remaining)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Hypothetical generation exceeded {self.latency_budget:.1f}s budget, "
+                "using original question results only"
+            )
+            return results_question
+        
+        results_hypothetical = await asyncio.to_thread(retriever.search, hypothetical, top_k=top_k)
+        return self._fuse(results_question, results_hypothetical)
+    
+    @staticmethod
+    def _fuse(
+        results_question: list[SearchResult],
+        results_hypothetical: list[SearchResult],
+    ) -> list[SearchResult]:
+        """RRF-merge the original-question and hypothetical result lists."""
         # Edge case: empty results
         if not results_question and not results_hypothetical:
             logger.warning("Both searches returned empty results")
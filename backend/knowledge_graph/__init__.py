@@ -4,8 +4,17 @@ Knowledge Graph module for Indonesian legal documents.
 Provides Pydantic models for legal document nodes (UU, PP, Perpres, Permen,
 Bab, Pasal) and a NetworkX-backed directed graph for traversing legal
 hierarchies and cross-references.
+
+The schema models are imported eagerly; the graph, persistence and ingest
+helpers (which pull in NetworkX) load on first attribute access, so code
+that only needs the schema does not pay for NetworkX at import time.
 """
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .schema import (
     Article,
     BaseNode,
@@ -18,9 +27,30 @@ from .schema import (
     PresidentialRegulation,
     RegulationType,
 )
-from .graph import LegalKnowledgeGraph
-from .persistence import load_graph, save_graph
-from .ingest import ingest_from_json, ingest_all
+
+if TYPE_CHECKING:
+    from .graph import LegalKnowledgeGraph
+    from .persistence import load_graph, save_graph
+    from .ingest import ingest_from_json, ingest_all
+
+# Public name -> submodule that defines it (imported lazily).
+_LAZY_EXPORTS: dict[str, str] = {
+    "LegalKnowledgeGraph": ".graph",
+    "load_graph": ".persistence",
+    "save_graph": ".persistence",
+    "ingest_from_json": ".ingest",
+    "ingest_all": ".ingest",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "Law",
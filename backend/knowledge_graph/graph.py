@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import time
 from collections import deque
-from typing import Any
+from typing import Any, Iterable
 
 import networkx as nx
 
@@ -38,6 +38,11 @@ class LegalKnowledgeGraph:
 
     def __init__(self) -> None:
         self._graph: nx.DiGraph[str] = nx.DiGraph()  # pyright: ignore[reportMissingTypeArgument]
+        # Integer-coded regulation adjacency (see build_regulation_adjacency).
+        # None means stale; rebuilt lazily on the next related-codes lookup.
+        self._reg_codes: dict[str, int] | None = None
+        self._reg_ids: list[str] = []
+        self._adjacency: dict[int, list[frozenset[int]]] = {}
 
     # ── Properties ───────────────────────────────────────────────────────
 
@@ -51,6 +56,7 @@ class LegalKnowledgeGraph:
     def _add_node(self, node: BaseNode) -> None:
         """Store a Pydantic node in the graph."""
         self._graph.add_node(node.id, **node.model_dump())
+        self._reg_codes = None
 
     def add_regulation(self, reg: RegulationType) -> None:
         """Add a regulation node (Law, PP, Perpres, or Permen)."""
@@ -79,6 +85,7 @@ class LegalKnowledgeGraph:
         metadata: dict[str, Any] | None = None,
     ) -> None:
         """Add a typed, directed edge between two nodes."""
+        self._reg_codes = None
         # Merge semantics: if an edge already exists between source and
         # target, preserve existing edge types and metadata instead of
         # overwriting. This allows multiple relation types (e.g.
@@ -607,6 +614,87 @@ class LegalKnowledgeGraph:
 
         return results
 
+    # ── Precomputed regulation adjacency ─────────────────────────────────
+
+    def build_regulation_adjacency(self, max_hops: int = 2) -> None:
+        """Precompute 1..*max_hops* related-regulation sets for every regulation.
+
+        Regulation node IDs are integer-coded and, for each hop count ``h``,
+        every regulation gets a ``frozenset`` of the codes reachable within
+        ``h`` hops.  Reachability matches :meth:`get_related_regulations`:
+        IMPLEMENTS/AMENDS/REFERENCES/SUPERSEDES edges in both directions,
+        through regulation nodes only, excluding the source itself.
+
+        Called once when the graph is loaded (:meth:`from_dict`); any later
+        mutation marks the index stale and it is rebuilt on next use.
+
+        Args:
+            max_hops: Deepest hop count to precompute (default 2).
+        """
+        reg_ids = [
+            node_id for node_id, data in self._graph.nodes(data=True)
+            if data.get("node_type", "") in self._REGULATION_NODE_TYPES
+        ]
+        codes = {node_id: i for i, node_id in enumerate(reg_ids)}
+
+        neighbors: list[set[int]] = [set() for _ in reg_ids]
+        for src, tgt, edata in self._graph.edges(data=True):
+            if edata.get("edge_type", "") not in self._REGULATION_EDGE_TYPES:
+                continue
+            src_code = codes.get(src)
+            tgt_code = codes.get(tgt)
+            if src_code is None or tgt_code is None or src_code == tgt_code:
+                continue
+            neighbors[src_code].add(tgt_code)
+            neighbors[tgt_code].add(src_code)
+
+        adjacency: dict[int, list[frozenset[int]]] = {1: [frozenset(n) for n in neighbors]}
+        for hop in range(2, max_hops + 1):
+            previous = adjacency[hop - 1]
+            expanded: list[frozenset[int]] = []
+            for code, reach in enumerate(previous):
+                grown = set(reach)
+                for other in reach:
+                    grown |= adjacency[1][other]
+                grown.discard(code)
+                expanded.append(frozenset(grown))
+            adjacency[hop] = expanded
+
+        self._reg_ids = reg_ids
+        self._adjacency = adjacency
+        self._reg_codes = codes
+
+    def regulation_codes(self, reg_ids: Iterable[str]) -> set[int]:
+        """Integer codes for the given regulation IDs (unknown IDs are skipped)."""
+        if self._reg_codes is None:
+            self.build_regulation_adjacency()
+        codes = self._reg_codes or {}
+        return {codes[reg_id] for reg_id in reg_ids if reg_id in codes}
+
+    def related_regulation_codes(self, codes: Iterable[int], max_hops: int = 1) -> set[int]:
+        """Union of the precomputed *max_hops* neighbourhoods of *codes*.
+
+        Constant work per source regulation — no graph traversal.  Source
+        codes themselves are included only if related to another source,
+        so zero (or negative) hops relate nothing.
+        """
+        if max_hops < 1:
+            return set()
+        if self._reg_codes is None:
+            self.build_regulation_adjacency()
+        if max_hops not in self._adjacency:
+            self.build_regulation_adjacency(max_hops=max_hops)
+        table = self._adjacency[max_hops]
+        related: set[int] = set()
+        for code in codes:
+            related |= table[code]
+        return related
+
+    def get_related_regulation_ids(self, reg_ids: Iterable[str], max_hops: int = 1) -> set[str]:
+        """Regulation IDs within *max_hops* of any of *reg_ids* (precomputed)."""
+        related = self.related_regulation_codes(self.regulation_codes(reg_ids), max_hops=max_hops)
+        return {self._reg_ids[code] for code in related}
+
     def search_nodes(
         self, query: str, node_type: str | None = None
     ) -> list[dict[str, Any]]:
@@ -690,6 +778,8 @@ class LegalKnowledgeGraph:
                 if not self._graph.has_edge(tgt, src):
                     self._graph.add_edge(tgt, src, edge_type=reverse_type)
                     added += 1
+        if added:
+            self._reg_codes = None
         return added
 
     @classmethod
@@ -709,4 +799,5 @@ class LegalKnowledgeGraph:
             kg._graph.add_edge(source, target, **edge_data)
 
         kg.ensure_reverse_edges()
+        kg.build_regulation_adjacency()
         return kg
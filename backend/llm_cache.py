@@ -0,0 +1,315 @@
+"""
+Persistent cache for auxiliary LLM generations (HyDE, decomposition, rephrase).
+
+``HyDE.generate_hypothetical``, ``QueryPlanner.decompose`` and
+``CRAG.rephrase_query`` each make a full LLM round trip whose output depends
+only on the prompt template, the model and the question. This module stores
+those raw LLM responses in a small SQLite file keyed by a content hash of
+``(kind, template version, provider, model, normalized question)``, so a
+repeated question skips one to three LLM calls before answer generation.
+
+Intuition:
+    These generations are "good enough" rather than exact: any one
+    hypothetical answer or rephrase is as useful as the next, so reusing the
+    previous output for the same question is free quality-neutral latency.
+    Bumping a template version constant (e.g. ``HYDE_PROMPT_VERSION``) makes
+    every old entry unreachable; TTL and LRU eviction bound staleness and
+    file size.
+
+Only real provider clients are cached: a client whose ``model`` attribute is
+not a string (mocks, ad-hoc test doubles) is passed straight through.
+Failures are never cached — the generator's exception propagates and the
+caller's existing fallback applies.
+
+Example:
+    >>> cache = LLMCache("data/llm_cache.sqlite3")
+    >>> text = cache.get_or_generate(
+    ...     "hyde", HYDE_PROMPT_VERSION, llm_client, question,
+    ...     lambda: llm_client.generate(user_message=prompt),
+    ... )
+    >>> text = await cache.aget_or_generate(
+    ...     "hyde", HYDE_PROMPT_VERSION, llm_client, question,
+    ...     lambda: async_generate(llm_client, prompt),
+    ... )
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "llm_cache.sqlite3"),
+)
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """
+    Canonical form of a question for cache keys.
+
+    NFKC-normalizes, lowercases, collapses whitespace and drops trailing
+    punctuation, so "Apa itu PT ?" and "apa itu  PT?" share an entry.
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return text.rstrip(" ?!.")
+
+
+def client_identity(llm_client: Any) -> tuple[str, str] | None:
+    """
+    ``(provider, model)`` for a client, or None if it cannot be identified.
+
+    FallbackChain is identified by its provider order and models, since any
+    of them may answer.
+    """
+    providers = getattr(llm_client, "providers", None)
+    if isinstance(providers, list):
+        models = []
+        for _, client in providers:
+            model = getattr(client, "model", None)
+            if not isinstance(model, str):
+                return None
+            models.append(model)
+        names = ",".join(name for name, _ in providers)
+        return f"fallback[{names}]", ",".join(models)
+    model = getattr(llm_client, "model", None)
+    if not isinstance(model, str):
+        return None
+    return type(llm_client).__name__, model
+
+
+class LLMCache:
+    """
+    Thread-safe, TTL + LRU bounded SQLite cache of LLM text outputs.
+
+    Usage:
+        cache = LLMCache("data/llm_cache.sqlite3", ttl_seconds=86400, max_entries=5000)
+        cache.get_or_generate("decompose", "1", llm_client, question, call_llm)
+        cache.stats()
+    """
+
+    def __init__(
+        self,
+        path: str | Path = LLM_CACHE_PATH,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: SQLite file path (``":memory:"`` for a process-local cache)
+            ttl_seconds: Entry lifetime; expired entries are misses
+            max_entries: Least-recently-used entries beyond this are evicted
+        """
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+
+    @staticmethod
+    def make_key(
+        kind: str,
+        template_version: str,
+        provider: str,
+        model: str,
+        question: str,
+    ) -> str:
+        """SHA-256 content address of one auxiliary generation."""
+        parts = (kind, template_version, provider, model, normalize_question(question))
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Cached value for ``key``, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str, kind: str = "") -> None:
+        """Store ``value`` and evict expired / least-recently-used entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, kind, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, kind, value, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    " SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def _lookup(
+        self,
+        kind: str,
+        template_version: str,
+        llm_client: Any,
+        question: str,
+    ) -> tuple[str | None, str | None]:
+        """``(key, cached value)``; key is None when the client is not identifiable."""
+        identity = client_identity(llm_client)
+        if identity is None:
+            return None, None
+        key = self.make_key(kind, template_version, identity[0], identity[1], question)
+        try:
+            cached = self.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed, calling LLM: {e}")
+            cached = None
+        if cached is not None:
+            logger.info(f"LLM cache hit ({kind}): {question[:50]}...")
+        return key, cached
+
+    def _store(self, key: str | None, value: Any, kind: str) -> None:
+        """Store a fresh generation unless it is empty or uncacheable."""
+        if key is None or not isinstance(value, str) or not value.strip():
+            return
+        try:
+            self.set(key, value, kind)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def get_or_generate(
+        self,
+        kind: str,
+        template_version: str,
+        llm_client: Any,
+        question: str,
+        generate: Callable[[], str],
+    ) -> str:
+        """
+        Return the cached generation for this question, or call ``generate``.
+
+        Args:
+            kind: Generation kind ("hyde", "decompose", "rephrase")
+            template_version: Prompt template version of the caller
+            llm_client: Client that ``generate`` uses (identifies provider/model)
+            question: Question the prompt was built from
+            generate: Zero-argument callable making the LLM call
+
+        Returns:
+            Raw LLM output text
+        """
+        key, cached = self._lookup(kind, template_version, llm_client, question)
+        if cached is not None:
+            return cached
+        value = generate()
+        self._store(key, value, kind)
+        return value
+
+    async def aget_or_generate(
+        self,
+        kind: str,
+        template_version: str,
+        llm_client: Any,
+        question: str,
+        agenerate: Callable[[], Awaitable[str]],
+    ) -> str:
+        """
+        Async :meth:`get_or_generate`; ``agenerate`` returns an awaitable.
+
+        The SQLite lookup and write are local and sub-millisecond, so they
+        run inline on the event loop.
+        """
+        key, cached = self._lookup(kind, template_version, llm_client, question)
+        if cached is not None:
+            return cached
+        value = await agenerate()
+        self._store(key, value, kind)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry and reset counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count, hit/miss counters and hit rate."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_llm_cache: LLMCache | None = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache | None:
+    """Process-wide cache at LLM_CACHE_PATH, or None when LLM_CACHE_ENABLED=false."""
+    global _llm_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                try:
+                    _llm_cache = LLMCache()
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"LLM cache unavailable at {LLM_CACHE_PATH}: {e}")
+                    return None
+    return _llm_cache
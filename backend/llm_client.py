@@ -9,7 +9,11 @@ different AI model providers. Currently supports:
   - Google Gemini (Gemini 2.5 Flash) — generous free tier, OpenAI-compatible
   - Mistral (mistral-small-latest) — moderate free tier, OpenAI-compatible
 
-All providers support streaming (generate_stream) and non-streaming (generate).
+All providers support streaming (generate_stream) and non-streaming (generate),
+plus native asyncio variants (agenerate / agenerate_stream) built on a pooled
+httpx.AsyncClient, so an async caller waiting on a remote LLM holds no thread.
+Use async_generate / async_generate_stream to call any client from a coroutine;
+clients without native async methods are bridged through a worker thread.
 
 Usage:
     from llm_client import create_llm_client
@@ -26,22 +30,31 @@ Usage:
     client = create_llm_client("mistral")
 
     response = client.generate("What is PT?", system_message="You are a lawyer")
+    response = await client.agenerate("What is PT?", system_message="You are a lawyer")
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
+import inspect
 import json
 import logging
 import os
 import platform
 import threading
 import time
+import weakref
 from pathlib import Path
-from typing import Generator, Protocol
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator, Protocol
 
+import httpx
 import requests
 from dotenv import load_dotenv
 
+from telemetry import LLM_CALL_SECONDS
+
 # Load environment variables
 load_dotenv()
 
@@ -100,24 +113,329 @@ ANTIGRAVITY_CLIENT_ID = "1071006060591-tmhssin2h21lcre235vtolojh4g403ep.apps.goo
 ANTIGRAVITY_CLIENT_SECRET = "REDACTED_SECRET"  # pragma: allowlist secret
 ANTIGRAVITY_DEFAULT_MODEL = "gemini-3-flash"
 ANTIGRAVITY_DEFAULT_PROJECT_ID = "rising-fact-p41fc"
+ANTIGRAVITY_STREAM_ENDPOINT = f"{ANTIGRAVITY_API_URL}/v1internal:streamGenerateContent?alt=sse"
+
+# ---------------------------------------------------------------------------
+# Async HTTP
+# ---------------------------------------------------------------------------
+# Connections per event loop shared by all async provider calls
+LLM_ASYNC_MAX_CONNECTIONS = int(os.getenv("LLM_ASYNC_MAX_CONNECTIONS", "200"))
 
 
 # ---------------------------------------------------------------------------
 # LLMClient Protocol
 # ---------------------------------------------------------------------------
 class LLMClient(Protocol):
-    """Protocol for LLM client implementations."""
+    """Protocol for LLM client implementations.
+
+    ``max_tokens`` and ``temperature`` override the client's defaults for one
+    call only; clients never mutate their own settings per request, so one
+    instance can serve concurrent requests with different tuning.
+    """
 
-    def generate(self, user_message: str, system_message: str | None = None) -> str:
+    def generate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
         """Generate a response from the LLM."""
         ...
 
     def generate_stream(
-        self, user_message: str, system_message: str | None = None
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ) -> Generator[str, None, None]:
         """Generate a streaming response from the LLM. Yields chunks of text."""
         ...
 
+    async def agenerate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Async ``generate``: awaits the provider without holding a thread."""
+        ...
+
+    def agenerate_stream(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Async ``generate_stream``. Yields chunks of text."""
+        ...
+
+
+def generation_options(
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+) -> dict[str, int | float]:
+    """Keyword arguments for ``generate``/``generate_stream``, omitting unset options."""
+    options: dict[str, int | float] = {}
+    if max_tokens is not None:
+        options["max_tokens"] = max_tokens
+    if temperature is not None:
+        options["temperature"] = temperature
+    return options
+
+
+def _call_kwargs(
+    user_message: str,
+    system_message: str | None,
+    max_tokens: int | None,
+    temperature: float | None,
+) -> dict[str, Any]:
+    """Keyword arguments for one generate call (same shape as sync callers use)."""
+    kwargs: dict[str, Any] = {"user_message": user_message}
+    if system_message is not None:
+        kwargs["system_message"] = system_message
+    kwargs.update(generation_options(max_tokens, temperature))
+    return kwargs
+
+
+async def async_generate(
+    llm_client: Any,
+    user_message: str,
+    system_message: str | None = None,
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+) -> str:
+    """
+    Await a generation from any client.
+
+    Uses the client's native ``agenerate`` coroutine when it has one;
+    otherwise runs the blocking ``generate`` in a worker thread.
+    """
+    kwargs = _call_kwargs(user_message, system_message, max_tokens, temperature)
+    agenerate = getattr(llm_client, "agenerate", None)
+    if inspect.iscoroutinefunction(agenerate):
+        return await agenerate(**kwargs)
+    return await asyncio.to_thread(llm_client.generate, **kwargs)
+
+
+async def async_generate_stream(
+    llm_client: Any,
+    user_message: str,
+    system_message: str | None = None,
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Stream a generation from any client as an async iterator.
+
+    Uses the client's native ``agenerate_stream`` when it is an async
+    generator; otherwise the blocking ``generate_stream`` runs in a worker
+    thread and its chunks are handed over through a queue. Closing the
+    iterator early stops the worker at the next chunk.
+    """
+    kwargs = _call_kwargs(user_message, system_message, max_tokens, temperature)
+    agenerate_stream = getattr(llm_client, "agenerate_stream", None)
+    if inspect.isasyncgenfunction(agenerate_stream):
+        async for chunk in agenerate_stream(**kwargs):
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue()
+    stop = threading.Event()
+
+    def put(item: tuple[bool, Any]) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:  # event loop already closed
+            stop.set()
+
+    def produce() -> None:
+        try:
+            for chunk in llm_client.generate_stream(**kwargs):
+                if stop.is_set():
+                    return
+                put((False, chunk))
+        except Exception as e:  # re-raised in the consumer
+            put((True, e))
+        else:
+            put((True, None))
+
+    producer = loop.run_in_executor(None, contextvars.copy_context().run, produce)
+    try:
+        while True:
+            finished, item = await queue.get()
+            if finished:
+                if item is not None:
+                    raise item
+                break
+            yield item
+    finally:
+        stop.set()
+    await producer
+
+
+# One pooled client per event loop: httpx async clients are bound to the
+# loop they were first used on.
+_async_http_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _async_http() -> httpx.AsyncClient:
+    """Shared async HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_ASYNC_MAX_CONNECTIONS,
+            ),
+        )
+        _async_http_clients[loop] = client
+    return client
+
+
+async def aclose_async_http() -> None:
+    """Close the running loop's shared async HTTP client (call at shutdown)."""
+    client = _async_http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def _asend(
+    name: str,
+    url: str,
+    payload: dict[str, Any],
+    headers: Callable[[], dict[str, str]],
+    timeout: float = 120,
+    max_retries: int = 3,
+    stream: bool = False,
+    refresh_auth: Callable[[], Awaitable[Any]] | None = None,
+    honor_retry_after: bool = False,
+    failure_message: str | None = None,
+) -> httpx.Response:
+    """
+    POST ``payload`` with the same retry policy as the sync clients.
+
+    Retries transport errors and error statuses with exponential backoff
+    (1s, 2s, ...). A 401 triggers one ``refresh_auth`` before retrying;
+    with ``honor_retry_after`` a 429 waits for its Retry-After header.
+
+    Args:
+        name: Client name for log messages
+        url: Endpoint URL
+        payload: JSON request body
+        headers: Called per attempt, so refreshed credentials are picked up
+        timeout: Per-request timeout in seconds
+        max_retries: Attempts before giving up
+        stream: Return an unread streaming response (caller must close it)
+        refresh_auth: Coroutine function that refreshes credentials
+        honor_retry_after: Sleep for Retry-After on 429 instead of failing
+        failure_message: RuntimeError message after the last attempt
+
+    Returns:
+        Successful response
+
+    Raises:
+        RuntimeError: If every attempt failed
+    """
+    http = _async_http()
+    auth_refreshed = False
+    last_exception: Exception | None = None
+    for attempt in range(max_retries):
+        try:
+            request = http.build_request("POST", url, headers=headers(), json=payload, timeout=timeout)
+            response = await http.send(request, stream=stream)
+
+            if response.status_code == 401 and refresh_auth is not None and not auth_refreshed:
+                await response.aclose()
+                logger.warning(f"{name} returned 401, refreshing credentials...")
+                await refresh_auth()
+                auth_refreshed = True
+                continue
+
+            if response.status_code == 429 and honor_retry_after:
+                await response.aclose()
+                retry_after = int(response.headers.get("Retry-After", 2 ** attempt))
+                logger.warning(
+                    f"{name} rate limited (429). "
+                    f"Waiting {retry_after}s (attempt {attempt + 1}/{max_retries})..."
+                )
+                await asyncio.sleep(retry_after)
+                last_exception = httpx.HTTPStatusError(
+                    "429 Too Many Requests", request=request, response=response
+                )
+                continue
+
+            if response.is_error:
+                await response.aclose()
+                response.raise_for_status()
+            return response
+
+        except httpx.HTTPError as e:
+            last_exception = e
+            if attempt < max_retries - 1:
+                wait_time = 2 ** attempt
+                logger.warning(
+                    f"{name} async attempt {attempt + 1}/{max_retries} failed: {e}. "
+                    f"Retrying in {wait_time}s..."
+                )
+                await asyncio.sleep(wait_time)
+            else:
+                logger.error(f"{name} async error after {max_retries} attempts: {e}")
+
+    raise RuntimeError(
+        failure_message or f"{name} API failed after {max_retries} attempts."
+    ) from last_exception
+
+
+async def _aiter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any], None]:
+    """Decoded JSON ``data:`` events of a streaming SSE response, until ``[DONE]``."""
+    try:
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            data = line[6:]
+            if data.strip() == "[DONE]":
+                break
+            try:
+                yield json.loads(data)
+            except json.JSONDecodeError:
+                continue
+    finally:
+        await response.aclose()
+
+
+def _chat_messages(user_message: str, system_message: str | None) -> list[dict[str, str]]:
+    """OpenAI-style messages list."""
+    messages: list[dict[str, str]] = []
+    if system_message:
+        messages.append({"role": "system", "content": system_message})
+    messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+def _message_content(message: dict[str, Any]) -> str:
+    """Answer text of a chat completion message (reasoning models may omit 'content')."""
+    return (
+        message.get("content")
+        or message.get("reasoning")
+        or message.get("reasoning_content")
+        or ""
+    )
+
+
+def _delta_content(chunk: dict[str, Any]) -> str:
+    """Text of one streamed chat completion chunk."""
+    if "choices" in chunk and len(chunk["choices"]) > 0:
+        return chunk["choices"][0].get("delta", {}).get("content", "") or ""
+    return ""
+
 
 # ---------------------------------------------------------------------------
 # OpenAICompatibleClient — Base class for OpenAI-compatible API endpoints
@@ -151,32 +469,32 @@ class OpenAICompatibleClient:
             **(extra_headers or {}),
         }
 
+    def _payload(
+        self,
+        user_message: str,
+        system_message: str | None,
+        max_tokens: int | None,
+        temperature: float | None,
+        stream: bool,
+    ) -> dict:
+        """Chat completion request body; per-call options override the defaults."""
+        return {
+            "model": self.model,
+            "messages": _chat_messages(user_message, system_message),
+            "max_tokens": self.max_tokens if max_tokens is None else max_tokens,
+            "temperature": self.temperature if temperature is None else temperature,
+            "stream": stream,
+        }
+
     def generate(
         self,
         user_message: str,
         system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ) -> str:
         """Generate response from an OpenAI-compatible API."""
-        messages: list[dict[str, str]] = []
-
-        if system_message:
-            messages.append({
-                "role": "system",
-                "content": system_message,
-            })
-
-        messages.append({
-            "role": "user",
-            "content": user_message,
-        })
-
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
-            "stream": False,
-        }
+        payload = self._payload(user_message, system_message, max_tokens, temperature, stream=False)
 
         max_retries = 3
         last_exception: Exception | None = None
@@ -227,28 +545,11 @@ class OpenAICompatibleClient:
         self,
         user_message: str,
         system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ) -> Generator[str, None, None]:
         """Generate streaming response from an OpenAI-compatible API. Yields chunks of text."""
-        messages: list[dict[str, str]] = []
-
-        if system_message:
-            messages.append({
-                "role": "system",
-                "content": system_message,
-            })
-
-        messages.append({
-            "role": "user",
-            "content": user_message,
-        })
-
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
-            "stream": True,
-        }
+        payload = self._payload(user_message, system_message, max_tokens, temperature, stream=True)
 
         max_retries = 3
         last_exception: Exception | None = None
@@ -299,6 +600,46 @@ class OpenAICompatibleClient:
             f"{self.__class__.__name__} streaming API failed after {max_retries} attempts."
         ) from last_exception
 
+    async def agenerate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Async ``generate`` (same retry policy, no thread held while waiting)."""
+        response = await _asend(
+            self.__class__.__name__,
+            self.base_url,
+            self._payload(user_message, system_message, max_tokens, temperature, stream=False),
+            lambda: self.headers,
+        )
+        message = response.json()["choices"][0]["message"]
+        content = _message_content(message)
+        if not content:
+            logger.warning(f"Empty response from model. Full message: {message}")
+        return content
+
+    async def agenerate_stream(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Async ``generate_stream``. Yields chunks of text."""
+        response = await _asend(
+            self.__class__.__name__,
+            self.base_url,
+            self._payload(user_message, system_message, max_tokens, temperature, stream=True),
+            lambda: self.headers,
+            stream=True,
+        )
+        async for chunk in _aiter_sse(response):
+            content = _delta_content(chunk)
+            if content:
+                yield content
+
 
 # ---------------------------------------------------------------------------
 # GroqClient — Groq API (LLaMA 3.3 70B)
@@ -409,32 +750,32 @@ class NVIDIANimClient:
             "Content-Type": "application/json",
         }
 
+    def _payload(
+        self,
+        user_message: str,
+        system_message: str | None,
+        max_tokens: int | None,
+        temperature: float | None,
+        stream: bool,
+    ) -> dict:
+        """Chat completion request body; per-call options override the defaults."""
+        return {
+            "model": self.model,
+            "messages": _chat_messages(user_message, system_message),
+            "max_tokens": self.max_tokens if max_tokens is None else max_tokens,
+            "temperature": self.temperature if temperature is None else temperature,
+            "stream": stream,
+        }
+
     def generate(
         self,
         user_message: str,
         system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ) -> str:
         """Generate response from NVIDIA NIM API."""
-        messages = []
-
-        if system_message:
-            messages.append({
-                "role": "system",
-                "content": system_message,
-            })
-
-        messages.append({
-            "role": "user",
-            "content": user_message,
-        })
-
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
-            "stream": False,
-        }
+        payload = self._payload(user_message, system_message, max_tokens, temperature, stream=False)
 
         max_retries = 2
         last_exception: Exception | None = None
@@ -484,28 +825,11 @@ class NVIDIANimClient:
         self,
         user_message: str,
         system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ):
         """Generate streaming response from NVIDIA NIM API. Yields chunks of text."""
-        messages = []
-
-        if system_message:
-            messages.append({
-                "role": "system",
-                "content": system_message,
-            })
-
-        messages.append({
-            "role": "user",
-            "content": user_message,
-        })
-
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
-            "stream": True,
-        }
+        payload = self._payload(user_message, system_message, max_tokens, temperature, stream=True)
 
         max_retries = 2
         last_exception: Exception | None = None
@@ -554,6 +878,52 @@ class NVIDIANimClient:
             "Gagal mendapatkan respons streaming dari layanan AI. Silakan coba lagi nanti."
         ) from last_exception
 
+    async def agenerate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Async ``generate`` (same retry policy, no thread held while waiting)."""
+        response = await _asend(
+            "NVIDIA NIM API",
+            self.api_url,
+            self._payload(user_message, system_message, max_tokens, temperature, stream=False),
+            lambda: self.headers,
+            timeout=60,
+            max_retries=2,
+            failure_message="Gagal mendapatkan respons dari layanan AI. Silakan coba lagi nanti.",
+        )
+        message = response.json()["choices"][0]["message"]
+        content = _message_content(message)
+        if not content:
+            logger.warning(f"Empty response from model. Full message: {message}")
+        return content
+
+    async def agenerate_stream(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Async ``generate_stream``. Yields chunks of text."""
+        response = await _asend(
+            "NVIDIA NIM API",
+            self.api_url,
+            self._payload(user_message, system_message, max_tokens, temperature, stream=True),
+            lambda: self.headers,
+            timeout=60,
+            max_retries=2,
+            stream=True,
+            failure_message="Gagal mendapatkan respons streaming dari layanan AI. Silakan coba lagi nanti.",
+        )
+        async for chunk in _aiter_sse(response):
+            content = _delta_content(chunk)
+            if content:
+                yield content
+
 
 # ---------------------------------------------------------------------------
 # CopilotChatClient — GitHub Copilot Chat API
@@ -919,6 +1289,8 @@ class CopilotChatClient:
         self,
         user_message: str,
         system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ) -> str:
         """Generate response from Copilot Chat API.
 
@@ -937,8 +1309,8 @@ class CopilotChatClient:
         payload = {
             "model": self.model,
             "messages": messages,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
+            "max_tokens": self.max_tokens if max_tokens is None else max_tokens,
+            "temperature": self.temperature if temperature is None else temperature,
             "stream": False,
         }
 
@@ -1012,6 +1384,8 @@ class CopilotChatClient:
         self,
         user_message: str,
         system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ) -> Generator[str, None, None]:
         """Generate streaming response from Copilot Chat API. Yields chunks of text.
 
@@ -1028,8 +1402,8 @@ class CopilotChatClient:
         payload = {
             "model": self.model,
             "messages": messages,
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
+            "max_tokens": self.max_tokens if max_tokens is None else max_tokens,
+            "temperature": self.temperature if temperature is None else temperature,
             "stream": True,
         }
 
@@ -1110,6 +1484,71 @@ class CopilotChatClient:
             f"Copilot Chat API streaming failed after {max_retries} attempts."
         ) from last_exception
 
+    async def _aensure_valid_token(self) -> None:
+        """Async ``_ensure_valid_token``; the (rare) token exchange runs in a thread."""
+        if time.time() > self._token_expires_at - 300:
+            logger.info("Copilot bearer token expired or near expiry, refreshing...")
+            await asyncio.to_thread(self._exchange_and_store_token)
+
+    async def _asend_chat(self, payload: dict, stream: bool) -> httpx.Response:
+        """POST to the chat endpoint with 401 token refresh and 429 Retry-After."""
+        await self._aensure_valid_token()
+        return await _asend(
+            "Copilot API",
+            COPILOT_CHAT_URL,
+            payload,
+            lambda: {**self.COPILOT_HEADERS, "Authorization": f"Bearer {self._bearer_token}"},
+            stream=stream,
+            refresh_auth=lambda: asyncio.to_thread(self._exchange_and_store_token),
+            honor_retry_after=True,
+            failure_message=(
+                f"Copilot Chat API {'streaming ' if stream else ''}failed after 3 attempts."
+            ),
+        )
+
+    async def agenerate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Async ``generate`` (same retry/refresh policy, no thread held while waiting)."""
+        payload = {
+            "model": self.model,
+            "messages": _chat_messages(user_message, system_message),
+            "max_tokens": self.max_tokens if max_tokens is None else max_tokens,
+            "temperature": self.temperature if temperature is None else temperature,
+            "stream": False,
+        }
+        response = await self._asend_chat(payload, stream=False)
+        result = response.json()
+        content = result["choices"][0]["message"]["content"]
+        if not content:
+            logger.warning(f"Empty response from Copilot. Full result: {result}")
+        return content or ""
+
+    async def agenerate_stream(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Async ``generate_stream``. Yields chunks of text."""
+        payload = {
+            "model": self.model,
+            "messages": _chat_messages(user_message, system_message),
+            "max_tokens": self.max_tokens if max_tokens is None else max_tokens,
+            "temperature": self.temperature if temperature is None else temperature,
+            "stream": True,
+        }
+        response = await self._asend_chat(payload, stream=True)
+        async for chunk in _aiter_sse(response):
+            content = _delta_content(chunk)
+            if content:
+                yield content
+
 
 # ---------------------------------------------------------------------------
 # AntigravityClient — Google IDE (Antigravity) OAuth-based provider
@@ -1199,30 +1638,15 @@ class AntigravityClient:
                 return self._access_token
         return self._refresh_access_token()
 
-    def generate(
-        self,
-        user_message: str,
-        system_message: str | None = None,
-    ) -> str:
-        """Generate response from Antigravity (Google IDE) API.
-
-        Delegates to generate_stream() and joins chunks to avoid 403s on
-        the non-streaming :generateContent endpoint (free accounts only).
-        """
-        return "".join(self.generate_stream(user_message, system_message))
-
-    def generate_stream(
+    def _request_body(
         self,
         user_message: str,
-        system_message: str | None = None,
-    ) -> Generator[str, None, None]:
-        """Streaming via Antigravity SSE endpoint (:streamGenerateContent?alt=sse)."""
+        system_message: str | None,
+        max_tokens: int | None,
+        temperature: float | None,
+    ) -> dict:
+        """Google GenerativeLanguage request body for one generation."""
         import uuid
-        access_token = self._get_access_token()
-        headers = {
-            **self.ANTIGRAVITY_HEADERS,
-            "Authorization": f"Bearer {access_token}",
-        }
 
         contents = []
         if system_message:
@@ -1245,6 +1669,12 @@ class AntigravityClient:
         elif actual_model.startswith("ag-"):
             actual_model = actual_model.replace("ag-", "", 1)
         
+        generation_config: dict[str, int | float] = {
+            "maxOutputTokens": self.max_tokens if max_tokens is None else max_tokens,
+        }
+        if temperature is not None:
+            generation_config["temperature"] = temperature
+
         body = {
             "project": self.project_id,
             "model": actual_model,
@@ -1254,11 +1684,61 @@ class AntigravityClient:
             "request": {
                 "model": actual_model,
                 "contents": contents,
-                "generationConfig": {"maxOutputTokens": self.max_tokens},
+                "generationConfig": generation_config,
             },
         }
+        return body
+
+    @staticmethod
+    def _chunk_text(chunk: dict) -> str:
+        """Text of one SSE chunk (candidates are wrapped in a "response" object)."""
+        candidates = chunk.get("response", {}).get("candidates", [])
+        if candidates:
+            parts = candidates[0].get("content", {}).get("parts", [])
+            if parts:
+                return parts[0].get("text", "")
+        return ""
+
+    async def _aget_access_token(self) -> str:
+        """Async ``_get_access_token``; a refresh runs in a thread."""
+        with self._token_lock:
+            if self._access_token and time.time() < self._token_expires_at:
+                return self._access_token
+        return await asyncio.to_thread(self._refresh_access_token)
+
+    def generate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Generate response from Antigravity (Google IDE) API.
 
-        endpoint = f"{ANTIGRAVITY_API_URL}/v1internal:streamGenerateContent?alt=sse"
+        Delegates to generate_stream() and joins chunks to avoid 403s on
+        the non-streaming :generateContent endpoint (free accounts only).
+        """
+        return "".join(self.generate_stream(
+            user_message, system_message, max_tokens=max_tokens, temperature=temperature
+        ))
+
+    def generate_stream(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> Generator[str, None, None]:
+        """Streaming via Antigravity SSE endpoint (:streamGenerateContent?alt=sse)."""
+        access_token = self._get_access_token()
+        headers = {
+            **self.ANTIGRAVITY_HEADERS,
+            "Authorization": f"Bearer {access_token}",
+        }
+
+        body = self._request_body(user_message, system_message, max_tokens, temperature)
+
+        endpoint = ANTIGRAVITY_STREAM_ENDPOINT
 
         max_retries = 3
         last_exception: Exception | None = None
@@ -1287,16 +1767,9 @@ class AntigravityClient:
                         if data_str.strip() == "[DONE]":
                             break
                         try:
-                            chunk = json.loads(data_str)
-                            # The format wraps candidates inside a "response" object
-                            response_obj = chunk.get("response", {})
-                            candidates = response_obj.get("candidates", [])
-                            if candidates:
-                                parts = candidates[0].get("content", {}).get("parts", [])
-                                if parts:
-                                    text = parts[0].get("text", "")
-                                    if text:
-                                        yield text
+                            text = self._chunk_text(json.loads(data_str))
+                            if text:
+                                yield text
                         except json.JSONDecodeError:
                             continue
                 return  # success
@@ -1319,6 +1792,43 @@ class AntigravityClient:
             f"AntigravityClient streaming API failed after {max_retries} attempts."
         ) from last_exception
 
+    async def agenerate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Async ``generate`` (joins the async stream, like the sync version)."""
+        return "".join([
+            chunk async for chunk in self.agenerate_stream(
+                user_message, system_message, max_tokens=max_tokens, temperature=temperature
+            )
+        ])
+
+    async def agenerate_stream(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Async ``generate_stream``. Yields chunks of text."""
+        await self._aget_access_token()
+        response = await _asend(
+            "AntigravityClient",
+            ANTIGRAVITY_STREAM_ENDPOINT,
+            self._request_body(user_message, system_message, max_tokens, temperature),
+            lambda: {**self.ANTIGRAVITY_HEADERS, "Authorization": f"Bearer {self._access_token}"},
+            stream=True,
+            refresh_auth=lambda: asyncio.to_thread(self._refresh_access_token),
+            failure_message="AntigravityClient streaming API failed after 3 attempts.",
+        )
+        async for chunk in _aiter_sse(response):
+            text = self._chunk_text(chunk)
+            if text:
+                yield text
+
 
 # ---------------------------------------------------------------------------
 # CircuitBreaker — Resilience pattern for provider health tracking
@@ -1376,6 +1886,106 @@ class CircuitBreaker:
             self.last_failure_time = time.time()
 
 
+class LLMHealth:
+    """Outcome of real answer-generation calls, for health probes.
+
+    Health checks read this instead of issuing synthetic completions: the
+    last success/failure time, the consecutive failure count and the last
+    error seen by real traffic. Only ``Exception`` counts as a failure, so
+    a client disconnecting mid-stream (GeneratorExit, CancelledError) does
+    not mark the provider unhealthy.
+    """
+
+    def __init__(self) -> None:
+        self.last_success: float | None = None
+        self.last_failure: float | None = None
+        self.last_error: str | None = None
+        self.consecutive_failures = 0
+        self._lock = threading.Lock()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.last_success = time.time()
+            self.consecutive_failures = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self.last_failure = time.time()
+            self.last_error = f"{type(error).__name__}: {error}"[:200]
+            self.consecutive_failures += 1
+
+    @contextlib.contextmanager
+    def track(
+        self, llm_client: Any = None, operation: str = "generate", record: bool = True
+    ) -> Generator[None, None, None]:
+        """Record the outcome of the LLM call(s) inside this block.
+
+        When ``llm_client`` is a single provider, the call duration is also
+        exported per provider; a ``FallbackChain`` times each attempt itself.
+        ``record=False`` only times the call: a per-request provider/model
+        override says nothing about the health of the default client.
+        """
+        timer = (
+            llm_call_timer(provider_label(llm_client), operation)
+            if llm_client is not None and not isinstance(llm_client, FallbackChain)
+            else contextlib.nullcontext()
+        )
+        try:
+            with timer:
+                yield
+        except Exception as e:
+            if record:
+                self.record_failure(e)
+            raise
+        if record:
+            self.record_success()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "last_success": self.last_success,
+                "last_failure": self.last_failure,
+                "last_error": self.last_error,
+                "consecutive_failures": self.consecutive_failures,
+            }
+
+
+# Process-wide record of answer generation outcomes (see LegalRAGChain).
+llm_health = LLMHealth()
+
+
+def provider_label(llm_client: Any) -> str:
+    """Short provider name for metrics labels (``GroqClient`` -> ``groq``)."""
+    name = getattr(llm_client, "provider_name", None)
+    if isinstance(name, str) and name:
+        return name
+    class_name = type(llm_client).__name__
+    for suffix in ("NimClient", "ChatClient", "Client"):
+        if class_name.endswith(suffix) and class_name != suffix:
+            class_name = class_name[: -len(suffix)]
+            break
+    return class_name.lower()
+
+
+@contextlib.contextmanager
+def llm_call_timer(provider: str, operation: str) -> Generator[None, None, None]:
+    """Export the duration of one provider call, labelled ok / error / cancelled.
+
+    For streams the duration covers the whole stream; a consumer that stops
+    early (client disconnect) is recorded as ``cancelled``, not ``error``.
+    """
+    start = time.perf_counter()
+    outcome = "cancelled"
+    try:
+        yield
+        outcome = "ok"
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        LLM_CALL_SECONDS.observe(time.perf_counter() - start, provider, operation, outcome)
+
+
 # ---------------------------------------------------------------------------
 # FallbackChain — Try providers in order with circuit breaker protection
 # ---------------------------------------------------------------------------
@@ -1399,6 +2009,8 @@ class FallbackChain:
         self,
         user_message: str,
         system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ) -> str:
         """Try each provider in order. Skip providers with open circuits."""
         errors: list[str] = []
@@ -1410,7 +2022,10 @@ class FallbackChain:
                 continue
 
             try:
-                result = client.generate(user_message, system_message)
+                with llm_call_timer(name, "generate"):
+                    result = client.generate(
+                        user_message, system_message, **generation_options(max_tokens, temperature)
+                    )
                 cb.record_success()
                 logger.debug(f"FallbackChain: {name} succeeded")
                 return result
@@ -1427,6 +2042,8 @@ class FallbackChain:
         self,
         user_message: str,
         system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ) -> Generator[str, None, None]:
         """Try each provider in order for streaming. Skip providers with open circuits."""
         errors: list[str] = []
@@ -1438,8 +2055,78 @@ class FallbackChain:
                 continue
 
             try:
-                for chunk in client.generate_stream(user_message, system_message):
-                    yield chunk
+                with llm_call_timer(name, "stream"):
+                    for chunk in client.generate_stream(
+                        user_message, system_message, **generation_options(max_tokens, temperature)
+                    ):
+                        yield chunk
+                cb.record_success()
+                logger.debug(f"FallbackChain: {name} streaming succeeded")
+                return
+            except Exception as e:
+                cb.record_failure()
+                errors.append(f"{name}: {e}")
+                logger.warning(f"FallbackChain: {name} streaming failed: {e}")
+
+        raise RuntimeError(
+            f"All providers in fallback chain failed (streaming): {'; '.join(errors)}"
+        )
+
+    async def agenerate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Async ``generate``: same provider order and circuit breakers."""
+        errors: list[str] = []
+
+        for name, client in self.providers:
+            cb = self.circuit_breakers[name]
+            if cb.is_open():
+                logger.debug(f"FallbackChain: skipping {name} (circuit open)")
+                continue
+
+            try:
+                with llm_call_timer(name, "generate"):
+                    result = await async_generate(
+                        client, user_message, system_message, max_tokens, temperature
+                    )
+                cb.record_success()
+                logger.debug(f"FallbackChain: {name} succeeded")
+                return result
+            except Exception as e:
+                cb.record_failure()
+                errors.append(f"{name}: {e}")
+                logger.warning(f"FallbackChain: {name} failed: {e}")
+
+        raise RuntimeError(
+            f"All providers in fallback chain failed: {'; '.join(errors)}"
+        )
+
+    async def agenerate_stream(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Async ``generate_stream``: same provider order and circuit breakers."""
+        errors: list[str] = []
+
+        for name, client in self.providers:
+            cb = self.circuit_breakers[name]
+            if cb.is_open():
+                logger.debug(f"FallbackChain: skipping {name} for streaming (circuit open)")
+                continue
+
+            try:
+                with llm_call_timer(name, "stream"):
+                    async for chunk in async_generate_stream(
+                        client, user_message, system_message, max_tokens, temperature
+                    ):
+                        yield chunk
                 cb.record_success()
                 logger.debug(f"FallbackChain: {name} streaming succeeded")
                 return
@@ -1475,12 +2162,14 @@ class AnthropicClient:
         self.max_tokens = max_tokens
         self.timeout = timeout
 
-    def generate(
+    def _request(
         self,
         user_message: str,
-        system_message: str | None = None,
-    ) -> str:
-        """Generate a response using the Anthropic Messages API."""
+        system_message: str | None,
+        max_tokens: int | None,
+        temperature: float | None,
+    ) -> tuple[dict, dict]:
+        """Headers and Messages API body for one generation."""
         if not self.api_key:
             raise ValueError(
                 "ANTHROPIC_API_KEY is not set. "
@@ -1497,11 +2186,23 @@ class AnthropicClient:
         body: dict = {
             "model": self.model,
             "messages": messages,
-            "max_tokens": self.max_tokens,
+            "max_tokens": self.max_tokens if max_tokens is None else max_tokens,
         }
+        if temperature is not None:
+            body["temperature"] = temperature
         if system_message:
             body["system"] = system_message
+        return headers, body
 
+    def generate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Generate a response using the Anthropic Messages API."""
+        headers, body = self._request(user_message, system_message, max_tokens, temperature)
         resp = requests.post(
             ANTHROPIC_API_URL,
             headers=headers,
@@ -1516,6 +2217,8 @@ class AnthropicClient:
         self,
         user_message: str,
         system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
     ) -> Generator[str, None, None]:
         """Streaming is not yet implemented for AnthropicClient."""
         raise NotImplementedError(
@@ -1523,6 +2226,39 @@ class AnthropicClient:
             "Use generate() for non-streaming responses."
         )
 
+    async def agenerate(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> str:
+        """Async ``generate`` using the Anthropic Messages API."""
+        headers, body = self._request(user_message, system_message, max_tokens, temperature)
+        response = await _asend(
+            "AnthropicClient",
+            ANTHROPIC_API_URL,
+            body,
+            lambda: headers,
+            timeout=self.timeout,
+            max_retries=1,
+        )
+        return response.json()["content"][0]["text"]
+
+    async def agenerate_stream(
+        self,
+        user_message: str,
+        system_message: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Streaming is not yet implemented for AnthropicClient."""
+        raise NotImplementedError(
+            "Streaming is not yet implemented for AnthropicClient. "
+            "Use agenerate() for non-streaming responses."
+        )
+        yield  # unreachable; makes this an async generator like the other clients
+
 
 # ---------------------------------------------------------------------------
 # OpenRouterClient — OpenRouter (200+ models, OpenAI-compatible)
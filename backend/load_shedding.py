@@ -0,0 +1,238 @@
+"""
+Route cost classes, per-class admission and graceful degradation under load.
+
+Cheap reads (``/graph/*``, ``/regulations``, ``/document-types``, ...)
+finish in milliseconds; ``/ask``, ``/compliance/check`` and ``/guidance``
+make several LLM calls each. slowapi only limits per IP, so during a
+traffic spike the expensive routes can take every slot the server has and
+cheap reads queue behind them. ``LoadShedder`` classifies each request by
+route and admits it against that class's own in-flight limit, so
+expensive work can never consume the capacity reserved for cheap reads.
+Probes and scrapes (``/health*``, ``/metrics``) are exempt: an orchestrator
+must not see a live server as dead just because it is busy.
+
+Intuition:
+    Overload is handled in two steps. First degrade: once the pipeline
+    pool's estimated queue wait passes ``LOAD_SHED_WAIT_SLO`` seconds, new
+    expensive requests run a cheaper plan (no HyDE, no query decomposition,
+    no grounding judge, ``top_k`` capped), which shortens every run and
+    drains the queue faster. Only when that is not enough — the class
+    in-flight limit or the pool queue is full — is a request rejected with
+    503 and ``Retry-After``. Tail latency stays bounded by the SLO instead
+    of growing with the spike.
+
+Example:
+    >>> shedder = LoadShedder(pipeline_pool)
+    >>> app.add_middleware(AdmissionMiddleware, shedder=shedder)
+    >>> route_cost("/api/v1/ask")
+    'expensive'
+    >>> if shedder.try_admit("expensive"):
+    ...     kwargs = shedder.plan().apply({"top_k": 10})
+    ...     shedder.release("expensive")
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from request_pool import RequestPool
+
+logger = logging.getLogger(__name__)
+
+# Estimated pipeline queue wait (seconds) above which expensive requests degrade (0 = never)
+LOAD_SHED_WAIT_SLO = float(os.getenv("LOAD_SHED_WAIT_SLO", "5"))
+# top_k cap for degraded requests
+LOAD_SHED_TOP_K = int(os.getenv("LOAD_SHED_TOP_K", "3"))
+# Concurrent in-flight requests per cost class
+ADMISSION_EXPENSIVE_MAX_INFLIGHT = int(os.getenv("ADMISSION_EXPENSIVE_MAX_INFLIGHT", "48"))
+ADMISSION_CHEAP_MAX_INFLIGHT = int(os.getenv("ADMISSION_CHEAP_MAX_INFLIGHT", "256"))
+
+EXPENSIVE = "expensive"
+CHEAP = "cheap"
+EXEMPT = "exempt"
+
+# Routes (relative to /api and /api/v1) that make LLM calls.
+EXPENSIVE_ROUTES: frozenset[str] = frozenset({
+    "/ask",
+    "/ask/stream",
+    "/ask/followup",
+    "/compliance/check",
+    "/guidance",
+})
+
+_API_PREFIXES = ("/api/v1", "/api")
+
+# Root-level probe and scrape paths (and everything under them) never admitted or shed.
+EXEMPT_PATHS: tuple[str, ...] = ("/health", "/metrics")
+
+
+def route_cost(path: str) -> str:
+    """Cost class (``"expensive"``, ``"cheap"`` or ``"exempt"``) of a request path."""
+    if any(path == exempt or path.startswith(exempt + "/") for exempt in EXEMPT_PATHS):
+        return EXEMPT
+    for prefix in _API_PREFIXES:
+        if path.startswith(prefix + "/"):
+            path = path[len(prefix):]
+            break
+    return EXPENSIVE if path.rstrip("/") in EXPENSIVE_ROUTES else CHEAP
+
+
+@dataclass(frozen=True)
+class DegradePlan:
+    """Pipeline options for one expensive request; ``degraded=False`` changes nothing."""
+
+    degraded: bool = False
+    top_k_cap: int | None = None
+
+    def apply(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """
+        Return ``kwargs`` for ``LegalRAGChain.query`` with the plan applied.
+
+        Degraded requests skip HyDE, decomposition and grounding and have
+        ``top_k`` capped.
+        """
+        if not self.degraded:
+            return kwargs
+        return {
+            **kwargs,
+            "use_hyde": False,
+            "use_decomposition": False,
+            "skip_grounding": True,
+            "top_k": self.cap_top_k(kwargs.get("top_k")),
+        }
+
+    def cap_top_k(self, top_k: int | None) -> int | None:
+        """``top_k`` limited to the plan's cap (unchanged when not degraded)."""
+        if not self.degraded or self.top_k_cap is None:
+            return top_k
+        return min(top_k, self.top_k_cap) if top_k else self.top_k_cap
+
+
+NORMAL_PLAN = DegradePlan()
+
+
+class LoadShedder:
+    """
+    Per-cost-class admission counters plus the degrade decision.
+
+    Usage:
+        shedder = LoadShedder(pool, wait_slo=5)
+        if not shedder.try_admit(route_cost(path)):
+            ...  # 503 + Retry-After
+        plan = shedder.plan()
+    """
+
+    def __init__(
+        self,
+        pool: RequestPool,
+        wait_slo: float = LOAD_SHED_WAIT_SLO,
+        degraded_top_k: int = LOAD_SHED_TOP_K,
+        max_expensive: int = ADMISSION_EXPENSIVE_MAX_INFLIGHT,
+        max_cheap: int = ADMISSION_CHEAP_MAX_INFLIGHT,
+    ):
+        """
+        Args:
+            pool: Pipeline pool whose estimated wait drives degradation
+            wait_slo: Estimated wait (seconds) that triggers degradation
+                (0 = never degrade)
+            degraded_top_k: ``top_k`` cap for degraded requests
+            max_expensive: In-flight limit for expensive routes
+            max_cheap: In-flight limit for cheap routes
+        """
+        self.pool = pool
+        self.wait_slo = wait_slo
+        self.degraded_plan = DegradePlan(degraded=True, top_k_cap=max(1, degraded_top_k))
+        self.limits = {EXPENSIVE: max(1, max_expensive), CHEAP: max(1, max_cheap)}
+        self.in_flight = {EXPENSIVE: 0, CHEAP: 0}
+        self.rejected = {EXPENSIVE: 0, CHEAP: 0}
+        self.degraded = 0
+        self._lock = threading.Lock()
+
+    def try_admit(self, cost: str) -> bool:
+        """Take an in-flight slot for ``cost``; False when the class is full."""
+        with self._lock:
+            if self.in_flight[cost] >= self.limits[cost]:
+                self.rejected[cost] += 1
+                return False
+            self.in_flight[cost] += 1
+            return True
+
+    def release(self, cost: str) -> None:
+        """Return a slot taken by :meth:`try_admit`."""
+        with self._lock:
+            self.in_flight[cost] -= 1
+
+    def plan(self) -> DegradePlan:
+        """Degraded plan while the pool's estimated wait exceeds the SLO."""
+        if self.wait_slo <= 0:
+            return NORMAL_PLAN
+        wait = self.pool.estimated_wait()
+        if wait <= self.wait_slo:
+            return NORMAL_PLAN
+        with self._lock:
+            self.degraded += 1
+        logger.warning(
+            f"Estimated queue wait {wait:.1f}s exceeds {self.wait_slo:.1f}s SLO, "
+            "degrading request (no HyDE/decomposition/grounding, "
+            f"top_k<={self.degraded_plan.top_k_cap})"
+        )
+        return self.degraded_plan
+
+    def snapshot(self) -> dict[str, Any]:
+        """Per-class limits, in-flight counts, rejections and the degrade count."""
+        with self._lock:
+            return {
+                "wait_slo_s": self.wait_slo,
+                "estimated_wait_s": round(self.pool.estimated_wait(), 3),
+                "degraded": self.degraded,
+                "classes": {
+                    cost: {
+                        "limit": self.limits[cost],
+                        "in_flight": self.in_flight[cost],
+                        "rejected": self.rejected[cost],
+                    }
+                    for cost in (EXPENSIVE, CHEAP)
+                },
+            }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware admitting each HTTP request against its cost class.
+
+    Pure ASGI (not ``BaseHTTPMiddleware``) so a streaming response keeps its
+    slot until the last chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp, shedder: LoadShedder):
+        self.app = app
+        self.shedder = shedder
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cost = route_cost(scope["path"])
+        if cost == EXEMPT:
+            await self.app(scope, receive, send)
+            return
+        if not self.shedder.try_admit(cost):
+            logger.warning(f"Rejecting {cost} request {scope['path']}: class in-flight limit reached")
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server sedang sibuk. Silakan coba lagi sebentar lagi."},
+                headers={"Retry-After": str(self.shedder.pool.retry_after())},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.shedder.release(cost)
@@ -0,0 +1,77 @@
+"""
+Named full/coarse vectors for two-stage Matryoshka dense search.
+
+When ``MATRYOSHKA_COARSE_DIM`` > 0 the Qdrant collection stores two named
+vectors per point: ``full`` (the embedder's native dimension) and
+``coarse`` (the first N components, re-normalized). ``HybridRetriever``
+runs a cheap ANN pass on the coarse vector and rescores the shortlist
+with the full one. Every writer (``scripts/ingest.py``,
+``scripts/ingest_markdown.py`` and incremental sync) and the retriever
+build vectors through this module, so they cannot drift apart.
+
+Intuition:
+    Matryoshka-trained embedders front-load information, so a prefix of
+    the vector is itself a usable (lower-fidelity) embedding once scaled
+    back to unit length. Writers follow the layout of the collection they
+    write into, not the environment, so a collection created with named
+    vectors keeps receiving named vectors.
+
+Example:
+    >>> point_vector([3.0, 4.0, 12.0], coarse_dim=2)
+    {'full': [3.0, 4.0, 12.0], 'coarse': [0.6, 0.8]}
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+# Coarse vector dimension for new collections (0 = single unnamed vector)
+MATRYOSHKA_COARSE_DIM = int(os.getenv("MATRYOSHKA_COARSE_DIM", "0"))
+FULL_VECTOR_NAME = "full"
+COARSE_VECTOR_NAME = "coarse"
+
+
+def truncate_embedding(embedding: list[float], dim: int) -> list[float]:
+    """
+    Truncate a Matryoshka embedding to its first ``dim`` components.
+
+    The prefix is re-normalized to unit length so cosine scores on the
+    coarse vector stay comparable across documents.
+
+    Args:
+        embedding: Full-dimension embedding vector
+        dim: Number of leading components to keep
+
+    Returns:
+        Unit-length truncated vector (unchanged if already <= dim)
+    """
+    prefix = list(embedding[:dim])
+    norm = sum(x * x for x in prefix) ** 0.5
+    if norm == 0:
+        return prefix
+    return [x / norm for x in prefix]
+
+
+def point_vector(embedding: list[float], coarse_dim: int = 0) -> Any:
+    """Vector for a ``PointStruct``: named full/coarse when ``coarse_dim`` > 0, else unnamed."""
+    if not coarse_dim:
+        return embedding
+    return {
+        FULL_VECTOR_NAME: embedding,
+        COARSE_VECTOR_NAME: truncate_embedding(embedding, coarse_dim),
+    }
+
+
+def collection_coarse_dim(client: Any, collection_name: str) -> int:
+    """
+    Coarse vector size of an existing collection (0 if it uses one unnamed vector).
+
+    Args:
+        client: QdrantClient
+        collection_name: Collection to inspect
+    """
+    vectors = client.get_collection(collection_name).config.params.vectors
+    if isinstance(vectors, dict) and COARSE_VECTOR_NAME in vectors:
+        return int(vectors[COARSE_VECTOR_NAME].size)
+    return 0
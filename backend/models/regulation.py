@@ -38,6 +38,8 @@ class RegulationListItem(BaseModel):
     chapter_count: int = 0
     article_count: int = 0
     indexed_chunk_count: int = 0
+    indexed_char_count: int = 0
+    indexed_pasal_count: int = 0
     amendment_count: int = 0
     cross_reference_count: int = 0
 
@@ -99,6 +101,8 @@ class RegulationDetailResponse(BaseModel):
     parent_law: RegulationListItem | None = None
     cross_reference_count: int = 0
     indexed_chunk_count: int = 0
+    indexed_char_count: int = 0
+    indexed_pasal_count: int = 0
 
 
 class AmendmentTimelineEntry(BaseModel):
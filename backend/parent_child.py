@@ -4,7 +4,8 @@ Parent-Child Retrieval for Enhanced Indonesian Legal Search.
 Indexes small child chunks for retrieval precision but returns large parent
 context to the LLM for better answer generation. Children are mapped to their
 parent via metadata["parent_citation_id"], and the full parent text is looked
-up from a pre-built parent_store dictionary.
+up from a pre-built parent store (a dict, or the on-disk
+:class:`parent_store.ParentStore` that ingestion writes).
 
 Intuition: Small chunks match user queries precisely (high recall), but the
 surrounding parent context (e.g., full Pasal or Bab) gives the LLM enough
@@ -27,6 +28,7 @@ Algorithm:
 from __future__ import annotations
 
 import logging
+from typing import Mapping
 
 from retriever import SearchResult
 
@@ -55,19 +57,23 @@ class ParentChildRetriever:
         ...     print(f"{result.citation}: {result.score:.3f}")
     """
 
-    def __init__(self, parent_store: dict[str, str] | None = None) -> None:
+    def __init__(self, parent_store: Mapping[str, str] | None = None) -> None:
         """
         Initialize ParentChildRetriever with an optional parent store.
 
         Args:
-            parent_store: Dictionary mapping parent_citation_id to full parent text.
+            parent_store: Mapping of parent_citation_id to full parent text.
                           If None, enhanced_search falls back to returning children.
+                          A lazy ParentStore is not opened until first lookup.
         """
-        self.parent_store = parent_store or {}
-        logger.info(
-            "Initialized ParentChildRetriever with %d parent documents",
-            len(self.parent_store),
-        )
+        self.parent_store = parent_store if parent_store is not None else {}
+        if isinstance(self.parent_store, dict):
+            logger.info(
+                "Initialized ParentChildRetriever with %d parent documents",
+                len(self.parent_store),
+            )
+        else:
+            logger.info("Initialized ParentChildRetriever with lazy parent store")
 
     def enhanced_search(
         self,
@@ -116,6 +122,26 @@ class ParentChildRetriever:
         # Retrieve 2x children for dedup margin
         child_results = retriever.hybrid_search(question, top_k=top_k * 2)
 
+        return self.expand(child_results, top_k=top_k)
+
+    def expand(
+        self,
+        child_results: list[SearchResult],
+        top_k: int = 5,
+    ) -> list[SearchResult]:
+        """
+        Expand an existing result list to parent context (no retrieval).
+
+        Runs steps 2-7 of :meth:`enhanced_search` on results the caller has
+        already retrieved, so expansion costs only parent lookups.
+
+        Args:
+            child_results: Retrieved child chunks, best first
+            top_k: Number of results to return (default: 5)
+
+        Returns:
+            List of SearchResult objects with parent text (or child fallback)
+        """
         # Fallback: if no parent_store, return children directly
         if not self.parent_store:
             logger.info("No parent store available, returning child results")
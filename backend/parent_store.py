@@ -0,0 +1,163 @@
+"""
+Offset-indexed, memory-mapped parent store for parent-child retrieval.
+
+Parent-child retrieval needs the full text of a parent (e.g. a whole Pasal)
+only for the handful of children that make it into the final context.
+Loading every parent into a dict at startup costs seconds and resident
+memory proportional to the corpus, duplicated in every worker process.
+This store keeps parent texts in one flat UTF-8 file and a small
+``{parent_citation_id: [offset, length]}`` index; the data file is
+memory-mapped on first use, so a lookup reads only that parent's bytes
+and the pages are shared between workers by the OS page cache.
+
+On-disk layout (one directory):
+    index.json     {"parent_citation_id": [byte_offset, byte_length], ...}
+    parents.txt    concatenated UTF-8 parent texts
+
+Example:
+    >>> ParentStore.write("data/parent_store", {"UU_40_2007_Pasal1": "Pasal 1 ..."})
+    >>> store = ParentStore("data/parent_store")   # nothing read yet
+    >>> store.get("UU_40_2007_Pasal1")
+    'Pasal 1 ...'
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Iterator, Mapping
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+DATA_FILE = "parents.txt"
+
+PARENT_STORE_PATH = os.getenv(
+    "PARENT_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "parent_store"),
+)
+
+
+class ParentStore(Mapping[str, str]):
+    """
+    Read-only mapping of parent_citation_id -> parent text, opened lazily.
+
+    Supports the dict operations ParentChildRetriever uses (``get``,
+    ``in``, ``len``, truthiness), so it is a drop-in replacement for the
+    in-memory ``parent_store`` dict.
+    """
+
+    def __init__(self, path: str | Path = PARENT_STORE_PATH):
+        """
+        Point at a store directory without reading it.
+
+        Args:
+            path: Directory written by :meth:`write`
+        """
+        self.path = Path(path)
+        self._index: dict[str, list[int]] | None = None
+        self._data: mmap.mmap | bytes | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def exists(path: str | Path = PARENT_STORE_PATH) -> bool:
+        """Whether ``path`` holds a parent store."""
+        directory = Path(path)
+        return (directory / INDEX_FILE).is_file() and (directory / DATA_FILE).is_file()
+
+    def _open(self) -> dict[str, list[int]]:
+        """Load the index and memory-map the data file (once)."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    with open(self.path / INDEX_FILE, "r", encoding="utf-8") as f:
+                        index = json.load(f)
+                    with open(self.path / DATA_FILE, "rb") as f:
+                        if os.fstat(f.fileno()).st_size:
+                            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                        else:
+                            self._data = b""
+                    self._index = index
+                    logger.info(f"Opened parent store {self.path}: {len(index)} parents")
+        return self._index
+
+    def __getitem__(self, parent_id: str) -> str:
+        index = self._open()
+        offset, length = index[parent_id]
+        assert self._data is not None
+        return self._data[offset:offset + length].decode("utf-8")
+
+    def __contains__(self, parent_id: object) -> bool:
+        return parent_id in self._open()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._open())
+
+    def __len__(self) -> int:
+        return len(self._open())
+
+    def close(self) -> None:
+        """Unmap the data file; the store reopens on next access."""
+        with self._lock:
+            if isinstance(self._data, mmap.mmap):
+                self._data.close()
+            self._data = None
+            self._index = None
+
+    @classmethod
+    def write(
+        cls,
+        path: str | Path,
+        parents: Mapping[str, str],
+        append: bool = False,
+    ) -> int:
+        """
+        Write parent texts to a store directory.
+
+        Args:
+            path: Target directory (created if missing)
+            parents: parent_citation_id -> full parent text
+            append: Keep existing parents and append new or changed ones
+                (incremental ingestion); otherwise replace the store
+
+        Returns:
+            Number of parent texts written to the data file
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        index: dict[str, list[int]] = {}
+        existing: ParentStore | None = None
+        if append and cls.exists(directory):
+            existing = cls(directory)
+            index = dict(existing._open())
+
+        # Appends leave existing offsets valid for readers that already have
+        # the file mapped; a full rewrite goes to a new file that replaces
+        # the old one atomically.
+        data_path = directory / DATA_FILE if existing is not None else directory / f"{DATA_FILE}.tmp"
+        written = 0
+        with open(data_path, "ab" if existing is not None else "wb") as f:
+            offset = f.tell()
+            for parent_id, text in parents.items():
+                if existing is not None and parent_id in index and existing[parent_id] == text:
+                    continue  # unchanged; avoid growing the file on re-ingest
+                data = text.encode("utf-8")
+                f.write(data)
+                index[parent_id] = [offset, len(data)]
+                offset += len(data)
+                written += 1
+        if existing is not None:
+            existing.close()
+        else:
+            os.replace(data_path, directory / DATA_FILE)
+
+        tmp_index = directory / f"{INDEX_FILE}.tmp"
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_index, directory / INDEX_FILE)
+        return written
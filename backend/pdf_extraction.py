@@ -0,0 +1,325 @@
+"""
+Process-pool PDF text extraction for the compliance checker.
+
+``/compliance/check`` accepts PDFs up to 10 MB. ``pypdf`` parsing and
+``extract_text()`` are pure-Python CPU work (seconds for a long contract),
+so running them in the handler froze the event loop, and running them in
+a thread would still serialize on the GIL. ``PdfExtractor`` parses in a
+pool of worker processes instead, page batch by page batch, with a
+per-document deadline, a page limit and a content-hash cache.
+
+Intuition:
+    The first batch also reports the page count; the remaining batches
+    (up to ``max_pages``) are then submitted at once, so one long document
+    spreads over every worker core while concurrent uploads share the
+    pool. Batches are consumed in page order and each page is yielded as
+    soon as its batch completes; once ``max_chars`` of text has arrived
+    (the compliance prompt cannot use more) the rest is cancelled. A
+    document that misses its deadline has its workers terminated — a
+    running process cannot be cancelled otherwise — and the pool is
+    rebuilt on next use; documents sharing that pool at the time fail
+    with ``PdfExtractionError`` rather than waiting behind it. Results are
+    cached by SHA-256 of the bytes, so a repeat upload of the same
+    contract skips parsing entirely.
+
+Metrics (``snapshot()``, served at ``/api/v1/metrics/pool`` and
+``/metrics``): cache hits/misses, documents extracted, timeouts,
+failures and documents in flight.
+
+Example:
+    >>> extractor = PdfExtractor(max_workers=4, timeout=20, max_pages=50)
+    >>> async for page_number, text in extractor.iter_pages(pdf_bytes):
+    ...     print(page_number, len(text))
+    >>> (await extractor.extract(pdf_bytes)).cached
+    True
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for PDF parsing (defaults to the CPU count, capped at 4)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Seconds one document may take to extract, queueing included
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", "20"))
+# Pages read per document; later pages are ignored
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+# Pages per worker task
+PDF_EXTRACT_BATCH_PAGES = int(os.getenv("PDF_EXTRACT_BATCH_PAGES", "8"))
+# Characters after which extraction stops (the compliance prompt uses 8000)
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "8000"))
+# Extraction results kept by content hash (0 disables the cache)
+PDF_CACHE_SIZE = int(os.getenv("PDF_CACHE_SIZE", "128"))
+
+# Worker processes are recycled after this many batches to bound pypdf's memory growth.
+_TASKS_PER_CHILD = 200
+
+
+class PdfExtractionError(RuntimeError):
+    """The document could not be parsed."""
+
+
+class PdfExtractionTimeout(PdfExtractionError):
+    """The document was not extracted within the per-document deadline."""
+
+
+@dataclass
+class PdfExtraction:
+    """Extracted text of one document."""
+
+    pages: list[str] = field(default_factory=list)
+    page_count: int = 0
+    truncated: bool = False
+    cached: bool = False
+
+    @property
+    def text(self) -> str:
+        """Non-empty pages joined by newlines."""
+        return "\n".join(page for page in self.pages if page)
+
+
+def _extract_batch(content: bytes, start: int, stop: int) -> tuple[int, list[str]]:
+    """Worker: page count and the text of pages ``[start, stop)``."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(content))
+    page_count = len(reader.pages)
+    return page_count, [
+        reader.pages[i].extract_text() or "" for i in range(start, min(stop, page_count))
+    ]
+
+
+class PdfExtractor:
+    """
+    Process pool for PDF text extraction with a per-document deadline and a hash cache.
+
+    Usage:
+        extractor = PdfExtractor(max_workers=2, timeout=10)
+        extraction = await extractor.extract(pdf_bytes)
+        extractor.snapshot()
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PDF_EXTRACT_WORKERS,
+        timeout: float = PDF_EXTRACT_TIMEOUT,
+        max_pages: int = PDF_MAX_PAGES,
+        batch_pages: int = PDF_EXTRACT_BATCH_PAGES,
+        max_chars: int = PDF_MAX_CHARS,
+        cache_size: int = PDF_CACHE_SIZE,
+    ):
+        """
+        Configure the extractor; worker processes are started on first use.
+
+        Args:
+            max_workers: Worker processes shared by all documents
+            timeout: Seconds one document may take (0 = no limit)
+            max_pages: Pages read per document
+            batch_pages: Pages per worker task
+            max_chars: Stop once this much text has been extracted (0 = no limit)
+            cache_size: Documents cached by content hash (0 = no cache)
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.max_pages = max(1, max_pages)
+        self.batch_pages = max(1, batch_pages)
+        self.max_chars = max_chars
+        self.cache_size = max(0, cache_size)
+        self.in_flight = 0
+        self.extracted = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.timeouts = 0
+        self.failures = 0
+        self._cache: OrderedDict[str, PdfExtraction] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Lazily start the worker processes."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn: forking a process that runs threads can deadlock the child.
+                    self._executor = concurrent.futures.ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        max_tasks_per_child=_TASKS_PER_CHILD,
+                    )
+        return self._executor
+
+    def _cache_get(self, key: str) -> PdfExtraction | None:
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+    def _cache_put(self, key: str, extraction: PdfExtraction) -> None:
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[key] = PdfExtraction(
+                list(extraction.pages), extraction.page_count, extraction.truncated
+            )
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    async def iter_pages(self, content: bytes) -> AsyncIterator[tuple[int, str]]:
+        """
+        Yield ``(page_number, text)`` in page order as batches complete.
+
+        Raises:
+            PdfExtractionTimeout: The document missed its deadline
+            PdfExtractionError: The document could not be parsed
+        """
+        async for page in self._run(content, PdfExtraction()):
+            yield page
+
+    async def extract(self, content: bytes) -> PdfExtraction:
+        """Extract the document within the page and character limits (see ``iter_pages``)."""
+        extraction = PdfExtraction()
+        async for _ in self._run(content, extraction):
+            pass
+        return extraction
+
+    async def _run(self, content: bytes, extraction: PdfExtraction) -> AsyncIterator[tuple[int, str]]:
+        """Fill ``extraction`` (from the cache or the pool), yielding each page as it arrives."""
+        key = hashlib.sha256(content).hexdigest()
+        cached = self._cache_get(key)
+        if cached is not None:
+            extraction.page_count = cached.page_count
+            extraction.truncated = cached.truncated
+            extraction.cached = True
+            for text in cached.pages:
+                extraction.pages.append(text)
+                yield len(extraction.pages), text
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout if self.timeout > 0 else None
+        executor = self._get_executor()
+        chars = 0
+        pending: list[asyncio.Future] = []
+        with self._lock:
+            self.in_flight += 1
+        try:
+            # The first batch also tells how many pages there are.
+            pending.append(loop.run_in_executor(
+                executor, _extract_batch, content, 0, min(self.batch_pages, self.max_pages)
+            ))
+            page_count, _ = await self._await(pending[0], deadline, executor)
+            limit = min(page_count, self.max_pages)
+            pending.extend(
+                loop.run_in_executor(
+                    executor, _extract_batch, content, start, min(start + self.batch_pages, limit)
+                )
+                for start in range(self.batch_pages, limit, self.batch_pages)
+            )
+
+            while pending and not (self.max_chars and chars >= self.max_chars):
+                _, texts = await self._await(pending[0], deadline, executor)
+                pending.pop(0)
+                for text in texts:
+                    extraction.pages.append(text)
+                    chars += len(text)
+                    yield len(extraction.pages), text
+                    if self.max_chars and chars >= self.max_chars:
+                        break
+
+            extraction.page_count = page_count
+            extraction.truncated = len(extraction.pages) < page_count
+            with self._lock:
+                self.extracted += 1
+            self._cache_put(key, extraction)
+            logger.info(
+                f"Extracted {len(extraction.pages)}/{page_count} PDF pages, {chars} characters"
+                + (" (truncated)" if extraction.truncated else "")
+            )
+        finally:
+            for future in pending:
+                future.cancel()
+            with self._lock:
+                self.in_flight -= 1
+
+    async def _await(
+        self,
+        future: asyncio.Future,
+        deadline: float | None,
+        executor: concurrent.futures.ProcessPoolExecutor,
+    ) -> Any:
+        """Wait for one batch until the document deadline; map failures to extraction errors."""
+        remaining = None if deadline is None else max(0.0, deadline - asyncio.get_running_loop().time())
+        try:
+            return await asyncio.wait_for(future, remaining)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            logger.warning(f"PDF extraction exceeded {self.timeout}s; restarting the extraction workers")
+            self._terminate(executor)
+            raise PdfExtractionTimeout(f"PDF extraction exceeded {self.timeout}s") from None
+        except concurrent.futures.BrokenExecutor as e:
+            with self._lock:
+                self.failures += 1
+            self._terminate(executor)
+            raise PdfExtractionError(f"PDF worker crashed: {e}") from e
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+            raise PdfExtractionError(f"{type(e).__name__}: {e}") from e
+
+    def _terminate(self, executor: concurrent.futures.ProcessPoolExecutor) -> None:
+        """Kill the given pool's workers (a running task cannot be cancelled) and drop it.
+
+        Every document that shared the pool ends up here, so only the first
+        call does the work; later ones find the pool already replaced.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        # ProcessPoolExecutor has no public way to stop a busy worker; the
+        # attribute is None once the pool has shut itself down (broken pool).
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Pool size, limits, in-flight documents and cache / timeout totals."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "timeout_s": self.timeout,
+                "max_pages": self.max_pages,
+                "in_flight": self.in_flight,
+                "extracted": self.extracted,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "cache_entries": len(self._cache),
+                "timeouts": self.timeouts,
+                "failures": self.failures,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; queued batches are dropped."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
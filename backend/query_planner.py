@@ -9,6 +9,16 @@ Intuition: Complex compound questions often fail to match relevant documents
 because they mix multiple concepts. Decomposing into focused sub-queries
 increases recall by finding documents for each concept independently.
 
+Sub-queries are searched concurrently on a small thread pool of their own
+(at most QUERY_PLANNER_MAX_WORKERS threads), so a search another request
+abandoned at its deadline never queues this request's sub-queries behind
+it. Every search shares one deadline (QUERY_PLANNER_SUBQUERY_TIMEOUT); whatever
+has finished by then is merged, and failed or slow sub-queries are dropped
+so they degrade the answer instead of blocking it. If none completes, the
+plain question is searched within whatever is left of that deadline.
+``amulti_hop_search`` is the asyncio variant (awaited decomposition,
+searches in worker threads).
+
 Example:
     Complex: "Apa perbedaan antara PT dan CV serta bagaimana cara mendirikannya?"
     Sub-queries:
@@ -19,14 +29,22 @@ Example:
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import os
 import re
 import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from llm_cache import LLMCache
     from llm_client import LLMClient
     from retriever import HybridRetriever, SearchResult
 
+from llm_client import async_generate
+
 # Import SearchResult at runtime for creating merged results
 from retriever import SearchResult
 
@@ -36,6 +54,13 @@ logger = logging.getLogger(__name__)
 # RRF constant (must match hyde.py and retriever.py)
 RRF_K = 60
 
+# Concurrent sub-query execution
+SUBQUERY_MAX_WORKERS = int(os.getenv("QUERY_PLANNER_MAX_WORKERS", "4"))
+SUBQUERY_TIMEOUT = float(os.getenv("QUERY_PLANNER_SUBQUERY_TIMEOUT", "10"))
+
+# Bump when the decomposition prompt changes (invalidates cached generations)
+DECOMPOSE_PROMPT_VERSION = "1"
+
 
 class QueryPlanner:
     """
@@ -47,21 +72,104 @@ class QueryPlanner:
     
     Attributes:
         llm_client: LLM client for generating sub-queries
+        max_workers: Most sub-query searches one request runs at once
+        subquery_timeout: Seconds to wait for sub-query searches
     """
     
     def __init__(
         self,
         llm_client: LLMClient,
+        max_workers: int = SUBQUERY_MAX_WORKERS,
+        subquery_timeout: float = SUBQUERY_TIMEOUT,
+        cache: LLMCache | None = None,
     ):
         """
         Initialize QueryPlanner.
         
         Args:
             llm_client: LLM client for decomposing complex questions
+            max_workers: Maximum sub-query searches running at once
+            subquery_timeout: Deadline (seconds) for the sub-query searches;
+                results that are not ready by then are dropped
+            cache: Optional persistent cache of decomposition responses
         """
         self.llm_client = llm_client
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.subquery_timeout = subquery_timeout
         logger.info("QueryPlanner initialized with LLM client")
     
+    def _new_executor(self, n_searches: int) -> ThreadPoolExecutor:
+        """
+        Per-request pool: one thread per sub-query, capped at ``max_workers``.
+        
+        Sharing one pool across requests would let a search abandoned at its
+        deadline hold a worker while the next request's sub-queries sit in
+        the queue, spending their deadline before they even start.
+        """
+        return ThreadPoolExecutor(
+            max_workers=min(n_searches, self.max_workers),
+            thread_name_prefix="query-planner",
+        )
+    
+    def _search_sub_queries(
+        self,
+        sub_questions: list[str],
+        retriever: HybridRetriever,
+        top_k: int,
+        executor: ThreadPoolExecutor,
+    ) -> list[list[SearchResult]]:
+        """
+        Run ``retriever.hybrid_search`` for every sub-query concurrently.
+        
+        Each search runs in a copy of the caller's context (so retrieval
+        metric labels carry over). Searches still running at the deadline
+        are abandoned and failed ones are skipped.
+        
+        Args:
+            sub_questions: Decomposed sub-queries
+            retriever: HybridRetriever instance for searching
+            top_k: Number of results per sub-query
+            executor: This request's pool (see :meth:`_new_executor`)
+        
+        Returns:
+            Result lists of the sub-queries that completed, in sub-query order
+        """
+        futures: list[Future[list[SearchResult]]] = [
+            executor.submit(
+                contextvars.copy_context().run, retriever.hybrid_search, sub_q, top_k=top_k
+            )
+            for sub_q in sub_questions
+        ]
+        
+        start = time.perf_counter()
+        done, not_done = wait(futures, timeout=self.subquery_timeout)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        all_results: list[list[SearchResult]] = []
+        for i, (sub_q, future) in enumerate(zip(sub_questions, futures), start=1):
+            if future in not_done:
+                future.cancel()  # no-op if already running; result is ignored
+                logger.warning(
+                    f"Sub-query {i}/{len(sub_questions)} timed out after "
+                    f"{self.subquery_timeout:.1f}s: '{sub_q}'"
+                )
+                continue
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"Search failed for sub-query '{sub_q}': {e}")
+                # Continue with other sub-queries
+                continue
+            logger.debug(f"Sub-query {i}/{len(sub_questions)}: {sub_q} -> {len(results)} results")
+            all_results.append(results)
+        
+        logger.info(
+            f"Sub-query searches: {len(all_results)}/{len(sub_questions)} completed "
+            f"in {elapsed_ms:.0f}ms"
+        )
+        return all_results
+    
     def should_decompose(self, question: str) -> bool:
         """
         Detect if question is complex and needs decomposition.
@@ -104,6 +212,62 @@ class QueryPlanner:
         
         return is_complex
     
+    @staticmethod
+    def _decompose_prompt(question: str) -> str:
+        """Indonesian prompt asking for 2-4 independent sub-questions."""
+        return f"""Pecah pertanyaan hukum berikut menjadi 2-4 sub-pertanyaan yang lebih sederhana dan spesifik.
+Setiap sub-pertanyaan harus bisa dijawab secara independen dan fokus pada satu konsep hukum.
+
+Pertanyaan asli: {question}
+
+Format output (satu baris per sub-pertanyaan, maksimal 4):
+1. Sub-pertanyaan pertama
+2. Sub-pertanyaan kedua
+3. Sub-pertanyaan ketiga (jika diperlukan)
+4. Sub-pertanyaan keempat (jika diperlukan)
+
+PENTING: Jangan tambahkan penjelasan atau komentar. Hanya tulis sub-pertanyaan.
+
+Sub-pertanyaan:"""
+    
+    @staticmethod
+    def _parse_sub_questions(response: str) -> list[str]:
+        """Extract up to 4 sub-questions from a numbered/bulleted LLM response."""
+        logger.debug(f"LLM decomposition response: {response[:200]}...")
+        
+        # Parse numbered/bulleted lines
+        sub_questions = []
+        lines = response.strip().split('\n')
+        
+        for line in lines:
+            line = line.strip()
+            
+            # Skip empty lines
+            if not line:
+                continue
+            
+            # Match patterns like "1. ", "2) ", "- ", "• "
+            # Also handle plain lines without markers
+            match = re.match(r'^(?:\d+[\.\)]\s*|[-•]\s*)(.+)$', line)
+            
+            if match:
+                cleaned = match.group(1).strip()
+                if cleaned:
+                    sub_questions.append(cleaned)
+            elif line and not line.startswith(('Sub-pertanyaan:', 'Pertanyaan:', 'PENTING:')):
+                # Handle plain lines without markers (fallback)
+                sub_questions.append(line)
+        
+        # Cap at 4 sub-questions for performance
+        sub_questions = sub_questions[:4]
+        
+        if not sub_questions:
+            logger.warning(f"No sub-questions extracted from LLM response: {response}")
+            return []
+        
+        logger.info(f"Decomposed into {len(sub_questions)} sub-queries: {sub_questions}")
+        return sub_questions
+    
     def decompose(self, question: str) -> list[str]:
         """
         Break complex question into 2-4 sub-queries using LLM.
@@ -125,62 +289,48 @@ class QueryPlanner:
                 "Bagaimana cara mendirikan PT?"
             ]
         """
-        # Indonesian decomposition prompt
-        prompt = f"""Pecah pertanyaan hukum berikut menjadi 2-4 sub-pertanyaan yang lebih sederhana dan spesifik.
-Setiap sub-pertanyaan harus bisa dijawab secara independen dan fokus pada satu konsep hukum.
-
-Pertanyaan asli: {question}
-
-Format output (satu baris per sub-pertanyaan, maksimal 4):
-1. Sub-pertanyaan pertama
-2. Sub-pertanyaan kedua
-3. Sub-pertanyaan ketiga (jika diperlukan)
-4. Sub-pertanyaan keempat (jika diperlukan)
-
-PENTING: Jangan tambahkan penjelasan atau komentar. Hanya tulis sub-pertanyaan.
-
-Sub-pertanyaan:"""
+        prompt = self._decompose_prompt(question)
         
         try:
-            # Generate sub-queries via LLM
-            response = self.llm_client.generate(
-                user_message=prompt,
-            )
-            
-            logger.debug(f"LLM decomposition response: {response[:200]}...")
+            # Generate sub-queries via LLM (raw response is cached, parsing is not)
+            if self.cache is not None:
+                response = self.cache.get_or_generate(
+                    "decompose", DECOMPOSE_PROMPT_VERSION, self.llm_client, question,
+                    lambda: self.llm_client.generate(user_message=prompt),
+                )
+            else:
+                response = self.llm_client.generate(
+                    user_message=prompt,
+                )
             
-            # Parse numbered/bulleted lines
-            sub_questions = []
-            lines = response.strip().split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                
-                # Skip empty lines
-                if not line:
-                    continue
-                
-                # Match patterns like "1. ", "2) ", "- ", "• "
-                # Also handle plain lines without markers
-                match = re.match(r'^(?:\d+[\.\)]\s*|[-•]\s*)(.+)$', line)
-                
-                if match:
-                    cleaned = match.group(1).strip()
-                    if cleaned:
-                        sub_questions.append(cleaned)
-                elif line and not line.startswith(('Sub-pertanyaan:', 'Pertanyaan:', 'PENTING:')):
-                    # Handle plain lines without markers (fallback)
-                    sub_questions.append(line)
-            
-            # Cap at 4 sub-questions for performance
-            sub_questions = sub_questions[:4]
+            return self._parse_sub_questions(response)
+        
+        except Exception as e:
+            logger.error(f"Decomposition failed: {e}", exc_info=True)
+            return []
+    
+    async def adecompose(self, question: str) -> list[str]:
+        """
+        Async :meth:`decompose` (same prompt, cache and parsing).
+        
+        Args:
+            question: Complex question to decompose
             
-            if not sub_questions:
-                logger.warning(f"No sub-questions extracted from LLM response: {response}")
-                return []
+        Returns:
+            List of 2-4 sub-query strings. Empty list if decomposition fails.
+        """
+        prompt = self._decompose_prompt(question)
+        
+        try:
+            if self.cache is not None:
+                response = await self.cache.aget_or_generate(
+                    "decompose", DECOMPOSE_PROMPT_VERSION, self.llm_client, question,
+                    lambda: async_generate(self.llm_client, prompt),
+                )
+            else:
+                response = await async_generate(self.llm_client, prompt)
             
-            logger.info(f"Decomposed into {len(sub_questions)} sub-queries: {sub_questions}")
-            return sub_questions
+            return self._parse_sub_questions(response)
         
         except Exception as e:
             logger.error(f"Decomposition failed: {e}", exc_info=True)
@@ -200,7 +350,8 @@ Sub-pertanyaan:"""
             2. If simple: return regular retriever.search()
             3. If complex:
                 a. Decompose into 2-4 sub-queries
-                b. Search each sub-query independently
+                b. Search the sub-queries concurrently (per-request pool,
+                   shared deadline; slow or failed ones are skipped)
                 c. Merge all results using RRF
                 d. Deduplicate and sort by RRF score
         
@@ -211,7 +362,9 @@ Sub-pertanyaan:"""
             
         Returns:
             List of SearchResult objects, sorted by RRF score. If decomposition
-            fails or question is simple, returns regular search results.
+            fails or question is simple, returns regular search results; if
+            every sub-query fails, regular search results within the rest of
+            the deadline (empty if it runs out).
             
         Example:
             >>> results = planner.multi_hop_search(
@@ -235,27 +388,123 @@ Sub-pertanyaan:"""
             logger.warning("Decomposition failed - falling back to regular search")
             return retriever.hybrid_search(question, top_k=top_k)
         
-        # Search each sub-query
+        # Search the sub-queries concurrently
         logger.info(f"Searching {len(sub_questions)} sub-queries...")
-        all_results: list[list[SearchResult]] = []
-        
-        for i, sub_q in enumerate(sub_questions, start=1):
-            logger.debug(f"Sub-query {i}/{len(sub_questions)}: {sub_q}")
+        start = time.perf_counter()
+        executor = self._new_executor(len(sub_questions))
+        try:
+            all_results = self._search_sub_queries(sub_questions, retriever, top_k, executor)
             
+            # Check if we got any results
+            if not all_results:
+                remaining = self.subquery_timeout - (time.perf_counter() - start)
+                logger.warning("All sub-query searches failed - falling back to regular search")
+                future = executor.submit(
+                    contextvars.copy_context().run, retriever.hybrid_search, question, top_k=top_k
+                )
+                try:
+                    return future.result(timeout=max(0.0, remaining))
+                except FutureTimeoutError:
+                    future.cancel()
+                    logger.warning(
+                        "Fallback search missed the sub-query deadline - returning no results"
+                    )
+                    return []
+        finally:
+            # Abandoned searches finish on their own threads; nothing waits for them
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return self._merge(all_results, top_k)
+    
+    async def _asearch_sub_queries(
+        self,
+        sub_questions: list[str],
+        retriever: HybridRetriever,
+        top_k: int,
+    ) -> list[list[SearchResult]]:
+        """
+        Async :meth:`_search_sub_queries`: searches run in worker threads
+        under the same shared deadline.
+        """
+        tasks = [
+            asyncio.ensure_future(asyncio.to_thread(retriever.hybrid_search, sub_q, top_k=top_k))
+            for sub_q in sub_questions
+        ]
+        
+        start = time.perf_counter()
+        done, not_done = await asyncio.wait(tasks, timeout=self.subquery_timeout)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        all_results: list[list[SearchResult]] = []
+        for i, (sub_q, task) in enumerate(zip(sub_questions, tasks), start=1):
+            if task in not_done:
+                task.cancel()  # the thread finishes on its own; result is ignored
+                logger.warning(
+                    f"Sub-query {i}/{len(sub_questions)} timed out after "
+                    f"{self.subquery_timeout:.1f}s: '{sub_q}'"
+                )
+                continue
             try:
-                results = retriever.hybrid_search(sub_q, top_k=top_k)
-                all_results.append(results)
-                logger.debug(f"  Retrieved {len(results)} results")
+                results = task.result()
             except Exception as e:
                 logger.error(f"Search failed for sub-query '{sub_q}': {e}")
-                # Continue with other sub-queries
                 continue
+            logger.debug(f"Sub-query {i}/{len(sub_questions)}: {sub_q} -> {len(results)} results")
+            all_results.append(results)
         
-        # Check if we got any results
+        logger.info(
+            f"Sub-query searches: {len(all_results)}/{len(sub_questions)} completed "
+            f"in {elapsed_ms:.0f}ms"
+        )
+        return all_results
+    
+    async def amulti_hop_search(
+        self,
+        question: str,
+        retriever: HybridRetriever,
+        top_k: int = 5,
+    ) -> list[SearchResult]:
+        """
+        Async :meth:`multi_hop_search`: decomposition is awaited, searches
+        run in worker threads.
+        
+        Args:
+            question: User's question (may be complex)
+            retriever: HybridRetriever instance for searching
+            top_k: Number of results to return after merging
+            
+        Returns:
+            List of SearchResult objects, sorted by RRF score
+        """
+        if not self.should_decompose(question):
+            logger.info("Simple question - using regular search")
+            return await asyncio.to_thread(retriever.hybrid_search, question, top_k=top_k)
+        
+        sub_questions = await self.adecompose(question)
+        if not sub_questions:
+            logger.warning("Decomposition failed - falling back to regular search")
+            return await asyncio.to_thread(retriever.hybrid_search, question, top_k=top_k)
+        
+        logger.info(f"Searching {len(sub_questions)} sub-queries...")
+        start = time.perf_counter()
+        all_results = await self._asearch_sub_queries(sub_questions, retriever, top_k)
         if not all_results:
+            remaining = self.subquery_timeout - (time.perf_counter() - start)
             logger.warning("All sub-query searches failed - falling back to regular search")
-            return retriever.hybrid_search(question, top_k=top_k)
+            try:
+                return await asyncio.wait_for(
+                    asyncio.to_thread(retriever.hybrid_search, question, top_k=top_k),
+                    max(0.0, remaining),
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Fallback search missed the sub-query deadline - returning no results")
+                return []
         
+        return self._merge(all_results, top_k)
+    
+    @staticmethod
+    def _merge(all_results: list[list[SearchResult]], top_k: int) -> list[SearchResult]:
+        """RRF-merge the sub-query result lists and keep the top ``top_k``."""
         # Merge with RRF (same formula as HyDE)
         logger.info("Merging results with RRF...")
         
@@ -38,10 +38,12 @@ from llm_client import (  # noqa: E402
     MistralClient,
     FallbackChain,
     CircuitBreaker,
+    async_generate,
+    async_generate_stream,
     create_llm_client,
+    llm_health,
     NVIDIA_API_KEY,
     NVIDIA_API_URL,
-    NVIDIA_MODEL,
     MAX_TOKENS,
     TEMPERATURE,
 )
@@ -52,11 +54,15 @@ from prompts import (  # noqa: E402
     detect_question_type,
 )
 from hyde import HyDE  # noqa: E402
+from llm_cache import get_llm_cache  # noqa: E402
 from query_planner import QueryPlanner  # noqa: E402
 from multi_query import MultiQueryFusion  # noqa: E402
 from crag import CRAG  # noqa: E402
 from parent_child import ParentChildRetriever  # noqa: E402
+from parent_store import PARENT_STORE_PATH, ParentStore  # noqa: E402
+from grounding import GROUNDING_BACKGROUND, GroundingVerifier  # noqa: E402
 from agentic_rag import AgenticRAG  # noqa: E402
+from stage_metrics import retrieval_metrics  # noqa: E402
 # NOTE: semantic_chunker is indexing-time only, not imported here
 
 # Retriever configuration
@@ -202,6 +208,13 @@ INSTRUKSI:
 JAWABAN:"""
 
 
+# Retrieval confidence below which the chain refuses to answer
+CONFIDENCE_THRESHOLD = 0.15
+
+NO_RESULTS_ANSWER = "Maaf, saya tidak menemukan dokumen yang relevan dengan pertanyaan Anda dalam database."
+REFUSAL_ANSWER = "Maaf, saya tidak memiliki cukup informasi hukum untuk menjawab pertanyaan ini dengan akurat. Silakan konsultasikan dengan ahli hukum."
+
+
 @dataclass
 class ConfidenceScore:
     """Confidence score with numeric value and text label."""
@@ -229,8 +242,10 @@ class ValidationResult:
     warnings: list[str] = field(default_factory=list)
     hallucination_risk: str = "low"  # low, medium, high, refused
     missing_citations: list[int] = field(default_factory=list)
-    grounding_score: float | None = None  # LLM-as-judge grounding score 0-1
+    grounding_score: float | None = None  # Grounding score 0-1 (local check or LLM-as-judge)
     ungrounded_claims: list[str] = field(default_factory=list)  # Claims not supported by sources
+    grounding_pending: bool = False  # LLM judge still running in the background
+    verification_id: str | None = None  # Id to fetch the background grounding result
     
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -241,6 +256,8 @@ class ValidationResult:
             "missing_citations": self.missing_citations,
             "grounding_score": self.grounding_score,
             "ungrounded_claims": self.ungrounded_claims,
+            "grounding_pending": self.grounding_pending,
+            "verification_id": self.verification_id,
         }
 
 
@@ -310,23 +327,31 @@ class LegalRAGChain:
             self.retriever.search = self.retriever.hybrid_search  # type: ignore[attr-defined]
         
         # Initialize Advanced RAG components
-        self.hyde = HyDE(self.llm_client)
-        self.query_planner = QueryPlanner(self.llm_client)
+        # Auxiliary generations (hypothetical, decomposition, rephrase) share
+        # one persistent cache; None when LLM_CACHE_ENABLED=false
+        llm_cache = get_llm_cache()
+        self.hyde = HyDE(self.llm_client, cache=llm_cache)
+        self.query_planner = QueryPlanner(self.llm_client, cache=llm_cache)
         
         # Initialize new Advanced RAG techniques
         self.multi_query = MultiQueryFusion()
-        self.crag = CRAG(self.llm_client)
+        self.crag = CRAG(self.llm_client, cache=llm_cache)
         
-        # Parent-child: load parent_store if available, else empty dict
-        parent_store_path = os.path.join(os.path.dirname(__file__), "parent_store.json")
-        parent_store = {}
-        if os.path.exists(parent_store_path):
-            with open(parent_store_path, "r", encoding="utf-8") as f:
+        # Parent-child: memory-mapped store written by ingestion (opened on
+        # first lookup), else the legacy parent_store.json, else empty dict
+        parent_store: Any = {}
+        legacy_store_path = os.path.join(os.path.dirname(__file__), "parent_store.json")
+        if ParentStore.exists(PARENT_STORE_PATH):
+            parent_store = ParentStore(PARENT_STORE_PATH)
+            logger.info(f"Using parent store at {PARENT_STORE_PATH}")
+        elif os.path.exists(legacy_store_path):
+            with open(legacy_store_path, "r", encoding="utf-8") as f:
                 parent_store = json.load(f)
-            logger.info(f"Loaded parent store with {len(parent_store)} entries")
+            logger.info(f"Loaded legacy parent store with {len(parent_store)} entries")
         else:
-            logger.warning(f"Parent store not found at {parent_store_path} — parent-child retrieval disabled")
+            logger.warning(f"Parent store not found at {PARENT_STORE_PATH} — parent-child retrieval disabled")
         self.parent_child = ParentChildRetriever(parent_store=parent_store)
+        self.grounding = GroundingVerifier()
         
         # Agentic orchestrator (composes all techniques)
         self.agentic = AgenticRAG(
@@ -593,91 +618,350 @@ class LegalRAGChain:
             missing_citations=sorted(invalid_refs),
         )
     
+    @staticmethod
+    def _provider_tuning(llm_client: Any) -> tuple[str, dict[str, Any]]:
+        """Provider name and its PROVIDER_TUNING generation options."""
+        provider_name = getattr(llm_client, 'provider_name', None)
+        if not provider_name:
+            # Detect from class name
+            class_name = llm_client.__class__.__name__.lower()
+            if 'groq' in class_name:
+                provider_name = 'groq'
+            elif 'gemini' in class_name:
+                provider_name = 'gemini'
+            elif 'mistral' in class_name:
+                provider_name = 'mistral'
+            elif 'nvidia' in class_name or 'nim' in class_name:
+                provider_name = 'nvidia'
+            else:
+                provider_name = 'copilot'
+        return provider_name, PROVIDER_TUNING.get(provider_name, PROVIDER_TUNING['copilot'])
+    
     def _verify_grounding(
         self,
         answer: str,
         citations: list[dict[str, Any]],
+        source_texts: list[str] | None = None,
+        llm_client: LLMClient | None = None,
     ) -> tuple[float | None, list[str]]:
         """
-        Use LLM-as-judge to verify that answer claims are grounded in cited sources.
+        Verify that answer claims are grounded in cited sources.
+        
+        A local lexical check scores most answers; the LLM-as-judge is only
+        called when the local score is uncertain (see grounding.py).
+        
+        Args:
+            llm_client: Judge client for this call (defaults to the chain's)
         
         Returns:
             Tuple of (grounding_score, ungrounded_claims)
         """
-        if not citations:
-            return None, ["Tidak ada sumber untuk diverifikasi"]
-        
-        # Format sources for grounding prompt
-        sources_text = "\n\n".join([
-            f"[{c.get('number', i+1)}] {c.get('citation', c.get('text', ''))[:500]}"
-            for i, c in enumerate(citations[:5])  # Limit to top 5 sources
-        ])
+        return self.grounding.verify(answer, citations, llm_client or self.llm_client, source_texts)
+    
+    def _apply_grounding(
+        self,
+        validation: ValidationResult,
+        answer: str,
+        citations: list[dict[str, Any]],
+        source_texts: list[str],
+        background: bool,
+        llm_client: LLMClient,
+    ) -> None:
+        """
+        Fill the grounding fields of ``validation``.
         
-        grounding_prompt = f"""Anda adalah hakim yang mengevaluasi kualitas jawaban hukum.
+        In background mode the local score is filled in immediately; if the
+        LLM judge is still needed, it runs in the background and the
+        validation is marked ``grounding_pending`` with a ``verification_id``.
+        """
+        if background:
+            score, ungrounded, verification_id = self.grounding.verify_deferred(
+                answer, citations, llm_client, source_texts
+            )
+            validation.grounding_pending = verification_id is not None
+            validation.verification_id = verification_id
+        else:
+            score, ungrounded = self._verify_grounding(
+                answer, citations, source_texts=source_texts, llm_client=llm_client
+            )
+        validation.grounding_score = score
+        validation.ungrounded_claims = ungrounded
+    
+    async def _aapply_grounding(
+        self,
+        validation: ValidationResult,
+        answer: str,
+        citations: list[dict[str, Any]],
+        source_texts: list[str],
+        background: bool,
+        llm_client: LLMClient,
+    ) -> None:
+        """Async :meth:`_apply_grounding`; a foreground LLM judge is awaited."""
+        if background:
+            self._apply_grounding(validation, answer, citations, source_texts, True, llm_client)
+            return
+        score, ungrounded = await self.grounding.averify(answer, citations, llm_client, source_texts)
+        validation.grounding_score = score
+        validation.ungrounded_claims = ungrounded
+    
+    def _retrieve(
+        self,
+        question: str,
+        filter_jenis_dokumen: str | None,
+        k: int,
+        use_hyde: bool,
+        use_decomposition: bool,
+        use_crag: bool,
+        use_multi_query: bool,
+        use_parent_child: bool,
+        use_agentic: bool,
+    ) -> list[SearchResult]:
+        """Run the Advanced RAG retrieval cascade for query()."""
+        # Retrieval stages are labelled with the active strategy so
+        # /metrics/retrieval shows per-strategy latency distributions.
+        if filter_jenis_dokumen:
+            # Filtered search — bypass advanced RAG
+            with retrieval_metrics.strategy("filtered"):
+                return self.retriever.search_by_document_type(
+                    query=question,
+                    jenis_dokumen=filter_jenis_dokumen,
+                    top_k=k,
+                )
+
+        # Priority cascade (highest priority first):
+        if use_agentic:
+            # Agentic mode: orchestrator picks strategy dynamically
+            with retrieval_metrics.strategy("agentic"):
+                results = self.agentic.enhanced_search(question, self.retriever, top_k=k)
+            logger.info("Agentic RAG orchestration applied")
+        elif use_decomposition and self.query_planner.should_decompose(question):
+            # Complex compound questions
+            with retrieval_metrics.strategy("decomposition"):
+                results = self.query_planner.multi_hop_search(question, self.retriever, top_k=k)
+            logger.info("Query decomposition applied")
+        elif use_multi_query:
+            # Vague/ambiguous questions
+            with retrieval_metrics.strategy("multi_query"):
+                results = self.multi_query.enhanced_search(question, self.retriever, top_k=k)
+            logger.info("Multi-Query Fusion applied")
+        elif use_hyde:
+            # Definition/concept questions
+            with retrieval_metrics.strategy("hyde"):
+                results = self.hyde.enhanced_search(question, self.retriever, top_k=k)
+            logger.info("HyDE applied")
+        else:
+            # Direct search fallback
+            results = self.retriever.hybrid_search(query=question, top_k=k, expand_queries=True)
+
+        # Post-retrieval correction with CRAG (applied after any retrieval strategy)
+        if use_crag and results:
+            grade = self.crag.grade_retrieval(question, results)
+            if grade != "correct":
+                logger.info(f"CRAG quality gate: {grade} — correcting")
+                # Correct the results we already have; only the rephrased
+                # search is new retrieval work
+                with retrieval_metrics.strategy("crag"):
+                    corrected = self.crag.correct(
+                        question, results, self.retriever, top_k=k, grade=grade
+                    )
+                results = self._keep_corrected(results, corrected)
+            else:
+                logger.info("CRAG quality gate: correct — keeping results")
+
+        # Parent-child expansion of the retrieved (and corrected) results
+        if use_parent_child and self.parent_child.parent_store:
+            with retrieval_metrics.strategy("parent_child"):
+                results = self.parent_child.expand(results, top_k=k)
+            logger.info("Parent-child expansion applied")
+
+        return results
+
+    async def _aretrieve(
+        self,
+        question: str,
+        filter_jenis_dokumen: str | None,
+        k: int,
+        use_hyde: bool,
+        use_decomposition: bool,
+        use_crag: bool,
+        use_multi_query: bool,
+        use_parent_child: bool,
+        use_agentic: bool,
+    ) -> list[SearchResult]:
+        """
+        Async :meth:`_retrieve`.
 
-Sumber hukum:
-{sources_text}
+        LLM steps (HyDE, decomposition, CRAG rephrase) are awaited natively;
+        the CPU-bound search stages and the agentic orchestrator run in
+        worker threads, which copy the strategy label context.
+        """
+        if filter_jenis_dokumen:
+            with retrieval_metrics.strategy("filtered"):
+                return await asyncio.to_thread(
+                    self.retriever.search_by_document_type,
+                    query=question,
+                    jenis_dokumen=filter_jenis_dokumen,
+                    top_k=k,
+                )
+
+        if use_agentic:
+            with retrieval_metrics.strategy("agentic"):
+                results = await asyncio.to_thread(
+                    self.agentic.enhanced_search, question, self.retriever, top_k=k
+                )
+            logger.info("Agentic RAG orchestration applied")
+        elif use_decomposition and self.query_planner.should_decompose(question):
+            with retrieval_metrics.strategy("decomposition"):
+                results = await self.query_planner.amulti_hop_search(question, self.retriever, top_k=k)
+            logger.info("Query decomposition applied")
+        elif use_multi_query:
+            with retrieval_metrics.strategy("multi_query"):
+                results = await asyncio.to_thread(
+                    self.multi_query.enhanced_search, question, self.retriever, top_k=k
+                )
+            logger.info("Multi-Query Fusion applied")
+        elif use_hyde:
+            with retrieval_metrics.strategy("hyde"):
+                results = await self.hyde.aenhanced_search(question, self.retriever, top_k=k)
+            logger.info("HyDE applied")
+        else:
+            results = await asyncio.to_thread(
+                self.retriever.hybrid_search, query=question, top_k=k, expand_queries=True
+            )
 
-Jawaban yang akan dievaluasi:
-{answer}
+        if use_crag and results:
+            grade = self.crag.grade_retrieval(question, results)
+            if grade != "correct":
+                logger.info(f"CRAG quality gate: {grade} — correcting")
+                with retrieval_metrics.strategy("crag"):
+                    corrected = await self.crag.acorrect(
+                        question, results, self.retriever, top_k=k, grade=grade
+                    )
+                results = self._keep_corrected(results, corrected)
+            else:
+                logger.info("CRAG quality gate: correct — keeping results")
 
-Tugas Anda: Evaluasi setiap klaim dalam jawaban apakah didukung oleh sumber hukum di atas.
+        if use_parent_child and self.parent_child.parent_store:
+            with retrieval_metrics.strategy("parent_child"):
+                results = await asyncio.to_thread(self.parent_child.expand, results, top_k=k)
+            logger.info("Parent-child expansion applied")
 
-Instruksi:
-1. Identifikasi klaim-klaim utama dalam jawaban
-2. Untuk setiap klaim, tentukan apakah didukung oleh sumber yang diberikan
-3. Jika ada klaim yang TIDAK didukung oleh sumber,cantumkan
+        return results
 
-Respons dalam format JSON:
-{{
-  "grounding_score": <skor 0.0-1.0 indicating percentage of claims fully supported>,
-  "ungrounded_claims": [<list of claim descriptions that are not supported by sources>],
-  "grounded_claims": [<list of claim descriptions that ARE supported>]
-}}
+    @staticmethod
+    def _keep_corrected(
+        results: list[SearchResult],
+        corrected: list[SearchResult],
+    ) -> list[SearchResult]:
+        """CRAG-corrected results, or the originals when re-retrieval came back empty."""
+        if corrected:
+            return corrected
+        logger.info("CRAG re-retrieval returned empty — keeping original results")
+        return results
 
-JSON:"""
+    @staticmethod
+    def _no_results_response() -> RAGResponse:
+        """Response when retrieval found nothing."""
+        return RAGResponse(
+            answer=NO_RESULTS_ANSWER,
+            citations=[],
+            sources=[],
+            confidence="tidak ada",
+            confidence_score=ConfidenceScore(
+                numeric=0.0,
+                label="tidak ada",
+                top_score=0.0,
+                avg_score=0.0,
+            ),
+            raw_context="",
+            validation=ValidationResult(
+                is_valid=True,
+                citation_coverage=0.0,
+                warnings=[],
+                hallucination_risk="low",
+                missing_citations=[],
+            ),
+        )
+
+    @staticmethod
+    def _refusal_response(
+        context: str,
+        citations: list[dict],
+        sources: list[str],
+        confidence: ConfidenceScore,
+    ) -> RAGResponse:
+        """Response when retrieval confidence is below CONFIDENCE_THRESHOLD."""
+        logger.info(f"Low confidence ({confidence.numeric:.3f} < {CONFIDENCE_THRESHOLD}) - refusing to answer")
+        return RAGResponse(
+            answer=REFUSAL_ANSWER,
+            citations=citations,
+            sources=sources,
+            confidence="rendah",
+            confidence_score=confidence,
+            raw_context=context,
+            validation=ValidationResult(
+                is_valid=True,
+                citation_coverage=0.0,
+                warnings=["Pertanyaan di luar jangkauan basis pengetahuan"],
+                hallucination_risk="refused",
+                missing_citations=[],
+            ),
+        )
+
+    @staticmethod
+    def _answer_prompts(question: str, context: str, mode: str) -> tuple[str, str]:
+        """User prompt and mode/question-type specific system prompt."""
+        user_prompt = USER_PROMPT_TEMPLATE.format(
+            context=context,
+            question=question,
+        )
+
+        # Detect question type and get specialized instruction
+        question_type = detect_question_type(question)
+        type_specific_instruction = QUESTION_TYPE_PROMPTS.get(question_type, "")
+        logger.info(f"Detected question type: {question_type}")
+
+        # Select system prompt based on mode
+        if mode == "verbatim":
+            system_msg = VERBATIM_SYSTEM_PROMPT
+        else:
+            # Use CoT prompt + type-specific instruction for synthesized mode
+            system_msg = SYSTEM_PROMPT_COT
+            if type_specific_instruction:
+                system_msg = system_msg + "\n\n" + type_specific_instruction
+        return user_prompt, system_msg
+
+    def _validate_raw_answer(
+        self,
+        raw_answer: str,
+        citations: list[dict],
+    ) -> tuple[str, ValidationResult]:
+        """Strip the JSON metadata block and validate citations of the answer."""
+        # Extract structured JSON metadata from LLM response
+        answer, json_metadata = self._extract_json_metadata(raw_answer)
+
+        # If JSON metadata has cited_sources, pass them to validation; otherwise regex fallback
+        json_cited_sources: list[int] | None = None
+        if json_metadata and "cited_sources" in json_metadata:
+            try:
+                json_cited_sources = [int(s) for s in json_metadata["cited_sources"]]
+                logger.info(f"Using JSON-extracted cited_sources: {json_cited_sources}")
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Invalid cited_sources in JSON metadata: {e}")
+                json_cited_sources = None
+
+        validation = self._validate_answer(answer, citations, json_cited_sources=json_cited_sources)
+        if validation.warnings:
+            logger.warning(f"Answer validation warnings: {validation.warnings}")
+        return answer, validation
+
+    @staticmethod
+    def _skip_grounding(validation: ValidationResult) -> None:
+        """Mark grounding as skipped (fields None/empty)."""
+        validation.grounding_score = None
+        validation.ungrounded_claims = []
+        validation.hallucination_risk = "skipped"
 
-        try:
-            import json
-            import time
-            
-            start_time = time.time()
-            timeout = 5.0  # 5 second timeout
-            
-            response = self.llm_client.generate(
-                user_message=grounding_prompt,
-                system_message="Anda adalah evaluasi jawaban hukum yang objektif. Selalu respond dengan JSON yang valid.",
-            )
-            
-            elapsed = time.time() - start_time
-            logger.info(f"Grounding verification took {elapsed:.2f}s")
-            
-            # Parse JSON response
-            # Find JSON in response (in case there's extra text
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                result = json.loads(json_str)
-                
-                grounding_score = float(result.get('grounding_score', 0.5))
-                ungrounded = result.get('ungrounded_claims', [])
-                
-                # Clamp score to 0-1
-                grounding_score = max(0.0, min(1.0, grounding_score))
-                
-                logger.info(f"Grounding score: {grounding_score:.2f}, ungrounded claims: {len(ungrounded)}")
-                return grounding_score, ungrounded
-            else:
-                logger.warning("Could not parse JSON from grounding response")
-                return None, []
-                
-        except Exception as e:
-            error_type = type(e).__name__
-            logger.warning(f"Grounding verification failed ({error_type}): {e}")
-            return None, []
-    
     def query(
         self,
         question: str,
@@ -685,228 +969,97 @@ JSON:"""
         top_k: int | None = None,
         mode: str = "synthesized",
         skip_grounding: bool = False,
+        background_grounding: bool = GROUNDING_BACKGROUND,
         use_hyde: bool = True,
         use_decomposition: bool = True,
         use_crag: bool = False,           # NEW (off by default — enable for quality gate)
         use_multi_query: bool = False,    # NEW (off by default)
         use_parent_child: bool = False,   # NEW (off by default)
         use_agentic: bool = False,        # NEW (off by default)
+        llm_client: LLMClient | None = None,
     ) -> RAGResponse:
         """
         Query the RAG chain with a question.
-        
+
         Args:
             question: User question in Indonesian
             filter_jenis_dokumen: Optional filter by document type (UU, PP, Perpres, etc.)
             top_k: Number of documents to retrieve
             mode: Response mode - "synthesized" for AI answer, "verbatim" for direct quotes
-            skip_grounding: If True, skip the LLM-as-judge grounding verification call
-                (saves ~30% time per query). Grounding fields will be None/empty.
+            skip_grounding: If True, skip grounding verification.
+                Grounding fields will be None/empty.
+            background_grounding: If True, return without waiting for the
+                LLM judge; the validation then carries the local score,
+                ``grounding_pending`` and a ``verification_id``.
             use_hyde: If True, use HyDE enhanced search for better retrieval (default True)
             use_decomposition: If True, decompose complex questions into sub-queries (default True)
             use_crag: If True, apply CRAG quality grading post-retrieval (default False, enable for quality gate)
             use_multi_query: If True, use Multi-Query Fusion (template-based variants, default False)
             use_parent_child: If True, expand child chunks to parent context (default False, requires parent_store)
             use_agentic: If True, use Agentic RAG orchestration (default False, overrides cascade)
-        
+            llm_client: Provider for this call's answer generation and grounding
+                (per-request override; defaults to the chain's client). The
+                chain itself is never mutated, so concurrent calls are safe.
+
         Returns:
             RAGResponse with answer, citations, and sources
         """
         k = top_k or self.top_k
-        
+        client = llm_client or self.llm_client
+
         # Step 1: Retrieve relevant documents (Advanced RAG pipeline)
         logger.info(f"Retrieving documents for: {question[:50]}...")
-        
-        if filter_jenis_dokumen:
-            # Filtered search — bypass advanced RAG
-            results = self.retriever.search_by_document_type(
-                query=question,
-                jenis_dokumen=filter_jenis_dokumen,
-                top_k=k,
-            )
-        else:
-            # Advanced RAG retrieval pipeline with feature flags
-            
-            # Priority cascade (highest priority first):
-            if use_agentic:
-                # Agentic mode: orchestrator picks strategy dynamically
-                results = self.agentic.enhanced_search(question, self.retriever, top_k=k)
-                logger.info("Agentic RAG orchestration applied")
-            elif use_decomposition and self.query_planner.should_decompose(question):
-                # Complex compound questions
-                results = self.query_planner.multi_hop_search(question, self.retriever, top_k=k)
-                logger.info("Query decomposition applied")
-            elif use_multi_query:
-                # Vague/ambiguous questions
-                results = self.multi_query.enhanced_search(question, self.retriever, top_k=k)
-                logger.info("Multi-Query Fusion applied")
-            elif use_hyde:
-                # Definition/concept questions
-                results = self.hyde.enhanced_search(question, self.retriever, top_k=k)
-                logger.info("HyDE applied")
-            else:
-                # Direct search fallback
-                results = self.retriever.hybrid_search(query=question, top_k=k, expand_queries=True)
-            
-            # Post-retrieval correction with CRAG (applied after any retrieval strategy)
-            if use_crag and results:
-                grade = self.crag.grade_retrieval(question, results)
-                if grade != "correct":
-                    logger.info(f"CRAG quality gate: {grade} — re-retrieving")
-                    corrected = self.crag.enhanced_search(question, self.retriever, top_k=k)
-                    if corrected:
-                        results = corrected
-                    else:
-                        logger.info("CRAG re-retrieval returned empty — keeping original results")
-                else:
-                    logger.info("CRAG quality gate: correct — keeping results")
-            
-            # Parent-child expansion (applied after retrieval + correction)
-            if use_parent_child and self.parent_child.parent_store:
-                results = self.parent_child.enhanced_search(question, self.retriever, top_k=k)
-                logger.info("Parent-child expansion applied")
-        
+        results = self._retrieve(
+            question, filter_jenis_dokumen, k,
+            use_hyde=use_hyde,
+            use_decomposition=use_decomposition,
+            use_crag=use_crag,
+            use_multi_query=use_multi_query,
+            use_parent_child=use_parent_child,
+            use_agentic=use_agentic,
+        )
+
         # Handle no results
         if not results:
-            return RAGResponse(
-                answer="Maaf, saya tidak menemukan dokumen yang relevan dengan pertanyaan Anda dalam database.",
-                citations=[],
-                sources=[],
-                confidence="tidak ada",
-                confidence_score=ConfidenceScore(
-                    numeric=0.0,
-                    label="tidak ada",
-                    top_score=0.0,
-                    avg_score=0.0,
-                ),
-                raw_context="",
-                validation=ValidationResult(
-                    is_valid=True,
-                    citation_coverage=0.0,
-                    warnings=[],
-                    hallucination_risk="low",
-                    missing_citations=[],
-                ),
-            )
-        
+            return self._no_results_response()
+
         # Step 2: Format context
         context, citations = self._format_context(results)
         sources = self._extract_sources(citations)
         confidence = self._assess_confidence(results)
-        
+
         # Step 2.5: Check confidence threshold - refuse if too low
-        CONFIDENCE_THRESHOLD = 0.15
         if confidence.numeric < CONFIDENCE_THRESHOLD:
-            refusal_text = "Maaf, saya tidak memiliki cukup informasi hukum untuk menjawab pertanyaan ini dengan akurat. Silakan konsultasikan dengan ahli hukum."
-            logger.info(f"Low confidence ({confidence.numeric:.3f} < {CONFIDENCE_THRESHOLD}) - refusing to answer")
-            return RAGResponse(
-                answer=refusal_text,
-                citations=citations,
-                sources=sources,
-                confidence="rendah",
-                confidence_score=confidence,
-                raw_context=context,
-                validation=ValidationResult(
-                    is_valid=True,
-                    citation_coverage=0.0,
-                    warnings=["Pertanyaan di luar jangkauan basis pengetahuan"],
-                    hallucination_risk="refused",
-                    missing_citations=[],
-                ),
-            )
-        
+            return self._refusal_response(context, citations, sources, confidence)
+
         # Step 3: Generate answer using LLM with Advanced RAG prompts
-        user_prompt = USER_PROMPT_TEMPLATE.format(
-            context=context,
-            question=question,
+        user_prompt, system_msg = self._answer_prompts(question, context, mode)
+
+        # Provider-specific tuning (temperature, max_tokens), passed per call
+        provider_name, tuning = self._provider_tuning(client)
+        logger.info(
+            f"Generating answer (mode: {mode}, provider: {provider_name}, "
+            f"temp: {tuning['temperature']}, max_tokens: {tuning['max_tokens']})..."
         )
-        
-        # Detect question type and get specialized instruction
-        question_type = detect_question_type(question)
-        type_specific_instruction = QUESTION_TYPE_PROMPTS.get(question_type, "")
-        logger.info(f"Detected question type: {question_type}")
-        
-        # Select system prompt based on mode
-        if mode == "verbatim":
-            system_msg = VERBATIM_SYSTEM_PROMPT
-        else:
-            # Use CoT prompt + type-specific instruction for synthesized mode
-            system_msg = SYSTEM_PROMPT_COT
-            if type_specific_instruction:
-                system_msg = system_msg + "\n\n" + type_specific_instruction
-        
-        # Get provider-specific tuning (temperature, max_tokens)
-        provider_name = getattr(self.llm_client, 'provider_name', None)
-        if not provider_name:
-            # Detect from class name
-            class_name = self.llm_client.__class__.__name__.lower()
-            if 'groq' in class_name:
-                provider_name = 'groq'
-            elif 'gemini' in class_name:
-                provider_name = 'gemini'
-            elif 'mistral' in class_name:
-                provider_name = 'mistral'
-            elif 'nvidia' in class_name or 'nim' in class_name:
-                provider_name = 'nvidia'
-            else:
-                provider_name = 'copilot'
-        tuning = PROVIDER_TUNING.get(provider_name, PROVIDER_TUNING['copilot'])
-        
-        # Apply provider-specific tuning to LLM client
-        original_max_tokens = getattr(self.llm_client, 'max_tokens', None)
-        original_temperature = getattr(self.llm_client, 'temperature', None)
-        try:
-            if hasattr(self.llm_client, 'max_tokens'):
-                setattr(self.llm_client, 'max_tokens', tuning['max_tokens'])
-            if hasattr(self.llm_client, 'temperature'):
-                setattr(self.llm_client, 'temperature', tuning['temperature'])
-            
-            logger.info(
-                f"Generating answer (mode: {mode}, question_type: {question_type}, "
-                f"provider: {provider_name}, temp: {tuning['temperature']}, "
-                f"max_tokens: {tuning['max_tokens']})..."
-            )
-            raw_answer = self.llm_client.generate(
+        with llm_health.track(client, "generate", record=llm_client is None):
+            raw_answer = client.generate(
                 user_message=user_prompt,
                 system_message=system_msg,
+                max_tokens=tuning['max_tokens'],
+                temperature=tuning['temperature'],
             )
-        finally:
-            # Restore original LLM client settings
-            if original_max_tokens is not None and hasattr(self.llm_client, 'max_tokens'):
-                setattr(self.llm_client, 'max_tokens', original_max_tokens)
-            if original_temperature is not None and hasattr(self.llm_client, 'temperature'):
-                setattr(self.llm_client, 'temperature', original_temperature)
-        
-        # Step 3.5: Extract structured JSON metadata from LLM response
-        answer, json_metadata = self._extract_json_metadata(raw_answer)
-        
-        # Step 4: Validate answer for citation accuracy
-        # If JSON metadata has cited_sources, pass them to validation; otherwise regex fallback
-        json_cited_sources: list[int] | None = None
-        if json_metadata and "cited_sources" in json_metadata:
-            try:
-                json_cited_sources = [int(s) for s in json_metadata["cited_sources"]]
-                logger.info(f"Using JSON-extracted cited_sources: {json_cited_sources}")
-            except (TypeError, ValueError) as e:
-                logger.warning(f"Invalid cited_sources in JSON metadata: {e}")
-                json_cited_sources = None
-        
-        validation = self._validate_answer(answer, citations, json_cited_sources=json_cited_sources)
-        if validation.warnings:
-            logger.warning(f"Answer validation warnings: {validation.warnings}")
-        
-        # Step 5: LLM-as-judge grounding verification
+
+        # Step 4: Extract JSON metadata and validate answer for citation accuracy
+        answer, validation = self._validate_raw_answer(raw_answer, citations)
+
+        # Step 5: Grounding verification (local check, LLM judge when uncertain)
         if skip_grounding:
-            grounding_score = None
-            ungrounded_claims: list[str] = []
-            validation.grounding_score = grounding_score
-            validation.ungrounded_claims = ungrounded_claims
-            validation.hallucination_risk = "skipped"
+            self._skip_grounding(validation)
         else:
-            grounding_score, ungrounded_claims = self._verify_grounding(answer, citations)
-            validation.grounding_score = grounding_score
-            validation.ungrounded_claims = ungrounded_claims
-        
+            self._apply_grounding(
+                validation, answer, citations, [r.text for r in results], background_grounding, client
+            )
+
         # Step 6: Build response
         return RAGResponse(
             answer=answer,
@@ -917,7 +1070,18 @@ JSON:"""
             raw_context=context,
             validation=validation,
         )
-    
+
+    @staticmethod
+    def _history_question(question: str, chat_history: list[dict[str, str]] | None) -> str:
+        """Prepend the last three Q&A turns to a follow-up question."""
+        if not chat_history:
+            return question
+        history_context = "\n".join([
+            f"Q: {h['question']}\nA: {h['answer'][:200]}..."
+            for h in chat_history[-3:]  # Last 3 turns
+        ])
+        return f"Konteks sebelumnya:\n{history_context}\n\nPertanyaan saat ini: {question}"
+
     def query_with_history(
         self,
         question: str,
@@ -926,70 +1090,208 @@ JSON:"""
     ) -> RAGResponse:
         """
         Query with conversation history for follow-up questions.
-        
+
         Args:
             question: Current question
             chat_history: Previous Q&A pairs [{"question": ..., "answer": ...}, ...]
             **kwargs: Additional args passed to query()
-        
+
         Returns:
             RAGResponse
         """
-        # For follow-up questions, prepend context from history
-        if chat_history:
-            history_context = "\n".join([
-                f"Q: {h['question']}\nA: {h['answer'][:200]}..."
-                for h in chat_history[-3:]  # Last 3 turns
-            ])
-            enhanced_question = f"Konteks sebelumnya:\n{history_context}\n\nPertanyaan saat ini: {question}"
-        else:
-            enhanced_question = question
-        
-        return self.query(enhanced_question, **kwargs)
-    
+        return self.query(self._history_question(question, chat_history), **kwargs)
+
     async def aquery(
         self,
         question: str,
         filter_jenis_dokumen: str | None = None,
         top_k: int | None = None,
+        mode: str = "synthesized",
+        skip_grounding: bool = False,
+        background_grounding: bool = GROUNDING_BACKGROUND,
+        use_hyde: bool = True,
+        use_decomposition: bool = True,
+        use_crag: bool = False,
+        use_multi_query: bool = False,
+        use_parent_child: bool = False,
+        use_agentic: bool = False,
+        llm_client: LLMClient | None = None,
     ) -> RAGResponse:
         """
-        Async version of query() for use with FastAPI async endpoints.
-        
-        Args:
-            question: User question in Indonesian
-            filter_jenis_dokumen: Optional filter by document type
-            top_k: Number of documents to retrieve
-        
+        Native async version of query() (same arguments and result).
+
+        LLM calls (HyDE, decomposition, CRAG rephrase, answer generation,
+        grounding judge) are awaited on the event loop, so a waiting
+        question holds no thread; only CPU-bound retrieval stages borrow a
+        worker thread. Many in-flight questions therefore are not capped
+        by the default thread pool size.
+
         Returns:
             RAGResponse with answer, citations, and sources
         """
-        # Run synchronous query in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: self.query(question, filter_jenis_dokumen, top_k)
+        k = top_k or self.top_k
+        client = llm_client or self.llm_client
+
+        logger.info(f"Retrieving documents (async) for: {question[:50]}...")
+        results = await self._aretrieve(
+            question, filter_jenis_dokumen, k,
+            use_hyde=use_hyde,
+            use_decomposition=use_decomposition,
+            use_crag=use_crag,
+            use_multi_query=use_multi_query,
+            use_parent_child=use_parent_child,
+            use_agentic=use_agentic,
         )
-    
+        if not results:
+            return self._no_results_response()
+
+        context, citations = self._format_context(results)
+        sources = self._extract_sources(citations)
+        confidence = self._assess_confidence(results)
+        if confidence.numeric < CONFIDENCE_THRESHOLD:
+            return self._refusal_response(context, citations, sources, confidence)
+
+        user_prompt, system_msg = self._answer_prompts(question, context, mode)
+        provider_name, tuning = self._provider_tuning(client)
+        logger.info(
+            f"Generating answer (async, mode: {mode}, provider: {provider_name}, "
+            f"temp: {tuning['temperature']}, max_tokens: {tuning['max_tokens']})..."
+        )
+        with llm_health.track(client, "generate", record=llm_client is None):
+            raw_answer = await async_generate(
+                client,
+                user_prompt,
+                system_msg,
+                max_tokens=tuning['max_tokens'],
+                temperature=tuning['temperature'],
+            )
+
+        answer, validation = self._validate_raw_answer(raw_answer, citations)
+        if skip_grounding:
+            self._skip_grounding(validation)
+        else:
+            await self._aapply_grounding(
+                validation, answer, citations, [r.text for r in results], background_grounding, client
+            )
+
+        return RAGResponse(
+            answer=answer,
+            citations=citations,
+            sources=sources,
+            confidence=confidence.label,
+            confidence_score=confidence,
+            raw_context=context,
+            validation=validation,
+        )
+
+    async def aquery_with_history(
+        self,
+        question: str,
+        chat_history: list[dict[str, str]] | None = None,
+        **kwargs,
+    ) -> RAGResponse:
+        """Async query_with_history(); ``kwargs`` are passed to aquery()."""
+        return await self.aquery(self._history_question(question, chat_history), **kwargs)
+
+    @staticmethod
+    def _single_message_events(
+        metadata: dict[str, Any],
+        text: str,
+        warnings: list[str],
+        hallucination_risk: str,
+    ) -> list[tuple[str, Any]]:
+        """Stream events for a canned answer (no results, or refusal)."""
+        return [
+            ("metadata", metadata),
+            ("chunk", text),
+            ("done", {
+                "validation": {
+                    "is_valid": True,
+                    "citation_coverage": 0.0,
+                    "warnings": warnings,
+                    "hallucination_risk": hallucination_risk,
+                    "missing_citations": [],
+                }
+            }),
+        ]
+
+    def _early_stream_events(
+        self,
+        results: list[SearchResult],
+    ) -> tuple[list[tuple[str, Any]] | None, str, list[dict], list[str], ConfidenceScore | None]:
+        """
+        Context for streaming, or the complete event list when the stream
+        ends before generation (no results or low confidence).
+
+        Returns:
+            Tuple of (early events or None, context, citations, sources, confidence)
+        """
+        if not results:
+            events = self._single_message_events(
+                {
+                    "citations": [],
+                    "sources": [],
+                    "confidence_score": {
+                        "numeric": 0.0,
+                        "label": "tidak ada",
+                        "top_score": 0.0,
+                        "avg_score": 0.0,
+                    },
+                },
+                NO_RESULTS_ANSWER,
+                [],
+                "low",
+            )
+            return events, "", [], [], None
+
+        context, citations = self._format_context(results)
+        sources = self._extract_sources(citations)
+        confidence = self._assess_confidence(results)
+        metadata = {
+            "citations": citations,
+            "sources": sources,
+            "confidence_score": confidence.to_dict(),
+        }
+
+        # Check confidence threshold - refuse if too low
+        if confidence.numeric < CONFIDENCE_THRESHOLD:
+            logger.info(f"Low confidence ({confidence.numeric:.3f} < {CONFIDENCE_THRESHOLD}) - refusing to answer (streaming)")
+            events = self._single_message_events(
+                metadata,
+                REFUSAL_ANSWER,
+                ["Pertanyaan di luar jangkauan basis pengetahuan"],
+                "refused",
+            )
+            return events, context, citations, sources, confidence
+        return None, context, citations, sources, confidence
+
     def query_stream(
         self,
         question: str,
         filter_jenis_dokumen: str | None = None,
         top_k: int | None = None,
+        background_grounding: bool = GROUNDING_BACKGROUND,
+        llm_client: LLMClient | None = None,
     ):
         """
         Streaming version of query() that yields answer chunks.
-        
+
+        ``llm_client`` overrides the provider for this call only.
+
         Yields tuples of (event_type, data):
         - ("metadata", {citations, sources, confidence_score})
         - ("chunk", "text chunk")
         - ("done", {validation})
+        - ("grounding", {verification_id, status, grounding_score, ...}) —
+          only with ``background_grounding`` when the LLM judge was needed;
+          sent after "done" once the judge finishes
         """
         k = top_k or self.top_k
-        
+        client = llm_client or self.llm_client
+
         # Step 1: Retrieve relevant documents
         logger.info(f"Retrieving documents for: {question[:50]}...")
-        
+
         if filter_jenis_dokumen:
             results = self.retriever.search_by_document_type(
                 query=question,
@@ -1002,99 +1304,149 @@ JSON:"""
                 top_k=k,
                 expand_queries=True,
             )
-        
-        # Handle no results
-        if not results:
-            yield ("metadata", {
-                "citations": [],
-                "sources": [],
-                "confidence_score": {
-                    "numeric": 0.0,
-                    "label": "tidak ada",
-                    "top_score": 0.0,
-                    "avg_score": 0.0,
-                },
-            })
-            yield ("chunk", "Maaf, saya tidak menemukan dokumen yang relevan dengan pertanyaan Anda dalam database.")
-            yield ("done", {
-                "validation": {
-                    "is_valid": True,
-                    "citation_coverage": 0.0,
-                    "warnings": [],
-                    "hallucination_risk": "low",
-                    "missing_citations": [],
-                }
-            })
-            return
-        
-        # Step 2: Format context and send metadata first
-        context, citations = self._format_context(results)
-        sources = self._extract_sources(citations)
-        confidence = self._assess_confidence(results)
-        
-        # Step 2.5: Check confidence threshold - refuse if too low
-        CONFIDENCE_THRESHOLD = 0.15
-        if confidence.numeric < CONFIDENCE_THRESHOLD:
-            refusal_text = "Maaf, saya tidak memiliki cukup informasi hukum untuk menjawab pertanyaan ini dengan akurat. Silakan konsultasikan dengan ahli hukum."
-            logger.info(f"Low confidence ({confidence.numeric:.3f} < {CONFIDENCE_THRESHOLD}) - refusing to answer (streaming)")
-            yield ("metadata", {
-                "citations": citations,
-                "sources": sources,
-                "confidence_score": confidence.to_dict(),
-            })
-            yield ("chunk", refusal_text)
-            yield ("done", {
-                "validation": {
-                    "is_valid": True,
-                    "citation_coverage": 0.0,
-                    "warnings": ["Pertanyaan di luar jangkauan basis pengetahuan"],
-                    "hallucination_risk": "refused",
-                    "missing_citations": [],
-                }
-            })
+
+        # Step 2: Format context; no results / low confidence end the stream here
+        early_events, context, citations, sources, confidence = self._early_stream_events(results)
+        if early_events is not None:
+            yield from early_events
             return
-        
+
         # Send metadata immediately so frontend can show sources while waiting for answer
         yield ("metadata", {
             "citations": citations,
             "sources": sources,
             "confidence_score": confidence.to_dict(),
         })
-        
+
         # Step 3: Generate answer using streaming LLM
         user_prompt = USER_PROMPT_TEMPLATE.format(
             context=context,
             question=question,
         )
-        
-        logger.info(f"Streaming answer with NVIDIA NIM {NVIDIA_MODEL}...")
-        
+
+        provider_name, tuning = self._provider_tuning(client)
+        logger.info(f"Streaming answer (provider: {provider_name})...")
+
         full_answer = ""
-        for chunk in self.llm_client.generate_stream(
-            user_message=user_prompt,
-            system_message=SYSTEM_PROMPT,
-        ):
-            full_answer += chunk
-            yield ("chunk", chunk)
-        
+        with llm_health.track(client, "stream", record=llm_client is None):
+            for chunk in client.generate_stream(
+                user_message=user_prompt,
+                system_message=SYSTEM_PROMPT,
+                max_tokens=tuning['max_tokens'],
+                temperature=tuning['temperature'],
+            ):
+                full_answer += chunk
+                yield ("chunk", chunk)
+
         # Step 4: Validate answer for citation accuracy
         validation = self._validate_answer(full_answer, citations)
         if validation.warnings:
             logger.warning(f"Answer validation warnings: {validation.warnings}")
-        
-        # Step 5: LLM-as-judge grounding verification (streaming post-generation)
+
+        # Step 5: Grounding verification (streaming post-generation)
         logger.info("Performing grounding verification for streaming response...")
-        grounding_score, ungrounded_claims = self._verify_grounding(full_answer, citations)
-        validation.grounding_score = grounding_score
-        validation.ungrounded_claims = ungrounded_claims
-        
+        self._apply_grounding(
+            validation, full_answer, citations, [r.text for r in results], background_grounding, client
+        )
+        grounding_score = validation.grounding_score
+
         if grounding_score is not None and grounding_score < 0.5:
             logger.warning(f"Low grounding score ({grounding_score:.2f}) detected in streaming response")
-        
+
         yield ("done", {
             "validation": validation.to_dict(),
         })
 
+        # Late event: the background LLM judge result, on the same stream
+        if validation.verification_id is not None:
+            result = self.grounding.wait_result(validation.verification_id)
+            if result is not None:
+                yield ("grounding", result)
+
+    async def aquery_stream(
+        self,
+        question: str,
+        filter_jenis_dokumen: str | None = None,
+        top_k: int | None = None,
+        background_grounding: bool = GROUNDING_BACKGROUND,
+        llm_client: LLMClient | None = None,
+    ):
+        """
+        Native async version of query_stream() (same events, async iterator).
+
+        Chunks come from the provider's ``agenerate_stream``; the search
+        runs in a worker thread.
+        """
+        k = top_k or self.top_k
+        client = llm_client or self.llm_client
+
+        logger.info(f"Retrieving documents (async) for: {question[:50]}...")
+        if filter_jenis_dokumen:
+            results = await asyncio.to_thread(
+                self.retriever.search_by_document_type,
+                query=question,
+                jenis_dokumen=filter_jenis_dokumen,
+                top_k=k,
+            )
+        else:
+            results = await asyncio.to_thread(
+                self.retriever.hybrid_search,
+                query=question,
+                top_k=k,
+                expand_queries=True,
+            )
+
+        early_events, context, citations, sources, confidence = self._early_stream_events(results)
+        if early_events is not None:
+            for event in early_events:
+                yield event
+            return
+
+        yield ("metadata", {
+            "citations": citations,
+            "sources": sources,
+            "confidence_score": confidence.to_dict(),
+        })
+
+        user_prompt = USER_PROMPT_TEMPLATE.format(
+            context=context,
+            question=question,
+        )
+        provider_name, tuning = self._provider_tuning(client)
+        logger.info(f"Streaming answer (async, provider: {provider_name})...")
+
+        full_answer = ""
+        with llm_health.track(client, "stream", record=llm_client is None):
+            async for chunk in async_generate_stream(
+                client,
+                user_prompt,
+                SYSTEM_PROMPT,
+                max_tokens=tuning['max_tokens'],
+                temperature=tuning['temperature'],
+            ):
+                full_answer += chunk
+                yield ("chunk", chunk)
+
+        validation = self._validate_answer(full_answer, citations)
+        if validation.warnings:
+            logger.warning(f"Answer validation warnings: {validation.warnings}")
+
+        await self._aapply_grounding(
+            validation, full_answer, citations, [r.text for r in results], background_grounding, client
+        )
+        grounding_score = validation.grounding_score
+        if grounding_score is not None and grounding_score < 0.5:
+            logger.warning(f"Low grounding score ({grounding_score:.2f}) detected in streaming response")
+
+        yield ("done", {
+            "validation": validation.to_dict(),
+        })
+
+        if validation.verification_id is not None:
+            result = await asyncio.to_thread(self.grounding.wait_result, validation.verification_id)
+            if result is not None:
+                yield ("grounding", result)
+
 
 def main():
     """Test the RAG chain."""
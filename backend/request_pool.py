@@ -0,0 +1,233 @@
+"""
+Bounded worker pool with admission control for blocking RAG pipeline calls.
+
+``/ask``, ``/ask/followup`` and ``/compliance/check`` run the synchronous
+``LegalRAGChain.query`` (retrieval, rerank, generation, grounding — 5-30s).
+Called directly from an ``async def`` handler that work freezes the event
+loop, so one slow question stalls every other request, ``/health``
+included. ``RequestPool`` moves the call onto a dedicated, fixed-size
+thread pool and bounds how many calls may wait for a worker.
+
+Intuition:
+    Admitted = running + queued. While admitted < workers + queue size a
+    request is accepted; beyond that it is rejected immediately with a
+    ``Retry-After`` estimate instead of piling up behind work the server
+    cannot finish in time. A request that is admitted but still has not
+    started after ``queue_timeout`` seconds is dropped from the queue the
+    same way, and a client that disconnects while queued frees its slot.
+    Throughput scales with the pool size; latency under overload stays
+    bounded by the queue.
+
+Metrics (``snapshot()``, served at ``/api/v1/metrics/pool``): current
+running/queued counts, admitted/rejected/expired/completed totals, and
+queue-wait and run-time histograms in milliseconds.
+
+Example:
+    >>> pool = RequestPool(max_workers=8, max_queue=32)
+    >>> response = await pool.run(rag_chain.query, question="Apa itu PT?")
+    PoolSaturated: ...  # when 8 are running and 32 are already waiting
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+from stage_metrics import LATENCY_BUCKETS_MS, Histogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Worker threads for blocking pipeline calls
+REQUEST_POOL_WORKERS = int(os.getenv("REQUEST_POOL_WORKERS", "8"))
+# Admitted requests allowed to wait for a free worker (0 = reject when all busy)
+REQUEST_POOL_QUEUE_SIZE = int(os.getenv("REQUEST_POOL_QUEUE_SIZE", "32"))
+# Seconds a request may wait for a worker before it is dropped (0 = no limit)
+REQUEST_POOL_QUEUE_TIMEOUT = float(os.getenv("REQUEST_POOL_QUEUE_TIMEOUT", "30"))
+
+# Pool wait/run times reach well past the retrieval stage buckets.
+POOL_LATENCY_BUCKETS_MS: tuple[float, ...] = LATENCY_BUCKETS_MS + (20000, 30000, 60000)
+
+MAX_RETRY_AFTER_SECONDS = 60
+
+
+class PoolSaturated(RuntimeError):
+    """The pool cannot take (or start) a request; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RequestPool:
+    """
+    Fixed-size thread pool with a bounded admission queue.
+
+    Usage:
+        pool = RequestPool(max_workers=4, max_queue=16, queue_timeout=20)
+        result = await pool.run(blocking_fn, arg, key=value)
+        pool.snapshot()
+    """
+
+    def __init__(
+        self,
+        max_workers: int = REQUEST_POOL_WORKERS,
+        max_queue: int = REQUEST_POOL_QUEUE_SIZE,
+        queue_timeout: float = REQUEST_POOL_QUEUE_TIMEOUT,
+    ):
+        """
+        Configure the pool; threads are started on first use.
+
+        Args:
+            max_workers: Concurrent blocking calls
+            max_queue: Admitted calls that may wait for a worker
+            queue_timeout: Seconds a call may wait before it is dropped
+                (0 = wait indefinitely)
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.expired = 0
+        self.completed = 0
+        self._wait_ms = Histogram(POOL_LATENCY_BUCKETS_MS)
+        self._run_ms = Histogram(POOL_LATENCY_BUCKETS_MS)
+        self._lock = threading.Lock()
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Lazily create the worker threads."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="rag-pool",
+                    )
+        return self._executor
+
+    def estimated_wait(self) -> float:
+        """
+        Seconds a request admitted now would likely wait for a worker.
+
+        Zero while a worker is free; otherwise the mean run time times the
+        work already queued ahead, spread over the workers. Zero before any
+        call has completed.
+        """
+        with self._lock:
+            if self.running + self.queued < self.max_workers or not self._run_ms.count:
+                return 0.0
+            mean_s = self._run_ms.total / self._run_ms.count / 1000
+            return mean_s * (self.queued + 1) / self.max_workers
+
+    def retry_after(self) -> int:
+        """Seconds until a worker is likely free, for the ``Retry-After`` header."""
+        return min(MAX_RETRY_AFTER_SECONDS, max(1, math.ceil(self.estimated_wait())))
+
+    async def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """
+        Run ``fn(*args, **kwargs)`` on a pool worker and await its result.
+
+        The caller's contextvars are carried into the worker thread.
+
+        Raises:
+            PoolSaturated: The queue is full, or the call waited longer than
+                ``queue_timeout`` without starting
+        """
+        with self._lock:
+            if self.running + self.queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                saturated = True
+            else:
+                self.queued += 1
+                self.admitted += 1
+                saturated = False
+        if saturated:
+            logger.warning(
+                f"Request pool saturated ({self.max_workers} running, {self.max_queue} queued), "
+                "rejecting request"
+            )
+            raise PoolSaturated("Request pool is saturated", self.retry_after())
+
+        enqueued_at = time.perf_counter()
+        ctx = contextvars.copy_context()
+
+        def job() -> T:
+            started_at = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self._wait_ms.record((started_at - enqueued_at) * 1000)
+            try:
+                return ctx.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self._run_ms.record((time.perf_counter() - started_at) * 1000)
+
+        cfuture = self._get_executor().submit(job)
+        future = asyncio.wrap_future(cfuture)
+        try:
+            if self.queue_timeout > 0:
+                done, _ = await asyncio.wait({future}, timeout=self.queue_timeout)
+                if not done and self._drop(cfuture):
+                    with self._lock:
+                        self.expired += 1
+                    logger.warning(
+                        f"Request waited {self.queue_timeout:.0f}s for a pool worker, dropping it"
+                    )
+                    raise PoolSaturated("Timed out waiting for a pool worker", self.retry_after())
+            return await future
+        except asyncio.CancelledError:
+            # Client went away: free the queue slot if the call has not started.
+            self._drop(cfuture)
+            raise
+
+    def _drop(self, cfuture: concurrent.futures.Future) -> bool:
+        """Remove a not-yet-started call from the queue; False if it is already running."""
+        if not cfuture.cancel():
+            return False
+        with self._lock:
+            self.queued -= 1
+        return True
+
+    def snapshot(self) -> dict[str, Any]:
+        """Pool size, current load, totals and wait/run-time percentiles (ms)."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_timeout_s": self.queue_timeout,
+                "running": self.running,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "expired": self.expired,
+                "completed": self.completed,
+                "wait_ms": self._wait_ms.summary(),
+                "run_ms": self._run_ms.summary(),
+            }
+
+    def latency_histograms(self) -> dict[str, Histogram]:
+        """Copies of the queue-wait and run-time histograms (ms)."""
+        with self._lock:
+            return {"wait": self._wait_ms.copy(), "run": self._run_ms.copy()}
+
+    def shutdown(self) -> None:
+        """Stop accepting work and drop queued calls; running calls finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -10,17 +10,26 @@ Uses Reciprocal Rank Fusion (RRF) to merge results:
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
+import numpy as np
 import requests
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue
+from qdrant_client.models import Filter, FieldCondition, MatchValue, Prefetch, QueryRequest
 from langchain_huggingface import HuggingFaceEmbeddings
 from rank_bm25 import BM25Okapi
 
+try:
+    from matryoshka import COARSE_VECTOR_NAME, FULL_VECTOR_NAME, MATRYOSHKA_COARSE_DIM, truncate_embedding
+    from stage_metrics import StageMetrics, retrieval_metrics
+except ImportError:  # imported as backend.retriever (scripts run from repo root)
+    from backend.matryoshka import COARSE_VECTOR_NAME, FULL_VECTOR_NAME, MATRYOSHKA_COARSE_DIM, truncate_embedding
+    from backend.stage_metrics import StageMetrics, retrieval_metrics
+
 # Load environment variables
 load_dotenv()
 
@@ -50,6 +59,20 @@ JINA_EMBEDDING_DIM = int(os.getenv("JINA_EMBEDDING_DIM", "1024"))
 JINA_API_KEY = os.getenv("JINA_API_KEY")
 JINA_API_URL = "https://api.jina.ai/v1/embeddings"
 
+# Two-stage Matryoshka search (vector layout in matryoshka.py): dense search
+# runs a cheap ANN pass on the coarse vector, then rescores the oversampled
+# shortlist with the full vector.
+MATRYOSHKA_OVERSAMPLE = int(os.getenv("MATRYOSHKA_OVERSAMPLE", "4"))
+
+# Dense search backend: "qdrant" (default) or "numpy" — an embedded,
+# memory-mapped index exported with scripts/export_vector_index.py.
+# The numpy backend needs no Qdrant server at query time.
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "qdrant").lower()
+NUMPY_INDEX_PATH = os.getenv(
+    "NUMPY_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "vector_index"),
+)
+
 
 class NVIDIAEmbedder:
     """
@@ -224,6 +247,24 @@ class NVIDIAEmbedder:
         """
         result = self._make_request([text], input_type="query")
         return result["data"][0]["embedding"]
+    
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed several queries in one request per 100 texts.
+        
+        Args:
+            texts: Query texts
+        
+        Returns:
+            List of embedding vectors, aligned with ``texts``
+        """
+        all_embeddings: list[list[float]] = []
+        for i in range(0, len(texts), 100):
+            result = self._make_request(texts[i:i + 100], input_type="query")
+            all_embeddings.extend(
+                item["embedding"] for item in sorted(result["data"], key=lambda x: x["index"])
+            )
+        return all_embeddings
 
 
 class JinaEmbedder:
@@ -393,12 +434,62 @@ class JinaEmbedder:
         """
         result = self._make_request([text], task="retrieval.query")
         return result["data"][0]["embedding"]
+    
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed several queries in one request per 100 texts.
+        
+        Args:
+            texts: Query texts
+        
+        Returns:
+            List of embedding vectors, aligned with ``texts``
+        """
+        all_embeddings: list[list[float]] = []
+        for i in range(0, len(texts), 100):
+            result = self._make_request(texts[i:i + 100], task="retrieval.query")
+            all_embeddings.extend(
+                item["embedding"] for item in sorted(result["data"], key=lambda x: x["index"])
+            )
+        return all_embeddings
+
+
+@dataclass
+class RegulationStats:
+    """Per-regulation corpus aggregates, maintained incrementally."""
+    chunk_count: int = 0
+    total_chars: int = 0
+    # pasal number -> chunk count (counts let removals stay O(1))
+    pasal_chunks: dict[str, int] = field(default_factory=dict)
+    
+    @property
+    def pasal_count(self) -> int:
+        """Number of distinct Pasal covered by indexed chunks."""
+        return len(self.pasal_chunks)
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "chunk_count": self.chunk_count,
+            "total_chars": self.total_chars,
+            "pasal_count": self.pasal_count,
+        }
+
+
+def regulation_key(citation_id: str) -> str:
+    """
+    Base regulation ID for a chunk citation_id.
+    
+    ``"UU_11_2020_pasal_5"`` -> ``"uu_11_2020"``; IDs without a Pasal part are
+    only lowercased.
+    """
+    return citation_id.lower().split("_pasal_")[0]
 
 
 @dataclass
 class SearchResult:
     """Single search result with score and metadata."""
-    id: int
+    id: int | str
     text: str
     citation: str
     citation_id: str
@@ -515,6 +606,10 @@ class HybridRetriever:
         use_nvidia: bool = USE_NVIDIA_EMBEDDINGS,
         use_jina: bool = USE_JINA_EMBEDDINGS,
         knowledge_graph: Any | None = None,
+        coarse_dim: int = MATRYOSHKA_COARSE_DIM,
+        vector_backend: str = VECTOR_BACKEND,
+        vector_index_path: str = NUMPY_INDEX_PATH,
+        metrics: StageMetrics | None = None,
     ):
         """
         Initialize the hybrid retriever.
@@ -531,6 +626,14 @@ class HybridRetriever:
             use_nvidia: Whether to use NVIDIA NIM API embeddings (1024-dim)
             use_jina: Whether to use Jina AI embeddings (jina-embeddings-v3)
             knowledge_graph: Optional LegalKnowledgeGraph instance for KG-aware boosting
+            coarse_dim: Matryoshka coarse vector dimension for two-stage dense
+                search (0 disables; requires a collection ingested with the
+                same MATRYOSHKA_COARSE_DIM)
+            vector_backend: Dense backend, "qdrant" or "numpy" (embedded
+                NumpyVectorIndex; no Qdrant connection is made)
+            vector_index_path: Directory of the NumPy index (numpy backend only)
+            metrics: Per-stage latency histograms (defaults to the process-wide
+                ``stage_metrics.retrieval_metrics``)
         """
         self.collection_name = collection_name
         self.qdrant_url = qdrant_url
@@ -538,9 +641,23 @@ class HybridRetriever:
         self.use_nvidia = use_nvidia
         self.use_jina = use_jina
         self.knowledge_graph = knowledge_graph
+        self.metrics = metrics or retrieval_metrics
         
-        # Initialize Qdrant client (with API key for cloud)
-        if qdrant_api_key:
+        # Initialize dense backend: embedded NumPy index or Qdrant client
+        self.vector_backend = vector_backend
+        self.vector_index = None
+        self.client: QdrantClient | None = None
+        if vector_backend == "numpy":
+            try:
+                from vector_index import NumpyVectorIndex
+            except ImportError:  # imported as backend.retriever
+                from backend.vector_index import NumpyVectorIndex
+
+            logger.info(f"Using embedded NumPy vector index: {vector_index_path}")
+            self.vector_index = NumpyVectorIndex.load(vector_index_path)
+        elif vector_backend != "qdrant":
+            raise ValueError(f"Unknown vector backend '{vector_backend}' (expected 'qdrant' or 'numpy')")
+        elif qdrant_api_key:
             self.client = QdrantClient(url=qdrant_url, api_key=qdrant_api_key, timeout=10)
         else:
             self.client = QdrantClient(url=qdrant_url, timeout=10)
@@ -559,71 +676,168 @@ class HybridRetriever:
             self.embedder = HuggingFaceEmbeddings(model_name=embedding_model)
             self.embedding_dim = EMBEDDING_DIM
         
+        # Two-stage search only makes sense when the coarse vector is a
+        # strict prefix of the full embedding.
+        self.coarse_dim = coarse_dim if 0 < coarse_dim < self.embedding_dim else 0
+        if coarse_dim and not self.coarse_dim:
+            logger.warning(
+                f"Ignoring MATRYOSHKA_COARSE_DIM={coarse_dim} "
+                f"(must be between 1 and {self.embedding_dim - 1})"
+            )
+        
         # Initialize CrossEncoder for re-ranking (optional but recommended)
         # Set USE_DUMMY_RERANKER=1 to skip loading (useful when paging file/memory is low)
         self.reranker = None
         _skip_reranker = os.environ.get("USE_DUMMY_RERANKER", "0") == "1"
-        if use_reranker and not _skip_reranker:
-            try:
-                from sentence_transformers import CrossEncoder
-                logger.info(f"Loading CrossEncoder reranker: {RERANKER_MODEL}")
-                self.reranker = CrossEncoder(RERANKER_MODEL)
-                logger.info("CrossEncoder reranker loaded successfully")
-            except Exception as e:
-                logger.warning(f"Failed to load CrossEncoder, continuing without re-ranking: {e}")
-                self.reranker = None
-        elif _skip_reranker:
+        if _skip_reranker:
             logger.info("CrossEncoder reranker skipped (USE_DUMMY_RERANKER=1)")
         
         # Load corpus for BM25
         self._corpus: list[dict[str, Any]] = []
         self._bm25: BM25Okapi | None = None
-        self._load_corpus()
+        # Per-regulation aggregates, built once with the corpus so the
+        # regulation-library endpoints never scan _corpus per request
+        self._regulation_stats: dict[str, RegulationStats] = {}
+        # term -> (doc rows, BM25 contributions); built lazily for batched BM25
+        self._bm25_postings: dict[str, tuple[np.ndarray, np.ndarray]] | None = None
+        
+        # The CrossEncoder load (disk + model init) and the corpus scroll /
+        # BM25 build are independent, so they overlap at startup.
+        if use_reranker and not _skip_reranker:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker-load") as executor:
+                reranker_future = executor.submit(self._load_reranker)
+                self._load_corpus()
+                self.reranker = reranker_future.result()
+        else:
+            self._load_corpus()
+    
+    @staticmethod
+    def _load_reranker() -> Any:
+        """Load the CrossEncoder reranker, or None if it cannot be loaded."""
+        try:
+            from sentence_transformers import CrossEncoder
+            logger.info(f"Loading CrossEncoder reranker: {RERANKER_MODEL}")
+            reranker = CrossEncoder(RERANKER_MODEL)
+            logger.info("CrossEncoder reranker loaded successfully")
+            return reranker
+        except Exception as e:
+            logger.warning(f"Failed to load CrossEncoder, continuing without re-ranking: {e}")
+            return None
     
     def _load_corpus(self) -> None:
-        """Load all documents from Qdrant for BM25 indexing."""
-        # Get collection info
-        collection_info = self.client.get_collection(self.collection_name)
-        total_points = collection_info.points_count
-        if total_points is None or total_points == 0:
-            self._corpus = []
-            self._bm25 = None
-            return
-        
-        # Scroll through all points
-        records, _ = self.client.scroll(
-            collection_name=self.collection_name,
-            limit=total_points,
-            with_payload=True,
-            with_vectors=False,  # Don't need vectors for BM25
-        )
+        """Load all documents from Qdrant (or the NumPy index) for BM25 indexing."""
+        self._regulation_stats = {}
+        self._bm25_postings = None
+        if self.vector_index is not None:
+            records: list[Any] = list(
+                zip(self.vector_index.point_ids(), self.vector_index.payloads)
+            )
+        else:
+            # Get collection info
+            collection_info = self.client.get_collection(self.collection_name)
+            total_points = collection_info.points_count
+            if total_points is None or total_points == 0:
+                self._corpus = []
+                self._bm25 = None
+                return
+            
+            # Scroll through all points
+            points, _ = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=total_points,
+                with_payload=True,
+                with_vectors=False,  # Don't need vectors for BM25
+            )
+            records = [(point.id, point.payload) for point in points]
         
         # Build corpus
         self._corpus = []
         tokenized_corpus = []
         
-        for record in records:
-            payload = record.payload
+        for point_id, payload in records:
             if payload is None:
                 continue
-            text = payload.get("text", "")
-            doc = {
-                "id": record.id,
-                "text": text,
-                "citation": payload.get("citation", ""),
-                "citation_id": payload.get("citation_id", ""),
-                "metadata": {
-                    k: v for k, v in payload.items()
-                    if k not in ("text", "citation", "citation_id")
-                },
-            }
+            doc = self.corpus_document(point_id, payload)
             self._corpus.append(doc)
-            tokenized_corpus.append(tokenize_indonesian(str(text)))
+            tokenized_corpus.append(tokenize_indonesian(str(doc["text"])))
+            self._update_regulation_stats(doc)
         
         # Initialize BM25 index
         if tokenized_corpus:
             self._bm25 = BM25Okapi(tokenized_corpus)
     
+    def _update_regulation_stats(self, doc: dict[str, Any], sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) one corpus doc from the regulation aggregates."""
+        cid = doc.get("citation_id", "")
+        if not cid:
+            return
+        key = regulation_key(cid)
+        stats = self._regulation_stats.setdefault(key, RegulationStats())
+        stats.chunk_count += sign
+        stats.total_chars += sign * len(str(doc.get("text", "")))
+        pasal = str(doc.get("metadata", {}).get("pasal", "") or "")
+        if pasal:
+            remaining = stats.pasal_chunks.get(pasal, 0) + sign
+            if remaining > 0:
+                stats.pasal_chunks[pasal] = remaining
+            else:
+                stats.pasal_chunks.pop(pasal, None)
+        if stats.chunk_count <= 0:
+            del self._regulation_stats[key]
+    
+    def _rebuild_bm25(self) -> None:
+        """Rebuild the BM25 index from the current corpus (BM25Okapi is immutable)."""
+        tokenized_corpus = [tokenize_indonesian(str(doc["text"])) for doc in self._corpus]
+        self._bm25 = BM25Okapi(tokenized_corpus) if tokenized_corpus else None
+        self._bm25_postings = None
+    
+    @staticmethod
+    def corpus_document(point_id: int | str, payload: dict[str, Any]) -> dict[str, Any]:
+        """Corpus entry for one Qdrant point (the shape kept in ``_corpus``)."""
+        return {
+            "id": point_id,
+            "text": payload.get("text", ""),
+            "citation": payload.get("citation", ""),
+            "citation_id": payload.get("citation_id", ""),
+            "metadata": {
+                k: v for k, v in payload.items()
+                if k not in ("text", "citation", "citation_id")
+            },
+        }
+    
+    def add_corpus_documents(self, docs: list[dict[str, Any]]) -> None:
+        """
+        Add newly ingested chunks to the in-memory corpus.
+        
+        Regulation aggregates are updated incrementally; BM25 is rebuilt.
+        Called by ``IncrementalSyncPipeline`` after it upserts new chunks.
+        
+        Args:
+            docs: Corpus docs built with :meth:`corpus_document`
+        """
+        for doc in docs:
+            self._corpus.append(doc)
+            self._update_regulation_stats(doc)
+        self._rebuild_bm25()
+    
+    def remove_corpus_documents(self, ids: set[int | str]) -> None:
+        """
+        Remove chunks (by point id) from the in-memory corpus.
+        
+        Called by ``IncrementalSyncPipeline`` when it deletes a file's points.
+        
+        Args:
+            ids: Point ids to drop
+        """
+        kept = []
+        for doc in self._corpus:
+            if doc["id"] in ids:
+                self._update_regulation_stats(doc, sign=-1)
+            else:
+                kept.append(doc)
+        self._corpus = kept
+        self._rebuild_bm25()
+    
     # Indonesian legal term synonym groups for query expansion.
     #
     # 55 groups covering:
@@ -897,37 +1111,163 @@ class HybridRetriever:
             List of SearchResult objects sorted by score (descending)
         """
         # Generate query embedding
-        query_embedding = self.embedder.embed_query(query)
-        
-        # Build filter if provided
-        search_filter = None
-        if filter_conditions:
-            conditions = []
-            for key, value in filter_conditions.items():
-                conditions.append(
-                    FieldCondition(key=key, match=MatchValue(value=value))
+        with self.metrics.stage("embed"):
+            query_embedding = self.embedder.embed_query(query)
+        
+        search_filter = self._build_filter(filter_conditions)
+        
+        with self.metrics.stage("qdrant") as timer:
+            hits = self._query_dense_backend(query_embedding, top_k, search_filter, filter_conditions)
+            timer.count = len(hits)
+        return self._hits_to_results(hits)
+    
+    @staticmethod
+    def _build_filter(filter_conditions: dict[str, Any] | None) -> Filter | None:
+        """Build a Qdrant ``Filter(must=...)`` from ``{payload_key: value}`` conditions."""
+        if not filter_conditions:
+            return None
+        conditions = []
+        for key, value in filter_conditions.items():
+            conditions.append(
+                FieldCondition(key=key, match=MatchValue(value=value))
+            )
+        return Filter(must=conditions)
+    
+    def _embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """
+        Embed queries with one embedding request (duplicates embedded once).
+        
+        Falls back to per-query ``embed_query`` for embedders without a
+        batch query method (e.g. HuggingFaceEmbeddings).
+        """
+        unique = list(dict.fromkeys(queries))
+        embed_queries = getattr(self.embedder, "embed_queries", None)
+        if callable(embed_queries) and len(unique) > 1:
+            embeddings = embed_queries(unique)
+        else:
+            embeddings = [self.embedder.embed_query(q) for q in unique]
+        by_text = dict(zip(unique, embeddings))
+        return [by_text[q] for q in queries]
+    
+    def dense_search_many(
+        self,
+        queries: list[str],
+        top_k: int = 10,
+        filter_conditions: dict[str, Any] | list[dict[str, Any] | None] | None = None,
+    ) -> list[list[SearchResult]]:
+        """
+        Batched :meth:`dense_search`: one embedding request, one Qdrant round-trip.
+        
+        Args:
+            queries: Search queries in natural language
+            top_k: Number of results per query
+            filter_conditions: One filter for every query, or a list of
+                per-query filters aligned with ``queries``
+        
+        Returns:
+            One result list per query, each sorted by score (descending)
+        """
+        if not queries:
+            return []
+        if isinstance(filter_conditions, list):
+            filters = filter_conditions
+        else:
+            filters = [filter_conditions] * len(queries)
+        
+        with self.metrics.stage("embed"):
+            embeddings = self._embed_queries(queries)
+        
+        with self.metrics.stage("qdrant") as timer:
+            if self.vector_index is not None:
+                hit_lists = [
+                    self.vector_index.search(embedding, top_k, flt)
+                    for embedding, flt in zip(embeddings, filters)
+                ]
+            else:
+                requests_ = []
+                for embedding, flt in zip(embeddings, filters):
+                    search_filter = self._build_filter(flt)
+                    if self.coarse_dim:
+                        # Same two-stage Matryoshka request as _query_dense_backend
+                        requests_.append(QueryRequest(
+                            prefetch=Prefetch(
+                                query=truncate_embedding(embedding, self.coarse_dim),
+                                using=COARSE_VECTOR_NAME,
+                                limit=top_k * MATRYOSHKA_OVERSAMPLE,
+                                filter=search_filter,
+                            ),
+                            query=embedding,
+                            using=FULL_VECTOR_NAME,
+                            limit=top_k,
+                            filter=search_filter,
+                            with_payload=True,
+                        ))
+                    else:
+                        requests_.append(QueryRequest(
+                            query=embedding,
+                            limit=top_k,
+                            filter=search_filter,
+                            with_payload=True,
+                        ))
+                responses = self.client.query_batch_points(
+                    collection_name=self.collection_name,
+                    requests=requests_,
                 )
-            search_filter = Filter(must=conditions)
+                hit_lists = [response.points for response in responses]
+            timer.count = sum(len(hits) for hits in hit_lists)
+        return [self._hits_to_results(hits) for hits in hit_lists]
+    
+    def _query_dense_backend(
+        self,
+        query_embedding: list[float],
+        top_k: int,
+        search_filter: Filter | None,
+        filter_conditions: dict[str, Any] | None,
+    ) -> list[Any]:
+        """Run the vector search against the configured backend; returns raw hits."""
+        # Embedded backend: exact cosine top-k, same payload filter semantics
+        if self.vector_index is not None:
+            return self.vector_index.search(query_embedding, top_k, filter_conditions)
         
         # Search Qdrant (using query_points API for qdrant-client 1.16+)
-        from qdrant_client.models import QueryRequest
-        
-        query_response = self.client.query_points(
-            collection_name=self.collection_name,
-            query=query_embedding,
-            limit=top_k,
-            query_filter=search_filter,
-            with_payload=True,
-        )
+        if self.coarse_dim:
+            # Two-stage Matryoshka search: the prefetch shortlists candidates
+            # on the truncated vector, the outer query rescores them with the
+            # full vector. Both stages run server-side in a single request.
+            query_response = self.client.query_points(
+                collection_name=self.collection_name,
+                prefetch=Prefetch(
+                    query=truncate_embedding(query_embedding, self.coarse_dim),
+                    using=COARSE_VECTOR_NAME,
+                    limit=top_k * MATRYOSHKA_OVERSAMPLE,
+                    filter=search_filter,
+                ),
+                query=query_embedding,
+                using=FULL_VECTOR_NAME,
+                limit=top_k,
+                query_filter=search_filter,
+                with_payload=True,
+            )
+        else:
+            query_response = self.client.query_points(
+                collection_name=self.collection_name,
+                query=query_embedding,
+                limit=top_k,
+                query_filter=search_filter,
+                with_payload=True,
+            )
         
-        # Convert to SearchResult
+        return query_response.points
+    
+    def _hits_to_results(self, hits: list[Any]) -> list[SearchResult]:
+        """Convert Qdrant ScoredPoints (or IndexHits) to SearchResults."""
         search_results = []
-        for hit in query_response.points:
+        for hit in hits:
             payload = hit.payload
             if payload is None:
                 continue
             search_results.append(SearchResult(
-                id=int(hit.id),
+                id=hit.id,
                 text=payload.get("text", ""),
                 citation=payload.get("citation", ""),
                 citation_id=payload.get("citation_id", ""),
@@ -988,6 +1328,91 @@ class HybridRetriever:
         
         return results
     
+    def _build_bm25_postings(self) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """
+        Per-term postings of precomputed BM25Okapi contributions.
+        
+        For term t and document d the contribution is exactly the
+        ``BM25Okapi.get_scores`` expression
+        ``idf(t) * tf*(k1+1) / (tf + k1*(1 - b + b*len(d)/avgdl))``,
+        evaluated once per (t, d) with tf > 0. Scoring a tokenized query is
+        then a sparse (query-term counts) x (term x document) product.
+        """
+        bm25 = self._bm25
+        doc_len = np.asarray(bm25.doc_len)
+        norm = bm25.k1 * (1 - bm25.b + bm25.b * doc_len / bm25.avgdl)
+        rows_by_term: dict[str, list[int]] = {}
+        tfs_by_term: dict[str, list[int]] = {}
+        for row, freqs in enumerate(bm25.doc_freqs):
+            for term, tf in freqs.items():
+                rows_by_term.setdefault(term, []).append(row)
+                tfs_by_term.setdefault(term, []).append(tf)
+        postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for term, rows in rows_by_term.items():
+            idf = bm25.idf.get(term) or 0
+            row_arr = np.asarray(rows, dtype=np.int64)
+            tf = np.asarray(tfs_by_term[term])
+            postings[term] = (row_arr, idf * (tf * (bm25.k1 + 1) / (tf + norm[row_arr])))
+        return postings
+    
+    def _sparse_search_many(
+        self,
+        queries: list[str],
+        top_k: int = 10,
+    ) -> list[list[SearchResult]]:
+        """
+        Batched :meth:`sparse_search` over the precomputed BM25 postings.
+        
+        Scores are accumulated in the same term order as
+        ``BM25Okapi.get_scores``, so rankings and scores match
+        ``sparse_search`` exactly, but each query touches only the postings
+        of its own terms instead of every document for every term.
+        
+        Args:
+            queries: Search queries in natural language
+            top_k: Number of results per query
+        
+        Returns:
+            One result list per query, sorted by BM25 score (descending)
+        """
+        if not self._bm25 or not self._corpus:
+            return [[] for _ in queries]
+        if not isinstance(getattr(self._bm25, "doc_freqs", None), list):
+            return [self.sparse_search(q, top_k=top_k) for q in queries]
+        postings = getattr(self, "_bm25_postings", None)
+        if postings is None:
+            postings = self._bm25_postings = self._build_bm25_postings()
+        corpus_size = len(self._bm25.doc_freqs)
+        
+        all_results: list[list[SearchResult]] = []
+        for query in queries:
+            query_tokens = tokenize_indonesian(query)
+            if not query_tokens:
+                all_results.append([])
+                continue
+            scores = np.zeros(corpus_size)
+            for token in query_tokens:
+                posting = postings.get(token)
+                if posting is not None:
+                    scores[posting[0]] += posting[1]
+            # Stable descending order keeps ties in corpus order, like sparse_search
+            top_indices = np.argsort(-scores, kind="stable")[:top_k]
+            results = []
+            for idx in top_indices:
+                score = scores[idx]
+                if score > 0:  # Only include non-zero scores
+                    doc = self._corpus[idx]
+                    results.append(SearchResult(
+                        id=doc["id"],
+                        text=doc["text"],
+                        citation=doc["citation"],
+                        citation_id=doc["citation_id"],
+                        score=score,
+                        metadata=doc["metadata"],
+                    ))
+            all_results.append(results)
+        return all_results
+    
     def _rrf_fusion(
         self,
         dense_results: list[SearchResult],
@@ -1060,25 +1485,7 @@ class HybridRetriever:
             elapsed_ms = (time.perf_counter() - start) * 1000
             logger.info(f"CrossEncoder reranked {len(pairs)} candidates in {elapsed_ms:.1f}ms")
             
-            # Create scored results and sort by cross-encoder score
-            scored_results = list(zip(results, scores))
-            scored_results.sort(key=lambda x: x[1], reverse=True)
-            
-            # Return top_k with updated scores
-            reranked = []
-            for result, ce_score in scored_results[:top_k]:
-                # Normalize cross-encoder score to 0-1 range
-                # mMiniLMv2 CE scores typically fall in [-5, +5] range
-                normalized_score = max(0.0, min(1.0, (ce_score + 5) / 10))
-                reranked.append(SearchResult(
-                    id=result.id,
-                    text=result.text,
-                    citation=result.citation,
-                    citation_id=result.citation_id,
-                    score=normalized_score,
-                    metadata=result.metadata,
-                ))
-            
+            reranked = self._apply_rerank_scores(results, list(scores), top_k)
             logger.debug(f"Re-ranked {len(results)} results to top {len(reranked)}")
             return reranked
             
@@ -1086,6 +1493,81 @@ class HybridRetriever:
             logger.warning(f"Re-ranking failed, returning original results: {e}")
             return results[:top_k]
     
+    @staticmethod
+    def _apply_rerank_scores(
+        results: list[SearchResult],
+        scores: list[float],
+        top_k: int,
+    ) -> list[SearchResult]:
+        """Sort results by cross-encoder score and keep top_k with normalized scores."""
+        # Create scored results and sort by cross-encoder score
+        scored_results = list(zip(results, scores))
+        scored_results.sort(key=lambda x: x[1], reverse=True)
+        
+        # Return top_k with updated scores
+        reranked = []
+        for result, ce_score in scored_results[:top_k]:
+            # Normalize cross-encoder score to 0-1 range
+            # mMiniLMv2 CE scores typically fall in [-5, +5] range
+            normalized_score = max(0.0, min(1.0, (ce_score + 5) / 10))
+            reranked.append(SearchResult(
+                id=result.id,
+                text=result.text,
+                citation=result.citation,
+                citation_id=result.citation_id,
+                score=normalized_score,
+                metadata=result.metadata,
+            ))
+        return reranked
+    
+    def _rerank_many(
+        self,
+        queries: list[str],
+        result_lists: list[list[SearchResult]],
+        top_k: int,
+    ) -> list[list[SearchResult]]:
+        """
+        Re-rank several candidate lists with a single CrossEncoder forward pass.
+        
+        Args:
+            queries: Original search queries
+            result_lists: Candidate lists, aligned with ``queries``
+            top_k: Number of results to keep per query
+        
+        Returns:
+            Re-ranked result lists, aligned with ``queries``
+        """
+        if not self.reranker:
+            return [results[:top_k] for results in result_lists]
+        
+        pairs = [
+            (query, result.text)
+            for query, results in zip(queries, result_lists)
+            for result in results
+        ]
+        if not pairs:
+            return [[] for _ in result_lists]
+        
+        try:
+            start = time.perf_counter()
+            scores = list(self.reranker.predict(pairs))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.info(
+                f"CrossEncoder reranked {len(pairs)} candidates for "
+                f"{len(queries)} queries in {elapsed_ms:.1f}ms"
+            )
+        except Exception as e:
+            logger.warning(f"Re-ranking failed, returning original results: {e}")
+            return [results[:top_k] for results in result_lists]
+        
+        reranked_lists = []
+        offset = 0
+        for results in result_lists:
+            query_scores = scores[offset:offset + len(results)]
+            offset += len(results)
+            reranked_lists.append(self._apply_rerank_scores(results, query_scores, top_k))
+        return reranked_lists
+    
     def _extract_regulation_ids(self, results: list[SearchResult]) -> set[str]:
         """Extract unique regulation IDs from search result payloads.
 
@@ -1110,7 +1592,8 @@ class HybridRetriever:
 
         Workflow:
         1. Extract regulation IDs from the top candidates.
-        2. Query the knowledge graph for 1-hop related regulations.
+        2. Look up their 1-hop related regulations in the graph's
+           precomputed, integer-coded adjacency sets (no BFS per query).
         3. For every candidate whose regulation appears in the related set,
            multiply its score by *boost_factor*.
 
@@ -1132,19 +1615,14 @@ class HybridRetriever:
         if not source_reg_ids:
             return candidates
 
-        # Step 2: Query KG for related regulations (1-hop for speed)
-        related_reg_ids: set[str] = set()
-        for reg_id in source_reg_ids:
-            try:
-                related = self.knowledge_graph.get_related_regulations(
-                    reg_id, max_hops=1, timeout_ms=200
-                )
-                for node in related:
-                    node_id = node.get("id", "")
-                    if node_id:
-                        related_reg_ids.add(node_id)
-            except Exception as e:
-                logger.debug(f"KG traversal failed for {reg_id}: {e}")
+        # Step 2: Union of precomputed 1-hop neighbourhoods (set lookups only)
+        try:
+            related_reg_ids = self.knowledge_graph.get_related_regulation_ids(
+                source_reg_ids, max_hops=1
+            )
+        except Exception as e:
+            logger.debug(f"KG adjacency lookup failed: {e}")
+            return candidates
 
         if not related_reg_ids:
             return candidates
@@ -1298,6 +1776,62 @@ class HybridRetriever:
         Returns:
             List of SearchResult objects with RRF-fused (and optionally re-ranked) scores
         """
+        dense_top_k, sparse_top_k = self._pool_sizes(top_k, dense_top_k, sparse_top_k, use_reranking)
+        
+        with self.metrics.stage("total"):
+            queries, filter_conditions, auto_detected_filter = self._prepare_queries(
+                query, filter_conditions, expand_queries
+            )
+            
+            # Collect results from all query variants
+            all_dense_results: list[SearchResult] = []
+            all_sparse_results: list[SearchResult] = []
+            
+            for q in queries:
+                dense_results = self.dense_search(
+                    q, top_k=dense_top_k, filter_conditions=filter_conditions
+                )
+                with self.metrics.stage("bm25") as timer:
+                    sparse_results = self.sparse_search(q, top_k=sparse_top_k)
+                    timer.count = len(sparse_results)
+                all_dense_results.extend(dense_results)
+                all_sparse_results.extend(sparse_results)
+            
+            # --- Filter fallback ---
+            # If the auto-detected filter produced zero dense results, retry
+            # without the filter so the user still gets semantic search results.
+            if auto_detected_filter and not all_dense_results:
+                logger.info(
+                    "Auto-detected filter returned 0 dense results; "
+                    "falling back to unfiltered search."
+                )
+                all_dense_results = []
+                for q in queries:
+                    dense_results = self.dense_search(
+                        q, top_k=dense_top_k, filter_conditions=None
+                    )
+                    all_dense_results.extend(dense_results)
+            
+            candidates = self._fuse_and_boost(
+                query, all_dense_results, all_sparse_results, top_k, min_score
+            )
+            
+            if use_reranking and self.reranker:
+                with self.metrics.stage("rerank") as timer:
+                    timer.count = len(candidates)
+                    return self._rerank(query, candidates, top_k)
+            
+            # Return top_k without re-ranking
+            return candidates[:top_k]
+    
+    def _pool_sizes(
+        self,
+        top_k: int,
+        dense_top_k: int | None,
+        sparse_top_k: int | None,
+        use_reranking: bool,
+    ) -> tuple[int, int]:
+        """Default dense/sparse retrieval counts for a final ``top_k``."""
         # Default retrieval counts - fetch more if reranking
         # Without a reranker, use a larger candidate pool to improve RRF recall
         if use_reranking and self.reranker:
@@ -1310,56 +1844,53 @@ class HybridRetriever:
             dense_top_k = top_k * rerank_multiplier
         if sparse_top_k is None:
             sparse_top_k = top_k * rerank_multiplier
+        return dense_top_k, sparse_top_k
+    
+    def _prepare_queries(
+        self,
+        query: str,
+        filter_conditions: dict[str, Any] | None,
+        expand_queries: bool,
+    ) -> tuple[list[str], dict[str, Any] | None, dict[str, Any] | None]:
+        """
+        Legal-reference auto-filter and query expansion for one query.
         
-        # --- Legal reference auto-detection ---
-        # When no explicit filter_conditions are provided, attempt to detect
-        # structured references (e.g. "Pasal 5 UU 11/2020") and build a
-        # targeted Qdrant filter.  The filter is used optimistically: if it
-        # yields zero dense results we fall back to unfiltered search.
-        auto_detected_filter: dict[str, Any] | None = None
-        if filter_conditions is None:
-            auto_detected_filter = self.detect_legal_references(query)
-            if auto_detected_filter:
-                filter_conditions = auto_detected_filter
-                logger.debug(
-                    "Auto-detected legal reference filter: %s", filter_conditions
-                )
-        
-        # Get query variants
-        if expand_queries:
-            queries = self.expand_query(query)
-            logger.debug(f"Expanded query into {len(queries)} variants: {queries}")
-        else:
-            queries = [query]
-        
-        # Collect results from all query variants
-        all_dense_results: list[SearchResult] = []
-        all_sparse_results: list[SearchResult] = []
-        
-        for q in queries:
-            dense_results = self.dense_search(
-                q, top_k=dense_top_k, filter_conditions=filter_conditions
-            )
-            sparse_results = self.sparse_search(q, top_k=sparse_top_k)
-            all_dense_results.extend(dense_results)
-            all_sparse_results.extend(sparse_results)
-        
-        # --- Filter fallback ---
-        # If the auto-detected filter produced zero dense results, retry
-        # without the filter so the user still gets semantic search results.
-        if auto_detected_filter and not all_dense_results:
-            logger.info(
-                "Auto-detected filter returned 0 dense results; "
-                "falling back to unfiltered search."
-            )
-            filter_conditions = None
-            all_dense_results = []
-            for q in queries:
-                dense_results = self.dense_search(
-                    q, top_k=dense_top_k, filter_conditions=None
-                )
-                all_dense_results.extend(dense_results)
-        
+        Returns:
+            (query variants, effective filter, auto-detected filter or None)
+        """
+        with self.metrics.stage("expansion") as timer:
+            # --- Legal reference auto-detection ---
+            # When no explicit filter_conditions are provided, attempt to detect
+            # structured references (e.g. "Pasal 5 UU 11/2020") and build a
+            # targeted Qdrant filter.  The filter is used optimistically: if it
+            # yields zero dense results we fall back to unfiltered search.
+            auto_detected_filter: dict[str, Any] | None = None
+            if filter_conditions is None:
+                auto_detected_filter = self.detect_legal_references(query)
+                if auto_detected_filter:
+                    filter_conditions = auto_detected_filter
+                    logger.debug(
+                        "Auto-detected legal reference filter: %s", filter_conditions
+                    )
+            
+            # Get query variants
+            if expand_queries:
+                queries = self.expand_query(query)
+                logger.debug(f"Expanded query into {len(queries)} variants: {queries}")
+            else:
+                queries = [query]
+            timer.count = len(queries)
+        return queries, filter_conditions, auto_detected_filter
+    
+    def _fuse_and_boost(
+        self,
+        query: str,
+        all_dense_results: list[SearchResult],
+        all_sparse_results: list[SearchResult],
+        top_k: int,
+        min_score: float | None,
+    ) -> list[SearchResult]:
+        """Dedup, RRF-fuse, KG/authority boost and min_score filter (pre-rerank candidates)."""
         # Deduplicate by ID, keeping highest score per source
         def dedup(results: list[SearchResult]) -> list[SearchResult]:
             best: dict[int, SearchResult] = {}
@@ -1368,11 +1899,13 @@ class HybridRetriever:
                     best[r.id] = r
             return sorted(best.values(), key=lambda x: x.score, reverse=True)
         
-        dense_deduped = dedup(all_dense_results)
-        sparse_deduped = dedup(all_sparse_results)
-        
-        # Fuse with RRF
-        fused = self._rrf_fusion(dense_deduped, sparse_deduped)
+        with self.metrics.stage("rrf") as timer:
+            dense_deduped = dedup(all_dense_results)
+            sparse_deduped = dedup(all_sparse_results)
+            
+            # Fuse with RRF
+            fused = self._rrf_fusion(dense_deduped, sparse_deduped)
+            timer.count = len(fused)
         
         # Get candidates for potential re-ranking
         candidates = []
@@ -1387,26 +1920,121 @@ class HybridRetriever:
             ))
         
         # Apply KG-aware boosting (before reranking so reranker sees adjusted order)
-        candidates = self._boost_with_kg(candidates)
+        with self.metrics.stage("kg"):
+            candidates = self._boost_with_kg(candidates)
 
         # Apply document authority boosting (UU > PP > Perpres > Permen > Perda)
-        candidates = self._boost_with_authority(candidates)
+        with self.metrics.stage("authority"):
+            candidates = self._boost_with_authority(candidates)
 
         # Hard-prioritize national docs for national-law queries (when no reranker)
         if not self.reranker and self._is_national_law_query(query):
             candidates = self._prioritize_national_docs(candidates, top_k)
         
-        # Apply CrossEncoder re-ranking if enabled (always re-rank against original query)
         # Apply minimum score filtering if specified
         if min_score is not None:
             candidates = [r for r in candidates if r.score >= min_score]
             logger.debug(f"Filtered to {len(candidates)} results with min_score={min_score}")
         
-        if use_reranking and self.reranker:
-            return self._rerank(query, candidates, top_k)
+        return candidates
+    
+    def hybrid_search_many(
+        self,
+        queries: list[str],
+        top_k: int = 5,
+        dense_top_k: int | None = None,
+        sparse_top_k: int | None = None,
+        filter_conditions: dict[str, Any] | None = None,
+        use_reranking: bool = True,
+        expand_queries: bool = True,
+        min_score: float | None = None,
+    ) -> list[list[SearchResult]]:
+        """
+        Batched :meth:`hybrid_search` for multi-query workloads.
+        
+        Per-query results are the same as calling ``hybrid_search`` for each
+        query in turn, but the expensive stages are shared:
+        
+        - all query variants are embedded in one embedding request,
+        - dense search is one Qdrant ``query_batch_points`` call,
+        - BM25 scores for every variant come from one query-term x
+          document postings product (see :meth:`_sparse_search_many`),
+        - all (query, candidate) pairs are reranked in one CrossEncoder pass.
+        
+        Args:
+            queries: Search queries in natural language
+            top_k: Number of final results per query
+            dense_top_k: Dense results per variant (default: multiplier * top_k)
+            sparse_top_k: Sparse results per variant (default: multiplier * top_k)
+            filter_conditions: Optional filter applied to every query.  When
+                ``None``, legal reference auto-detection runs per query.
+            use_reranking: Whether to apply CrossEncoder re-ranking
+            expand_queries: Whether to expand queries with synonyms
+            min_score: Minimum score threshold to filter results
+        
+        Returns:
+            One result list per input query, in input order
+        """
+        if not queries:
+            return []
+        dense_top_k, sparse_top_k = self._pool_sizes(top_k, dense_top_k, sparse_top_k, use_reranking)
         
-        # Return top_k without re-ranking
-        return candidates[:top_k]
+        with self.metrics.stage("total"):
+            prepared = [
+                self._prepare_queries(q, filter_conditions, expand_queries) for q in queries
+            ]
+            
+            # Flatten (query index, variant, filter) for the batched stages
+            flat: list[tuple[int, str, dict[str, Any] | None]] = [
+                (qi, variant, flt)
+                for qi, (variants, flt, _) in enumerate(prepared)
+                for variant in variants
+            ]
+            dense_lists = self.dense_search_many(
+                [variant for _, variant, _ in flat],
+                top_k=dense_top_k,
+                filter_conditions=[flt for _, _, flt in flat],
+            )
+            with self.metrics.stage("bm25") as timer:
+                sparse_lists = self._sparse_search_many([variant for _, variant, _ in flat], sparse_top_k)
+                timer.count = sum(len(r) for r in sparse_lists)
+            
+            all_dense: list[list[SearchResult]] = [[] for _ in queries]
+            all_sparse: list[list[SearchResult]] = [[] for _ in queries]
+            for (qi, _, _), dense_results, sparse_results in zip(flat, dense_lists, sparse_lists):
+                all_dense[qi].extend(dense_results)
+                all_sparse[qi].extend(sparse_results)
+            
+            # --- Filter fallback (batched) for auto-filtered queries with no dense hits ---
+            fallback = [
+                qi for qi, (_, _, auto_filter) in enumerate(prepared)
+                if auto_filter and not all_dense[qi]
+            ]
+            if fallback:
+                logger.info(
+                    f"Auto-detected filter returned 0 dense results for {len(fallback)} "
+                    "queries; falling back to unfiltered search."
+                )
+                retry = [(qi, variant) for qi in fallback for variant in prepared[qi][0]]
+                retry_lists = self.dense_search_many(
+                    [variant for _, variant in retry], top_k=dense_top_k
+                )
+                for qi in fallback:
+                    all_dense[qi] = []
+                for (qi, _), dense_results in zip(retry, retry_lists):
+                    all_dense[qi].extend(dense_results)
+            
+            candidate_lists = [
+                self._fuse_and_boost(q, all_dense[qi], all_sparse[qi], top_k, min_score)
+                for qi, q in enumerate(queries)
+            ]
+            
+            if use_reranking and self.reranker:
+                with self.metrics.stage("rerank") as timer:
+                    timer.count = sum(len(c) for c in candidate_lists)
+                    return self._rerank_many(queries, candidate_lists, top_k)
+            
+            return [candidates[:top_k] for candidates in candidate_lists]
     
     def search_by_document_type(
         self,
@@ -1433,10 +2061,14 @@ class HybridRetriever:
     
     def get_stats(self) -> dict[str, Any]:
         """Get retriever statistics."""
-        collection_info = self.client.get_collection(self.collection_name)
+        if self.vector_index is not None:
+            total_documents = len(self.vector_index)
+        else:
+            total_documents = self.client.get_collection(self.collection_name).points_count
         return {
             "collection_name": self.collection_name,
-            "total_documents": collection_info.points_count,
+            "vector_backend": self.vector_backend,
+            "total_documents": total_documents,
             "corpus_loaded": len(self._corpus),
             "bm25_initialized": self._bm25 is not None,
             "embedding_model": EMBEDDING_MODEL,
@@ -1446,23 +2078,17 @@ class HybridRetriever:
     def get_chunk_counts_by_regulation(self) -> dict[str, int]:
         """Count Qdrant chunks grouped by citation_id prefix.
 
-        Uses the already-loaded corpus (self._corpus) to aggregate counts.
+        Reads the precomputed regulation index (O(#regulations), no corpus scan).
         Returns: {"uu_11_2020": 145, "pp_35_2021": 67, ...}
-        Falls back to empty dict on any error.
         """
-        try:
-            counts: dict[str, int] = {}
-            for doc in self._corpus:
-                cid = doc.get("citation_id", "")
-                if cid:
-                    # Normalize: lowercase, strip to base regulation ID
-                    # citation_id may be "uu_11_2020" or "uu_11_2020_pasal_5"
-                    parts = cid.lower().split("_pasal_")
-                    base_id = parts[0]
-                    counts[base_id] = counts.get(base_id, 0) + 1
-            return counts
-        except Exception:
-            return {}
+        return {key: stats.chunk_count for key, stats in self._regulation_stats.items()}
+
+    def get_regulation_stats(self) -> dict[str, RegulationStats]:
+        """Precomputed per-regulation aggregates (chunks, characters, Pasal coverage).
+
+        Returns: {"uu_11_2020": RegulationStats(...), ...} — read-only view.
+        """
+        return self._regulation_stats
 
 
 # Convenience function for quick access
@@ -0,0 +1,90 @@
+"""
+Export a Qdrant collection to an embedded NumPy vector index.
+
+Scrolls every point (vector + payload) out of Qdrant and writes the
+directory layout read by ``backend.vector_index.NumpyVectorIndex``. Point
+the retriever at it with ``VECTOR_BACKEND=numpy`` and ``NUMPY_INDEX_PATH``
+to serve dense search without a running Qdrant server.
+
+Usage:
+    python -m backend.scripts.export_vector_index
+    python -m backend.scripts.export_vector_index --dtype float32
+    python -m backend.scripts.export_vector_index --output backend/data/vector_index
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from qdrant_client import QdrantClient
+
+from backend.vector_index import SUPPORTED_DTYPES, NumpyVectorIndex
+
+load_dotenv()
+
+DEFAULT_COLLECTION = "indonesian_legal_docs"
+DEFAULT_OUTPUT = Path("backend/data/vector_index")
+
+
+def main() -> None:
+    """CLI entry-point for exporting a Qdrant collection to a NumPy index."""
+    parser = argparse.ArgumentParser(
+        description="Export Qdrant collection to an embedded NumPy vector index",
+    )
+    parser.add_argument(
+        "--qdrant-url",
+        default=os.getenv("QDRANT_URL", "http://localhost:6333"),
+        help="Qdrant server URL",
+    )
+    parser.add_argument(
+        "--collection",
+        default=DEFAULT_COLLECTION,
+        help=f"Collection name (default: {DEFAULT_COLLECTION})",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_OUTPUT,
+        help=f"Output directory (default: {DEFAULT_OUTPUT})",
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=SUPPORTED_DTYPES,
+        default="float16",
+        help="Storage dtype for the vector matrix (default: float16)",
+    )
+    parser.add_argument(
+        "--vector-name",
+        default=None,
+        help="Named vector to export (default: unnamed, or 'full' for Matryoshka collections)",
+    )
+    args = parser.parse_args()
+
+    api_key = os.getenv("QDRANT_API_KEY")
+    if api_key:
+        client = QdrantClient(url=args.qdrant_url, api_key=api_key, timeout=60)
+    else:
+        client = QdrantClient(url=args.qdrant_url, timeout=60)
+
+    print(f"Exporting collection '{args.collection}' from {args.qdrant_url}")
+    t0 = time.perf_counter()
+    index = NumpyVectorIndex.from_qdrant(
+        client,
+        args.collection,
+        vector_name=args.vector_name,
+        dtype=args.dtype,
+    )
+    index.save(args.output)
+    elapsed = time.perf_counter() - t0
+
+    size_mb = (args.output / "vectors.npy").stat().st_size / (1024 * 1024)
+    print(f"\nDone. {len(index)} vectors exported in {elapsed:.1f}s")
+    print(f"  Directory: {args.output} (vectors: {size_mb:.1f} MB, dtype={args.dtype})")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,14 +14,18 @@ import logging
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue, FilterSelector
-
-from backend.scripts.ingest_markdown import MarkdownIngestionPipeline
 from backend.scripts.detect_changes import ChangeDetector, ChangeSet
 
+# qdrant_client and the ingestion stack (networkx, yaml, ...) take about a second
+# to import; they load when a pipeline is built, so ``--help`` and tooling
+# that only imports this module stay fast.
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+
+    from backend.scripts.ingest_markdown import MarkdownIngestionPipeline
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,7 +77,10 @@ class IncrementalSyncPipeline:
 
     Orchestrates :class:`ChangeDetector` for delta detection and
     :class:`MarkdownIngestionPipeline` for parsing/chunking, then manages
-    Qdrant point deletions for modified and removed files.
+    Qdrant point deletions for modified and removed files. When given the
+    in-process ``HybridRetriever`` serving the collection, its BM25 corpus
+    and per-regulation aggregates are updated in place instead of being
+    reloaded from Qdrant.
     """
 
     def __init__(
@@ -83,18 +90,24 @@ class IncrementalSyncPipeline:
         repo_dir: Path,
         state_file: Path,
         jina_api_key: str | None = None,
+        retriever: Any = None,
     ) -> None:
+        from qdrant_client import QdrantClient
+
+        from backend.scripts.ingest_markdown import MarkdownIngestionPipeline
+
         self.collection_name = collection_name
         self.repo_dir = repo_dir
+        self.retriever = retriever
 
-        self.pipeline = MarkdownIngestionPipeline(
+        self.pipeline: MarkdownIngestionPipeline = MarkdownIngestionPipeline(
             qdrant_url=qdrant_url,
             collection_name=collection_name,
             jina_api_key=jina_api_key,
             repo_dir=repo_dir,
         )
         self.detector = ChangeDetector(repo_dir, state_file)
-        self.qdrant_client = QdrantClient(url=qdrant_url)
+        self.qdrant_client: QdrantClient = QdrantClient(url=qdrant_url)
 
     # ── Public API ───────────────────────────────────────────────────────
 
@@ -163,8 +176,13 @@ class IncrementalSyncPipeline:
 
         # ── Embed and upsert ─────────────────────────────────────────
         if all_chunks:
-            self.pipeline._embed_and_upsert(all_chunks, batch_size=100)
+            points = self.pipeline._embed_and_upsert(all_chunks, batch_size=100)
             result.chunks_created = len(all_chunks)
+            if self.retriever is not None:
+                self.retriever.add_corpus_documents([
+                    self.retriever.corpus_document(point_id, payload)
+                    for point_id, payload in points
+                ])
 
         # ── Save state ───────────────────────────────────────────────
         self.detector.save_state(
@@ -185,23 +203,46 @@ class IncrementalSyncPipeline:
     def _delete_points_for_file(self, filepath: str) -> int:
         """Delete all Qdrant points whose ``filepath`` field matches.
 
-        Returns a count placeholder (Qdrant delete is fire-and-forget).
+        With a retriever attached, the same points are dropped from its
+        corpus and their count is returned; otherwise returns 0 (Qdrant
+        delete does not report a count).
         """
+        from qdrant_client.models import Filter, FieldCondition, MatchValue, FilterSelector
+
+        file_filter = Filter(
+            must=[
+                FieldCondition(
+                    key="filepath",
+                    match=MatchValue(value=filepath),
+                )
+            ]
+        )
+        point_ids = self._point_ids(file_filter) if self.retriever is not None else set()
         self.qdrant_client.delete(
             collection_name=self.collection_name,
-            points_selector=FilterSelector(
-                filter=Filter(
-                    must=[
-                        FieldCondition(
-                            key="filepath",
-                            match=MatchValue(value=filepath),
-                        )
-                    ]
-                )
-            ),
+            points_selector=FilterSelector(filter=file_filter),
         )
         logger.info("Deleted points for filepath=%s", filepath)
-        return 0  # Qdrant delete doesn't return count
+        if point_ids:
+            self.retriever.remove_corpus_documents(point_ids)
+        return len(point_ids)
+
+    def _point_ids(self, scroll_filter: Any) -> set[int | str]:
+        """Ids of every point matching ``scroll_filter``."""
+        point_ids: set[int | str] = set()
+        offset = None
+        while True:
+            points, offset = self.qdrant_client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=1000,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            point_ids.update(point.id for point in points)
+            if offset is None:
+                return point_ids
 
 
 # ── CLI Entry Point ──────────────────────────────────────────────────────────
@@ -26,6 +26,14 @@ from qdrant_client.models import Distance, VectorParams, PointStruct
 from langchain_huggingface import HuggingFaceEmbeddings
 from tqdm import tqdm
 
+try:
+    from backend.matryoshka import COARSE_VECTOR_NAME, FULL_VECTOR_NAME, MATRYOSHKA_COARSE_DIM, point_vector
+    from backend.parent_store import PARENT_STORE_PATH, ParentStore
+except ImportError:  # run as `cd backend && python scripts/ingest.py`
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from matryoshka import COARSE_VECTOR_NAME, FULL_VECTOR_NAME, MATRYOSHKA_COARSE_DIM, point_vector
+    from parent_store import PARENT_STORE_PATH, ParentStore
+
 # Future integration hook — adapters from format_converter.py are
 # available for use when external data sources are integrated (Phase 2).
 # from backend.scripts.format_converter import RegulationChunk, ManualAdapter
@@ -389,7 +397,26 @@ def chunk_text(
     return chunks
 
 
-def create_document_chunks(documents: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def parent_citation_id(metadata: dict[str, Any], unit_citation_id: str) -> str:
+    """
+    Parent ID for a chunk: its whole Pasal (all ayat), or the unit itself.
+
+    Penjelasan entries get their own parent so explanations are never
+    merged into the normative text of the same Pasal.
+    """
+    if metadata.get("pasal"):
+        parent_id = generate_citation_id({k: v for k, v in metadata.items() if k != "ayat"})
+    else:
+        parent_id = unit_citation_id
+    if metadata.get("is_penjelasan"):
+        parent_id += "_Penjelasan"
+    return parent_id
+
+
+def create_document_chunks(
+    documents: list[dict[str, Any]],
+    parent_texts: dict[str, str] | None = None,
+) -> list[dict[str, Any]]:
     """
     Create chunks from legal documents with metadata for citations.
 
@@ -413,6 +440,12 @@ def create_document_chunks(documents: list[dict[str, Any]]) -> list[dict[str, An
     - ``parent_ayat``: Ayat number (or empty string)
     - ``is_penjelasan``: boolean — True if chunk is from an
       explanation (Penjelasan) section
+
+    **Parent-child**: when ``parent_texts`` is given, every chunk also gets
+    ``parent_citation_id`` (see :func:`parent_citation_id`) and
+    ``parent_texts`` is filled in the same pass with the full parent text
+    (the unit texts of that Pasal, in input order), ready for
+    ``ParentStore.write``.
     """
     chunks = []
 
@@ -458,6 +491,12 @@ def create_document_chunks(documents: list[dict[str, Any]]) -> list[dict[str, An
         base_citation_id = generate_citation_id(metadata)
         base_citation = format_citation(metadata)
 
+        if parent_texts is not None:
+            parent_id = parent_citation_id(metadata, base_citation_id)
+            metadata["parent_citation_id"] = parent_id
+            previous = parent_texts.get(parent_id)
+            parent_texts[parent_id] = f"{previous}\n{text}" if previous else text
+
         # --- Phase 2 §3.2 + Phase 4: Pasal-based + structure-aware chunking ---
         # Each document entry is already a legal unit (Pasal/Ayat).
         # Only split if the text exceeds MAX_CHUNK_SIZE.
@@ -510,6 +549,10 @@ def get_collection_config() -> dict[str, Any]:
     - Jina jina-embeddings-v3: 1024 dimensions (default)
     - NVIDIA NV-Embed-QA: 1024 dimensions
     - HuggingFace MiniLM: 384 dimensions
+
+    When ``MATRYOSHKA_COARSE_DIM`` is set (and smaller than the full
+    dimension), ``coarse_size`` is included and the collection is created
+    with named ``full``/``coarse`` vectors for two-stage search.
     """
     if USE_JINA_EMBEDDINGS:
         dim = JINA_EMBEDDING_DIM
@@ -517,12 +560,13 @@ def get_collection_config() -> dict[str, Any]:
         dim = NVIDIA_EMBEDDING_DIM
     else:
         dim = EMBEDDING_DIM
-    return {
-        "vectors_config": {
-            "size": dim,
-            "distance": "Cosine",
-        }
+    vectors_config: dict[str, Any] = {
+        "size": dim,
+        "distance": "Cosine",
     }
+    if 0 < MATRYOSHKA_COARSE_DIM < dim:
+        vectors_config["coarse_size"] = MATRYOSHKA_COARSE_DIM
+    return {"vectors_config": vectors_config}
 
 
 def create_point_struct(
@@ -530,6 +574,7 @@ def create_point_struct(
     chunk: dict[str, Any],
     embedding: list[float],
     source: str = "manual",
+    coarse_dim: int = 0,
 ) -> PointStruct:
     """
     Create a Qdrant PointStruct from a chunk and its embedding.
@@ -541,6 +586,9 @@ def create_point_struct(
         embedding: Dense vector for the chunk text.
         source: Provenance tag (e.g. ``"manual"``,
             ``"huggingface_azzindani"``, ``"otf_peraturan"``).
+        coarse_dim: When > 0, store named ``full`` and ``coarse`` vectors
+            (the latter truncated to ``coarse_dim``) instead of a single
+            unnamed vector.
 
     Returns:
         A :class:`PointStruct` ready for upsert into Qdrant.
@@ -558,7 +606,7 @@ def create_point_struct(
     
     return PointStruct(
         id=point_id,
-        vector=embedding,
+        vector=point_vector(embedding, coarse_dim),
         payload=payload
     )
 
@@ -675,10 +723,18 @@ def ensure_collection_exists(
         force_reindex: If ``True``, drop and recreate.
     """
     config = get_collection_config()
-    vectors = VectorParams(
+    vectors: Any = VectorParams(
         size=config["vectors_config"]["size"],
         distance=Distance.COSINE,
     )
+    coarse_size = config["vectors_config"].get("coarse_size")
+    if coarse_size:
+        # Named vectors for two-stage Matryoshka search. Switching an
+        # existing single-vector collection requires --force-reindex.
+        vectors = {
+            FULL_VECTOR_NAME: vectors,
+            COARSE_VECTOR_NAME: VectorParams(size=coarse_size, distance=Distance.COSINE),
+        }
 
     if force_reindex:
         client.recreate_collection(
@@ -706,12 +762,13 @@ def ingest_documents(
     batch_size: int = 100,
     source: str = "manual",
     force_reindex: bool = False,
+    parent_store_path: str | None = PARENT_STORE_PATH,
 ) -> dict[str, Any]:
     """
     Main ingestion pipeline with incremental deduplication.
     
     1. Load documents from JSON
-    2. Create chunks with metadata
+    2. Create chunks with metadata (and parent texts → parent store)
     3. Ensure collection exists (non-destructive unless force_reindex)
     4. Deduplicate against existing data
     5. Generate embeddings using HuggingFace (batched with progress)
@@ -727,6 +784,9 @@ def ingest_documents(
             ``"huggingface_azzindani"``, ``"otf_peraturan"``).
         force_reindex: When ``True``, recreate the collection from
             scratch (deletes all existing data).
+        parent_store_path: Directory of the on-disk parent store for
+            parent-child retrieval (``None`` skips writing it). Appended
+            to incrementally; rewritten on ``force_reindex``.
     
     Returns:
         Status dict with ingestion and deduplication results.
@@ -769,9 +829,17 @@ def ingest_documents(
     
     print(f"Loaded {len(documents)} documents from {json_path}")
     
-    # Create chunks
-    chunks = create_document_chunks(documents)
-    print(f"Created {len(chunks)} chunks")
+    # Create chunks (parent texts are collected in the same pass)
+    parent_texts: dict[str, str] = {}
+    chunks = create_document_chunks(documents, parent_texts=parent_texts)
+    print(f"Created {len(chunks)} chunks ({len(parent_texts)} parents)")
+    
+    parents_written = 0
+    if parent_store_path and parent_texts:
+        parents_written = ParentStore.write(
+            parent_store_path, parent_texts, append=not force_reindex
+        )
+        print(f"Parent store: {parents_written} parents written to {parent_store_path}")
     
     # Ensure collection exists (non-destructive by default)
     ensure_collection_exists(client, collection_name, force_reindex)
@@ -797,6 +865,7 @@ def ingest_documents(
             "chunks_created": len(chunks),
             "chunks_new": 0,
             "chunks_skipped": len(chunks),
+            "parents_written": parents_written,
             "collection_name": collection_name,
         }
     
@@ -844,8 +913,9 @@ def ingest_documents(
             start_id = 0
     
     # Create points with source tracking
+    coarse_dim = get_collection_config()["vectors_config"].get("coarse_size", 0)
     points = [
-        create_point_struct(start_id + i, chunk, embedding, source=source)
+        create_point_struct(start_id + i, chunk, embedding, source=source, coarse_dim=coarse_dim)
         for i, (chunk, embedding) in enumerate(zip(new_chunks, embeddings))
     ]
     
@@ -865,6 +935,7 @@ def ingest_documents(
         "chunks_created": len(chunks),
         "chunks_new": len(new_chunks),
         "chunks_skipped": len(chunks) - len(new_chunks),
+        "parents_written": parents_written,
         "collection_name": collection_name,
     }
 
@@ -907,6 +978,11 @@ def main():
         default=100,
         help="Number of texts to embed per batch (default: 100)"
     )
+    parser.add_argument(
+        "--parent-store",
+        default=PARENT_STORE_PATH,
+        help=f"Parent store directory for parent-child retrieval (default: {PARENT_STORE_PATH})"
+    )
     parser.add_argument(
         "--yes",
         action="store_true",
@@ -934,6 +1010,7 @@ def main():
         batch_size=args.batch_size,
         source=args.source,
         force_reindex=args.force_reindex,
+        parent_store_path=args.parent_store,
     )
     
     print("\n=== Ingestion Complete ===")
@@ -40,12 +40,12 @@ from backend.scripts.markdown_parser import (
     compute_content_hash,
 )
 from backend.cross_reference import extract_legal_references, LegalReference
+from backend.matryoshka import collection_coarse_dim, point_vector
 from backend.amendment_detector import (
     AmendmentDetector,
     AmendmentRelation,
     AmendmentType,
 )
-from backend.knowledge_graph.graph import LegalKnowledgeGraph
 from backend.knowledge_graph.schema import EdgeType
 
 logger = logging.getLogger(__name__)
@@ -433,6 +433,9 @@ class MarkdownIngestionPipeline:
 
         self.parser = MarkdownParser()
         self.amendment_detector = AmendmentDetector()
+        # networkx is only needed once a pipeline is built, not to import the CLI
+        from backend.knowledge_graph.graph import LegalKnowledgeGraph
+
         self.kg = LegalKnowledgeGraph()
         self.dedup = ContentDeduplicator()
         self.stats = IngestionStats()
@@ -739,10 +742,19 @@ class MarkdownIngestionPipeline:
 
     # ── Embedding & Upsert ───────────────────────────────────────────────
 
-    def _embed_and_upsert(self, chunks: list[ChunkData], batch_size: int) -> None:
-        """Embed chunk texts and upsert to Qdrant in batches."""
+    def _embed_and_upsert(
+        self, chunks: list[ChunkData], batch_size: int
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Embed chunk texts and upsert to Qdrant in batches.
+
+        Returns:
+            ``(point_id, payload)`` of every upserted point.
+        """
         embedder = self._get_embedder()
         texts = [c.text for c in chunks]
+        # Follow the collection's layout: named full/coarse vectors if it has them.
+        coarse_dim = collection_coarse_dim(self.qdrant_client, self.collection_name)
+        upserted: list[tuple[str, dict[str, Any]]] = []
 
         for i in range(0, len(texts), batch_size):
             batch_texts = texts[i : i + batch_size]
@@ -762,7 +774,7 @@ class MarkdownIngestionPipeline:
             points = [
                 PointStruct(
                     id=str(uuid.uuid4()),
-                    vector=emb,
+                    vector=point_vector(emb, coarse_dim),
                     payload=chunk.to_payload(),
                 )
                 for chunk, emb in zip(batch_chunks, embeddings)
@@ -774,6 +786,7 @@ class MarkdownIngestionPipeline:
                 wait=False,
             )
             self.stats.uploaded += len(points)
+            upserted.extend((point.id, point.payload) for point in points)
             logger.info(
                 "Upserted batch of %d points (total: %d)",
                 len(points),
@@ -784,6 +797,8 @@ class MarkdownIngestionPipeline:
             if i + batch_size < len(texts):
                 time.sleep(1)
 
+        return upserted
+
     def _get_embedder(self) -> Any:
         """Lazy-initialize the embedder (Jina v3 preferred, HuggingFace fallback)."""
         if self._embedder is not None:
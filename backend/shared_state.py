@@ -0,0 +1,619 @@
+"""
+Pluggable state shared by every worker process on a node.
+
+Chat sessions, the accuracy-metrics ring buffer and rate-limit counters
+used to live in per-process dicts. Run uvicorn with ``--workers 4`` and a
+follow-up lands on a worker that never saw the session, the accuracy
+dashboard shows one worker's slice, and every per-IP limit is effectively
+multiplied by four. ``StateBackend`` is the small set of primitives those
+three need — expiring key/values with atomic read-modify-write, capped
+lists, windowed counters and scored sets ranked by the backend (session
+activity, so evicting the oldest never scans every session) — behind a
+URL-selected implementation:
+
+- ``memory://`` (default): process-local, today's single-worker behaviour.
+- ``sqlite:///path/to/state.sqlite3``: one SQLite file in WAL mode shared
+  by all workers on the box; readers never block the writer and each write
+  is a short transaction.
+
+Intuition:
+    Workers on one node already share a filesystem, so an embedded WAL
+    database gives cross-process consistency without a new service. The
+    callers only see ``StateBackend``; a network store (Redis, ...) for
+    multi-node deployments slots in by implementing it and registering its
+    URL scheme with :func:`register_backend`. Rate limits go through the
+    ``limits`` library's own storage registry (:class:`SQLiteLimitStorage`
+    adds ``sqlite://``; ``redis://`` is built in), so the same URL works
+    for the limiter.
+
+Example:
+    >>> state = create_state_backend("sqlite:///data/shared_state.sqlite3")
+    >>> state.set("sessions", sid, payload, ttl=1800)
+    >>> state.append("accuracy", "recent", json.dumps(metric), max_len=100)
+    >>> state.incr("ratelimit", "1.2.3.4/ask", ttl=60)
+    1
+    >>> Limiter(key_func=get_remote_address, storage_uri=SHARED_STATE_URL)
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from limits.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+# Where shared state lives: memory:// (per process) or sqlite:///<path> (all workers on a node)
+SHARED_STATE_URL = os.getenv("SHARED_STATE_URL", "memory://")
+# Milliseconds a worker waits for another worker's SQLite write lock
+SHARED_STATE_BUSY_TIMEOUT_MS = int(os.getenv("SHARED_STATE_BUSY_TIMEOUT_MS", "5000"))
+
+
+class StateBackend(ABC):
+    """
+    Namespaced state primitives shared by the workers using one backend.
+
+    Values are strings (callers serialize); ``ttl`` is in seconds and
+    ``None`` means no expiry. Expired entries are invisible immediately and
+    removed by :meth:`purge_expired`.
+    """
+
+    #: Whether other processes see this backend's state.
+    shared: bool = False
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> str | None:
+        """Value for ``key``, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: str, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``."""
+
+    @abstractmethod
+    def update(
+        self,
+        namespace: str,
+        key: str,
+        fn: Callable[[str | None], str | None],
+        ttl: float | None = None,
+    ) -> str | None:
+        """
+        Atomically replace a value with ``fn(current)``.
+
+        ``fn`` receives None for a missing key; returning None deletes the
+        key. Returns the new value.
+        """
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> bool:
+        """Remove ``key``; True if it existed."""
+
+    @abstractmethod
+    def items(self, namespace: str) -> list[tuple[str, str]]:
+        """Every live ``(key, value)`` in ``namespace``."""
+
+    @abstractmethod
+    def append(self, namespace: str, key: str, value: str, max_len: int) -> None:
+        """Append to a list, keeping only its newest ``max_len`` items."""
+
+    @abstractmethod
+    def get_list(self, namespace: str, key: str) -> list[str]:
+        """A list's items, oldest first."""
+
+    @abstractmethod
+    def incr(self, namespace: str, key: str, ttl: float, amount: int = 1) -> int:
+        """
+        Add ``amount`` to a windowed counter and return the new count.
+
+        The window (``ttl`` seconds) starts at the first increment; once it
+        ends the counter restarts from zero.
+        """
+
+    @abstractmethod
+    def counter(self, namespace: str, key: str) -> tuple[int, float | None]:
+        """``(count, window end)`` of a counter; ``(0, None)`` if none is live."""
+
+    @abstractmethod
+    def set_score(
+        self, namespace: str, key: str, score: float, ttl: float | None = None
+    ) -> None:
+        """Add ``key`` to a scored set, replacing its previous score."""
+
+    @abstractmethod
+    def delete_score(self, namespace: str, key: str) -> bool:
+        """Remove ``key`` from a scored set; True if it was there."""
+
+    @abstractmethod
+    def count_scores(self, namespace: str) -> int:
+        """Number of live keys in a scored set."""
+
+    @abstractmethod
+    def lowest_scores(
+        self, namespace: str, limit: int | None = None, below: float | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        Live ``(key, score)`` pairs of a scored set, lowest score first.
+
+        Args:
+            namespace: The scored set
+            limit: Return at most this many pairs (None for all)
+            below: Only keys whose score is strictly lower than this
+        """
+
+    @abstractmethod
+    def clear(self, namespace: str, key: str | None = None) -> None:
+        """Remove one key (value, list, counter and score) or the whole namespace."""
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Delete expired values, counters and scores; returns how many were removed."""
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+
+
+class MemoryBackend(StateBackend):
+    """Process-local backend; the single-worker default."""
+
+    shared = False
+
+    def __init__(self) -> None:
+        self._values: dict[tuple[str, str], tuple[str, float | None]] = {}
+        self._lists: dict[tuple[str, str], deque[str]] = {}
+        self._counters: dict[tuple[str, str], tuple[int, float]] = {}
+        self._scores: dict[str, dict[str, tuple[float, float | None]]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _expires_at(ttl: float | None) -> float | None:
+        return time.time() + ttl if ttl is not None else None
+
+    def _live(self, namespace: str, key: str) -> str | None:
+        entry = self._values.get((namespace, key))
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._values[(namespace, key)]
+            return None
+        return value
+
+    def get(self, namespace: str, key: str) -> str | None:
+        with self._lock:
+            return self._live(namespace, key)
+
+    def set(self, namespace: str, key: str, value: str, ttl: float | None = None) -> None:
+        with self._lock:
+            self._values[(namespace, key)] = (value, self._expires_at(ttl))
+
+    def update(
+        self,
+        namespace: str,
+        key: str,
+        fn: Callable[[str | None], str | None],
+        ttl: float | None = None,
+    ) -> str | None:
+        with self._lock:
+            value = fn(self._live(namespace, key))
+            if value is None:
+                self._values.pop((namespace, key), None)
+            else:
+                self._values[(namespace, key)] = (value, self._expires_at(ttl))
+            return value
+
+    def delete(self, namespace: str, key: str) -> bool:
+        with self._lock:
+            existed = self._live(namespace, key) is not None
+            self._values.pop((namespace, key), None)
+            return existed
+
+    def items(self, namespace: str) -> list[tuple[str, str]]:
+        with self._lock:
+            keys = [key for ns, key in self._values if ns == namespace]
+            live = ((key, self._live(namespace, key)) for key in keys)
+            return [(key, value) for key, value in live if value is not None]
+
+    def append(self, namespace: str, key: str, value: str, max_len: int) -> None:
+        with self._lock:
+            items = self._lists.get((namespace, key))
+            if items is None or items.maxlen != max_len:
+                items = deque(items or (), maxlen=max(1, max_len))
+                self._lists[(namespace, key)] = items
+            items.append(value)
+
+    def get_list(self, namespace: str, key: str) -> list[str]:
+        with self._lock:
+            return list(self._lists.get((namespace, key), ()))
+
+    def incr(self, namespace: str, key: str, ttl: float, amount: int = 1) -> int:
+        now = time.time()
+        with self._lock:
+            count, window_end = self._counters.get((namespace, key), (0, 0.0))
+            if window_end <= now:
+                count, window_end = 0, now + ttl
+            count += amount
+            self._counters[(namespace, key)] = (count, window_end)
+            return count
+
+    def counter(self, namespace: str, key: str) -> tuple[int, float | None]:
+        with self._lock:
+            count, window_end = self._counters.get((namespace, key), (0, 0.0))
+            if window_end <= time.time():
+                return 0, None
+            return count, window_end
+
+    def _live_scores(self, namespace: str) -> dict[str, tuple[float, float | None]]:
+        scores = self._scores.get(namespace, {})
+        now = time.time()
+        for key in [k for k, (_, exp) in scores.items() if exp is not None and exp <= now]:
+            del scores[key]
+        return scores
+
+    def set_score(
+        self, namespace: str, key: str, score: float, ttl: float | None = None
+    ) -> None:
+        with self._lock:
+            self._scores.setdefault(namespace, {})[key] = (score, self._expires_at(ttl))
+
+    def delete_score(self, namespace: str, key: str) -> bool:
+        with self._lock:
+            return self._live_scores(namespace).pop(key, None) is not None
+
+    def count_scores(self, namespace: str) -> int:
+        with self._lock:
+            return len(self._live_scores(namespace))
+
+    def lowest_scores(
+        self, namespace: str, limit: int | None = None, below: float | None = None
+    ) -> list[tuple[str, float]]:
+        with self._lock:
+            pairs = (
+                (score, key)
+                for key, (score, _) in self._live_scores(namespace).items()
+                if below is None or score < below
+            )
+            lowest = heapq.nsmallest(limit, pairs) if limit is not None else sorted(pairs)
+        return [(key, score) for score, key in lowest]
+
+    def clear(self, namespace: str, key: str | None = None) -> None:
+        with self._lock:
+            for store in (self._values, self._lists, self._counters):
+                for ns_key in [k for k in store if k[0] == namespace and key in (None, k[1])]:
+                    del store[ns_key]
+            if key is None:
+                self._scores.pop(namespace, None)
+            else:
+                self._scores.get(namespace, {}).pop(key, None)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            values = [k for k, (_, exp) in self._values.items() if exp is not None and exp <= now]
+            counters = [k for k, (_, end) in self._counters.items() if end <= now]
+            for k in values:
+                del self._values[k]
+            for k in counters:
+                del self._counters[k]
+            removed = len(values) + len(counters)
+            for scores in self._scores.values():
+                expired = [k for k, (_, exp) in scores.items() if exp is not None and exp <= now]
+                for k in expired:
+                    del scores[k]
+                removed += len(expired)
+            return removed
+
+
+class SQLiteBackend(StateBackend):
+    """
+    SQLite (WAL) backend shared by every process that opens the same file.
+
+    Each process keeps one connection guarded by a lock; writes that read
+    first (``update``, ``incr``, ``append``) run in ``BEGIN IMMEDIATE``
+    transactions so concurrent workers serialize on the database lock
+    instead of losing updates.
+    """
+
+    shared = True
+
+    def __init__(self, path: str | Path, busy_timeout_ms: int = SHARED_STATE_BUSY_TIMEOUT_MS):
+        """
+        Open (or create) the state file.
+
+        Args:
+            path: SQLite file path
+            busy_timeout_ms: How long a write waits for another worker's lock
+        """
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=busy_timeout_ms / 1000,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL,"
+            " PRIMARY KEY (ns, key));"
+            "CREATE TABLE IF NOT EXISTS list_items ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS list_items_key ON list_items (ns, key, id);"
+            "CREATE TABLE IF NOT EXISTS counters ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, count INTEGER NOT NULL,"
+            " window_end REAL NOT NULL, PRIMARY KEY (ns, key));"
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, score REAL NOT NULL, expires_at REAL,"
+            " PRIMARY KEY (ns, key));"
+            "CREATE INDEX IF NOT EXISTS scores_rank ON scores (ns, score);"
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Serialize with other threads and processes for a read-modify-write."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _expires_at(ttl: float | None) -> float | None:
+        return time.time() + ttl if ttl is not None else None
+
+    @staticmethod
+    def _select_live(conn: sqlite3.Connection, namespace: str, key: str) -> str | None:
+        row = conn.execute(
+            "SELECT value FROM kv WHERE ns = ? AND key = ?"
+            " AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def get(self, namespace: str, key: str) -> str | None:
+        with self._lock:
+            return self._select_live(self._conn, namespace, key)
+
+    def set(self, namespace: str, key: str, value: str, ttl: float | None = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv (ns, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, value, self._expires_at(ttl)),
+            )
+
+    def update(
+        self,
+        namespace: str,
+        key: str,
+        fn: Callable[[str | None], str | None],
+        ttl: float | None = None,
+    ) -> str | None:
+        with self._transaction() as conn:
+            value = fn(self._select_live(conn, namespace, key))
+            if value is None:
+                conn.execute("DELETE FROM kv WHERE ns = ? AND key = ?", (namespace, key))
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO kv (ns, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, value, self._expires_at(ttl)),
+                )
+            return value
+
+    def delete(self, namespace: str, key: str) -> bool:
+        with self._transaction() as conn:
+            existed = self._select_live(conn, namespace, key) is not None
+            conn.execute("DELETE FROM kv WHERE ns = ? AND key = ?", (namespace, key))
+            return existed
+
+    def items(self, namespace: str) -> list[tuple[str, str]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT key, value FROM kv WHERE ns = ?"
+                " AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, time.time()),
+            ).fetchall()
+
+    def append(self, namespace: str, key: str, value: str, max_len: int) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO list_items (ns, key, value) VALUES (?, ?, ?)", (namespace, key, value)
+            )
+            conn.execute(
+                "DELETE FROM list_items WHERE ns = ? AND key = ? AND id NOT IN ("
+                " SELECT id FROM list_items WHERE ns = ? AND key = ? ORDER BY id DESC LIMIT ?)",
+                (namespace, key, namespace, key, max(1, max_len)),
+            )
+
+    def get_list(self, namespace: str, key: str) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT value FROM list_items WHERE ns = ? AND key = ? ORDER BY id",
+                (namespace, key),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def incr(self, namespace: str, key: str, ttl: float, amount: int = 1) -> int:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT count, window_end FROM counters WHERE ns = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            count, window_end = row if row and row[1] > now else (0, now + ttl)
+            count += amount
+            conn.execute(
+                "INSERT OR REPLACE INTO counters (ns, key, count, window_end) VALUES (?, ?, ?, ?)",
+                (namespace, key, count, window_end),
+            )
+            return count
+
+    def counter(self, namespace: str, key: str) -> tuple[int, float | None]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT count, window_end FROM counters WHERE ns = ? AND key = ? AND window_end > ?",
+                (namespace, key, time.time()),
+            ).fetchone()
+        return (row[0], row[1]) if row else (0, None)
+
+    def set_score(
+        self, namespace: str, key: str, score: float, ttl: float | None = None
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scores (ns, key, score, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, score, self._expires_at(ttl)),
+            )
+
+    def delete_score(self, namespace: str, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM scores WHERE ns = ? AND key = ?"
+                " AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time()),
+            ).rowcount > 0
+
+    def count_scores(self, namespace: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM scores WHERE ns = ?"
+                " AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, time.time()),
+            ).fetchone()[0]
+
+    def lowest_scores(
+        self, namespace: str, limit: int | None = None, below: float | None = None
+    ) -> list[tuple[str, float]]:
+        # Walks the (ns, score) index, so only the returned rows are read.
+        with self._lock:
+            return self._conn.execute(
+                "SELECT key, score FROM scores WHERE ns = ? AND score < ?"
+                " AND (expires_at IS NULL OR expires_at > ?) ORDER BY score LIMIT ?",
+                (
+                    namespace,
+                    below if below is not None else float("inf"),
+                    time.time(),
+                    limit if limit is not None else -1,
+                ),
+            ).fetchall()
+
+    def clear(self, namespace: str, key: str | None = None) -> None:
+        with self._transaction() as conn:
+            for table in ("kv", "list_items", "counters", "scores"):
+                if key is None:
+                    conn.execute(f"DELETE FROM {table} WHERE ns = ?", (namespace,))
+                else:
+                    conn.execute(f"DELETE FROM {table} WHERE ns = ? AND key = ?", (namespace, key))
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._transaction() as conn:
+            removed = conn.execute(
+                "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            ).rowcount
+            removed += conn.execute("DELETE FROM counters WHERE window_end <= ?", (now,)).rowcount
+            removed += conn.execute(
+                "DELETE FROM scores WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            ).rowcount
+            return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# URL scheme -> factory taking the full URL.
+_BACKENDS: dict[str, Callable[[str], StateBackend]] = {}
+
+
+def register_backend(scheme: str, factory: Callable[[str], StateBackend]) -> None:
+    """Make ``create_state_backend`` accept URLs starting with ``<scheme>://``."""
+    _BACKENDS[scheme] = factory
+
+
+def sqlite_path(url: str) -> str:
+    """File path of a ``sqlite:///relative`` or ``sqlite:////absolute`` URL."""
+    path = url.split("://", 1)[1]
+    return path[1:] if path.startswith("/") else path
+
+
+register_backend("memory", lambda url: MemoryBackend())
+register_backend("sqlite", lambda url: SQLiteBackend(sqlite_path(url)))
+
+
+def create_state_backend(url: str = SHARED_STATE_URL) -> StateBackend:
+    """
+    Build the backend for a ``SHARED_STATE_URL``.
+
+    Raises:
+        ValueError: The URL's scheme has no registered backend
+    """
+    scheme = url.split("://", 1)[0].lower()
+    factory = _BACKENDS.get(scheme)
+    if factory is None:
+        raise ValueError(
+            f"Unsupported SHARED_STATE_URL scheme '{scheme}' (known: {', '.join(sorted(_BACKENDS))})"
+        )
+    backend = factory(url)
+    scope = "shared by all workers" if backend.shared else "per process"
+    logger.info(f"Shared state backend: {type(backend).__name__} ({scope})")
+    return backend
+
+
+class SQLiteLimitStorage(Storage):
+    """
+    ``limits`` storage on :class:`SQLiteBackend` counters (``sqlite://`` URIs).
+
+    Registered with ``limits`` by subclassing, so
+    ``Limiter(storage_uri="sqlite:///data/shared_state.sqlite3")`` shares
+    fixed-window rate limits across every worker using that file.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+    NAMESPACE = "ratelimit"
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **options: Any):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.backend = SQLiteBackend(sqlite_path(uri or "sqlite:///"))
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return sqlite3.Error
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self.backend.incr(self.NAMESPACE, key, ttl=expiry, amount=amount)
+
+    def get(self, key: str) -> int:
+        return self.backend.counter(self.NAMESPACE, key)[0]
+
+    def get_expiry(self, key: str) -> float:
+        return self.backend.counter(self.NAMESPACE, key)[1] or time.time()
+
+    def check(self) -> bool:
+        try:
+            self.backend.counter(self.NAMESPACE, "__check__")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int | None:
+        self.backend.clear(self.NAMESPACE)
+        return None
+
+    def clear(self, key: str) -> None:
+        self.backend.clear(self.NAMESPACE, key)
@@ -0,0 +1,194 @@
+"""
+Single-flight coalescing of identical in-flight questions.
+
+When a question trends, or the frontend retries, several identical
+``/ask`` requests arrive within seconds and each would run the whole
+pipeline (retrieval, one to three auxiliary LLM calls, generation,
+grounding). ``SingleFlight`` lets the first request for a key run the
+computation and every identical request that arrives while it is in
+flight await the same result; streaming requests share one generation
+whose events are fanned out to every SSE client.
+
+Intuition:
+    The key is the normalized question plus every parameter that changes
+    the answer (filter, top_k, mode, provider, model, ...). Coalescing
+    only spans the lifetime of one computation — it is not a cache: once
+    the result is delivered the key is released and the next request
+    computes afresh. The shared computation runs as its own task, so a
+    client that disconnects does not cancel it for the others; a shared
+    stream is cancelled only when its last subscriber leaves.
+
+Example:
+    >>> flight = SingleFlight()
+    >>> key = coalesce_key("Apa itu PT?", top_k=5, mode="synthesized", provider=None)
+    >>> response = await flight.do(key, lambda: pool.run(rag_chain.query, question=q))
+    >>> async for event in flight.stream(key, lambda: chain_events(q)):
+    ...     ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, TypeVar
+
+from llm_cache import normalize_question
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+COALESCE_ENABLED = os.getenv("COALESCE_ENABLED", "true").lower() == "true"
+
+
+def coalesce_key(question: str, **params: Any) -> str:
+    """SHA-256 key of a normalized question and the parameters that shape its answer."""
+    parts = [normalize_question(question)]
+    parts.extend(f"{name}={params[name]!r}" for name in sorted(params))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class _Broadcast(Generic[T]):
+    """Events of one shared stream, replayed to every subscriber."""
+
+    def __init__(self) -> None:
+        self.events: list[T] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.subscribers = 0
+        self.changed = asyncio.Condition()
+        self.task: asyncio.Task | None = None
+
+    async def produce(self, source: AsyncIterator[T]) -> None:
+        try:
+            async for event in source:
+                self.events.append(event)
+                async with self.changed:
+                    self.changed.notify_all()
+        except BaseException as e:
+            self.error = e
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            self.done = True
+            async with self.changed:
+                self.changed.notify_all()
+
+
+class SingleFlight:
+    """
+    Registry of in-flight computations keyed by :func:`coalesce_key`.
+
+    Usage:
+        flight = SingleFlight()
+        result = await flight.do(key, make_awaitable)
+        async for event in flight.stream(key, make_async_iterator):
+            ...
+        flight.snapshot()
+    """
+
+    def __init__(self, enabled: bool = COALESCE_ENABLED):
+        self.enabled = enabled
+        self.leaders = 0
+        self.coalesced = 0
+        self._calls: dict[str, asyncio.Task] = {}
+        self._streams: dict[str, _Broadcast] = {}
+        self._lock = threading.Lock()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fn()``, sharing one in-flight call among identical keys.
+
+        Every caller gets the same result object, or the same exception.
+        """
+        if not self.enabled:
+            return await fn()
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._release_call(key, t))
+            with self._lock:
+                self.leaders += 1
+        else:
+            with self._lock:
+                self.coalesced += 1
+            logger.info(f"Coalescing identical in-flight request ({key[:12]})")
+        # shield: one caller disconnecting must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _release_call(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved, so an unawaited failure is not logged twice
+
+    async def stream(
+        self,
+        key: str,
+        source: Callable[[], AsyncIterator[T]],
+    ) -> AsyncIterator[T]:
+        """
+        Iterate ``source()``, fanning one iteration out to identical keys.
+
+        A subscriber that joins late first receives every event produced so
+        far. The shared iteration is cancelled when its last subscriber
+        leaves before it finishes.
+        """
+        if not self.enabled:
+            async for event in source():
+                yield event
+            return
+
+        broadcast = self._streams.get(key)
+        # A stream that finished, or was abandoned by all its subscribers, is not joined.
+        if broadcast is None or broadcast.done or broadcast.subscribers == 0:
+            broadcast = _Broadcast()
+            broadcast.task = asyncio.ensure_future(broadcast.produce(source()))
+            self._streams[key] = broadcast
+            broadcast.task.add_done_callback(lambda _: self._release_stream(key, broadcast))
+            with self._lock:
+                self.leaders += 1
+        else:
+            with self._lock:
+                self.coalesced += 1
+            logger.info(f"Fanning out in-flight stream to another client ({key[:12]})")
+
+        broadcast.subscribers += 1
+        index = 0
+        try:
+            while True:
+                if index < len(broadcast.events):
+                    yield broadcast.events[index]
+                    index += 1
+                    continue
+                if broadcast.done:
+                    if broadcast.error is not None:
+                        raise broadcast.error
+                    return
+                async with broadcast.changed:
+                    await broadcast.changed.wait_for(
+                        lambda: index < len(broadcast.events) or broadcast.done
+                    )
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not broadcast.done and broadcast.task is not None:
+                broadcast.task.cancel()
+
+    def _release_stream(self, key: str, broadcast: _Broadcast) -> None:
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
+
+    def snapshot(self) -> dict[str, Any]:
+        """Leader/coalesced totals and current in-flight keys."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "in_flight_calls": len(self._calls),
+                "in_flight_streams": len(self._streams),
+            }
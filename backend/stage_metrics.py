@@ -0,0 +1,259 @@
+"""
+Per-stage latency and candidate-count histograms for the retrieval pipeline.
+
+``HybridRetriever.hybrid_search`` is a chain of stages — query expansion,
+query embedding, Qdrant search, BM25, RRF fusion, KG boost, authority
+boost and CrossEncoder rerank. This module records how long each stage
+takes (and how many candidates it produced) into fixed-bucket histograms,
+so p50/p95/p99 per stage can be read from ``/api/v1/metrics/retrieval``
+without an external metrics stack.
+
+Intuition:
+    Fixed buckets make recording O(#buckets) with no allocation and keep
+    memory constant no matter how many queries are served; percentiles are
+    estimated by linear interpolation inside the bucket that crosses the
+    requested rank (the same approach Prometheus' histogram_quantile uses).
+    When disabled, ``stage()`` returns a shared no-op context manager, so
+    the instrumented code pays one attribute lookup and one branch.
+
+Strategy labels:
+    Stages are grouped by the retrieval strategy active in the calling
+    context (``direct``, ``hyde``, ``decomposition``, ...), set with
+    ``retrieval_metrics.strategy("hyde")`` by the RAG chain. This shows,
+    for example, that HyDE doubles Qdrant time but not rerank time.
+
+Example:
+    >>> with retrieval_metrics.stage("bm25") as timer:
+    ...     results = retriever.sparse_search(query)
+    ...     timer.count = len(results)
+    >>> retrieval_metrics.snapshot()["strategies"]["direct"]["bm25"]["latency_ms"]["p95"]
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from typing import Any, Iterator
+
+# Latency buckets (upper bounds, milliseconds). The last bucket is +inf.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000,
+)
+# Candidate-count buckets (upper bounds).
+COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+RETRIEVAL_METRICS_ENABLED = os.getenv("RETRIEVAL_METRICS_ENABLED", "true").lower() == "true"
+
+DEFAULT_STRATEGY = "direct"
+_current_strategy: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "retrieval_strategy", default=DEFAULT_STRATEGY
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram with interpolated percentiles. Not thread-safe on its own."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # trailing +inf bucket
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """Add one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def copy(self) -> "Histogram":
+        """Independent snapshot of the current counts."""
+        clone = Histogram(self.buckets)
+        clone.counts = list(self.counts)
+        clone.count = self.count
+        clone.total = self.total
+        clone.max = self.max
+        return clone
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate the q-th quantile (0 < q <= 1).
+
+        Interpolates linearly inside the bucket containing the target rank;
+        the +inf bucket is capped at the observed maximum.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count == 0:
+                continue
+            if cumulative + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                upper = min(upper, self.max)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * fraction
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        """Count, mean, max and p50/p95/p99."""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "p50": round(self.percentile(0.50), 3),
+            "p95": round(self.percentile(0.95), 3),
+            "p99": round(self.percentile(0.99), 3),
+        }
+
+
+class _StageTimer:
+    """Context manager that records one stage duration (and optional count) on exit."""
+
+    __slots__ = ("_metrics", "_strategy", "_stage", "_start", "count")
+
+    def __init__(self, metrics: "StageMetrics", strategy: str, stage: str):
+        self._metrics = metrics
+        self._strategy = strategy
+        self._stage = stage
+        self.count: int | None = None
+
+    def __enter__(self) -> "_StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        self._metrics.record(self._stage, elapsed_ms, self.count, strategy=self._strategy)
+
+
+class _NullTimer:
+    """Shared no-op timer returned when metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    @property
+    def count(self) -> None:
+        return None
+
+    @count.setter
+    def count(self, value: int | None) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StageMetrics:
+    """
+    Thread-safe registry of per-(strategy, stage) latency and count histograms.
+
+    Usage:
+        metrics = StageMetrics()
+        with metrics.stage("rerank") as t:
+            ...
+            t.count = len(candidates)
+        metrics.snapshot()
+    """
+
+    def __init__(self, enabled: bool = RETRIEVAL_METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # strategy -> stage -> (latency histogram, count histogram)
+        self._stages: dict[str, dict[str, tuple[Histogram, Histogram]]] = {}
+
+    def stage(self, name: str) -> Any:
+        """Time a stage under the current strategy label (no-op when disabled)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, _current_strategy.get(), name)
+
+    def record(
+        self,
+        stage: str,
+        latency_ms: float,
+        count: int | None = None,
+        strategy: str | None = None,
+    ) -> None:
+        """
+        Record one stage observation.
+
+        Args:
+            stage: Stage name (e.g. "qdrant", "bm25")
+            latency_ms: Stage duration in milliseconds
+            count: Candidates produced by the stage (optional)
+            strategy: Strategy label (defaults to the current context's)
+        """
+        if not self.enabled:
+            return
+        strategy = strategy or _current_strategy.get()
+        with self._lock:
+            stages = self._stages.setdefault(strategy, {})
+            hists = stages.get(stage)
+            if hists is None:
+                hists = (Histogram(LATENCY_BUCKETS_MS), Histogram(COUNT_BUCKETS))
+                stages[stage] = hists
+            hists[0].record(latency_ms)
+            if count is not None:
+                hists[1].record(count)
+
+    @contextlib.contextmanager
+    def strategy(self, name: str) -> Iterator[None]:
+        """Label every stage recorded inside this block with ``name``."""
+        token = _current_strategy.set(name)
+        try:
+            yield
+        finally:
+            _current_strategy.reset(token)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Percentile summary for every recorded (strategy, stage)."""
+        with self._lock:
+            strategies = {
+                strategy: {
+                    stage: {
+                        "latency_ms": latency.summary(),
+                        "candidates": counts.summary() if counts.count else None,
+                    }
+                    for stage, (latency, counts) in stages.items()
+                }
+                for strategy, stages in self._stages.items()
+            }
+        return {
+            "enabled": self.enabled,
+            "latency_buckets_ms": list(LATENCY_BUCKETS_MS),
+            "strategies": strategies,
+        }
+
+    def latency_histograms(self) -> list[tuple[str, str, Histogram]]:
+        """``(strategy, stage, latency_ms histogram copy)`` for every recorded stage."""
+        with self._lock:
+            return [
+                (strategy, stage, latency.copy())
+                for strategy, stages in self._stages.items()
+                for stage, (latency, _counts) in stages.items()
+            ]
+
+    def reset(self) -> None:
+        """Drop all recorded observations."""
+        with self._lock:
+            self._stages.clear()
+
+
+# Process-wide registry used by HybridRetriever and the metrics endpoint.
+retrieval_metrics = StageMetrics()
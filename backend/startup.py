@@ -0,0 +1,180 @@
+"""
+Staged background startup with per-component progress.
+
+Building ``LegalRAGChain`` scrolls the whole corpus, builds BM25, loads the
+CrossEncoder and embedding models and may walk the fallback providers; the
+knowledge graph is a large JSON load. Doing that inside ``lifespan`` before
+the app accepts traffic keeps every instance dark for minutes during a
+rolling deploy. ``StartupManager`` runs each heavy component's loader in a
+worker thread once the app is up, concurrently, and records its progress.
+
+Intuition:
+    The app binds immediately, so liveness and cheap endpoints answer at
+    once. An endpoint that needs a component awaits just that component
+    (``await startup.wait("rag_chain")``) — with a timeout, after which it
+    answers 503 — instead of the whole process waiting for everything.
+    The readiness probe reports each component as pending, loading, ready
+    or failed, and turns ready when every required component is.
+
+Example:
+    >>> startup = StartupManager()
+    >>> startup.add("rag_chain", init_rag_chain)
+    >>> startup.add("knowledge_graph", load_graph, required=False)
+    >>> startup.start()                    # in lifespan; returns immediately
+    >>> await startup.wait("rag_chain", timeout=30)
+    True
+    >>> startup.snapshot()["components"]["knowledge_graph"]["status"]
+    'loading'
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Seconds an endpoint waits for a still-loading component before answering 503
+STARTUP_AWAIT_TIMEOUT = float(os.getenv("STARTUP_AWAIT_TIMEOUT", "30"))
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+@dataclass
+class Component:
+    """One startup component and its load progress."""
+
+    name: str
+    loader: Callable[[], Any]
+    required: bool = True
+    on_ready: Callable[[], Awaitable[Any]] | None = None
+    status: str = PENDING
+    started_at: float | None = None
+    finished_at: float | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 2)
+        return {
+            "status": self.status,
+            "required": self.required,
+            "elapsed_s": elapsed,
+            "error": self.error,
+        }
+
+
+class StartupManager:
+    """
+    Runs registered component loaders concurrently in the background.
+
+    A loader is a blocking zero-argument callable that publishes what it
+    built (e.g. assigns a module global); raising marks the component
+    failed. An optional ``on_ready`` coroutine runs on the event loop
+    after the loader succeeds and before the component is marked ready.
+
+    Usage:
+        startup = StartupManager()
+        startup.add("rag_chain", loader)
+        startup.start(); ...; await startup.wait("rag_chain")
+        startup.snapshot()
+    """
+
+    def __init__(self) -> None:
+        self.components: dict[str, Component] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.started_at: float | None = None
+
+    def add(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        required: bool = True,
+        on_ready: Callable[[], Awaitable[Any]] | None = None,
+    ) -> None:
+        """Register (or replace) a component loader."""
+        self.components[name] = Component(name, loader, required, on_ready)
+
+    async def _load(self, component: Component) -> None:
+        component.status = LOADING
+        component.started_at = time.time()
+        try:
+            await asyncio.to_thread(component.loader)
+            if component.on_ready is not None:
+                await component.on_ready()
+            component.status = READY
+            logger.info(
+                f"Startup: {component.name} ready in "
+                f"{time.time() - component.started_at:.1f}s"
+            )
+        except Exception as e:
+            component.status = FAILED
+            component.error = str(e)[:200]
+            logger.error(f"Startup: {component.name} failed: {e}")
+        finally:
+            component.finished_at = time.time()
+
+    def start(self) -> None:
+        """Start every registered loader concurrently; returns immediately."""
+        self.started_at = time.time()
+        for name, component in self.components.items():
+            component.status = PENDING
+            component.started_at = component.finished_at = None
+            component.error = None
+            self._tasks[name] = asyncio.create_task(self._load(component))
+
+    async def wait(self, name: str, timeout: float | None = STARTUP_AWAIT_TIMEOUT) -> bool:
+        """
+        Wait for a component to finish loading.
+
+        Returns:
+            True if the component is ready; False if it failed, is unknown
+            or did not finish within ``timeout`` seconds
+        """
+        task = self._tasks.get(name)
+        if task is not None and not task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Startup: still waiting for {name} after {timeout:.0f}s")
+                return False
+        component = self.components.get(name)
+        return component is not None and component.status == READY
+
+    async def wait_all(self, timeout: float | None = None) -> bool:
+        """Wait for every component; True if all required ones are ready."""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        return self.is_ready()
+
+    def is_ready(self) -> bool:
+        """Whether every required component is ready."""
+        return all(c.status == READY for c in self.components.values() if c.required)
+
+    async def stop(self) -> None:
+        """Stop waiting on loaders (threads already running finish on their own)."""
+        for task in self._tasks.values():
+            task.cancel()
+        for task in self._tasks.values():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Overall readiness and per-component progress."""
+        return {
+            "ready": self.is_ready(),
+            "uptime_s": round(time.time() - self.started_at, 2) if self.started_at else None,
+            "components": {name: c.to_dict() for name, c in self.components.items()},
+        }
@@ -0,0 +1,325 @@
+"""
+Prometheus text-exposition metrics for the API.
+
+``GET /metrics`` renders every metric in the Prometheus text format
+(version 0.0.4), so a scraper can alert and plan capacity on request
+latency per route, LLM call duration per provider, stream
+time-to-first-token, retrieval stage timings, cache hit rates, queue
+depths and in-flight counts — without adding ``prometheus_client`` as a
+dependency.
+
+Intuition:
+    Two kinds of metric live here. Event metrics (``CounterVec``,
+    ``HistogramVec``) are recorded on the hot path: one lock, one dict
+    lookup and a bisect into fixed buckets, with no allocation once a
+    label set has been seen. State metrics (queue depth, in-flight,
+    cache hits) already exist in their owners' ``snapshot()``/``stats()``
+    methods, so they are not duplicated: a *collector* callable reads them
+    only when ``/metrics`` is scraped. Label values must come from bounded
+    sets (route templates, provider names, outcomes) — never raw paths or
+    user input — to keep the series count fixed.
+
+Example:
+    >>> LLM_CALL_SECONDS.observe(1.8, "groq", "generate", "ok")
+    >>> registry.register_collector(lambda: [
+    ...     gauge("pipeline_pool_queued", "Jobs waiting", [({}, pipeline_pool.queued)])
+    ... ])
+    >>> print(registry.render())
+    # HELP llm_call_duration_seconds ...
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from stage_metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Serve GET /metrics and record request/LLM/stream metrics.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket upper bounds in seconds (the +Inf bucket is implicit).
+HTTP_BUCKETS_S: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60,
+)
+LLM_BUCKETS_S: tuple[float, ...] = (0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 20, 30, 60, 120)
+TTFT_BUCKETS_S: tuple[float, ...] = (0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 20, 30)
+
+Labels = dict[str, str]
+
+# Request methods exported as-is; anything else is labelled "other".
+HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"})
+
+
+@dataclass
+class MetricFamily:
+    """One metric name with its HELP/TYPE header and samples.
+
+    Each sample is ``(suffix, labels, value)``; the suffix is appended to
+    the family name (``"_bucket"``, ``"_sum"``, ... or ``""``).
+    """
+
+    name: str
+    type: str
+    help: str
+    samples: list[tuple[str, Labels, float]] = field(default_factory=list)
+
+
+def gauge(name: str, help: str, samples: Iterable[tuple[Labels, float]]) -> MetricFamily:
+    """Gauge family from ``(labels, value)`` pairs."""
+    return MetricFamily(name, "gauge", help, [("", labels, value) for labels, value in samples])
+
+
+def counter(name: str, help: str, samples: Iterable[tuple[Labels, float]]) -> MetricFamily:
+    """Counter family from ``(labels, value)`` pairs; ``name`` should end in ``_total``."""
+    return MetricFamily(name, "counter", help, [("", labels, value) for labels, value in samples])
+
+
+def histogram_samples(
+    hist: Histogram, labels: Labels, scale: float = 1.0
+) -> list[tuple[str, Labels, float]]:
+    """Cumulative ``_bucket``/``_sum``/``_count`` samples for one histogram.
+
+    ``scale`` converts the histogram's unit to the exported one, e.g.
+    ``0.001`` to export the millisecond ``stage_metrics`` histograms in
+    seconds.
+    """
+    samples: list[tuple[str, Labels, float]] = []
+    cumulative = 0
+    for bound, bucket_count in zip(hist.buckets, hist.counts):
+        cumulative += bucket_count
+        samples.append(("_bucket", {**labels, "le": _format_value(bound * scale)}, cumulative))
+    samples.append(("_bucket", {**labels, "le": "+Inf"}, hist.count))
+    samples.append(("_sum", labels, hist.total * scale))
+    samples.append(("_count", labels, hist.count))
+    return samples
+
+
+class CounterVec:
+    """Monotonic counter keyed by a fixed tuple of label names."""
+
+    def __init__(self, name: str, help: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0.0)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            items = list(self._values.items())
+        return counter(
+            self.name, self.help,
+            ((dict(zip(self.label_names, key)), value) for key, value in items),
+        )
+
+
+class HistogramVec:
+    """Fixed-bucket histogram keyed by a fixed tuple of label names."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation for the given label values (in label-name order)."""
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            hist = self._series.get(label_values)
+            if hist is None:
+                hist = self._series[label_values] = Histogram(self.buckets)
+            hist.record(value)
+
+    def count(self, *label_values: str) -> int:
+        with self._lock:
+            hist = self._series.get(label_values)
+            return hist.count if hist else 0
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, "histogram", self.help)
+        with self._lock:
+            for key, hist in self._series.items():
+                family.samples.extend(histogram_samples(hist, dict(zip(self.label_names, key))))
+        return family
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """Owns event metrics and scrape-time collectors, and renders both."""
+
+    def __init__(self) -> None:
+        self._metrics: list[CounterVec | HistogramVec] = []
+        self._collectors: list[Callable[[], Iterable[MetricFamily]]] = []
+
+    def counter(self, name: str, help: str, label_names: tuple[str, ...] = ()) -> CounterVec:
+        metric = CounterVec(name, help, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = HTTP_BUCKETS_S,
+    ) -> HistogramVec:
+        metric = HistogramVec(name, help, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Add a callable that returns state metrics at scrape time."""
+        self._collectors.append(collector)
+
+    def collect(self) -> list[MetricFamily]:
+        families = [metric.collect() for metric in self._metrics]
+        for collector in self._collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                # One broken collector must not take the whole scrape down.
+                logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        return families
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {_escape_help(family.help)}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for suffix, labels, value in family.samples:
+                lines.append(f"{family.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape_label_value(str(value))}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def route_template(scope: Scope) -> str | None:
+    """Path template of the matched route, router prefix included (None if unmatched)."""
+    # FastAPI resolves included routers lazily and keeps the prefixed template
+    # on the effective route context; Starlette routes carry it themselves.
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    return getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency per route template.
+
+    The label is the matched route's path template (``/api/v1/ask``), read
+    from the scope after routing; unmatched requests share the
+    ``"unmatched"`` label and methods outside ``HTTP_METHODS`` share
+    ``"other"``, so arbitrary paths or verbs from scanners cannot blow up
+    the series count. For streaming responses the duration covers the
+    whole stream.
+    """
+
+    def __init__(self, app: ASGIApp, histogram: HistogramVec | None = None):
+        self.app = app
+        self.histogram = histogram or HTTP_REQUEST_SECONDS
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.histogram.observe(
+                time.perf_counter() - start,
+                scope["method"] if scope["method"] in HTTP_METHODS else "other",
+                route_template(scope) or "unmatched",
+                str(status),
+            )
+
+
+# Process-wide registry and the event metrics recorded on the hot path.
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code.",
+    ("method", "route", "status"),
+    HTTP_BUCKETS_S,
+)
+LLM_CALL_SECONDS = registry.histogram(
+    "llm_call_duration_seconds",
+    "Duration of one LLM provider call (one fallback attempt) by outcome.",
+    ("provider", "operation", "outcome"),
+    LLM_BUCKETS_S,
+)
+STREAM_TTFT_SECONDS = registry.histogram(
+    "stream_time_to_first_token_seconds",
+    "Time from request start to the first streamed answer chunk.",
+    ("route",),
+    TTFT_BUCKETS_S,
+)
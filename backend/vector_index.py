@@ -0,0 +1,378 @@
+"""
+Embedded NumPy vector index — a zero-network dense backend for HybridRetriever.
+
+Keeps every chunk embedding in a single row-major matrix on disk
+(``vectors.npy``) that is memory-mapped on load, so only the pages touched
+by a search are read into RAM. Top-k is answered by exact cosine search:
+the matrix is scanned in fixed-size row blocks, each block is scored with
+one matrix-vector product, and ``np.argpartition`` keeps the best ``top_k``
+per block before a final merge.
+
+Intuition:
+    For a few thousand to a few hundred thousand chunks, brute-force
+    cosine over a contiguous float16 matrix is fast enough (milliseconds)
+    and exact. That removes the Qdrant server from tests, single-node demos
+    and offline evaluation, and gives a ground-truth reference to benchmark
+    the Qdrant (ANN) path against.
+
+On-disk layout (one directory):
+    manifest.json   {"dim", "count", "dtype", "collection_name", "vector_name"}
+    vectors.npy     (count, dim) float16/float32, rows L2-normalized
+    ids.npy         (count,) int64 Qdrant point ids, or ids.json (a JSON list)
+                    when the collection has UUID string ids
+    payloads.jsonl  one JSON payload per row, same order as vectors
+
+Example:
+    >>> index = NumpyVectorIndex.from_qdrant(client, "indonesian_legal_docs")
+    >>> index.save("data/vector_index")
+    >>> index = NumpyVectorIndex.load("data/vector_index")
+    >>> hits = index.search(query_embedding, top_k=5, filter_conditions={"jenis_dokumen": "UU"})
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+IDS_FILE = "ids.npy"
+IDS_JSON_FILE = "ids.json"
+PAYLOADS_FILE = "payloads.jsonl"
+
+# Rows scored per matrix-vector product; bounds the float32 scratch buffer
+# to BLOCK_SIZE * dim * 4 bytes regardless of corpus size.
+DEFAULT_BLOCK_SIZE = 8192
+SUPPORTED_DTYPES = ("float16", "float32")
+
+
+@dataclass
+class IndexHit:
+    """Single hit from a NumpyVectorIndex search (mirrors Qdrant ScoredPoint)."""
+    id: int | str
+    score: float
+    payload: dict[str, Any] | None
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so dot product equals cosine similarity."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _id_array(ids: list[int | str]) -> np.ndarray:
+    """int64 array for integer point ids; object array (ids kept as-is) once any is a UUID string."""
+    if all(isinstance(point_id, (int, np.integer)) for point_id in ids):
+        return np.asarray(ids, dtype=np.int64)
+    array = np.empty(len(ids), dtype=object)
+    array[:] = ids
+    return array
+
+
+def _point_id(value: Any) -> int | str:
+    """Qdrant point id from an ``ids`` element (numpy ints become Python ints)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _payload_matches(value: Any, expected: Any) -> bool:
+    """Qdrant MatchValue semantics: equality, or membership for list payloads."""
+    if isinstance(value, list):
+        return expected in value
+    return value == expected
+
+
+class NumpyVectorIndex:
+    """
+    Exact cosine top-k over a (memory-mapped) embedding matrix.
+
+    Usage:
+        index = NumpyVectorIndex.load("data/vector_index")
+        hits = index.search(query_vector, top_k=10)
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        ids: np.ndarray,
+        payloads: list[dict[str, Any]],
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        source: dict[str, Any] | None = None,
+    ):
+        """
+        Initialize the index from already-normalized vectors.
+
+        Args:
+            vectors: (count, dim) matrix with L2-normalized rows
+            ids: (count,) point ids, aligned with ``vectors``
+            payloads: Payload dicts, aligned with ``vectors``
+            block_size: Rows scored per matmul block
+            source: Provenance recorded in the manifest (collection/vector name)
+        """
+        if vectors.ndim != 2:
+            raise ValueError(f"vectors must be 2-D, got shape {vectors.shape}")
+        if not (len(vectors) == len(ids) == len(payloads)):
+            raise ValueError(
+                f"Length mismatch: {len(vectors)} vectors, {len(ids)} ids, {len(payloads)} payloads"
+            )
+        self.vectors = vectors
+        self.ids = ids
+        self.payloads = payloads
+        self.block_size = max(1, block_size)
+        self.source = source or {}
+        # (key, value) -> row indices; payload filters repeat across requests
+        self._filter_cache: dict[tuple[str, str], np.ndarray] = {}
+
+    @property
+    def dim(self) -> int:
+        """Embedding dimension."""
+        return int(self.vectors.shape[1])
+
+    def __len__(self) -> int:
+        return int(self.vectors.shape[0])
+
+    def point_ids(self) -> list[int | str]:
+        """Point ids as Qdrant returns them (ints, or UUID strings), in row order."""
+        return [_point_id(value) for value in self.ids]
+
+    # ------------------------------------------------------------------
+    # Construction / persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_records(
+        cls,
+        records: list[tuple[int | str, list[float], dict[str, Any]]],
+        dtype: str = "float16",
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> "NumpyVectorIndex":
+        """
+        Build an in-memory index from ``(id, vector, payload)`` tuples.
+
+        Args:
+            records: Points to index
+            dtype: Storage dtype, ``"float16"`` or ``"float32"``
+            block_size: Rows scored per matmul block
+
+        Returns:
+            NumpyVectorIndex with normalized vectors
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported dtype {dtype!r} (expected one of {SUPPORTED_DTYPES})")
+        if records:
+            matrix = np.asarray([vec for _, vec, _ in records], dtype=np.float32)
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+        vectors = _normalize_rows(matrix).astype(dtype)
+        ids = _id_array([record_id for record_id, _, _ in records])
+        payloads = [payload or {} for _, _, payload in records]
+        return cls(vectors, ids, payloads, block_size=block_size)
+
+    @classmethod
+    def from_qdrant(
+        cls,
+        client: Any,
+        collection_name: str,
+        vector_name: str | None = None,
+        dtype: str = "float16",
+        batch_size: int = 1000,
+    ) -> "NumpyVectorIndex":
+        """
+        Export every point (vector + payload) of a Qdrant collection.
+
+        Args:
+            client: QdrantClient instance
+            collection_name: Collection to export
+            vector_name: Named vector to export; when None, the unnamed
+                vector is used, or ``"full"`` for Matryoshka collections
+            dtype: Storage dtype, ``"float16"`` or ``"float32"``
+            batch_size: Scroll page size
+
+        Returns:
+            NumpyVectorIndex holding the exported collection
+        """
+        records: list[tuple[int | str, list[float], dict[str, Any]]] = []
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            for point in points:
+                vector = point.vector
+                if isinstance(vector, dict):
+                    vector = vector.get(vector_name or "full")
+                if vector is None:
+                    continue
+                records.append((point.id, list(vector), point.payload or {}))
+            if offset is None:
+                break
+        logger.info(f"Exported {len(records)} points from Qdrant collection '{collection_name}'")
+        index = cls.from_records(records, dtype=dtype)
+        index.source = {"collection_name": collection_name, "vector_name": vector_name}
+        return index
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the index to a directory (created if missing).
+
+        Args:
+            path: Target directory
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / VECTORS_FILE, np.ascontiguousarray(self.vectors))
+        if self.ids.dtype == object:
+            with open(directory / IDS_JSON_FILE, "w", encoding="utf-8") as f:
+                json.dump(list(self.ids), f)
+            (directory / IDS_FILE).unlink(missing_ok=True)
+        else:
+            np.save(directory / IDS_FILE, self.ids)
+            (directory / IDS_JSON_FILE).unlink(missing_ok=True)
+        with open(directory / PAYLOADS_FILE, "w", encoding="utf-8") as f:
+            for payload in self.payloads:
+                f.write(json.dumps(payload, ensure_ascii=False))
+                f.write("\n")
+        manifest = {
+            "dim": self.dim if len(self) else 0,
+            "count": len(self),
+            "dtype": str(self.vectors.dtype),
+            **self.source,
+        }
+        with open(directory / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path,
+        mmap: bool = True,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> "NumpyVectorIndex":
+        """
+        Open an index directory written by :meth:`save`.
+
+        Args:
+            path: Index directory
+            mmap: Memory-map the vector matrix instead of reading it into RAM
+            block_size: Rows scored per matmul block
+
+        Returns:
+            NumpyVectorIndex
+
+        Raises:
+            FileNotFoundError: If the directory or any index file is missing
+        """
+        directory = Path(path)
+        vectors = np.load(directory / VECTORS_FILE, mmap_mode="r" if mmap else None)
+        if (directory / IDS_JSON_FILE).exists():
+            with open(directory / IDS_JSON_FILE, "r", encoding="utf-8") as f:
+                ids = _id_array(json.load(f))
+        else:
+            ids = np.load(directory / IDS_FILE)
+        with open(directory / PAYLOADS_FILE, "r", encoding="utf-8") as f:
+            payloads = [json.loads(line) for line in f if line.strip()]
+        source: dict[str, Any] = {}
+        manifest_path = directory / MANIFEST_FILE
+        if manifest_path.exists():
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            source = {k: manifest[k] for k in ("collection_name", "vector_name") if k in manifest}
+        logger.info(
+            f"Loaded NumPy vector index from {directory}: "
+            f"{len(ids)} vectors, dtype={vectors.dtype}, mmap={mmap}"
+        )
+        return cls(vectors, ids, payloads, block_size=block_size, source=source)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _filter_rows(self, filter_conditions: dict[str, Any]) -> np.ndarray:
+        """Row indices whose payload matches every condition (AND, like Filter(must=...))."""
+        rows: np.ndarray | None = None
+        for key, value in filter_conditions.items():
+            cache_key = (key, json.dumps(value, sort_keys=True, default=str))
+            matched = self._filter_cache.get(cache_key)
+            if matched is None:
+                matched = np.fromiter(
+                    (
+                        i for i, payload in enumerate(self.payloads)
+                        if _payload_matches(payload.get(key), value)
+                    ),
+                    dtype=np.int64,
+                )
+                self._filter_cache[cache_key] = matched
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+        return rows if rows is not None else np.arange(len(self), dtype=np.int64)
+
+    def search(
+        self,
+        query_vector: list[float] | np.ndarray,
+        top_k: int = 10,
+        filter_conditions: dict[str, Any] | None = None,
+    ) -> list[IndexHit]:
+        """
+        Exact cosine top-k search.
+
+        Args:
+            query_vector: Query embedding (normalized internally)
+            top_k: Number of results to return
+            filter_conditions: Optional ``{payload_key: value}`` equality filters
+
+        Returns:
+            List of IndexHit sorted by score (descending)
+        """
+        if top_k <= 0 or len(self) == 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+
+        rows = self._filter_rows(filter_conditions) if filter_conditions else None
+        total = len(self) if rows is None else len(rows)
+        if total == 0:
+            return []
+
+        best_scores: list[np.ndarray] = []
+        best_rows: list[np.ndarray] = []
+        for start in range(0, total, self.block_size):
+            end = min(start + self.block_size, total)
+            if rows is None:
+                block_rows = np.arange(start, end, dtype=np.int64)
+                block = self.vectors[start:end]
+            else:
+                block_rows = rows[start:end]
+                block = self.vectors[block_rows]
+            scores = block.astype(np.float32, copy=False) @ query
+            if len(scores) > top_k:
+                keep = np.argpartition(-scores, top_k - 1)[:top_k]
+                scores = scores[keep]
+                block_rows = block_rows[keep]
+            best_scores.append(scores)
+            best_rows.append(block_rows)
+
+        scores = np.concatenate(best_scores)
+        candidate_rows = np.concatenate(best_rows)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+
+        return [
+            IndexHit(
+                id=_point_id(self.ids[candidate_rows[i]]),
+                score=float(scores[i]),
+                payload=self.payloads[candidate_rows[i]],
+            )
+            for i in order
+        ]
@@ -17,6 +17,10 @@ from fastapi.testclient import TestClient
 # Ensure backend is importable from the repo root
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
 
+# Keep LegalRAGChain from opening the real backend/data/llm_cache.sqlite3;
+# cache tests build their own LLMCache under tmp_path.
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+
 
 # ── SearchResult fixture data ────────────────────────────────────────────────
 
@@ -175,7 +179,10 @@ def test_client(mock_qdrant_client, mock_nvidia_llm):
     with patch("rag_chain.HybridRetriever", return_value=mock_retriever), \
          patch("rag_chain.create_llm_client", return_value=mock_nvidia_llm):
         # Import app after patching so lifespan uses mocks
-        from main import app
+        from main import app, startup
 
         with TestClient(app) as client:
+            # Startup components load in the background; finish before tests
+            # patch the globals they assign.
+            client.portal.call(startup.wait_all)
             yield client
@@ -553,6 +553,8 @@ export interface RegulationListItem {
   chapter_count: number;
   article_count: number;
   indexed_chunk_count: number;
+  indexed_char_count?: number;
+  indexed_pasal_count?: number;
   amendment_count: number;
   cross_reference_count: number;
 }
@@ -604,6 +606,8 @@ export interface RegulationDetailResponse {
   parent_law: RegulationListItem | null;
   cross_reference_count: number;
   indexed_chunk_count: number;
+  indexed_char_count?: number;
+  indexed_pasal_count?: number;
 }
 
 export interface AmendmentTimelineEntry {
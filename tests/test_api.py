@@ -99,6 +99,24 @@ class TestAskEndpoint:
         assert "confidence" in data
         assert "processing_time_ms" in data
 
+    def test_ask_provider_override_is_per_call(self, test_client):
+        """Provider override is passed to query(), not swapped onto the shared chain."""
+        override = MagicMock()
+        with patch("main.rag_chain") as mock_chain, \
+             patch("main._resolve_llm_client", return_value=override):
+            mock_chain.query.return_value = _mock_rag_response()
+            default = MagicMock()
+            mock_chain.llm_client = default
+
+            response = test_client.post(
+                "/api/ask",
+                json={"question": "Apa itu Undang-Undang Cipta Kerja?", "provider": "groq"},
+            )
+
+            assert response.status_code == 200
+            assert mock_chain.query.call_args.kwargs["llm_client"] is override
+            assert mock_chain.llm_client is default
+
     def test_ask_short_question_returns_422(self, test_client):
         """POST /api/ask with too-short question → 422."""
         response = test_client.post("/api/ask", json={"question": "ab"})
@@ -173,6 +191,40 @@ class TestAskEndpoint:
 
         assert response.status_code == 500
 
+    def test_ask_degrades_under_load(self, test_client):
+        """POST /api/ask past the wait SLO → no HyDE/decomposition/grounding, top_k capped."""
+        from load_shedding import DegradePlan
+
+        with patch("main.rag_chain") as mock_chain, \
+             patch("main.load_shedder.plan", return_value=DegradePlan(degraded=True, top_k_cap=3)):
+            mock_chain.query.return_value = _mock_rag_response()
+            response = test_client.post(
+                "/api/ask",
+                json={"question": "Apa itu Undang-Undang Cipta Kerja?", "top_k": 8},
+            )
+
+        assert response.status_code == 200
+        kwargs = mock_chain.query.call_args.kwargs
+        assert kwargs["top_k"] == 3
+        assert kwargs["use_hyde"] is False
+        assert kwargs["use_decomposition"] is False
+        assert kwargs["skip_grounding"] is True
+
+    def test_ask_pool_saturated_returns_503_with_retry_after(self, test_client):
+        """POST /api/ask when the pipeline pool is full → fast 503 + Retry-After."""
+        from request_pool import PoolSaturated
+
+        with patch("main.rag_chain") as mock_chain, \
+             patch("main.pipeline_pool.run", new=AsyncMock(side_effect=PoolSaturated("full", 7))):
+            response = test_client.post(
+                "/api/ask",
+                json={"question": "Apa itu Undang-Undang Cipta Kerja?"},
+            )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+        mock_chain.query.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # Followup Endpoint
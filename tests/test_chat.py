@@ -2,7 +2,8 @@
 Tests for multi-turn chat session management.
 
 Covers:
-- SessionManager unit tests (create, message, history, sliding window, expiry)
+- SessionManager unit tests (create, message, history, sliding window, expiry,
+  count/byte caps with LRU eviction)
 - API endpoint integration tests (POST /ask with session_id, GET/DELETE /chat/sessions)
 """
 
@@ -13,7 +14,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from chat.session import Message, Session, SessionManager
+from chat.session import InMemorySessionStore, Message, Session, SessionManager
 from rag_chain import RAGResponse, ConfidenceScore, ValidationResult
 
 
@@ -207,6 +208,68 @@ class TestSessionManagerExpiry:
             sm.add_message(sid, "user", "Hello")
 
 
+class TestSessionManagerBounds:
+    def test_session_cap_evicts_least_recently_active(self):
+        store = InMemorySessionStore(max_sessions=3)
+        sm = SessionManager(store=store)
+        first, second, third = (sm.create_session() for _ in range(3))
+        sm.add_message(first, "user", "still here")  # first becomes most recent
+
+        sm.create_session()
+
+        assert store.stats()["sessions"] == 3
+        assert store.stats()["evicted"] == 1
+        assert sm.get_history(second) == []
+        assert len(sm.get_history(first)) == 1
+        assert sm.clear_session(third) is True
+
+    def test_byte_cap_evicts_oldest(self):
+        store = InMemorySessionStore(max_bytes=20_000)
+        sm = SessionManager(store=store)
+        sids = []
+        for _ in range(5):
+            sids.append(sm.create_session())
+            sm.add_message(sids[-1], "assistant", "x" * 6_000)
+
+        stats = store.stats()
+        assert stats["bytes"] <= 20_000
+        assert stats["evicted"] >= 2
+        assert len(sm.get_history(sids[-1])) == 1
+        assert sm.get_history(sids[0]) == []
+
+    def test_memory_flat_under_churn(self):
+        store = InMemorySessionStore(max_sessions=100, max_bytes=1_000_000)
+        sm = SessionManager(store=store)
+        for i in range(5_000):
+            sid = sm.create_session()
+            sm.add_message(sid, "user", f"pertanyaan {i}")
+
+        stats = store.stats()
+        assert stats["sessions"] == 100
+        assert stats["bytes"] <= 1_000_000
+
+    def test_expiry_pops_only_expired_front(self):
+        store = InMemorySessionStore()
+        sm = SessionManager(expiry_seconds=0.05, store=store)
+        old = sm.create_session()
+        time.sleep(0.06)
+        fresh = sm.create_session()  # creating drains expired sessions first
+
+        assert store.stats()["expired"] == 1
+        assert sm.get_history(old) == []
+        assert sm.clear_session(fresh) is True
+
+    def test_compact_storage_round_trips_messages(self):
+        sm = SessionManager()
+        sid = sm.create_session()
+        sm.add_message(sid, "user", "Apa itu PT?")
+
+        message = sm.get_history(sid)[0]
+        assert isinstance(message, Message)
+        assert (message.role, message.content) == ("user", "Apa itu PT?")
+        assert isinstance(message.timestamp, float)
+
+
 # ===========================================================================
 # Pydantic model tests
 # ===========================================================================
@@ -264,3 +264,30 @@ class TestCRAG:
         # Empty → incorrect → rephrase → return rephrased results only
         assert mock_retriever.hybrid_search.call_count == 2
         assert results == rephrased_results
+
+    # ------------------------------------------------------------------ #
+    # Reuse of already-retrieved results
+    # ------------------------------------------------------------------ #
+
+    def test_enhanced_search_with_initial_results_skips_initial_search(
+        self, mock_llm_client, mock_retriever
+    ):
+        """initial_results are graded directly; only the rephrased search runs."""
+        initial = [_make_search_result(1, "UU_1", score=0.5)]
+        rephrased = [_make_search_result(2, "UU_2", score=0.6)]
+        mock_retriever.hybrid_search.return_value = rephrased
+
+        crag = CRAG(llm_client=mock_llm_client)
+        merged = crag.enhanced_search("Syarat PT?", mock_retriever, top_k=5, initial_results=initial)
+
+        mock_retriever.hybrid_search.assert_called_once_with("Pertanyaan hukum yang diulang", top_k=5)
+        assert {r.citation_id for r in merged} == {"UU_1", "UU_2"}
+
+    def test_correct_uses_precomputed_grade(self, mock_llm_client, mock_retriever):
+        """correct() with grade='correct' returns the given results untouched."""
+        results = [_make_search_result(1, "UU_1", score=0.1)]
+        crag = CRAG(llm_client=mock_llm_client)
+
+        assert crag.correct("Syarat PT?", results, mock_retriever, grade="correct") is results
+        mock_retriever.hybrid_search.assert_not_called()
+        mock_llm_client.generate.assert_not_called()
@@ -0,0 +1,302 @@
+"""
+Unit tests for local grounding verification with LLM-judge escalation.
+
+Covers: claim splitting, lexical support and number consistency, invalid
+citation numbers, mode/uncertain-band escalation rules, the enforced LLM
+timeout, judge failure fallback, LegalRAGChain wiring, background
+verification (pending marker, late SSE event) and the result endpoint.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from grounding import GroundingVerifier, split_claims
+
+
+SOURCE = (
+    "Modal dasar Perseroan paling sedikit Rp50.000.000,00 (lima puluh juta rupiah). "
+    "Perseroan didirikan oleh 2 (dua) orang atau lebih dengan akta notaris."
+)
+CITATIONS = [
+    {"number": 1, "citation": "UU 40 Tahun 2007 Pasal 32", "metadata": {"text": SOURCE}},
+    {"number": 2, "citation": "UU 40 Tahun 2007 Pasal 7", "metadata": {"text": "Pendirian Perseroan."}},
+]
+
+GROUNDED = "Modal dasar Perseroan paling sedikit Rp50.000.000,00 [1]. Perseroan didirikan oleh 2 orang dengan akta notaris [1]."
+WRONG_NUMBER = "Modal dasar Perseroan paling sedikit Rp10.000.000,00 rupiah [1]."
+UNSUPPORTED = "Pemegang saham wajib membayar pajak penghasilan tahunan secara progresif [1]."
+INVALID_REF = "Modal dasar Perseroan paling sedikit Rp50.000.000,00 [7]."
+
+
+def _judge_client(response='{"grounding_score": 0.6, "ungrounded_claims": ["x"]}'):
+    client = MagicMock()
+    client.generate.return_value = response
+    return client
+
+
+class TestLocalVerifier:
+    def test_split_claims(self):
+        assert split_claims("Satu [1]. Dua [2].\n\nTiga") == ["Satu [1].", "Dua [2].", "Tiga"]
+
+    def test_grounded_answer_scores_high(self):
+        result = GroundingVerifier().verify_local(GROUNDED, CITATIONS)
+        assert result.score is not None and result.score >= 0.9
+        assert result.ungrounded_claims == []
+        assert result.sentences_checked == 2
+
+    def test_unsupported_claim_scores_low(self):
+        result = GroundingVerifier().verify_local(UNSUPPORTED, CITATIONS)
+        assert result.score < 0.35
+        assert result.ungrounded_claims == [UNSUPPORTED]
+
+    def test_mismatched_number_penalized(self):
+        grounded = GroundingVerifier().verify_local(GROUNDED, CITATIONS).score
+        wrong = GroundingVerifier().verify_local(WRONG_NUMBER, CITATIONS).score
+        assert wrong < grounded
+
+    def test_invalid_reference_is_zero_support(self):
+        result = GroundingVerifier().verify_local(INVALID_REF, CITATIONS)
+        assert result.score == 0.0
+        assert result.invalid_references == [7]
+
+    def test_full_source_texts_take_precedence(self):
+        citations = [{"number": 1, "citation": "UU 40/2007", "metadata": {"text": ""}}]
+        answer = "Modal dasar Perseroan paling sedikit lima puluh juta rupiah [1]."
+        assert GroundingVerifier().verify_local(answer, citations).score < 0.35
+        assert GroundingVerifier().verify_local(answer, citations, [SOURCE]).score >= 0.9
+
+    def test_no_checkable_claims(self):
+        assert GroundingVerifier().verify_local("Ya [1].", CITATIONS).score is None
+
+
+class TestEscalation:
+    def test_confident_scores_skip_llm(self):
+        verifier = GroundingVerifier(mode="hybrid")
+        client = _judge_client()
+        high, _ = verifier.verify(GROUNDED, CITATIONS, client)
+        low, ungrounded = verifier.verify(UNSUPPORTED, CITATIONS, client)
+        assert high >= 0.9 and low < 0.35
+        assert ungrounded == [UNSUPPORTED]
+        client.generate.assert_not_called()
+        assert verifier.stats()["local"] == 2
+
+    def test_uncertain_band_calls_llm(self):
+        verifier = GroundingVerifier(mode="hybrid", uncertain_low=0.0, uncertain_high=1.01)
+        client = _judge_client()
+        assert verifier.verify(GROUNDED, CITATIONS, client) == (0.6, ["x"])
+        client.generate.assert_called_once()
+        assert verifier.stats()["llm"] == 1
+
+    def test_unscorable_answer_escalates(self):
+        client = _judge_client()
+        GroundingVerifier(mode="hybrid").verify("Ya [1].", CITATIONS, client)
+        client.generate.assert_called_once()
+
+    def test_modes(self):
+        client = _judge_client()
+        GroundingVerifier(mode="local").verify("Ya [1].", CITATIONS, client)
+        client.generate.assert_not_called()
+        GroundingVerifier(mode="llm").verify(GROUNDED, CITATIONS, client)
+        client.generate.assert_called_once()
+
+    def test_no_citations(self):
+        score, claims = GroundingVerifier().verify(GROUNDED, [], _judge_client())
+        assert score is None
+        assert claims == ["Tidak ada sumber untuk diverifikasi"]
+
+    def test_timeout_falls_back_to_local(self):
+        release = threading.Event()
+        client = MagicMock()
+        client.generate.side_effect = lambda **kwargs: release.wait(5) and "{}"
+        verifier = GroundingVerifier(mode="llm", llm_timeout=0.05)
+        try:
+            score, _ = verifier.verify(GROUNDED, CITATIONS, client)
+        finally:
+            release.set()
+        assert score == verifier.verify_local(GROUNDED, CITATIONS).score
+        assert verifier.stats()["llm_timeout"] == 1
+
+    def test_judge_errors_fall_back_to_local(self):
+        verifier = GroundingVerifier(mode="llm")
+        score, _ = verifier.verify(UNSUPPORTED, CITATIONS, _judge_client("not json"))
+        assert score == verifier.verify_local(UNSUPPORTED, CITATIONS).score
+        client = MagicMock()
+        client.generate.side_effect = RuntimeError("LLM down")
+        verifier.verify(UNSUPPORTED, CITATIONS, client)
+        assert verifier.stats()["llm_error"] == 1
+
+
+class TestRAGChainIntegration:
+    def test_grounded_query_makes_single_llm_call(self):
+        from rag_chain import LegalRAGChain
+        from retriever import SearchResult
+
+        results = [
+            SearchResult(
+                id=1,
+                text=SOURCE,
+                citation="UU 40 Tahun 2007 Pasal 32",
+                citation_id="UU_40_2007_Pasal32",
+                score=0.9,
+                metadata={"jenis_dokumen": "UU", "nomor": "40", "tahun": 2007},
+            )
+        ]
+        retriever = MagicMock()
+        retriever.hybrid_search.return_value = results
+        llm = MagicMock()
+        llm.generate.return_value = GROUNDED
+
+        chain = LegalRAGChain(retriever=retriever, llm_client=llm)
+        chain.grounding = GroundingVerifier(mode="hybrid")
+        response = chain.query("Berapa modal dasar PT?", use_hyde=False, use_decomposition=False)
+
+        assert llm.generate.call_count == 1  # answer only, no judge round trip
+        assert response.validation.grounding_score >= 0.9
+
+
+def _chain_with_results(answer):
+    from rag_chain import LegalRAGChain
+    from retriever import SearchResult
+
+    retriever = MagicMock()
+    retriever.hybrid_search.return_value = [
+        SearchResult(
+            id=1,
+            text=SOURCE,
+            citation="UU 40 Tahun 2007 Pasal 32",
+            citation_id="UU_40_2007_Pasal32",
+            score=0.9,
+            metadata={"jenis_dokumen": "UU", "nomor": "40", "tahun": 2007},
+        )
+    ]
+    llm = MagicMock()
+    llm.generate.return_value = answer
+    llm.generate_stream.return_value = iter([answer])
+    chain = LegalRAGChain(retriever=retriever, llm_client=llm)
+    return chain, llm
+
+
+class TestBackgroundVerification:
+    def test_confident_local_result_has_no_verification_id(self):
+        verifier = GroundingVerifier(mode="hybrid")
+        score, _, verification_id = verifier.verify_deferred(GROUNDED, CITATIONS, _judge_client())
+        assert score >= 0.9
+        assert verification_id is None
+
+    def test_pending_then_done(self):
+        release = threading.Event()
+        client = MagicMock()
+        client.generate.side_effect = lambda **kwargs: (
+            release.wait(5) and '{"grounding_score": 0.8, "ungrounded_claims": []}'
+        )
+        verifier = GroundingVerifier(mode="llm")
+
+        score, _, verification_id = verifier.verify_deferred(GROUNDED, CITATIONS, client)
+        assert verification_id is not None
+        pending = verifier.get_result(verification_id)
+        assert pending["status"] == "pending"
+        assert pending["grounding_score"] == score
+        assert pending["source"] == "local"
+
+        release.set()
+        done = verifier.wait_result(verification_id, timeout=5)
+        assert done["status"] == "done"
+        assert done["grounding_score"] == 0.8
+        assert done["source"] == "llm"
+        assert verifier.get_result(verification_id) == done
+
+    def test_judge_slower_than_llm_timeout_still_counts(self):
+        import time
+
+        client = MagicMock()
+        client.generate.side_effect = lambda **kwargs: (
+            time.sleep(0.5) or '{"grounding_score": 0.95, "ungrounded_claims": []}'
+        )
+        verifier = GroundingVerifier(mode="llm", llm_timeout=0.2)
+
+        _, _, verification_id = verifier.verify_deferred(UNSUPPORTED, CITATIONS, client)
+        result = verifier.wait_result(verification_id, timeout=5)
+
+        assert result["status"] == "done"
+        assert result["source"] == "llm"
+        assert result["grounding_score"] == 0.95
+        assert verifier.stats()["llm_timeout"] == 0
+
+    def test_failed_judge_reports_local_result(self):
+        client = MagicMock()
+        client.generate.side_effect = RuntimeError("LLM down")
+        verifier = GroundingVerifier(mode="llm")
+        score, _, verification_id = verifier.verify_deferred(UNSUPPORTED, CITATIONS, client)
+        result = verifier.wait_result(verification_id, timeout=5)
+        assert result["status"] == "done"
+        assert result["source"] == "local"
+        assert result["grounding_score"] == score
+
+    def test_unknown_and_expired_ids(self):
+        verifier = GroundingVerifier(mode="llm")
+        assert verifier.get_result("missing") is None
+        _, _, verification_id = verifier.verify_deferred(GROUNDED, CITATIONS, _judge_client())
+        with patch("grounding.GROUNDING_RESULT_TTL", -1):
+            assert verifier.get_result(verification_id) is None
+
+    def test_query_returns_pending_validation(self):
+        chain, llm = _chain_with_results(GROUNDED)
+        chain.grounding = GroundingVerifier(mode="llm")
+        llm.generate.side_effect = [GROUNDED, '{"grounding_score": 0.7, "ungrounded_claims": []}']
+
+        response = chain.query(
+            "Berapa modal dasar PT?", use_hyde=False, use_decomposition=False,
+            background_grounding=True,
+        )
+
+        validation = response.validation
+        assert validation.grounding_pending is True
+        assert validation.verification_id
+        assert validation.to_dict()["verification_id"] == validation.verification_id
+        result = chain.grounding.wait_result(validation.verification_id, timeout=5)
+        assert result["grounding_score"] == 0.7
+
+    def test_stream_emits_late_grounding_event(self):
+        chain, llm = _chain_with_results(GROUNDED)
+        chain.grounding = GroundingVerifier(mode="llm")
+        llm.generate.return_value = '{"grounding_score": 0.7, "ungrounded_claims": []}'
+
+        events = list(chain.query_stream("Berapa modal dasar PT?", background_grounding=True))
+        types = [e[0] for e in events]
+
+        assert types[-2:] == ["done", "grounding"]
+        done = events[-2][1]["validation"]
+        assert done["grounding_pending"] is True
+        assert events[-1][1]["verification_id"] == done["verification_id"]
+        assert events[-1][1]["grounding_score"] == 0.7
+
+
+class TestGroundingEndpoint:
+    def test_returns_result(self, test_client):
+        with patch("main.rag_chain") as mock_chain:
+            mock_chain.grounding.get_result.return_value = {
+                "verification_id": "abc",
+                "status": "done",
+                "grounding_score": 0.9,
+                "ungrounded_claims": [],
+                "source": "llm",
+            }
+            response = test_client.get("/api/v1/grounding/abc")
+        assert response.status_code == 200
+        assert response.json()["grounding_score"] == 0.9
+        mock_chain.grounding.get_result.assert_called_once_with("abc")
+
+    def test_unknown_id_is_404(self, test_client):
+        with patch("main.rag_chain") as mock_chain:
+            mock_chain.grounding.get_result.return_value = None
+            response = test_client.get("/api/v1/grounding/missing")
+        assert response.status_code == 404
+
+    def test_ask_forwards_background_flag(self, test_client):
+        with patch("main.rag_chain") as mock_chain:
+            mock_chain.query.side_effect = RuntimeError("stop")
+            test_client.post(
+                "/api/v1/ask",
+                json={"question": "Apa itu PT?", "background_grounding": True},
+            )
+        assert mock_chain.query.call_args.kwargs["background_grounding"] is True
@@ -0,0 +1,177 @@
+"""
+Unit tests for cached, non-invasive health probes.
+
+Covers: HealthMonitor caching / TTL refresh / failure capture, the LLM
+probe from real-traffic state and circuit breakers, LLMHealth tracking,
+and the /health, /health/live and /health/ready endpoints.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from health import HealthMonitor, llm_probe
+from llm_client import CircuitBreaker, LLMHealth
+
+
+class TestHealthMonitor:
+    async def test_results_are_cached(self):
+        check = MagicMock(return_value={"collection_count": 42})
+        monitor = HealthMonitor(interval=60, ttl=60)
+        monitor.register("vector_store", check)
+
+        first = await monitor.results()
+        second = await monitor.results()
+
+        assert check.call_count == 1
+        assert first["vector_store"].ok
+        assert second["vector_store"].details == {"collection_count": 42}
+
+    async def test_stale_result_refreshed_on_read(self):
+        check = MagicMock(return_value={})
+        monitor = HealthMonitor(interval=60, ttl=0.05)
+        monitor.register("vector_store", check)
+
+        await monitor.results()
+        await asyncio.sleep(0.1)
+        await monitor.results()
+        assert check.call_count == 2
+
+    async def test_failure_is_recorded_not_raised(self):
+        monitor = HealthMonitor()
+        monitor.register("vector_store", MagicMock(side_effect=ConnectionError("qdrant down")))
+
+        result = (await monitor.results())["vector_store"]
+        assert not result.ok
+        assert "qdrant down" in result.error
+
+    async def test_background_schedule(self):
+        check = MagicMock(return_value={})
+        monitor = HealthMonitor(interval=0.02, ttl=60)
+        monitor.register("vector_store", check)
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+        assert check.call_count >= 2
+
+
+class TestLLMProbe:
+    def test_unconfigured(self):
+        assert llm_probe(None)["status"] == "unconfigured"
+
+    def test_uses_real_traffic_state(self):
+        health = LLMHealth()
+        client = MagicMock()
+        with patch("health.llm_health", health):
+            assert llm_probe(client)["status"] == "unknown"
+            health.record_success()
+            assert llm_probe(client)["status"] == "ok"
+            for _ in range(3):
+                health.record_failure(RuntimeError("503"))
+            probe = llm_probe(client)
+        assert probe["status"] == "failing"
+        assert probe["last_error"] == "RuntimeError: 503"
+        client.generate.assert_not_called()
+
+    def test_failing_expires_after_window(self):
+        health = LLMHealth()
+        client = MagicMock()
+        for _ in range(3):
+            health.record_failure(RuntimeError("503"))
+        with patch("health.llm_health", health):
+            assert llm_probe(client)["status"] == "failing"
+            health.last_failure -= 301
+            assert llm_probe(client)["status"] == "unknown"
+
+    def test_all_circuits_open_is_failing(self):
+        client = MagicMock()
+        client.circuit_breakers = {"groq": CircuitBreaker("groq"), "gemini": CircuitBreaker("gemini")}
+        health = LLMHealth()
+        health.record_success()
+        with patch("health.llm_health", health):
+            for _ in range(3):
+                client.circuit_breakers["groq"].record_failure()
+            probe = llm_probe(client)
+            assert probe["status"] == "ok"
+            assert probe["open_circuits"] == ["groq"]
+            for _ in range(3):
+                client.circuit_breakers["gemini"].record_failure()
+            assert llm_probe(client)["status"] == "failing"
+
+
+class TestLLMHealth:
+    def test_track_records_outcomes(self):
+        health = LLMHealth()
+        with health.track():
+            pass
+        assert health.snapshot()["last_success"] is not None
+
+        with pytest.raises(ValueError):
+            with health.track():
+                raise ValueError("bad")
+        assert health.consecutive_failures == 1
+
+    def test_untracked_override_does_not_count(self):
+        health = LLMHealth()
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                with health.track(MagicMock(), record=False):
+                    raise ValueError("unknown model")
+        assert health.snapshot()["consecutive_failures"] == 0
+        assert health.snapshot()["last_failure"] is None
+
+    def test_closed_stream_is_not_a_failure(self):
+        health = LLMHealth()
+
+        def stream():
+            with health.track():
+                yield "a"
+                yield "b"
+
+        gen = stream()
+        next(gen)
+        gen.close()
+        assert health.consecutive_failures == 0
+        assert health.last_success is None
+
+
+class TestHealthEndpoints:
+    def test_health_does_not_call_llm(self, test_client):
+        with patch("main.rag_chain") as mock_chain:
+            mock_chain.retriever.vector_backend = "qdrant"
+            mock_chain.retriever.client.get_collection.return_value.points_count = 7
+            with patch("main.health_monitor", HealthMonitor()) as monitor:
+                from main import _check_vector_store
+
+                monitor.register("vector_store", _check_vector_store)
+                first = test_client.get("/health").json()
+                test_client.get("/health")
+
+        assert first["qdrant_connected"] is True
+        assert first["collection_count"] == 7
+        mock_chain.llm_client.generate.assert_not_called()
+        assert mock_chain.retriever.client.get_collection.call_count == 1
+
+    def test_liveness(self, test_client):
+        with patch("main.rag_chain", None):
+            response = test_client.get("/health/live")
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_readiness_without_rag_chain(self, test_client):
+        with patch("main.rag_chain", None):
+            response = test_client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["checks"]["rag_chain"]["ok"] is False
+
+    def test_readiness_ready(self, test_client):
+        monitor = HealthMonitor()
+        monitor.register("vector_store", lambda: {"collection_count": 1})
+        with patch("main.rag_chain") as mock_chain, \
+             patch("main.health_monitor", monitor), \
+             patch("health.llm_health", LLMHealth()):
+            mock_chain.llm_client.circuit_breakers = {}
+            response = test_client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["checks"]["vector_store"]["ok"] is True
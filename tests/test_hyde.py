@@ -151,3 +151,114 @@ class TestHyDE:
         assert len(merged) == 2
         ids = {r.citation_id for r in merged}
         assert ids == {"UU_1", "UU_2"}
+
+
+class TestSpeculativeHyDE:
+    def test_original_search_overlaps_generation(self, mock_llm_client, mock_retriever):
+        import threading
+
+        searched = threading.Event()
+
+        def generate(**kwargs):
+            # Only returns once the original-question search has started
+            assert searched.wait(5)
+            return "Hipotetikal"
+
+        def search(query, top_k=5):
+            searched.set()
+            return [_make_search_result(len(query), f"UU_{query}")]
+
+        mock_llm_client.generate.side_effect = generate
+        mock_retriever.search.side_effect = search
+
+        hyde = HyDE(mock_llm_client)
+        merged = hyde.enhanced_search("Apa itu PT?", mock_retriever, top_k=5)
+
+        assert {r.citation_id for r in merged} == {"UU_Apa itu PT?", "UU_Hipotetikal"}
+
+    def test_budget_exceeded_returns_plain_results(self, mock_llm_client, mock_retriever):
+        import threading
+
+        release = threading.Event()
+        mock_llm_client.generate.side_effect = lambda **kwargs: release.wait(5) and "terlambat"
+        plain = [_make_search_result(1, "UU_1")]
+        mock_retriever.search.return_value = plain
+
+        hyde = HyDE(mock_llm_client, latency_budget=0.1)
+        try:
+            res = hyde.enhanced_search("Apa itu PT?", mock_retriever, top_k=5)
+        finally:
+            release.set()
+
+        assert res == plain
+        mock_retriever.search.assert_called_once_with("Apa itu PT?", top_k=5)
+
+    def test_budget_exceeded_cancels_queued_generation(self, mock_llm_client, mock_retriever):
+        import threading
+
+        release = threading.Event()
+        mock_llm_client.generate.return_value = "Hipotetikal"
+        mock_retriever.search.return_value = [_make_search_result(1, "UU_1")]
+
+        hyde = HyDE(mock_llm_client, latency_budget=0.1, max_workers=1)
+        executor = hyde._get_executor()
+        executor.submit(release.wait, 5)  # occupies the only worker
+        try:
+            hyde.enhanced_search("Apa itu PT?", mock_retriever, top_k=5)
+        finally:
+            release.set()
+            executor.shutdown(wait=True)
+
+        mock_llm_client.generate.assert_not_called()
+
+    def test_zero_budget_waits_for_generation(self, mock_llm_client, mock_retriever):
+        import time
+
+        def generate(**kwargs):
+            time.sleep(0.05)
+            return "Hipotetikal"
+
+        mock_llm_client.generate.side_effect = generate
+        mock_retriever.search.return_value = [_make_search_result(1, "UU_1")]
+
+        hyde = HyDE(mock_llm_client, latency_budget=0)
+        hyde.enhanced_search("Apa itu PT?", mock_retriever, top_k=5)
+
+        assert mock_retriever.search.call_count == 2
+
+
+class TestAsyncHyDE:
+    async def test_budget_cancels_native_generation(self, mock_retriever):
+        import asyncio
+
+        cancelled = asyncio.Event()
+
+        class SlowClient:
+            async def agenerate(self, **kwargs):
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+        plain = [_make_search_result(1, "UU_1")]
+        mock_retriever.search.return_value = plain
+
+        hyde = HyDE(SlowClient(), latency_budget=0.1)
+        res = await hyde.aenhanced_search("Apa itu PT?", mock_retriever, top_k=5)
+
+        assert res == plain
+        assert cancelled.is_set()
+        mock_retriever.search.assert_called_once_with("Apa itu PT?", top_k=5)
+
+    async def test_sync_client_matches_enhanced_search(self, mock_llm_client, mock_retriever):
+        mock_retriever.search.side_effect = lambda query, top_k=5: [
+            _make_search_result(len(query), f"UU_{query}")
+        ]
+        hyde = HyDE(mock_llm_client)
+
+        res = await hyde.aenhanced_search("Apa itu PT?", mock_retriever, top_k=5)
+
+        assert {r.citation_id for r in res} == {
+            "UU_Apa itu PT?", "UU_Mocked hypothetical answer",
+        }
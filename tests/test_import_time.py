@@ -0,0 +1,84 @@
+"""
+Import-time benchmark for the API and CLI entry points.
+
+Each entry point is imported cold in a fresh interpreter with
+``python -X importtime``. Two things are checked: the heavy stacks
+(rag_chain, qdrant_client, networkx, pypdf, ...) must not load at import
+time, and the cumulative import time must stay under a budget. Budgets
+can be raised on slow CI machines via ``IMPORT_TIME_BUDGET_<NAME>``
+(seconds).
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.slow
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = REPO_ROOT / "backend"
+
+# Modules that each cost hundreds of milliseconds and are only needed at first use.
+HEAVY_MODULES = (
+    "rag_chain",
+    "retriever",
+    "qdrant_client",
+    "langchain_huggingface",
+    "sentence_transformers",
+    "rank_bm25",
+    "networkx",
+    "pypdf",
+)
+
+# (name, module, working directory, default budget in seconds)
+ENTRY_POINTS = [
+    ("main", "main", BACKEND_DIR, 1.5),
+    ("incremental_sync", "backend.scripts.incremental_sync", REPO_ROOT, 0.5),
+    ("detect_changes", "backend.scripts.detect_changes", REPO_ROOT, 0.5),
+]
+
+
+def _cold_import(module: str, cwd: Path) -> tuple[float, set[str]]:
+    """Import ``module`` in a fresh interpreter; return (seconds, loaded top-level modules)."""
+    code = (
+        f"import sys; import {module}; "
+        "print(' '.join(sorted({name.split('.')[0] for name in sys.modules})))"
+    )
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if line.startswith("import time:") and len(parts) == 3 and parts[2].strip() == module:
+            cumulative_us = int(parts[1])
+    assert cumulative_us is not None, f"no importtime entry for {module}"
+    return cumulative_us / 1_000_000, set(proc.stdout.split())
+
+
+@pytest.mark.parametrize(
+    ("name", "module", "cwd", "budget"),
+    ENTRY_POINTS,
+    ids=[entry[0] for entry in ENTRY_POINTS],
+)
+def test_cold_import_stays_lazy_and_within_budget(name, module, cwd, budget):
+    budget = float(os.getenv(f"IMPORT_TIME_BUDGET_{name.upper()}", budget))
+
+    seconds, loaded = _cold_import(module, cwd)
+
+    eager = sorted(loaded.intersection(HEAVY_MODULES))
+    assert not eager, f"{module} imports {eager} eagerly"
+    assert seconds <= budget, f"cold import of {module} took {seconds:.2f}s (budget {budget:.2f}s)"
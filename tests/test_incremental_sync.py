@@ -2,13 +2,14 @@
 Tests for incremental sync pipeline.
 
 Covers no-change detection, added/modified/deleted file processing,
-mixed operations, state persistence, Qdrant point deletion, and
-SyncResult serialization.
+mixed operations, state persistence, Qdrant point deletion, keeping an
+attached retriever's corpus in step, and SyncResult serialization.
 """
 
 from __future__ import annotations
 
 from pathlib import Path
+from types import SimpleNamespace
 from unittest import mock
 from unittest.mock import MagicMock
 
@@ -35,9 +36,9 @@ def _build_pipeline(tmp_path: Path) -> IncrementalSyncPipeline:
     repo_dir.mkdir()
     state_file = tmp_path / "state.json"
 
-    with mock.patch("backend.scripts.incremental_sync.MarkdownIngestionPipeline"), \
+    with mock.patch("backend.scripts.ingest_markdown.MarkdownIngestionPipeline"), \
          mock.patch("backend.scripts.incremental_sync.ChangeDetector"), \
-         mock.patch("backend.scripts.incremental_sync.QdrantClient"):
+         mock.patch("qdrant_client.QdrantClient"):
         pipeline = IncrementalSyncPipeline(
             qdrant_url="http://localhost:6333",
             collection_name="test_collection",
@@ -233,6 +234,41 @@ def test_delete_points_for_file(tmp_path: Path):
     assert condition.match.value == "docs/target.md"
 
 
+def test_sync_updates_attached_retriever(tmp_path: Path):
+    """A modified file's old chunks leave the retriever corpus, new ones join it."""
+    from retriever import HybridRetriever
+
+    with mock.patch("retriever.QdrantClient") as mock_qclient_cls, \
+         mock.patch("retriever.HuggingFaceEmbeddings"):
+        mock_qclient_cls.return_value.get_collection.return_value.points_count = 0
+        retriever = HybridRetriever(use_reranker=False, use_jina=False)
+    retriever.add_corpus_documents([
+        retriever.corpus_document(
+            "old-1", {"text": "lama", "citation_id": "uu_1_2020_pasal_1", "filepath": "docs/law.md"}
+        ),
+    ])
+
+    pipeline = _build_pipeline(tmp_path)
+    pipeline.retriever = retriever
+    pipeline.qdrant_client.scroll.return_value = ([SimpleNamespace(id="old-1")], None)
+    pipeline.pipeline.process_single_file.return_value = [_make_mock_chunk("docs/law.md")]
+    pipeline.pipeline._embed_and_upsert.return_value = [
+        ("new-1", {"text": "baru", "citation_id": "uu_1_2020_pasal_2", "filepath": "docs/law.md"}),
+        ("new-2", {"text": "baru lagi", "citation_id": "uu_1_2020_pasal_3", "filepath": "docs/law.md"}),
+    ]
+    pipeline.detector.detect.return_value = ChangeSet(
+        added=[], modified=["docs/law.md"], deleted=[],
+        current_sha="sha_new", previous_sha="sha_old",
+    )
+
+    result = pipeline.sync()
+
+    assert result.chunks_deleted == 1
+    assert [doc["id"] for doc in retriever._corpus] == ["new-1", "new-2"]
+    assert retriever.get_chunk_counts_by_regulation() == {"uu_1_2020": 2}
+    assert pipeline.qdrant_client.scroll.call_args.kwargs["scroll_filter"].must[0].match.value == "docs/law.md"
+
+
 # ── SyncResult.to_dict ──────────────────────────────────────────────────────
 
 
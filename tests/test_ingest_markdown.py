@@ -436,6 +436,31 @@ def test_pipeline_run_with_mock_qdrant(
     assert stats.uploaded >= 1
 
 
+@patch("backend.scripts.ingest_markdown.QdrantClient")
+def test_embed_and_upsert_follows_named_vector_collection(mock_qdrant_cls):
+    """A collection with full/coarse named vectors receives named points."""
+    mock_qclient = MagicMock()
+    mock_qclient.get_collection.return_value.config.params.vectors = {
+        "full": MagicMock(size=4),
+        "coarse": MagicMock(size=2),
+    }
+    mock_qdrant_cls.return_value = mock_qclient
+    pipeline = MarkdownIngestionPipeline(
+        qdrant_url="http://localhost:6333",
+        collection_name="test_col",
+    )
+    pipeline._embedder = MagicMock()
+    pipeline._embedder.embed_documents.return_value = [[3.0, 4.0, 0.0, 12.0]]
+
+    chunks = pipeline._chunk_regulation(
+        _make_parsed_regulation(format_pattern=FormatPattern.CATALOG, content="", has_full_text=False)
+    )
+    pipeline._embed_and_upsert(chunks, batch_size=10)
+
+    point = mock_qclient.upsert.call_args.kwargs["points"][0]
+    assert point.vector == {"full": [3.0, 4.0, 0.0, 12.0], "coarse": [0.6, 0.8]}
+
+
 # ── Checkpointer: corrupt file ──────────────────────────────────────────────
 
 
@@ -126,6 +126,36 @@ class TestDocumentChunker:
         assert "24" in chunks[0]["citation_id"]
         assert "2018" in chunks[0]["citation_id"]
 
+    def test_chunk_collects_parent_texts(self):
+        """Ayat chunks share their Pasal as parent; penjelasan is a separate parent."""
+        from backend.scripts.ingest import create_document_chunks
+
+        base = {"jenis_dokumen": "UU", "nomor": "40", "tahun": 2007, "pasal": "32"}
+        docs = [
+            {**base, "ayat": "1", "text": "Modal dasar Perseroan paling sedikit Rp50.000.000,00."},
+            {**base, "ayat": "2", "text": "Undang-undang dapat menentukan jumlah minimum modal lain."},
+            {**base, "bab": "Penjelasan", "text": "Cukup jelas, modal dasar sebagaimana dimaksud ayat (1)."},
+        ]
+        parent_texts: dict[str, str] = {}
+
+        chunks = create_document_chunks(docs, parent_texts=parent_texts)
+
+        parent_ids = [c["metadata"]["parent_citation_id"] for c in chunks]
+        assert parent_ids[0] == parent_ids[1] == "UU_40_2007_Pasal32"
+        assert parent_ids[2] == "UU_40_2007_Pasal32_Penjelasan"
+        assert parent_texts["UU_40_2007_Pasal32"] == (
+            "Modal dasar Perseroan paling sedikit Rp50.000.000,00.\n"
+            "Undang-undang dapat menentukan jumlah minimum modal lain."
+        )
+        assert parent_texts["UU_40_2007_Pasal32_Penjelasan"].startswith("Cukup jelas")
+
+    def test_chunk_without_parent_texts_unchanged(self):
+        """Callers that do not collect parents get no parent metadata."""
+        from backend.scripts.ingest import create_document_chunks
+
+        doc = {"jenis_dokumen": "UU", "nomor": "1", "tahun": 2020, "pasal": "1", "text": "Dalam Undang-Undang ini yang dimaksud dengan penanaman modal."}
+        assert "parent_citation_id" not in create_document_chunks([doc])[0]["metadata"]
+
 
 class TestEmbeddingGenerator:
     """Tests for HuggingFace embedding generation."""
@@ -212,6 +242,36 @@ class TestQdrantIngestion:
         assert payload["citation_id"] == chunk["citation_id"]
         assert payload["jenis_dokumen"] == "UU"
     
+    def test_point_struct_named_vectors(self):
+        """Matryoshka mode stores full + truncated coarse named vectors."""
+        from backend.scripts.ingest import create_point_struct
+
+        chunk = {
+            "text": "Penanaman modal adalah kegiatan menanamkan modal.",
+            "citation_id": "UU_11_2020_Pasal1",
+            "metadata": {"jenis_dokumen": "UU", "nomor": "11", "tahun": 2020},
+        }
+        embedding = [0.5] * 8
+
+        point = create_point_struct(point_id=1, chunk=chunk, embedding=embedding, coarse_dim=4)
+
+        assert isinstance(point.vector, dict)
+        assert point.vector["full"] == embedding
+        assert len(point.vector["coarse"]) == 4
+        assert sum(x * x for x in point.vector["coarse"]) == pytest.approx(1.0)
+
+    def test_collection_config_coarse_size(self):
+        """coarse_size appears only when MATRYOSHKA_COARSE_DIM is enabled."""
+        import backend.scripts.ingest as ingest_module
+
+        with patch.object(ingest_module, "MATRYOSHKA_COARSE_DIM", 128):
+            config = ingest_module.get_collection_config()
+        assert config["vectors_config"]["coarse_size"] == 128
+
+        with patch.object(ingest_module, "MATRYOSHKA_COARSE_DIM", 0):
+            config = ingest_module.get_collection_config()
+        assert "coarse_size" not in config["vectors_config"]
+
     @pytest.mark.skipif(
         not os.getenv("QDRANT_URL"),
         reason="QDRANT_URL not set (Qdrant not running)"
@@ -230,7 +290,7 @@ class TestQdrantIngestion:
 class TestIngestionPipeline:
     """End-to-end ingestion pipeline tests."""
     
-    def test_full_pipeline_mock(self):
+    def test_full_pipeline_mock(self, tmp_path):
         """Test full ingestion pipeline with mocks."""
         from backend.scripts.ingest import ingest_documents
         
@@ -261,7 +321,8 @@ class TestIngestionPipeline:
             result = ingest_documents(
                 json_path=str(SAMPLE_JSON),
                 collection_name="test_legal_docs",
-                qdrant_url="http://localhost:6333"
+                qdrant_url="http://localhost:6333",
+                parent_store_path=str(tmp_path / "parent_store"),
             )
             
             # Verify calls — ensure_collection_exists path
@@ -272,6 +333,24 @@ class TestIngestionPipeline:
             assert result["status"] == "success"
             assert result["documents_loaded"] == 10
             assert result["chunks_new"] >= 1
+            assert result["parents_written"] >= 1
+            assert (tmp_path / "parent_store" / "index.json").exists()
+
+    def test_script_runs_from_backend_dir(self):
+        """The documented `cd backend && python scripts/ingest.py` form resolves its imports."""
+        import subprocess
+        import sys
+
+        backend_dir = Path(__file__).resolve().parent.parent / "backend"
+        proc = subprocess.run(
+            [sys.executable, "scripts/ingest.py", "--help"],
+            cwd=backend_dir,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert proc.returncode == 0, proc.stderr[-2000:]
+        assert "--parent-store" in proc.stdout
 
 
 class TestCitationFormat:
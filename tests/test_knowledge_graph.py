@@ -632,3 +632,49 @@ class TestSupersedes:
         assert kg.graph.has_edge("uu_13_2003", "uu_5_1999")
         edge = kg.graph.edges["uu_13_2003", "uu_5_1999"]
         assert edge["edge_type"] == EdgeType.SUPERSEDES.value
+
+
+# ── Precomputed Regulation Adjacency ─────────────────────────────────────────
+
+
+class TestRegulationAdjacency:
+    """Precomputed adjacency sets must agree with get_related_regulations BFS."""
+
+    @staticmethod
+    def _bfs_ids(kg: LegalKnowledgeGraph, reg_id: str, max_hops: int) -> set[str]:
+        return {n["id"] for n in kg.get_related_regulations(reg_id, max_hops=max_hops, timeout_ms=5000)}
+
+    def test_matches_bfs(self, populated_graph: LegalKnowledgeGraph, uu_pdp: Law) -> None:
+        populated_graph.add_edge("uu_27_2022", "pp_24_2018", EdgeType.REFERENCES)
+        populated_graph.build_regulation_adjacency()
+        for reg_id in ("uu_11_2020", "pp_24_2018", "perpres_49_2021", "uu_27_2022"):
+            for hops in (1, 2):
+                assert populated_graph.get_related_regulation_ids([reg_id], max_hops=hops) == \
+                    self._bfs_ids(populated_graph, reg_id, hops), (reg_id, hops)
+
+    def test_union_over_sources(self, populated_graph: LegalKnowledgeGraph) -> None:
+        related = populated_graph.get_related_regulation_ids(["pp_24_2018", "perpres_49_2021"], max_hops=1)
+        assert related == {"uu_11_2020"}
+
+    def test_two_hop_reaches_siblings(self, populated_graph: LegalKnowledgeGraph) -> None:
+        related = populated_graph.get_related_regulation_ids(["pp_24_2018"], max_hops=2)
+        assert related == {"uu_11_2020", "perpres_49_2021"}
+
+    def test_zero_hops_relate_nothing(self, populated_graph: LegalKnowledgeGraph) -> None:
+        assert populated_graph.get_related_regulation_ids(["pp_24_2018"], max_hops=0) == set()
+        assert populated_graph.get_related_regulation_ids(["pp_24_2018"], max_hops=-1) == set()
+
+    def test_unknown_and_structural_ids_ignored(self, populated_graph: LegalKnowledgeGraph) -> None:
+        assert populated_graph.get_related_regulation_ids(["uu_99_1900", "uu_11_2020_pasal_5"]) == set()
+
+    def test_rebuilt_after_mutation(self, populated_graph: LegalKnowledgeGraph) -> None:
+        assert populated_graph.get_related_regulation_ids(["uu_27_2022"]) == set()
+        populated_graph.add_edge("uu_27_2022", "uu_11_2020", EdgeType.AMENDS)
+        assert populated_graph.get_related_regulation_ids(["uu_27_2022"]) == {"uu_11_2020"}
+
+    def test_built_on_load(self, populated_graph: LegalKnowledgeGraph) -> None:
+        restored = LegalKnowledgeGraph.from_dict(populated_graph.to_dict())
+        assert restored._reg_codes is not None
+        codes = restored.regulation_codes(["uu_11_2020"])
+        assert len(codes) == 1
+        assert len(restored.related_regulation_codes(codes, max_hops=1)) == 2
@@ -0,0 +1,144 @@
+"""
+Unit tests for the persistent auxiliary LLM generation cache.
+
+Covers: question normalization, client identity, get/set with TTL and LRU
+eviction, persistence across instances, get_or_generate pass-through rules,
+and HyDE / QueryPlanner / CRAG integration.
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from llm_cache import LLMCache, client_identity, normalize_question
+
+
+class FakeClient:
+    """Minimal LLM client with a real model name (mocks are never cached)."""
+
+    def __init__(self, response: str = "jawaban", model: str = "test-model"):
+        self.model = model
+        self.response = response
+        self.calls = 0
+
+    def generate(self, user_message, system_message=None):
+        self.calls += 1
+        return self.response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(tmp_path / "cache.sqlite3", ttl_seconds=3600, max_entries=100)
+
+
+class TestKeys:
+    def test_normalize_question(self):
+        assert normalize_question("  Apa itu  PT ?") == normalize_question("apa itu pt?")
+        assert normalize_question("Apa itu PT") != normalize_question("Apa itu CV")
+
+    def test_key_depends_on_every_component(self):
+        base = LLMCache.make_key("hyde", "1", "GroqClient", "m", "Apa itu PT?")
+        assert base == LLMCache.make_key("hyde", "1", "GroqClient", "m", "apa itu pt")
+        assert base != LLMCache.make_key("hyde", "2", "GroqClient", "m", "Apa itu PT?")
+        assert base != LLMCache.make_key("rephrase", "1", "GroqClient", "m", "Apa itu PT?")
+        assert base != LLMCache.make_key("hyde", "1", "GeminiClient", "m", "Apa itu PT?")
+        assert base != LLMCache.make_key("hyde", "1", "GroqClient", "m2", "Apa itu PT?")
+
+    def test_client_identity(self):
+        assert client_identity(FakeClient(model="llama")) == ("FakeClient", "llama")
+        assert client_identity(MagicMock()) is None
+
+    def test_fallback_chain_identity(self):
+        chain = MagicMock()
+        chain.providers = [("groq", FakeClient(model="a")), ("gemini", FakeClient(model="b"))]
+        assert client_identity(chain) == ("fallback[groq,gemini]", "a,b")
+
+
+class TestLLMCache:
+    def test_get_or_generate_caches(self, cache):
+        client = FakeClient()
+        first = cache.get_or_generate("hyde", "1", client, "Apa itu PT?", lambda: client.generate(""))
+        second = cache.get_or_generate("hyde", "1", client, "apa itu pt", lambda: client.generate(""))
+        assert first == second == "jawaban"
+        assert client.calls == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        LLMCache(path).set("k", "v")
+        assert LLMCache(path).get("k") == "v"
+
+    def test_ttl_expiry(self, cache):
+        with patch("llm_cache.time.time", return_value=1000.0):
+            cache.set("k", "v")
+        with patch("llm_cache.time.time", return_value=1000.0 + 3601):
+            assert cache.get("k") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        cache = LLMCache(tmp_path / "c.sqlite3", max_entries=2)
+        now = time.time()
+        with patch("llm_cache.time.time", side_effect=[now, now + 1, now + 2, now + 3]):
+            cache.set("a", "1")
+            cache.set("b", "2")
+            cache.get("a")  # a is now more recent than b
+            cache.set("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_failures_and_empty_outputs_not_cached(self, cache):
+        client = FakeClient()
+
+        def boom():
+            raise RuntimeError("LLM down")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_generate("hyde", "1", client, "q", boom)
+        cache.get_or_generate("hyde", "1", client, "q", lambda: "  ")
+        assert cache.stats()["entries"] == 0
+
+    def test_unidentified_client_bypasses_cache(self, cache):
+        generate = MagicMock(return_value="x")
+        cache.get_or_generate("hyde", "1", MagicMock(), "q", generate)
+        cache.get_or_generate("hyde", "1", MagicMock(), "q", generate)
+        assert generate.call_count == 2
+        assert cache.stats()["entries"] == 0
+
+
+class TestIntegration:
+    def test_hyde_repeat_question_skips_llm(self, cache):
+        from hyde import HyDE
+
+        client = FakeClient(response="Hipotetikal PT")
+        hyde = HyDE(client, cache=cache)
+        assert hyde.generate_hypothetical("Apa itu PT?") == "Hipotetikal PT"
+        assert hyde.generate_hypothetical("apa itu PT") == "Hipotetikal PT"
+        assert client.calls == 1
+
+    def test_decompose_and_rephrase_use_separate_entries(self, cache):
+        from crag import CRAG
+        from query_planner import QueryPlanner
+
+        client = FakeClient(response="1. Sub A\n2. Sub B")
+        planner = QueryPlanner(client, cache=cache)
+        crag = CRAG(client, cache=cache)
+
+        assert planner.decompose("PT dan CV") == ["Sub A", "Sub B"]
+        assert planner.decompose("PT dan CV") == ["Sub A", "Sub B"]
+        crag.rephrase_query("PT dan CV")
+
+        assert client.calls == 2  # one decompose + one rephrase
+        assert cache.stats()["entries"] == 2
+
+    async def test_aget_or_generate_shares_entries(self, cache):
+        client = FakeClient()
+
+        async def agenerate():
+            return client.generate("")
+
+        first = await cache.aget_or_generate("hyde", "1", client, "Apa itu PT?", agenerate)
+        second = cache.get_or_generate("hyde", "1", client, "apa itu pt", lambda: client.generate(""))
+        assert first == second == "jawaban"
+        assert client.calls == 1
@@ -9,8 +9,9 @@ import logging
 import os
 import time
 import threading
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
+import httpx
 import pytest
 import requests as req
 from typing import Any
@@ -30,6 +31,8 @@ from backend.llm_client import (
     CircuitBreaker,
     FallbackChain,
     KNOWN_PROVIDERS,
+    async_generate,
+    async_generate_stream,
 )
 
 
@@ -700,6 +703,29 @@ class TestOpenAICompatibleClient:
         chunks = list(client.generate_stream("hello"))
         assert chunks == ["Hello", " world"]
 
+    @patch("llm_client.requests.post")
+    def test_per_call_options_do_not_mutate_client(self, mock_post):
+        """max_tokens/temperature apply to one call only."""
+        mock_post.return_value = _mock_chat_response("tuned")
+        client = OpenAICompatibleClient(
+            base_url="https://api.example.com/v1/chat/completions",
+            api_key="test-key",  # pragma: allowlist secret
+            model="test-model",
+            max_tokens=1000,
+            temperature=0.5,
+        )
+        client.generate("hello", max_tokens=3000, temperature=0.1)
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["max_tokens"] == 3000
+        assert payload["temperature"] == 0.1
+        assert client.max_tokens == 1000
+        assert client.temperature == 0.5
+
+        client.generate("hello")
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["max_tokens"] == 1000
+        assert payload["temperature"] == 0.5
+
 
 # ---------------------------------------------------------------------------
 # GroqClient tests
@@ -983,3 +1009,137 @@ class TestFallbackChain:
         ])
         with pytest.raises(RuntimeError, match="All providers in fallback chain failed"):
             list(chain.generate_stream("question"))
+
+    def test_forwards_generation_options(self):
+        name, client = self._make_provider("groq", "groq answer")
+        chain = FallbackChain([(name, client)])
+        chain.generate("question", max_tokens=100, temperature=0.2)
+        client.generate.assert_called_once_with("question", None, max_tokens=100, temperature=0.2)
+
+    def test_omits_unset_generation_options(self):
+        name, client = self._make_provider("groq", "groq answer")
+        chain = FallbackChain([(name, client)])
+        list(chain.generate_stream("question", temperature=0.3))
+        client.generate_stream.assert_called_once_with("question", None, temperature=0.3)
+
+
+# ---------------------------------------------------------------------------
+# Async generation
+# ---------------------------------------------------------------------------
+
+
+def _openai_response(content="Halo"):
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+def _mock_async_http(handler):
+    """Serve the shared async HTTP client from ``handler`` (no network)."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return patch("backend.llm_client._async_http", return_value=client)
+
+
+class TestAsyncGeneration:
+    """Native agenerate/agenerate_stream and the sync-client bridges."""
+
+    async def test_agenerate_sends_per_call_options(self):
+        seen = []
+
+        def handler(request):
+            seen.append(json.loads(request.content))
+            return _openai_response()
+
+        client = GroqClient(api_key="test-key")
+        with _mock_async_http(handler):
+            result = await client.agenerate("Apa itu PT?", "sys", max_tokens=50, temperature=0.1)
+
+        assert result == "Halo"
+        assert seen[0]["max_tokens"] == 50
+        assert seen[0]["temperature"] == 0.1
+        assert seen[0]["messages"][0] == {"role": "system", "content": "sys"}
+        assert seen[0]["stream"] is False
+        assert (client.max_tokens, client.temperature) != (50, 0.1)
+
+    async def test_agenerate_stream_parses_sse(self):
+        body = "".join(
+            f"data: {json.dumps({'choices': [{'delta': {'content': part}}]})}\n\n"
+            for part in ("Ha", "lo")
+        ) + "data: [DONE]\n\n"
+        client = GroqClient(api_key="test-key")
+        with _mock_async_http(lambda request: httpx.Response(200, text=body)):
+            chunks = [chunk async for chunk in client.agenerate_stream("q")]
+        assert chunks == ["Ha", "lo"]
+
+    async def test_agenerate_retries_then_succeeds(self):
+        responses = [httpx.Response(503), _openai_response("ok")]
+        client = GroqClient(api_key="test-key")
+        with (
+            _mock_async_http(lambda request: responses.pop(0)),
+            patch("backend.llm_client.asyncio.sleep", new=AsyncMock()) as sleep,
+        ):
+            assert await client.agenerate("q") == "ok"
+        sleep.assert_awaited_once_with(1)
+
+    async def test_agenerate_all_attempts_fail(self):
+        client = GroqClient(api_key="test-key")
+        with (
+            _mock_async_http(lambda request: httpx.Response(500)),
+            patch("backend.llm_client.asyncio.sleep", new=AsyncMock()),
+        ):
+            with pytest.raises(RuntimeError, match="failed after 3 attempts"):
+                await client.agenerate("q")
+
+    async def test_copilot_refreshes_token_on_401(self):
+        client = CopilotChatClient.__new__(CopilotChatClient)
+        client.model = "gpt-4o-mini"
+        client.max_tokens = 100
+        client.temperature = 0.1
+        client._bearer_token = "old"
+        client._token_expires_at = time.time() + 3600
+
+        def refresh():
+            client._bearer_token = "new"
+
+        client._exchange_and_store_token = refresh
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers["Authorization"])
+            return httpx.Response(401) if len(seen) == 1 else _openai_response("ok")
+
+        with _mock_async_http(handler):
+            assert await client.agenerate("q") == "ok"
+        assert seen == ["Bearer old", "Bearer new"]
+
+    async def test_async_generate_bridges_sync_client(self):
+        client = MagicMock()
+        client.generate.return_value = "sync"
+        assert await async_generate(client, "q", max_tokens=10) == "sync"
+        client.generate.assert_called_once_with(user_message="q", max_tokens=10)
+
+    async def test_async_generate_stream_bridges_sync_generator(self):
+        client = MagicMock()
+        client.generate_stream.return_value = iter(["a", "b"])
+        assert [chunk async for chunk in async_generate_stream(client, "q")] == ["a", "b"]
+
+    async def test_async_generate_stream_propagates_errors(self):
+        client = MagicMock()
+        client.generate_stream.side_effect = RuntimeError("boom")
+        with pytest.raises(RuntimeError, match="boom"):
+            [chunk async for chunk in async_generate_stream(client, "q")]
+
+    async def test_fallback_chain_agenerate(self):
+        failing = MagicMock()
+        failing.generate.side_effect = RuntimeError("down")
+        working = MagicMock()
+        working.generate.return_value = "gemini answer"
+        chain = FallbackChain([("groq", failing), ("gemini", working)])
+
+        assert await chain.agenerate("question", temperature=0.2) == "gemini answer"
+        working.generate.assert_called_once_with(user_message="question", temperature=0.2)
+        assert chain.circuit_breakers["groq"].consecutive_failures == 1
+
+    async def test_fallback_chain_agenerate_stream(self):
+        working = MagicMock()
+        working.generate_stream.return_value = iter(["x", "y"])
+        chain = FallbackChain([("groq", working)])
+        assert [chunk async for chunk in chain.agenerate_stream("question")] == ["x", "y"]
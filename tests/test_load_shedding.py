@@ -0,0 +1,140 @@
+"""
+Unit tests for route cost classes, per-class admission and degradation.
+
+Covers: route classification under /api and /api/v1, per-class in-flight
+limits (cheap capacity unaffected by expensive load), the degrade plan
+applied to query kwargs, SLO-driven plan selection, and the ASGI
+middleware's 503 + Retry-After, and health/metrics paths bypassing it.
+"""
+
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from load_shedding import (
+    CHEAP,
+    EXEMPT,
+    EXPENSIVE,
+    NORMAL_PLAN,
+    AdmissionMiddleware,
+    DegradePlan,
+    LoadShedder,
+    route_cost,
+)
+
+
+def _pool(wait: float = 0.0, retry_after: int = 4):
+    pool = MagicMock()
+    pool.estimated_wait.return_value = wait
+    pool.retry_after.return_value = retry_after
+    return pool
+
+
+class TestRouteCost:
+    def test_expensive_routes(self):
+        for path in ("/api/ask", "/api/v1/ask", "/api/v1/ask/stream", "/api/ask/followup",
+                     "/api/v1/compliance/check", "/api/guidance/"):
+            assert route_cost(path) == EXPENSIVE, path
+
+    def test_cheap_routes(self):
+        for path in ("/api/v1/graph/laws", "/api/regulations", "/api/v1/metrics/pool",
+                     "/api/v1/document-types", "/api/v1/asked", "/healthz"):
+            assert route_cost(path) == CHEAP, path
+
+    def test_exempt_routes(self):
+        for path in ("/health", "/health/live", "/health/ready", "/metrics"):
+            assert route_cost(path) == EXEMPT, path
+
+
+class TestDegradePlan:
+    def test_normal_plan_is_identity(self):
+        kwargs = {"top_k": 10, "llm_client": None}
+        assert NORMAL_PLAN.apply(kwargs) is kwargs
+        assert NORMAL_PLAN.cap_top_k(10) == 10
+
+    def test_degraded_plan_skips_expensive_stages(self):
+        plan = DegradePlan(degraded=True, top_k_cap=3)
+        applied = plan.apply({"top_k": 10, "skip_grounding": False, "mode": "verbatim"})
+        assert applied == {
+            "top_k": 3,
+            "skip_grounding": True,
+            "mode": "verbatim",
+            "use_hyde": False,
+            "use_decomposition": False,
+        }
+        assert plan.cap_top_k(2) == 2
+        assert plan.cap_top_k(None) == 3
+
+
+class TestLoadShedder:
+    def test_classes_have_separate_limits(self):
+        shedder = LoadShedder(_pool(), max_expensive=1, max_cheap=2)
+        assert shedder.try_admit(EXPENSIVE)
+        assert not shedder.try_admit(EXPENSIVE)
+        assert shedder.try_admit(CHEAP)
+        assert shedder.try_admit(CHEAP)
+        shedder.release(EXPENSIVE)
+        assert shedder.try_admit(EXPENSIVE)
+
+        classes = shedder.snapshot()["classes"]
+        assert classes[EXPENSIVE] == {"limit": 1, "in_flight": 1, "rejected": 1}
+        assert classes[CHEAP]["in_flight"] == 2
+
+    def test_plan_degrades_past_slo(self):
+        pool = _pool(wait=2.0)
+        shedder = LoadShedder(pool, wait_slo=5, degraded_top_k=3)
+        assert shedder.plan() is NORMAL_PLAN
+
+        pool.estimated_wait.return_value = 8.0
+        plan = shedder.plan()
+        assert plan.degraded and plan.top_k_cap == 3
+        assert shedder.snapshot()["degraded"] == 1
+
+    def test_zero_slo_never_degrades(self):
+        shedder = LoadShedder(_pool(wait=100.0), wait_slo=0)
+        assert shedder.plan() is NORMAL_PLAN
+
+
+class TestAdmissionMiddleware:
+    def test_rejects_over_limit_with_retry_after(self):
+        shedder = LoadShedder(_pool(retry_after=9), max_expensive=1, max_cheap=5)
+        app = FastAPI()
+        app.add_middleware(AdmissionMiddleware, shedder=shedder)
+
+        @app.post("/api/ask")
+        async def ask():
+            return {"ok": True}
+
+        @app.get("/api/regulations")
+        async def regulations():
+            return {"ok": True}
+
+        client = TestClient(app)
+        assert client.post("/api/ask").status_code == 200
+        assert shedder.in_flight[EXPENSIVE] == 0
+
+        shedder.try_admit(EXPENSIVE)  # simulate one long-running question
+        response = client.post("/api/ask")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "9"
+        assert client.get("/api/regulations").status_code == 200
+
+    def test_health_probes_bypass_admission(self):
+        shedder = LoadShedder(_pool(), max_expensive=1, max_cheap=1)
+        app = FastAPI()
+        app.add_middleware(AdmissionMiddleware, shedder=shedder)
+
+        @app.get("/health/live")
+        async def live():
+            return {"status": "alive"}
+
+        @app.get("/api/regulations")
+        async def regulations():
+            return {"ok": True}
+
+        client = TestClient(app)
+        shedder.try_admit(CHEAP)  # cheap class saturated
+        assert client.get("/api/regulations").status_code == 503
+        assert client.get("/health/live").status_code == 200
+        assert shedder.rejected[CHEAP] == 1
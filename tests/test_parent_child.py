@@ -253,3 +253,15 @@ class TestParentChildRetriever:
         assert len(results) == 1
         assert results[0].text == "Full text of Pasal 1."
         assert results[0].citation_id == "UU_1"
+
+    def test_expand_given_results_without_retrieval(self, mock_retriever):
+        """expand() maps an existing result list to parents and never searches."""
+        parent_store = {"UU_40_2007_Pasal_1": "Full text of Pasal 1."}
+        children = [_make_search_result(1, "UU_1"), _make_search_result(2, "UU_2")]
+
+        pcr = ParentChildRetriever(parent_store=parent_store)
+        results = pcr.expand(children, top_k=5)
+
+        assert [r.text for r in results] == ["Full text of Pasal 1."]
+        assert results[0].citation_id == "UU_1"
+        mock_retriever.hybrid_search.assert_not_called()
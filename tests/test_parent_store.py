@@ -0,0 +1,109 @@
+"""
+Unit tests for the offset-indexed, memory-mapped parent store.
+
+Covers: write/read round trip, lazy opening, non-ASCII offsets, incremental
+append (unchanged parents skipped, changed ones superseded), full rewrite,
+and use as ParentChildRetriever's parent store.
+"""
+
+from unittest.mock import Mock
+
+from backend.parent_child import ParentChildRetriever
+from backend.parent_store import DATA_FILE, ParentStore
+from backend.retriever import SearchResult
+
+
+PARENTS = {
+    "UU_40_2007_Pasal32": "Pasal 32\n(1) Modal dasar paling sedikit Rp50.000.000.",
+    "UU_11_2020_Pasal1": "Pasal 1 — ketentuan umum “Cipta Kerja”.",
+}
+
+
+class TestParentStore:
+    def test_round_trip(self, tmp_path):
+        assert ParentStore.write(tmp_path, PARENTS) == 2
+        store = ParentStore(tmp_path)
+        assert dict(store) == PARENTS
+        assert len(store) == 2
+        assert "UU_40_2007_Pasal32" in store
+        assert store.get("missing") is None
+
+    def test_opens_lazily(self, tmp_path):
+        ParentStore.write(tmp_path, PARENTS)
+        store = ParentStore(tmp_path)
+        assert store._index is None
+        assert store.get("UU_11_2020_Pasal1") == PARENTS["UU_11_2020_Pasal1"]
+        assert store._index is not None
+
+    def test_exists(self, tmp_path):
+        assert not ParentStore.exists(tmp_path)
+        ParentStore.write(tmp_path, PARENTS)
+        assert ParentStore.exists(tmp_path)
+
+    def test_append_skips_unchanged_and_supersedes_changed(self, tmp_path):
+        ParentStore.write(tmp_path, PARENTS)
+        size = (tmp_path / DATA_FILE).stat().st_size
+
+        assert ParentStore.write(tmp_path, PARENTS, append=True) == 0
+        assert (tmp_path / DATA_FILE).stat().st_size == size
+
+        written = ParentStore.write(
+            tmp_path,
+            {"UU_11_2020_Pasal1": "Pasal 1 (diubah)", "PP_5_2021_Pasal2": "Pasal 2"},
+            append=True,
+        )
+        assert written == 2
+        store = ParentStore(tmp_path)
+        assert store["UU_11_2020_Pasal1"] == "Pasal 1 (diubah)"
+        assert store["UU_40_2007_Pasal32"] == PARENTS["UU_40_2007_Pasal32"]
+        assert store["PP_5_2021_Pasal2"] == "Pasal 2"
+
+    def test_rewrite_replaces_store(self, tmp_path):
+        ParentStore.write(tmp_path, PARENTS)
+        ParentStore.write(tmp_path, {"A": "a"})
+        assert dict(ParentStore(tmp_path)) == {"A": "a"}
+
+    def test_close_and_reopen(self, tmp_path):
+        ParentStore.write(tmp_path, PARENTS)
+        store = ParentStore(tmp_path)
+        assert len(store) == 2
+        store.close()
+        assert store["UU_40_2007_Pasal32"] == PARENTS["UU_40_2007_Pasal32"]
+
+
+class TestParentChildIntegration:
+    def test_expand_reads_from_store(self, tmp_path):
+        ParentStore.write(tmp_path, PARENTS)
+        store = ParentStore(tmp_path)
+        pcr = ParentChildRetriever(parent_store=store)
+        assert store._index is None  # constructing the retriever does not open it
+
+        child = SearchResult(
+            id="1",
+            text="Modal dasar paling sedikit Rp50.000.000.",
+            citation="UU 40/2007 Pasal 32 Ayat 1",
+            citation_id="UU_40_2007_Pasal32_Ayat1",
+            score=0.9,
+            metadata={"parent_citation_id": "UU_40_2007_Pasal32"},
+        )
+        results = pcr.expand([child], top_k=5)
+
+        assert results[0].text == PARENTS["UU_40_2007_Pasal32"]
+        assert results[0].citation_id == "UU_40_2007_Pasal32_Ayat1"
+
+    def test_enhanced_search_with_store(self, tmp_path):
+        ParentStore.write(tmp_path, PARENTS)
+        retriever = Mock()
+        retriever.hybrid_search.return_value = [
+            SearchResult(
+                id="2",
+                text="ketentuan umum",
+                citation="UU 11/2020 Pasal 1",
+                citation_id="UU_11_2020_Pasal1",
+                score=0.8,
+                metadata={"parent_citation_id": "UU_11_2020_Pasal1"},
+            )
+        ]
+        pcr = ParentChildRetriever(parent_store=ParentStore(tmp_path))
+        results = pcr.enhanced_search("Apa itu Cipta Kerja?", retriever, top_k=1)
+        assert results[0].text == PARENTS["UU_11_2020_Pasal1"]
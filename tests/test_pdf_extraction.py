@@ -0,0 +1,159 @@
+"""
+Unit tests for process-pool PDF extraction.
+
+Covers: page-ordered streaming, the page and character limits, the
+content-hash cache (a repeat upload never reaches the pool), corrupt
+input, the per-document timeout with pool recovery (also when several
+documents share the timed-out pool), concurrent documents, and
+/compliance/check reading an uploaded PDF.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pdf_extraction import PdfExtractionError, PdfExtractionTimeout, PdfExtractor
+from rag_chain import ConfidenceScore, RAGResponse, ValidationResult
+
+
+def _make_pdf(pages: list[str]) -> bytes:
+    """Minimal PDF with one line of Helvetica text per page."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "",  # page tree, filled in below
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    pool = PdfExtractor(max_workers=2, timeout=60, max_pages=5, batch_pages=2, max_chars=0)
+    yield pool
+    pool.shutdown()
+
+
+class TestExtraction:
+    async def test_pages_stream_in_order_up_to_page_limit(self, extractor):
+        pdf = _make_pdf([f"Halaman {i}" for i in range(1, 8)])
+
+        pages = [page async for page in extractor.iter_pages(pdf)]
+
+        assert pages == [(i, f"Halaman {i}") for i in range(1, 6)]
+
+    async def test_extract_reports_truncation(self, extractor):
+        extraction = await extractor.extract(_make_pdf([f"Pasal {i}" for i in range(1, 8)]))
+        assert extraction.page_count == 7
+        assert extraction.truncated
+        assert extraction.text.splitlines() == [f"Pasal {i}" for i in range(1, 6)]
+
+    async def test_stops_at_char_budget(self):
+        budgeted = PdfExtractor(max_workers=1, timeout=60, batch_pages=1, max_chars=12)
+        try:
+            extraction = await budgeted.extract(_make_pdf(["Kontrak A", "Kontrak B", "Kontrak C"]))
+        finally:
+            budgeted.shutdown()
+        assert extraction.pages == ["Kontrak A", "Kontrak B"]
+        assert extraction.truncated
+
+    async def test_repeat_upload_skips_parsing(self, extractor):
+        pdf = _make_pdf(["Perjanjian sewa", "Lampiran"])
+        first = await extractor.extract(pdf)
+        hits = extractor.snapshot()["cache_hits"]
+
+        with patch.object(extractor, "_get_executor", side_effect=AssertionError("parsed again")):
+            second = await extractor.extract(pdf)
+
+        assert not first.cached and second.cached
+        assert second.pages == first.pages
+        assert extractor.snapshot()["cache_hits"] == hits + 1
+
+    async def test_corrupt_pdf_raises(self, extractor):
+        with pytest.raises(PdfExtractionError):
+            await extractor.extract(b"%PDF-1.4 not really a pdf")
+
+    async def test_concurrent_documents(self, extractor):
+        docs = [_make_pdf([f"Dokumen {d} halaman {p}" for p in range(1, 4)]) for d in range(4)]
+        results = await asyncio.gather(*(extractor.extract(doc) for doc in docs))
+        assert [r.pages[0] for r in results] == [f"Dokumen {d} halaman 1" for d in range(4)]
+
+
+class TestTimeout:
+    async def test_timeout_then_pool_recovers(self):
+        slow = PdfExtractor(max_workers=1, timeout=0.001)
+        pdf = _make_pdf(["Satu"])
+        try:
+            with pytest.raises(PdfExtractionTimeout):
+                await slow.extract(pdf)
+            assert slow.snapshot()["timeouts"] == 1
+
+            slow.timeout = 60
+            assert (await slow.extract(pdf)).pages == ["Satu"]
+        finally:
+            slow.shutdown()
+
+    async def test_documents_sharing_a_timed_out_pool(self):
+        slow = PdfExtractor(max_workers=2, timeout=0.001, batch_pages=1)
+        docs = [_make_pdf([f"Dokumen {d} halaman {p}" for p in range(1, 4)]) for d in range(2)]
+        try:
+            results = await asyncio.gather(*(slow.extract(doc) for doc in docs), return_exceptions=True)
+            assert all(isinstance(r, PdfExtractionError) for r in results), results
+
+            slow.timeout = 60
+            assert (await slow.extract(docs[0])).pages[0] == "Dokumen 0 halaman 1"
+        finally:
+            slow.shutdown()
+
+
+class TestCompliancePdfUpload:
+    def test_pdf_text_reaches_the_prompt(self, test_client):
+        pdf = _make_pdf(["Usaha restoran di Jakarta tanpa NIB", "Karyawan 25 orang"])
+        with patch("main.rag_chain") as mock_chain:
+            mock_chain.query.return_value = RAGResponse(
+                answer="Perlu NIB [1].",
+                citations=[],
+                sources=[],
+                confidence="sedang",
+                confidence_score=ConfidenceScore(numeric=0.6, label="sedang", top_score=0.7, avg_score=0.6),
+                raw_context="",
+                validation=ValidationResult(is_valid=True, citation_coverage=1.0, hallucination_risk="low"),
+            )
+            mock_chain.llm_client = MagicMock()
+            response = test_client.post(
+                "/api/v1/compliance/check",
+                files={"pdf_file": ("usaha.pdf", pdf, "application/pdf")},
+            )
+
+        assert response.status_code == 200
+        prompt = mock_chain.query.call_args.kwargs["question"]
+        assert "Usaha restoran di Jakarta tanpa NIB" in prompt
+        assert "Karyawan 25 orang" in prompt
+
+    def test_oversized_pdf_is_413(self, test_client):
+        with patch("main.rag_chain"):
+            response = test_client.post(
+                "/api/v1/compliance/check",
+                files={"pdf_file": ("big.pdf", b"0" * (10 * 1024 * 1024 + 1), "application/pdf")},
+            )
+        assert response.status_code == 413
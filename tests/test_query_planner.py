@@ -172,3 +172,200 @@ class TestQueryPlanner:
         assert mock_retriever.hybrid_search.call_count >= 2
         # Result should be whatever retriever.search returns on fallback; since side_effect exhausted, subsequent calls return the last value
         assert isinstance(res, list)
+
+
+class TestParallelSubQueries:
+    def test_sub_queries_run_concurrently(self, mock_llm_client, mock_retriever):
+        import threading
+
+        mock_llm_client.generate.return_value = "1. A\n2. B\n3. C"
+        barrier = threading.Barrier(3, timeout=5)
+
+        def search(query, top_k=5):
+            barrier.wait()  # only passes if all three searches run at once
+            return [_make_search_result(ord(query), f"UU_{query}")]
+
+        mock_retriever.hybrid_search.side_effect = search
+
+        planner = QueryPlanner(mock_llm_client, max_workers=3)
+        res = planner.multi_hop_search("Perbedaan PT dan CV", mock_retriever, top_k=5)
+
+        assert sorted(r.citation_id for r in res) == ["UU_A", "UU_B", "UU_C"]
+
+    def test_slow_sub_query_dropped_at_deadline(self, mock_llm_client, mock_retriever):
+        import threading
+
+        mock_llm_client.generate.return_value = "1. cepat\n2. lambat"
+        release = threading.Event()
+
+        def search(query, top_k=5):
+            if query == "lambat":
+                release.wait(5)
+            return [_make_search_result(len(query), f"UU_{query}")]
+
+        mock_retriever.hybrid_search.side_effect = search
+
+        planner = QueryPlanner(mock_llm_client, subquery_timeout=0.2)
+        try:
+            res = planner.multi_hop_search("Perbedaan PT dan CV", mock_retriever, top_k=5)
+        finally:
+            release.set()
+
+        assert [r.citation_id for r in res] == ["UU_cepat"]
+
+    def test_failed_sub_query_degrades(self, mock_llm_client, mock_retriever):
+        mock_llm_client.generate.return_value = "1. ok\n2. rusak"
+
+        def search(query, top_k=5):
+            if query == "rusak":
+                raise RuntimeError("qdrant down")
+            return [_make_search_result(1, "UU_ok")]
+
+        mock_retriever.hybrid_search.side_effect = search
+
+        planner = QueryPlanner(mock_llm_client)
+        res = planner.multi_hop_search("Perbedaan PT dan CV", mock_retriever, top_k=5)
+
+        assert [r.citation_id for r in res] == ["UU_ok"]
+
+    def test_fallback_after_failed_sub_queries(self, mock_llm_client, mock_retriever):
+        mock_llm_client.generate.return_value = "1. rusak\n2. gagal"
+
+        def search(query, top_k=5):
+            if query in ("rusak", "gagal"):
+                raise RuntimeError("qdrant down")
+            return [_make_search_result(1, "UU_asli")]
+
+        mock_retriever.hybrid_search.side_effect = search
+
+        planner = QueryPlanner(mock_llm_client)
+        res = planner.multi_hop_search("Perbedaan PT dan CV", mock_retriever, top_k=5)
+
+        assert [r.citation_id for r in res] == ["UU_asli"]
+
+    def test_fallback_bounded_by_sub_query_deadline(self, mock_llm_client, mock_retriever):
+        import threading
+        import time
+
+        mock_llm_client.generate.return_value = "1. lambat\n2. pelan"
+        release = threading.Event()
+
+        def search(query, top_k=5):
+            release.wait(5)
+            return [_make_search_result(1, f"UU_{query}")]
+
+        mock_retriever.hybrid_search.side_effect = search
+
+        planner = QueryPlanner(mock_llm_client, subquery_timeout=0.2)
+        start = time.perf_counter()
+        try:
+            res = planner.multi_hop_search("Perbedaan PT dan CV", mock_retriever, top_k=5)
+        finally:
+            release.set()
+
+        assert res == []
+        assert time.perf_counter() - start < 1
+
+    def test_abandoned_searches_do_not_starve_next_request(self, mock_llm_client, mock_retriever):
+        import threading
+
+        release = threading.Event()
+
+        def search(query, top_k=5):
+            if query in ("lambat", "pelan"):
+                release.wait(5)
+            return [_make_search_result(len(query), f"UU_{query}")]
+
+        mock_retriever.hybrid_search.side_effect = search
+        planner = QueryPlanner(mock_llm_client, max_workers=2, subquery_timeout=0.3)
+        try:
+            # Both workers' worth of searches hang past the deadline ...
+            mock_llm_client.generate.return_value = "1. lambat\n2. pelan"
+            assert planner.multi_hop_search("Perbedaan PT dan CV", mock_retriever) == []
+            # ... yet the next request's sub-queries start right away
+            mock_llm_client.generate.return_value = "1. cepat\n2. kilat"
+            res = planner.multi_hop_search("Perbedaan PT dan CV serta CV", mock_retriever)
+        finally:
+            release.set()
+
+        assert sorted(r.citation_id for r in res) == ["UU_cepat", "UU_kilat"]
+
+    async def test_async_fallback_bounded_by_sub_query_deadline(self, mock_llm_client, mock_retriever):
+        import threading
+        import time
+
+        mock_llm_client.generate.return_value = "1. lambat\n2. pelan"
+        release = threading.Event()
+
+        def search(query, top_k=5):
+            release.wait(5)
+            return [_make_search_result(1, f"UU_{query}")]
+
+        mock_retriever.hybrid_search.side_effect = search
+
+        planner = QueryPlanner(mock_llm_client, subquery_timeout=0.2)
+        start = time.perf_counter()
+        try:
+            res = await planner.amulti_hop_search("Perbedaan PT dan CV", mock_retriever, top_k=5)
+        finally:
+            release.set()
+
+        assert res == []
+        assert time.perf_counter() - start < 1
+
+    def test_merge_order_follows_sub_queries(self, mock_llm_client, mock_retriever):
+        import time
+
+        mock_llm_client.generate.return_value = "1. pertama\n2. kedua"
+
+        def search(query, top_k=5):
+            if query == "pertama":
+                time.sleep(0.05)  # finishes last
+            return [_make_search_result(len(query), f"UU_{query}")]
+
+        mock_retriever.hybrid_search.side_effect = search
+
+        planner = QueryPlanner(mock_llm_client)
+        res = planner.multi_hop_search("Perbedaan PT dan CV", mock_retriever, top_k=5)
+
+        # Equal RRF scores: ties keep sub-query order, not completion order
+        assert [r.citation_id for r in res] == ["UU_pertama", "UU_kedua"]
+
+    def test_strategy_label_propagates_to_workers(self, mock_llm_client, mock_retriever):
+        from backend.stage_metrics import _current_strategy, retrieval_metrics
+
+        mock_llm_client.generate.return_value = "1. A\n2. B"
+        seen = []
+
+        def search(query, top_k=5):
+            seen.append(_current_strategy.get())
+            return []
+
+        mock_retriever.hybrid_search.side_effect = search
+
+        planner = QueryPlanner(mock_llm_client)
+        with retrieval_metrics.strategy("decomposition"):
+            planner.multi_hop_search("Perbedaan PT dan CV", mock_retriever, top_k=5)
+
+        assert seen[:2] == ["decomposition", "decomposition"]
+
+    async def test_async_multi_hop_drops_slow_sub_query(self, mock_llm_client, mock_retriever):
+        import threading
+
+        mock_llm_client.generate.return_value = "1. cepat\n2. lambat"
+        release = threading.Event()
+
+        def search(query, top_k=5):
+            if query == "lambat":
+                release.wait(5)
+            return [_make_search_result(len(query), f"UU_{query}")]
+
+        mock_retriever.hybrid_search.side_effect = search
+
+        planner = QueryPlanner(mock_llm_client, subquery_timeout=0.2)
+        try:
+            res = await planner.amulti_hop_search("Perbedaan PT dan CV", mock_retriever, top_k=5)
+        finally:
+            release.set()
+
+        assert [r.citation_id for r in res] == ["UU_cepat"]
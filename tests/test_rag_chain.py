@@ -5,7 +5,7 @@ Uses mocked NVIDIA NIM and retriever to avoid external dependencies.
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from rag_chain import (
     ConfidenceScore,
@@ -407,6 +407,204 @@ class TestQueryEndToEnd:
 # ---------------------------------------------------------------------------
 
 
+class TestPerCallClient:
+    """Per-call provider and generation options never mutate the shared chain."""
+
+    def test_override_client_used_for_generation(self):
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = _make_results(2)
+        default = MagicMock()
+        override = MagicMock()
+        override.generate.return_value = "Override [1]."
+
+        chain = LegalRAGChain(retriever=mock_r, llm_client=default)
+        resp = chain.query(
+            "Apa itu PT?", use_hyde=False, use_decomposition=False,
+            skip_grounding=True, llm_client=override,
+        )
+
+        assert resp.answer == "Override [1]."
+        default.generate.assert_not_called()
+        assert chain.llm_client is default
+
+    def test_tuning_passed_per_call(self):
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = _make_results(2)
+
+        class GroqLikeClient:
+            provider_name = "groq"
+            max_tokens = 999
+            temperature = 0.9
+
+            def __init__(self):
+                self.calls = []
+
+            def generate(self, user_message, system_message=None, max_tokens=None, temperature=None):
+                self.calls.append((max_tokens, temperature))
+                return "Jawaban [1]."
+
+        client = GroqLikeClient()
+        chain = LegalRAGChain(retriever=mock_r, llm_client=MagicMock())
+        chain.query(
+            "Apa itu PT?", use_hyde=False, use_decomposition=False,
+            skip_grounding=True, llm_client=client,
+        )
+
+        from prompts import PROVIDER_TUNING
+        assert client.calls == [
+            (PROVIDER_TUNING["groq"]["max_tokens"], PROVIDER_TUNING["groq"]["temperature"])
+        ]
+        assert (client.max_tokens, client.temperature) == (999, 0.9)
+
+    def test_stream_uses_override_client(self):
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = _make_results(2)
+        default = MagicMock()
+        override = MagicMock()
+        override.generate_stream.return_value = iter(["Stream [1]."])
+
+        chain = LegalRAGChain(retriever=mock_r, llm_client=default)
+        chain.grounding.verify = MagicMock(return_value=(0.9, []))
+        events = list(chain.query_stream("Apa itu PT?", llm_client=override))
+
+        assert ("chunk", "Stream [1].") in events
+        default.generate_stream.assert_not_called()
+        assert chain.grounding.verify.call_args.args[2] is override
+
+
+class AsyncOnlyClient:
+    """Client with native async methods; its sync methods must never be used."""
+
+    model = "async-model"
+
+    def __init__(self, answer: str = "Jawaban async [1]."):
+        self.answer = answer
+        self.calls = []
+
+    def generate(self, *args, **kwargs):
+        raise AssertionError("sync generate called from the async pipeline")
+
+    def generate_stream(self, *args, **kwargs):
+        raise AssertionError("sync generate_stream called from the async pipeline")
+
+    async def agenerate(self, user_message, system_message=None, max_tokens=None, temperature=None):
+        self.calls.append(system_message)
+        return self.answer
+
+    async def agenerate_stream(self, user_message, system_message=None, max_tokens=None, temperature=None):
+        self.calls.append(system_message)
+        for part in ("Jawaban ", "async [1]."):
+            yield part
+
+
+class TestAsyncQuery:
+    """aquery/aquery_stream run the pipeline natively and forward every option."""
+
+    async def test_aquery_uses_native_async_client(self):
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = _make_results(2)
+        client = AsyncOnlyClient()
+        chain = LegalRAGChain(retriever=mock_r, llm_client=client)
+
+        resp = await chain.aquery("Apa itu PT?", use_hyde=False, use_decomposition=False, skip_grounding=True)
+
+        assert resp.answer == "Jawaban async [1]."
+        assert resp.validation.hallucination_risk == "skipped"
+        assert len(client.calls) == 1
+
+    async def test_aquery_forwards_mode(self):
+        from rag_chain import VERBATIM_SYSTEM_PROMPT
+
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = _make_results(2)
+        client = AsyncOnlyClient()
+        chain = LegalRAGChain(retriever=mock_r, llm_client=client)
+
+        await chain.aquery(
+            "Apa itu PT?", mode="verbatim", use_hyde=False, use_decomposition=False, skip_grounding=True
+        )
+
+        assert client.calls == [VERBATIM_SYSTEM_PROMPT]
+
+    async def test_aquery_forwards_advanced_flags(self):
+        initial = _make_results(2, score_base=0.2)
+        corrected = _make_results(3, score_base=0.85)
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = initial
+        chain = LegalRAGChain(retriever=mock_r, llm_client=AsyncOnlyClient())
+        chain.crag.grade_retrieval = MagicMock(return_value="incorrect")
+        chain.crag.acorrect = AsyncMock(return_value=corrected)
+
+        resp = await chain.aquery(
+            "Test question", use_hyde=False, use_decomposition=False, use_crag=True, skip_grounding=True
+        )
+
+        chain.crag.acorrect.assert_awaited_once_with(
+            "Test question", initial, mock_r, top_k=chain.top_k, grade="incorrect"
+        )
+        assert len(resp.citations) == len(corrected)
+
+    async def test_aquery_uses_async_hyde(self):
+        results = _make_results(2)
+        chain = LegalRAGChain(retriever=MagicMock(), llm_client=AsyncOnlyClient())
+        chain.hyde.aenhanced_search = AsyncMock(return_value=results)
+        chain.hyde.enhanced_search = MagicMock()
+
+        await chain.aquery("Apa itu PT?", use_decomposition=False, skip_grounding=True)
+
+        chain.hyde.aenhanced_search.assert_awaited_once()
+        chain.hyde.enhanced_search.assert_not_called()
+
+    async def test_aquery_override_client(self):
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = _make_results(2)
+        default = AsyncOnlyClient("Default [1].")
+        override = AsyncOnlyClient("Override [1].")
+        chain = LegalRAGChain(retriever=mock_r, llm_client=default)
+
+        resp = await chain.aquery(
+            "Apa itu PT?", use_hyde=False, use_decomposition=False,
+            skip_grounding=True, llm_client=override,
+        )
+
+        assert resp.answer == "Override [1]."
+        assert default.calls == []
+
+    async def test_aquery_sync_only_client_runs_in_thread(self):
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = _make_results(2)
+        mock_l = MagicMock()
+        mock_l.generate.return_value = "Sync [1]."
+        chain = LegalRAGChain(retriever=mock_r, llm_client=mock_l)
+
+        resp = await chain.aquery("Apa itu PT?", use_hyde=False, use_decomposition=False, skip_grounding=True)
+
+        assert resp.answer == "Sync [1]."
+        mock_l.generate.assert_called_once()
+
+    async def test_aquery_stream_matches_sync_events(self):
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = _make_results(2)
+        client = AsyncOnlyClient()
+        chain = LegalRAGChain(retriever=mock_r, llm_client=client)
+        chain.grounding.averify = AsyncMock(return_value=(0.9, []))
+
+        events = [event async for event in chain.aquery_stream("Apa itu PT?")]
+
+        assert [e[0] for e in events] == ["metadata", "chunk", "chunk", "done"]
+        assert "".join(e[1] for e in events if e[0] == "chunk") == "Jawaban async [1]."
+        assert events[-1][1]["validation"]["grounding_score"] == 0.9
+
+    async def test_aquery_stream_no_results(self):
+        mock_r = MagicMock()
+        mock_r.hybrid_search.return_value = []
+        chain = LegalRAGChain(retriever=mock_r, llm_client=AsyncOnlyClient())
+
+        events = [event async for event in chain.aquery_stream("no results")]
+
+        assert events == list(chain.query_stream("no results"))
+
+
 class TestExtractJsonMetadata:
     """Tests for LegalRAGChain._extract_json_metadata."""
 
@@ -888,7 +1086,7 @@ class TestAdvancedRAGv2:
         assert resp.answer == "Answer [1] [2]."
 
     def test_query_with_parent_child_flag_with_store(self):
-        """Test use_parent_child=True with populated parent_store calls enhanced_search."""
+        """Test use_parent_child=True expands the retrieved results without re-retrieval."""
         results = _make_results(2)
         parent_results = _make_results(2, score_base=0.9)
         mock_r = MagicMock()
@@ -899,7 +1097,7 @@ class TestAdvancedRAGv2:
         chain = LegalRAGChain(retriever=mock_r, llm_client=mock_l)
         # Populate parent_store so parent-child is NOT skipped
         chain.parent_child.parent_store = {"UU_40_2007_Pasal_1": "Full parent text"}
-        chain.parent_child.enhanced_search = MagicMock(return_value=parent_results)
+        chain.parent_child.expand = MagicMock(return_value=parent_results)
         chain.crag.grade_retrieval = MagicMock(return_value="correct")
 
         resp = chain.query(
@@ -909,7 +1107,8 @@ class TestAdvancedRAGv2:
             use_decomposition=False,
         )
 
-        chain.parent_child.enhanced_search.assert_called_once()
+        chain.parent_child.expand.assert_called_once_with(results, top_k=chain.top_k)
+        mock_r.hybrid_search.assert_called_once()
         assert resp.answer == "Parent answer [1] [2]."
 
     def test_query_with_agentic_mode(self):
@@ -935,7 +1134,7 @@ class TestAdvancedRAGv2:
         assert resp.answer == "Agentic answer [1] [2]."
 
     def test_crag_quality_gate_applied_when_enabled(self):
-        """Test CRAG is applied when use_crag=True and triggers re-retrieval."""
+        """Test CRAG is applied when use_crag=True and corrects the retrieved results."""
         initial_results = _make_results(2, score_base=0.2)  # Low scores → incorrect grade
         corrected_results = _make_results(2, score_base=0.85)
         mock_r = MagicMock()
@@ -945,7 +1144,7 @@ class TestAdvancedRAGv2:
 
         chain = LegalRAGChain(retriever=mock_r, llm_client=mock_l)
         chain.crag.grade_retrieval = MagicMock(return_value="incorrect")
-        chain.crag.enhanced_search = MagicMock(return_value=corrected_results)
+        chain.crag.correct = MagicMock(return_value=corrected_results)
 
         resp = chain.query(
             "Test question",
@@ -954,9 +1153,12 @@ class TestAdvancedRAGv2:
             use_crag=True,
         )
 
-        # CRAG should grade and re-retrieve since grade is "incorrect"
+        # CRAG should grade and correct the initial results (no repeated initial search)
         chain.crag.grade_retrieval.assert_called_once()
-        chain.crag.enhanced_search.assert_called_once()
+        chain.crag.correct.assert_called_once_with(
+            "Test question", initial_results, mock_r, top_k=chain.top_k, grade="incorrect"
+        )
+        mock_r.hybrid_search.assert_called_once()
         assert resp.answer == "Corrected answer [1] [2]."
 
     def test_crag_correct_grade_keeps_results(self):
@@ -969,7 +1171,7 @@ class TestAdvancedRAGv2:
 
         chain = LegalRAGChain(retriever=mock_r, llm_client=mock_l)
         chain.crag.grade_retrieval = MagicMock(return_value="correct")
-        chain.crag.enhanced_search = MagicMock()
+        chain.crag.correct = MagicMock()
 
         resp = chain.query(
             "Test question",
@@ -980,7 +1182,7 @@ class TestAdvancedRAGv2:
 
         # CRAG graded "correct" → should NOT re-retrieve
         chain.crag.grade_retrieval.assert_called_once()
-        chain.crag.enhanced_search.assert_not_called()
+        chain.crag.correct.assert_not_called()
         assert resp.answer == "Good answer [1] [2]."
 
     def test_new_flags_backward_compatible(self):
@@ -259,6 +259,22 @@ class TestRegulationDetail:
         assert data["id"] == "uu_11_2020"
         assert "chapters" in data
 
+    def test_get_regulation_detail_indexed_aggregates(self, test_client, reg_kg_patch):
+        """Detail is enriched from the retriever's precomputed regulation stats."""
+        from retriever import RegulationStats
+
+        mock_chain = MagicMock()
+        mock_chain.retriever.get_regulation_stats.return_value = {
+            "uu_11_2020": RegulationStats(chunk_count=4, total_chars=900, pasal_chunks={"1": 2, "2": 2}),
+        }
+        with patch("main.rag_chain", mock_chain):
+            response = test_client.get("/api/v1/regulations/uu_11_2020")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["indexed_chunk_count"] == 4
+        assert data["indexed_char_count"] == 900
+        assert data["indexed_pasal_count"] == 2
+
     def test_get_regulation_detail_not_found(self, test_client, reg_kg_patch):
         """GET /api/v1/regulations/nonexistent returns 404."""
         response = test_client.get("/api/v1/regulations/nonexistent")
@@ -0,0 +1,115 @@
+"""
+Unit tests for the bounded pipeline worker pool.
+
+Covers: results and contextvars through the pool, admission rejection when
+workers and queue are full, queue-wait timeout, freeing a queued slot on
+cancellation, Retry-After estimation, and the snapshot counters.
+"""
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from request_pool import PoolSaturated, RequestPool
+
+_label: contextvars.ContextVar[str] = contextvars.ContextVar("label", default="none")
+
+
+def _blocker():
+    """A blocking job and the event that releases it."""
+    release = threading.Event()
+    return release, lambda: release.wait(5) and "done"
+
+
+async def _until(predicate, timeout=2.0):
+    """Poll until ``predicate()`` holds (jobs start on other threads)."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+class TestRequestPool:
+    async def test_runs_in_worker_with_context(self):
+        pool = RequestPool(max_workers=2, max_queue=2)
+        _label.set("ask")
+        result = await pool.run(
+            lambda x, y=0: (x + y, _label.get(), threading.current_thread().name), 1, y=2
+        )
+        assert result[:2] == (3, "ask")
+        assert result[2].startswith("rag-pool")
+        stats = pool.snapshot()
+        assert stats["completed"] == 1 and stats["running"] == 0 and stats["queued"] == 0
+        assert stats["wait_ms"]["count"] == 1
+
+    async def test_rejects_when_workers_and_queue_full(self):
+        pool = RequestPool(max_workers=1, max_queue=1, queue_timeout=0)
+        release, job = _blocker()
+        running = asyncio.ensure_future(pool.run(job))
+        await _until(lambda: pool.running == 1)
+        queued = asyncio.ensure_future(pool.run(job))
+        await _until(lambda: pool.queued == 1)
+
+        with pytest.raises(PoolSaturated) as exc_info:
+            await pool.run(job)
+        assert exc_info.value.retry_after >= 1
+
+        release.set()
+        assert await running == "done"
+        assert await queued == "done"
+        stats = pool.snapshot()
+        assert (stats["admitted"], stats["rejected"], stats["completed"]) == (2, 1, 2)
+
+    async def test_queue_timeout_drops_waiting_request(self):
+        pool = RequestPool(max_workers=1, max_queue=1, queue_timeout=0.1)
+        release, job = _blocker()
+        running = asyncio.ensure_future(pool.run(job))
+        await _until(lambda: pool.running == 1)
+        try:
+            with pytest.raises(PoolSaturated):
+                await pool.run(job)
+        finally:
+            release.set()
+        assert await running == "done"
+        stats = pool.snapshot()
+        assert stats["expired"] == 1
+        assert stats["queued"] == 0
+        assert stats["completed"] == 1
+
+    async def test_cancelled_waiter_frees_queue_slot(self):
+        pool = RequestPool(max_workers=1, max_queue=1, queue_timeout=0)
+        release, job = _blocker()
+        running = asyncio.ensure_future(pool.run(job))
+        await _until(lambda: pool.running == 1)
+        waiting = asyncio.ensure_future(pool.run(job))
+        await _until(lambda: pool.queued == 1)
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert pool.queued == 0
+
+        release.set()
+        assert await running == "done"
+        assert pool.snapshot()["completed"] == 1
+
+    async def test_exceptions_propagate(self):
+        pool = RequestPool(max_workers=1)
+
+        def boom():
+            raise RuntimeError("qdrant down")
+
+        with pytest.raises(RuntimeError, match="qdrant down"):
+            await pool.run(boom)
+        assert pool.snapshot()["running"] == 0
+
+    def test_retry_after_uses_mean_run_time(self):
+        pool = RequestPool(max_workers=2, max_queue=10)
+        assert pool.retry_after() == 1
+        pool._run_ms.record(4000)
+        pool.queued = 3
+        assert pool.retry_after() == 8  # 4s * (3 queued + 1) / 2 workers
+        pool._run_ms.record(1_000_000)
+        assert pool.retry_after() == 60
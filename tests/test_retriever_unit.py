@@ -2,7 +2,8 @@
 Unit tests for HybridRetriever — all external dependencies mocked.
 
 Covers: __init__, _load_corpus, expand_query, dense_search, sparse_search,
-_rrf_fusion, _rerank, hybrid_search, search_by_document_type, get_stats.
+_rrf_fusion, _rerank, hybrid_search, hybrid_search_many, search_by_document_type,
+get_stats.
 """
 
 import pytest
@@ -12,7 +13,9 @@ import numpy as np
 from retriever import (
     HybridRetriever,
     SearchResult,
+    RegulationStats,
     tokenize_indonesian,
+    truncate_embedding,
     get_retriever,
     COLLECTION_NAME,
     RRF_K,
@@ -332,6 +335,44 @@ class TestDenseSearch:
         results = retriever.dense_search("test")
         assert results == []
 
+    def test_dense_search_single_stage_by_default(self, retriever):
+        mock_response = MagicMock()
+        mock_response.points = []
+        retriever.client.query_points.return_value = mock_response
+
+        retriever.dense_search("test", top_k=5)
+        call_kwargs = retriever.client.query_points.call_args.kwargs
+        assert "prefetch" not in call_kwargs
+        assert "using" not in call_kwargs
+
+    def test_dense_search_two_stage_matryoshka(self, retriever):
+        mock_response = MagicMock()
+        mock_response.points = []
+        retriever.client.query_points.return_value = mock_response
+        retriever.coarse_dim = 256
+
+        retriever.dense_search("test", top_k=5, filter_conditions={"jenis_dokumen": "UU"})
+        call_kwargs = retriever.client.query_points.call_args.kwargs
+        prefetch = call_kwargs["prefetch"]
+        assert prefetch.using == "coarse"
+        assert len(prefetch.query) == 256
+        assert prefetch.limit > 5
+        assert prefetch.filter is not None
+        # Rescoring stage uses the full-dimension vector
+        assert call_kwargs["using"] == "full"
+        assert len(call_kwargs["query"]) == 1024
+        assert call_kwargs["limit"] == 5
+
+
+class TestTruncateEmbedding:
+    def test_truncates_and_normalizes(self):
+        vec = truncate_embedding([3.0, 4.0, 12.0], 2)
+        assert len(vec) == 2
+        assert vec == pytest.approx([0.6, 0.8])
+
+    def test_zero_vector(self):
+        assert truncate_embedding([0.0, 0.0, 1.0], 2) == [0.0, 0.0]
+
 
 # ---------------------------------------------------------------------------
 # hybrid_search tests
@@ -399,6 +440,105 @@ class TestHybridSearch:
 # ---------------------------------------------------------------------------
 
 
+class TestHybridSearchMany:
+    """hybrid_search_many must return exactly what hybrid_search returns per query."""
+
+    _TOPICS = ["perizinan berusaha", "pesangon pekerja", "modal asing", "pajak daerah", "cipta kerja"]
+
+    @pytest.fixture
+    def numpy_retriever(self, tmp_path):
+        from vector_index import NumpyVectorIndex
+
+        rng = np.random.default_rng(0)
+        records = []
+        for i in range(40):
+            jenis = ["UU", "PP", "Perda"][i % 3]
+            records.append((
+                i + 1,
+                rng.normal(size=16).tolist(),
+                {
+                    "text": f"Pasal {i % 7} {self._TOPICS[i % 5]} ketentuan {i}",
+                    "citation": f"{jenis} No. {i}",
+                    "citation_id": f"{jenis.lower()}_{i}_2020_pasal_{i % 7}",
+                    "jenis_dokumen": jenis,
+                    "nomor": str(i),
+                    "tahun": 2020,
+                    "pasal": str(i % 7),
+                },
+            ))
+        NumpyVectorIndex.from_records(records, dtype="float32").save(tmp_path)
+
+        ret = HybridRetriever(use_reranker=False, vector_backend="numpy", vector_index_path=str(tmp_path))
+
+        def fake_embed(text):
+            seed = sum(ord(c) * (i + 1) for i, c in enumerate(text))
+            return np.random.default_rng(seed).normal(size=16).tolist()
+
+        ret.embedder = MagicMock(spec=["embed_query", "embed_queries"])
+        ret.embedder.embed_query.side_effect = fake_embed
+        ret.embedder.embed_queries.side_effect = lambda texts: [fake_embed(t) for t in texts]
+        return ret
+
+    QUERIES = [
+        "syarat perizinan berusaha",
+        "hak pesangon pekerja PHK",
+        "Pasal 3 UU 3/2020",  # auto filter with a match
+        "Pasal 5 UU 99/2020",  # auto filter without a match -> unfiltered fallback
+        "penanaman modal asing",
+        "xyzzy",  # no BM25 hits
+    ]
+
+    @staticmethod
+    def _key(results):
+        return [(r.id, r.score) for r in results]
+
+    def test_matches_hybrid_search(self, numpy_retriever):
+        batched = numpy_retriever.hybrid_search_many(self.QUERIES, top_k=4)
+        for query, results in zip(self.QUERIES, batched):
+            assert self._key(results) == self._key(numpy_retriever.hybrid_search(query, top_k=4)), query
+
+    def test_matches_hybrid_search_with_reranker(self, numpy_retriever):
+        reranker = MagicMock()
+        reranker.predict.side_effect = lambda pairs: [
+            len(set(q.lower().split()) & set(t.lower().split())) - len(t) / 1000 for q, t in pairs
+        ]
+        numpy_retriever.reranker = reranker
+
+        batched = numpy_retriever.hybrid_search_many(self.QUERIES, top_k=3)
+
+        assert reranker.predict.call_count == 1  # one forward pass for all queries
+        for query, results in zip(self.QUERIES, batched):
+            assert self._key(results) == self._key(numpy_retriever.hybrid_search(query, top_k=3)), query
+
+    def test_single_embedding_request(self, numpy_retriever):
+        numpy_retriever.hybrid_search_many(self.QUERIES[:2] + self.QUERIES[:2], top_k=3, expand_queries=False)
+        assert numpy_retriever.embedder.embed_queries.call_count == 1
+        # duplicates are embedded once
+        assert len(numpy_retriever.embedder.embed_queries.call_args.args[0]) == 2
+        numpy_retriever.embedder.embed_query.assert_not_called()
+
+    def test_batched_bm25_equals_get_scores(self, numpy_retriever):
+        batched = numpy_retriever._sparse_search_many(self.QUERIES, top_k=10)
+        for query, results in zip(self.QUERIES, batched):
+            assert self._key(results) == self._key(numpy_retriever.sparse_search(query, top_k=10))
+
+    def test_empty_queries(self, numpy_retriever):
+        assert numpy_retriever.hybrid_search_many([]) == []
+
+    def test_qdrant_single_batch_request(self, retriever):
+        retriever.embedder.embed_queries = MagicMock(return_value=[[0.1] * 1024, [0.2] * 1024])
+        response = MagicMock()
+        response.points = []
+        retriever.client.query_batch_points.return_value = [response, response]
+
+        results = retriever.hybrid_search_many(["satu", "dua"], top_k=3, expand_queries=False)
+
+        assert results == [[], []]
+        retriever.client.query_batch_points.assert_called_once()
+        assert len(retriever.client.query_batch_points.call_args.kwargs["requests"]) == 2
+        retriever.client.query_points.assert_not_called()
+
+
 class TestSearchByDocumentType:
     def test_delegates_to_hybrid_search(self, retriever):
         with patch.object(retriever, "hybrid_search", return_value=[_sr(1)]) as mock_hs:
@@ -429,6 +569,102 @@ class TestGetStats:
         assert stats["bm25_initialized"] is False
 
 
+# ---------------------------------------------------------------------------
+# KG boost
+# ---------------------------------------------------------------------------
+
+
+def _reg_sr(doc_id: int, jenis: str, nomor: str, tahun: str, score: float) -> SearchResult:
+    return SearchResult(
+        id=doc_id,
+        text="text",
+        citation=f"{jenis} {nomor}/{tahun}",
+        citation_id=f"{jenis.lower()}_{nomor}_{tahun}_pasal_1",
+        score=score,
+        metadata={"jenis_dokumen": jenis, "nomor": nomor, "tahun": tahun},
+    )
+
+
+class TestBoostWithKG:
+    def test_boosts_related_regulations(self, retriever):
+        from knowledge_graph.graph import LegalKnowledgeGraph
+        from knowledge_graph.schema import EdgeType, GovernmentRegulation, Law
+
+        kg = LegalKnowledgeGraph()
+        kg.add_regulation(Law(id="uu_11_2020", number=11, year=2020, title="Cipta Kerja", about="x"))
+        kg.add_regulation(GovernmentRegulation(
+            id="pp_5_2021", number=5, year=2021, title="PP", about="y", parent_law_id="uu_11_2020",
+        ))
+        kg.add_edge("pp_5_2021", "uu_11_2020", EdgeType.IMPLEMENTS)
+        kg.build_regulation_adjacency()
+        retriever.knowledge_graph = kg
+
+        candidates = [
+            _reg_sr(1, "UU", "11", "2020", 0.50),
+            _reg_sr(2, "Perda", "3", "2019", 0.48),
+            _reg_sr(3, "PP", "5", "2021", 0.47),
+        ]
+        boosted = retriever._boost_with_kg(candidates)
+
+        scores = {r.id: r.score for r in boosted}
+        assert scores[1] == pytest.approx(0.50 * 1.15)
+        assert scores[3] == pytest.approx(0.47 * 1.15)
+        assert scores[2] == pytest.approx(0.48)
+        assert [r.id for r in boosted] == [1, 3, 2]
+
+    def test_no_graph_is_noop(self, retriever):
+        candidates = [_reg_sr(1, "UU", "11", "2020", 0.5)]
+        assert retriever._boost_with_kg(candidates) is candidates
+
+
+# ---------------------------------------------------------------------------
+# Regulation aggregates
+# ---------------------------------------------------------------------------
+
+
+def _corpus_doc(doc_id: int, citation_id: str, text: str, pasal: str = "") -> dict:
+    return {
+        "id": doc_id,
+        "text": text,
+        "citation": citation_id,
+        "citation_id": citation_id,
+        "metadata": {"pasal": pasal} if pasal else {},
+    }
+
+
+class TestRegulationStats:
+    def test_built_during_corpus_load(self, retriever_with_corpus):
+        counts = retriever_with_corpus.get_chunk_counts_by_regulation()
+        assert counts == {"uu-11-2020": 1, "pp-5-2021": 1, "perpres-10-2021": 1}
+        stats = retriever_with_corpus.get_regulation_stats()["pp-5-2021"]
+        assert stats.total_chars == len("Peraturan Pemerintah tentang perizinan berusaha")
+
+    def test_incremental_add_and_remove(self, retriever):
+        retriever.add_corpus_documents([
+            _corpus_doc(1, "UU_11_2020_pasal_1", "abcd", pasal="1"),
+            _corpus_doc(2, "uu_11_2020_pasal_1_chunk2", "ef", pasal="1"),
+            _corpus_doc(3, "uu_11_2020_pasal_5", "ghi", pasal="5"),
+        ])
+        stats = retriever.get_regulation_stats()["uu_11_2020"]
+        assert isinstance(stats, RegulationStats)
+        assert stats.to_dict() == {"chunk_count": 3, "total_chars": 9, "pasal_count": 2}
+        assert retriever._bm25 is not None
+
+        retriever.remove_corpus_documents({3})
+        assert retriever.get_regulation_stats()["uu_11_2020"].to_dict() == {
+            "chunk_count": 2, "total_chars": 6, "pasal_count": 1,
+        }
+
+        retriever.remove_corpus_documents({1, 2})
+        assert retriever.get_chunk_counts_by_regulation() == {}
+        assert retriever._corpus == []
+
+    def test_counts_do_not_scan_corpus(self, retriever_with_corpus):
+        # Counts come from the precomputed index, not _corpus
+        retriever_with_corpus._corpus = []
+        assert retriever_with_corpus.get_chunk_counts_by_regulation()["uu-11-2020"] == 1
+
+
 # ---------------------------------------------------------------------------
 # __init__ edge cases
 # ---------------------------------------------------------------------------
@@ -0,0 +1,219 @@
+"""
+Unit tests for the pluggable shared-state backend.
+
+Covers: key/value TTL, atomic update, capped lists and windowed counters on
+both backends; SQLite state seen by a second "worker" (another connection
+to the same file) and concurrent increments; shared chat sessions and
+accuracy metrics; the ``sqlite://`` rate-limit storage.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from limits import RateLimitItemPerMinute
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+from chat.session import InMemorySessionStore, SessionManager, SharedSessionStore, session_store_for
+from shared_state import (
+    MemoryBackend,
+    SQLiteBackend,
+    SQLiteLimitStorage,
+    create_state_backend,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    return SQLiteBackend(tmp_path / "state.sqlite3")
+
+
+class TestPrimitives:
+    def test_set_get_delete(self, backend):
+        backend.set("ns", "a", "1")
+        assert backend.get("ns", "a") == "1"
+        assert backend.get("other", "a") is None
+        assert backend.delete("ns", "a") is True
+        assert backend.delete("ns", "a") is False
+
+    def test_ttl_expiry(self, backend):
+        backend.set("ns", "a", "1", ttl=0.05)
+        backend.set("ns", "b", "2")
+        time.sleep(0.1)
+        assert backend.get("ns", "a") is None
+        assert backend.items("ns") == [("b", "2")]
+        assert backend.purge_expired() >= 0
+
+    def test_update(self, backend):
+        assert backend.update("ns", "n", lambda v: str(int(v or 0) + 1)) == "1"
+        assert backend.update("ns", "n", lambda v: str(int(v or 0) + 1)) == "2"
+        assert backend.update("ns", "n", lambda v: None) is None
+        assert backend.get("ns", "n") is None
+
+    def test_capped_list(self, backend):
+        for i in range(5):
+            backend.append("ns", "recent", str(i), max_len=3)
+        assert backend.get_list("ns", "recent") == ["2", "3", "4"]
+
+    def test_windowed_counter(self, backend):
+        assert backend.incr("rl", "ip", ttl=0.05) == 1
+        assert backend.incr("rl", "ip", ttl=0.05, amount=2) == 3
+        count, window_end = backend.counter("rl", "ip")
+        assert count == 3 and window_end > time.time()
+        time.sleep(0.1)
+        assert backend.counter("rl", "ip") == (0, None)
+        assert backend.incr("rl", "ip", ttl=60) == 1
+
+    def test_clear(self, backend):
+        backend.set("ns", "a", "1")
+        backend.append("ns", "l", "x", max_len=5)
+        backend.set("keep", "a", "1")
+        backend.clear("ns")
+        assert backend.get("ns", "a") is None
+        assert backend.get_list("ns", "l") == []
+        assert backend.get("keep", "a") == "1"
+
+    def test_scored_set(self, backend):
+        backend.set_score("z", "b", 2.0)
+        backend.set_score("z", "a", 3.0)
+        backend.set_score("z", "c", 1.0)
+        backend.set_score("z", "a", 0.5)  # re-scoring replaces
+        backend.set_score("z", "gone", 0.1, ttl=60)
+        assert backend.delete_score("z", "gone") is True
+        assert backend.delete_score("z", "gone") is False
+        assert backend.count_scores("z") == 3
+        assert backend.lowest_scores("z", limit=2) == [("a", 0.5), ("c", 1.0)]
+        assert backend.lowest_scores("z", below=2.0) == [("a", 0.5), ("c", 1.0)]
+        assert backend.lowest_scores("z") == [("a", 0.5), ("c", 1.0), ("b", 2.0)]
+        backend.clear("z", "a")
+        assert backend.count_scores("z") == 2
+
+    def test_scored_set_expiry(self, backend):
+        with patch("shared_state.time.time", return_value=1000.0):
+            backend.set_score("z", "old", 1.0, ttl=60)
+            backend.set_score("z", "kept", 2.0)
+        with patch("shared_state.time.time", return_value=1061.0):
+            assert backend.count_scores("z") == 1
+            assert backend.lowest_scores("z") == [("kept", 2.0)]
+            backend.set_score("z", "old", 1.0, ttl=0)
+            assert backend.purge_expired() == 1
+
+
+class TestSQLiteSharing:
+    def test_second_worker_sees_state(self, tmp_path):
+        worker_a = SQLiteBackend(tmp_path / "state.sqlite3")
+        worker_b = SQLiteBackend(tmp_path / "state.sqlite3")
+        worker_a.set("ns", "k", "v")
+        worker_a.append("ns", "recent", "m1", max_len=10)
+        assert worker_b.get("ns", "k") == "v"
+        assert worker_b.get_list("ns", "recent") == ["m1"]
+
+    def test_concurrent_increments_are_not_lost(self, tmp_path):
+        workers = [SQLiteBackend(tmp_path / "state.sqlite3") for _ in range(4)]
+
+        def hammer(worker):
+            for _ in range(50):
+                worker.incr("rl", "ip", ttl=60)
+
+        threads = [threading.Thread(target=hammer, args=(w,)) for w in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert workers[0].counter("rl", "ip")[0] == 200
+
+    def test_create_from_url(self, tmp_path):
+        backend = create_state_backend(f"sqlite:///{tmp_path / 'state.sqlite3'}")
+        assert isinstance(backend, SQLiteBackend) and backend.shared
+        assert isinstance(create_state_backend("memory://"), MemoryBackend)
+        with pytest.raises(ValueError, match="Unsupported"):
+            create_state_backend("etcd://localhost")
+
+
+class TestSharedSessions:
+    def test_follow_up_on_another_worker(self, tmp_path):
+        path = tmp_path / "state.sqlite3"
+        worker_a = SessionManager(store=SharedSessionStore(SQLiteBackend(path)))
+        worker_b = SessionManager(store=SharedSessionStore(SQLiteBackend(path)))
+
+        sid = worker_a.create_session()
+        worker_a.add_message(sid, "user", "Apa itu PT?")
+        worker_b.add_message(sid, "assistant", "Perseroan Terbatas")
+
+        assert worker_a.get_chat_history_for_rag(sid) == [
+            {"question": "Apa itu PT?", "answer": "Perseroan Terbatas"}
+        ]
+        assert worker_b.clear_session(sid) is True
+        assert worker_a.get_history(sid) == []
+
+    def test_expiry_in_backend(self, tmp_path):
+        clock = [time.time()]
+        backend = SQLiteBackend(tmp_path / "s.db")
+        sm = SessionManager(expiry_seconds=60, store=SharedSessionStore(backend))
+        with patch("time.time", lambda: clock[0]):
+            sid = sm.create_session()
+            clock[0] += 40
+            sm.add_message(sid, "user", "Apa itu PT?")  # activity extends the TTL
+            clock[0] += 40
+            assert len(sm.get_history(sid)) == 1
+
+            clock[0] += 30
+            assert backend.get(SharedSessionStore.NAMESPACE, sid) is None
+            assert backend.purge_expired() == 2  # the session and its activity entry
+            assert sm.cleanup_expired() == 0
+
+    def test_shared_store_evicts_least_recently_active(self, tmp_path):
+        store = SharedSessionStore(SQLiteBackend(tmp_path / "s.db"), max_sessions=2)
+        sm = SessionManager(store=store)
+        first = sm.create_session()
+        second = sm.create_session()
+        sm.add_message(first, "user", "Apa itu PT?")  # second is now least recent
+        third = sm.create_session()
+
+        assert store.get(second) is None
+        assert {s.id for s in store.sessions()} == {first, third}
+        assert store.evicted == 1
+        assert sm.clear_session(first) is True
+        assert store.backend.lowest_scores(SharedSessionStore.ACTIVITY_NAMESPACE) == [
+            (third, store.get(third).last_active)
+        ]
+
+    def test_store_for_backend(self, tmp_path):
+        assert isinstance(session_store_for(MemoryBackend()), InMemorySessionStore)
+        assert isinstance(session_store_for(SQLiteBackend(tmp_path / "s.db")), SharedSessionStore)
+
+
+class TestSharedAccuracyMetrics:
+    def test_summary_covers_all_workers(self, tmp_path):
+        from main import AccuracyMetricsCollector
+
+        path = tmp_path / "state.sqlite3"
+        worker_a = AccuracyMetricsCollector(backend=SQLiteBackend(path))
+        worker_b = AccuracyMetricsCollector(backend=SQLiteBackend(path))
+        worker_a.record("q1", 0.9, "low", "tinggi", 2)
+        worker_b.record("q2", None, "refused", "rendah", 0)
+
+        summary = worker_a.get_summary()
+        assert summary["total_queries"] == 2
+        assert summary["refusal_rate"] == 0.5
+        assert summary["avg_grounding_score"] == 0.9
+        assert [m["question"] for m in summary["recent_metrics"]] == ["q1", "q2"]
+
+
+class TestRateLimitStorage:
+    def test_limits_shared_across_workers(self, tmp_path):
+        uri = f"sqlite:///{tmp_path / 'state.sqlite3'}"
+        worker_a = FixedWindowRateLimiter(storage_from_string(uri))
+        worker_b = FixedWindowRateLimiter(storage_from_string(uri))
+        limit = RateLimitItemPerMinute(3)
+
+        assert isinstance(worker_a.storage, SQLiteLimitStorage)
+        assert worker_a.hit(limit, "1.2.3.4")
+        assert worker_b.hit(limit, "1.2.3.4")
+        assert worker_a.hit(limit, "1.2.3.4")
+        assert not worker_b.hit(limit, "1.2.3.4")
+        assert worker_b.hit(limit, "5.6.7.8")
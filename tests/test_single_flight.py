@@ -0,0 +1,162 @@
+"""
+Unit tests for single-flight coalescing of identical in-flight questions.
+
+Covers: key normalization, shared results and errors, release after
+completion, one caller cancelling without affecting the others, stream
+fan-out with late-join replay, and cancelling an abandoned stream.
+"""
+
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight, coalesce_key
+
+
+class TestCoalesceKey:
+    def test_normalizes_question_and_orders_params(self):
+        a = coalesce_key("Apa itu PT?", top_k=5, mode="synthesized", provider=None)
+        b = coalesce_key("  apa itu  pt", provider=None, mode="synthesized", top_k=5)
+        assert a == b
+
+    def test_every_param_changes_key(self):
+        base = coalesce_key("Apa itu PT?", top_k=5, mode="synthesized", provider=None)
+        assert base != coalesce_key("Apa itu PT?", top_k=3, mode="synthesized", provider=None)
+        assert base != coalesce_key("Apa itu PT?", top_k=5, mode="verbatim", provider=None)
+        assert base != coalesce_key("Apa itu PT?", top_k=5, mode="synthesized", provider="groq")
+        assert base != coalesce_key("Apa itu CV?", top_k=5, mode="synthesized", provider=None)
+
+
+class TestDo:
+    async def test_identical_calls_share_one_computation(self):
+        flight = SingleFlight(enabled=True)
+        release = asyncio.Event()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"answer": "PT adalah badan hukum"}
+
+        waiters = [asyncio.ensure_future(flight.do("k", compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert results[0] is results[1] is results[2]
+        stats = flight.snapshot()
+        assert (stats["leaders"], stats["coalesced"], stats["in_flight_calls"]) == (1, 2, 0)
+
+    async def test_key_released_after_completion(self):
+        flight = SingleFlight(enabled=True)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("k", compute) == 1
+        assert await flight.do("k", compute) == 2
+
+    async def test_errors_reach_every_caller(self):
+        flight = SingleFlight(enabled=True)
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            raise RuntimeError("LLM down")
+
+        waiters = [asyncio.ensure_future(flight.do("k", compute)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        for waiter in waiters:
+            with pytest.raises(RuntimeError, match="LLM down"):
+                await waiter
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight(enabled=True)
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.ensure_future(flight.do("k", compute))
+        second = asyncio.ensure_future(flight.do("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        assert await second == "ok"
+
+    async def test_disabled_runs_every_call(self):
+        flight = SingleFlight(enabled=False)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        await asyncio.gather(flight.do("k", compute), flight.do("k", compute))
+        assert calls == 2
+
+
+class TestStream:
+    async def test_fan_out_with_late_join_replay(self):
+        flight = SingleFlight(enabled=True)
+        step = asyncio.Event()
+        sources = 0
+
+        async def source():
+            nonlocal sources
+            sources += 1
+            yield ("metadata", {})
+            await step.wait()
+            yield ("chunk", "PT")
+            yield ("done", {})
+
+        async def consume():
+            return [event async for event in flight.stream("k", source)]
+
+        first = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.01)  # first event produced before the second client joins
+        second = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.01)
+        step.set()
+
+        expected = [("metadata", {}), ("chunk", "PT"), ("done", {})]
+        assert await first == expected
+        assert await second == expected
+        assert sources == 1
+        assert flight.snapshot()["in_flight_streams"] == 0
+
+    async def test_stream_error_reaches_subscribers(self):
+        flight = SingleFlight(enabled=True)
+
+        async def source():
+            yield "a"
+            raise RuntimeError("stream broke")
+
+        with pytest.raises(RuntimeError, match="stream broke"):
+            [event async for event in flight.stream("k", source)]
+
+    async def test_abandoned_stream_is_cancelled(self):
+        flight = SingleFlight(enabled=True)
+        cancelled = asyncio.Event()
+
+        async def source():
+            yield "first"
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            yield "never"
+
+        stream = flight.stream("k", source)
+        assert await stream.__anext__() == "first"
+        await stream.aclose()
+        await asyncio.wait_for(cancelled.wait(), 1)
@@ -0,0 +1,139 @@
+"""
+Unit tests for per-stage retrieval latency histograms.
+
+Covers: Histogram percentiles, StageMetrics recording/strategy labels/
+disabled no-op path, HybridRetriever stage instrumentation, and the
+/api/v1/metrics/retrieval endpoint.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from stage_metrics import (
+    COUNT_BUCKETS,
+    LATENCY_BUCKETS_MS,
+    Histogram,
+    StageMetrics,
+    retrieval_metrics,
+)
+
+
+class TestHistogram:
+    def test_empty(self):
+        hist = Histogram(LATENCY_BUCKETS_MS)
+        assert hist.percentile(0.5) == 0.0
+        assert hist.summary()["count"] == 0
+
+    def test_percentiles_within_bucket_bounds(self):
+        hist = Histogram(LATENCY_BUCKETS_MS)
+        for _ in range(90):
+            hist.record(3.0)  # (2, 5] bucket
+        for _ in range(10):
+            hist.record(150.0)  # (100, 200] bucket
+        assert 2.0 <= hist.percentile(0.50) <= 5.0
+        assert 100.0 <= hist.percentile(0.95) <= 150.0
+        assert hist.percentile(0.99) <= hist.max
+
+    def test_overflow_bucket_capped_at_max(self):
+        hist = Histogram(LATENCY_BUCKETS_MS)
+        hist.record(25000.0)
+        assert 10000.0 < hist.percentile(0.99) <= 25000.0
+        assert hist.percentile(1.0) == pytest.approx(25000.0)
+
+    def test_summary_fields(self):
+        hist = Histogram(COUNT_BUCKETS)
+        for value in (1, 2, 3):
+            hist.record(value)
+        summary = hist.summary()
+        assert summary["count"] == 3
+        assert summary["mean"] == pytest.approx(2.0)
+        assert summary["max"] == 3
+        assert set(summary) == {"count", "mean", "max", "p50", "p95", "p99"}
+
+
+class TestStageMetrics:
+    def test_stage_records_latency_and_count(self):
+        metrics = StageMetrics(enabled=True)
+        with metrics.stage("bm25") as timer:
+            timer.count = 7
+        snap = metrics.snapshot()["strategies"]["direct"]["bm25"]
+        assert snap["latency_ms"]["count"] == 1
+        assert snap["candidates"]["max"] == 7
+
+    def test_stage_without_count(self):
+        metrics = StageMetrics(enabled=True)
+        with metrics.stage("kg"):
+            pass
+        assert metrics.snapshot()["strategies"]["direct"]["kg"]["candidates"] is None
+
+    def test_strategy_label(self):
+        metrics = StageMetrics(enabled=True)
+        with metrics.strategy("hyde"):
+            with metrics.stage("qdrant"):
+                pass
+        with metrics.stage("qdrant"):
+            pass
+        strategies = metrics.snapshot()["strategies"]
+        assert strategies["hyde"]["qdrant"]["latency_ms"]["count"] == 1
+        assert strategies["direct"]["qdrant"]["latency_ms"]["count"] == 1
+
+    def test_disabled_is_noop(self):
+        metrics = StageMetrics(enabled=False)
+        with metrics.stage("rerank") as timer:
+            timer.count = 3
+        metrics.record("rerank", 1.0)
+        snap = metrics.snapshot()
+        assert snap["enabled"] is False
+        assert snap["strategies"] == {}
+
+    def test_disabled_returns_shared_timer(self):
+        metrics = StageMetrics(enabled=False)
+        assert metrics.stage("a") is metrics.stage("b")
+
+    def test_reset(self):
+        metrics = StageMetrics(enabled=True)
+        metrics.record("rrf", 1.0, count=2)
+        metrics.reset()
+        assert metrics.snapshot()["strategies"] == {}
+
+
+class TestRetrieverInstrumentation:
+    def test_hybrid_search_records_stages(self):
+        from retriever import HybridRetriever
+
+        with (
+            patch("retriever.QdrantClient") as mock_qclient_cls,
+            patch("retriever.HuggingFaceEmbeddings"),
+        ):
+            mock_client = MagicMock()
+            mock_client.get_collection.return_value = MagicMock(points_count=0)
+            mock_qclient_cls.return_value = mock_client
+            metrics = StageMetrics(enabled=True)
+            ret = HybridRetriever(use_reranker=False, metrics=metrics)
+
+        ret.embedder = MagicMock()
+        ret.embedder.embed_query.return_value = [0.1] * 1024
+        mock_response = MagicMock()
+        mock_response.points = []
+        ret.client.query_points.return_value = mock_response
+
+        ret.hybrid_search("apa itu cipta kerja", top_k=3)
+
+        stages = metrics.snapshot()["strategies"]["direct"]
+        for name in ("total", "expansion", "embed", "qdrant", "bm25", "rrf", "kg", "authority"):
+            assert name in stages, name
+        assert "rerank" not in stages  # reranker disabled
+
+
+class TestRetrievalMetricsEndpoint:
+    def test_endpoint_returns_snapshot(self, test_client):
+        retrieval_metrics.record("qdrant", 12.0, count=10, strategy="test-endpoint")
+        try:
+            response = test_client.get("/api/v1/metrics/retrieval")
+            assert response.status_code == 200
+            data = response.json()
+            assert "strategies" in data
+            assert data["strategies"]["test-endpoint"]["qdrant"]["latency_ms"]["count"] >= 1
+        finally:
+            retrieval_metrics.reset()
@@ -0,0 +1,116 @@
+"""
+Unit tests for staged background startup.
+
+Covers: concurrent component loading, per-component progress snapshots,
+wait() on success / failure / timeout, readiness ignoring optional
+components, and /health/ready while a required component is loading.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from health import HealthMonitor
+from startup import FAILED, LOADING, READY, StartupManager
+
+
+class TestStartupManager:
+    async def test_loaders_run_concurrently(self):
+        both_started = threading.Barrier(2, timeout=2)
+        manager = StartupManager()
+        manager.add("a", both_started.wait)
+        manager.add("b", both_started.wait)
+
+        manager.start()
+        # Each loader blocks until the other has started; sequential loading would time out.
+        assert await manager.wait_all(timeout=5)
+        assert manager.snapshot()["components"]["a"]["status"] == READY
+
+    async def test_snapshot_reports_progress(self):
+        release = threading.Event()
+        manager = StartupManager()
+        manager.add("slow", lambda: release.wait(2))
+
+        manager.start()
+        await asyncio.sleep(0.05)
+        snapshot = manager.snapshot()
+        assert snapshot["ready"] is False
+        assert snapshot["components"]["slow"]["status"] == LOADING
+
+        release.set()
+        assert await manager.wait("slow")
+        component = manager.snapshot()["components"]["slow"]
+        assert component["status"] == READY
+        assert component["elapsed_s"] is not None
+
+    async def test_wait_false_on_failure(self):
+        def boom():
+            raise RuntimeError("qdrant unreachable")
+
+        manager = StartupManager()
+        manager.add("rag_chain", boom)
+        manager.start()
+
+        assert await manager.wait("rag_chain") is False
+        component = manager.snapshot()["components"]["rag_chain"]
+        assert component["status"] == FAILED
+        assert "qdrant unreachable" in component["error"]
+
+    async def test_wait_false_on_timeout(self):
+        manager = StartupManager()
+        manager.add("slow", lambda: time.sleep(0.3))
+        manager.start()
+
+        assert await manager.wait("slow", timeout=0.01) is False
+        # The loader keeps going after a waiter gives up.
+        assert await manager.wait("slow", timeout=2) is True
+
+    async def test_on_ready_runs_before_ready(self):
+        seen = []
+        manager = StartupManager()
+
+        async def on_ready():
+            seen.append(manager.components["rag_chain"].status)
+
+        manager.add("rag_chain", lambda: None, on_ready=on_ready)
+        manager.start()
+
+        assert await manager.wait("rag_chain")
+        assert seen == [LOADING]
+
+    async def test_wait_unknown_component(self):
+        assert await StartupManager().wait("missing") is False
+
+    async def test_optional_component_does_not_block_readiness(self):
+        def boom():
+            raise RuntimeError("graph file corrupt")
+
+        manager = StartupManager()
+        manager.add("rag_chain", lambda: None)
+        manager.add("knowledge_graph", boom, required=False)
+        manager.start()
+
+        assert await manager.wait_all()
+        assert manager.snapshot()["components"]["knowledge_graph"]["status"] == FAILED
+
+
+class TestReadinessDuringStartup:
+    def test_not_ready_while_loading(self, test_client):
+        release = threading.Event()
+        manager = StartupManager()
+        manager.add("rag_chain", lambda: release.wait(2))
+        try:
+            with patch("main.startup", manager), \
+                 patch("main.rag_chain") as mock_chain, \
+                 patch("main.health_monitor", HealthMonitor()):
+                mock_chain.llm_client.circuit_breakers = {}
+                test_client.portal.call(manager.start)
+                response = test_client.get("/health/ready")
+        finally:
+            release.set()
+
+        assert response.status_code == 503
+        body = response.json()
+        assert body["status"] == "not_ready"
+        assert body["startup"]["components"]["rag_chain"]["status"] in ("pending", LOADING)
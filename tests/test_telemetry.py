@@ -0,0 +1,159 @@
+"""
+Unit tests for the Prometheus text-exposition metrics.
+
+Covers: histogram rendering (cumulative buckets, +Inf, _sum/_count, label
+escaping), collector isolation, the route-template latency middleware, LLM
+call timing per fallback attempt and per single provider, and the
+/metrics endpoint including stream time-to-first-token.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from llm_client import FallbackChain, LLMHealth, llm_call_timer, provider_label
+from telemetry import (
+    LLM_CALL_SECONDS,
+    STREAM_TTFT_SECONDS,
+    MetricsMiddleware,
+    MetricsRegistry,
+    gauge,
+)
+
+
+class TestRendering:
+    def test_histogram_exposition(self):
+        registry = MetricsRegistry()
+        hist = registry.histogram("req_seconds", "Request latency.", ("route",), buckets=(0.1, 1))
+        hist.observe(0.05, "/a")
+        hist.observe(0.5, "/a")
+        hist.observe(5, "/a")
+
+        lines = registry.render().splitlines()
+        assert lines[:2] == ["# HELP req_seconds Request latency.", "# TYPE req_seconds histogram"]
+        assert 'req_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'req_seconds_bucket{route="/a",le="1"} 2' in lines
+        assert 'req_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'req_seconds_sum{route="/a"} 5.55' in lines
+        assert 'req_seconds_count{route="/a"} 3' in lines
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors.", ("reason",)).inc('bad "quote"\\n')
+        assert 'errors_total{reason="bad \\"quote\\"\\\\n"} 1' in registry.render()
+
+    def test_broken_collector_does_not_fail_scrape(self):
+        registry = MetricsRegistry()
+
+        def broken():
+            raise RuntimeError("boom")
+
+        registry.register_collector(broken)
+        registry.register_collector(lambda: [gauge("queue_depth", "Queued.", [({}, 3)])])
+        assert "queue_depth 3" in registry.render()
+
+
+class TestMetricsMiddleware:
+    def test_labels_by_route_template(self):
+        registry = MetricsRegistry()
+        hist = registry.histogram("http_seconds", "Latency.", ("method", "route", "status"))
+
+        async def item(request):
+            return PlainTextResponse(request.path_params["item_id"])
+
+        app = Starlette(routes=[Route("/items/{item_id}", item)])
+        app.add_middleware(MetricsMiddleware, histogram=hist)
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/scanner/probe")
+        client.request("PROPFIND", "/items/1")
+        client.request("X-SCAN-42", "/items/1")
+
+        assert hist.count("GET", "/items/{item_id}", "200") == 2
+        assert hist.count("GET", "unmatched", "404") == 1
+        assert hist.count("other", "/items/{item_id}", "405") == 2
+
+
+class _Provider:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def generate(self, user_message, system_message=None, **kwargs):
+        if self.fail:
+            raise RuntimeError("rate limited")
+        return "ok"
+
+
+class TestLLMCallTiming:
+    def test_fallback_records_each_attempt(self):
+        chain = FallbackChain([("tm_first", _Provider(fail=True)), ("tm_second", _Provider())])
+        assert chain.generate("q") == "ok"
+        assert LLM_CALL_SECONDS.count("tm_first", "generate", "error") == 1
+        assert LLM_CALL_SECONDS.count("tm_second", "generate", "ok") == 1
+
+    def test_track_times_single_provider_only(self):
+        health = LLMHealth()
+        provider = _Provider()
+        provider.provider_name = "tm_single"
+        with health.track(provider, "generate"):
+            provider.generate("q")
+        before = LLM_CALL_SECONDS.count("tm_chain", "generate", "ok")
+        chain = FallbackChain([("tm_chain", _Provider())])
+        with health.track(chain, "generate"):
+            chain.generate("q")
+
+        assert LLM_CALL_SECONDS.count("tm_single", "generate", "ok") == 1
+        # The chain timed the attempt itself; track() must not add a second sample.
+        assert LLM_CALL_SECONDS.count("tm_chain", "generate", "ok") == before + 1
+
+    def test_early_close_is_cancelled_not_error(self):
+        def stream():
+            with llm_call_timer("tm_stream", "stream"):
+                yield "a"
+                yield "b"
+
+        gen = stream()
+        next(gen)
+        gen.close()
+        assert LLM_CALL_SECONDS.count("tm_stream", "stream", "cancelled") == 1
+        assert LLM_CALL_SECONDS.count("tm_stream", "stream", "error") == 0
+
+    @pytest.mark.parametrize(
+        ("class_name", "label"),
+        [("GroqClient", "groq"), ("NVIDIANimClient", "nvidia"), ("CopilotChatClient", "copilot")],
+    )
+    def test_provider_label(self, class_name, label):
+        assert provider_label(type(class_name, (), {})()) == label
+
+
+class TestMetricsEndpoint:
+    def test_exposition_format(self, test_client):
+        test_client.get("/health/live")
+        response = test_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert 'http_request_duration_seconds_count{method="GET",route="/health/live",status="200"}' in body
+        assert "# TYPE pipeline_pool_queued gauge" in body
+        assert 'admission_in_flight{cost="expensive"}' in body
+
+    def test_stream_records_time_to_first_token(self, test_client):
+        before = STREAM_TTFT_SECONDS.count("/api/v1/ask/stream")
+        with patch("main.rag_chain") as mock_chain:
+            mock_chain.query_stream.return_value = iter([
+                ("metadata", {"citations": [], "sources": []}),
+                ("chunk", "Halo "),
+                ("chunk", "dunia"),
+                ("done", {"validation": {"is_valid": True}}),
+            ])
+            mock_chain.llm_client = MagicMock()
+            response = test_client.post("/api/v1/ask/stream", json={"question": "Apa itu PT di Indonesia?"})
+
+        assert response.status_code == 200
+        assert STREAM_TTFT_SECONDS.count("/api/v1/ask/stream") == before + 1
@@ -0,0 +1,182 @@
+"""
+Unit tests for the embedded NumPy vector index backend.
+
+Covers: NumpyVectorIndex build/save/load round-trip, exact top-k against a
+brute-force reference, blocked search, payload filters, UUID point ids,
+Qdrant export, and HybridRetriever integration with VECTOR_BACKEND="numpy".
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from vector_index import IndexHit, NumpyVectorIndex
+
+
+def _records(n: int = 50, dim: int = 16, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    return [
+        (
+            100 + i,
+            vectors[i].tolist(),
+            {
+                "text": f"Pasal {i} tentang perizinan",
+                "citation": f"UU No. {i}",
+                "citation_id": f"uu_{i}_2020_pasal_1",
+                "jenis_dokumen": "UU" if i % 2 == 0 else "PP",
+                "tags": ["a", "b"] if i % 5 == 0 else ["c"],
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def _brute_force(records, query, top_k):
+    matrix = np.asarray([vec for _, vec, _ in records], dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    q = np.asarray(query, dtype=np.float32)
+    q /= np.linalg.norm(q)
+    scores = matrix @ q
+    order = np.argsort(-scores)[:top_k]
+    return [records[i][0] for i in order]
+
+
+class TestNumpyVectorIndex:
+    def test_matches_brute_force(self):
+        records = _records()
+        index = NumpyVectorIndex.from_records(records, dtype="float32")
+        query = records[7][1]
+
+        hits = index.search(query, top_k=5)
+
+        assert [h.id for h in hits] == _brute_force(records, query, 5)
+        assert hits[0].id == 107
+        assert hits[0].score == pytest.approx(1.0, abs=1e-5)
+        assert all(isinstance(h, IndexHit) for h in hits)
+
+    def test_blocked_search_equals_single_block(self):
+        records = _records(n=97)
+        query = records[3][1]
+        full = NumpyVectorIndex.from_records(records, dtype="float32")
+        blocked = NumpyVectorIndex.from_records(records, dtype="float32", block_size=10)
+
+        assert [h.id for h in blocked.search(query, 8)] == [h.id for h in full.search(query, 8)]
+
+    def test_scores_sorted_descending(self):
+        index = NumpyVectorIndex.from_records(_records(), block_size=7)
+        hits = index.search(_records()[0][1], top_k=10)
+        scores = [h.score for h in hits]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_filter_conditions(self):
+        records = _records()
+        index = NumpyVectorIndex.from_records(records, block_size=4)
+
+        hits = index.search(records[1][1], top_k=5, filter_conditions={"jenis_dokumen": "UU"})
+
+        assert len(hits) == 5
+        assert all(h.payload["jenis_dokumen"] == "UU" for h in hits)
+        assert 101 not in [h.id for h in hits]
+
+    def test_filter_matches_list_payload(self):
+        index = NumpyVectorIndex.from_records(_records())
+        hits = index.search(_records()[0][1], top_k=50, filter_conditions={"tags": "a"})
+        assert sorted(h.id for h in hits) == [100, 105, 110, 115, 120, 125, 130, 135, 140, 145]
+
+    def test_filter_without_matches(self):
+        index = NumpyVectorIndex.from_records(_records())
+        assert index.search(_records()[0][1], top_k=5, filter_conditions={"jenis_dokumen": "Perda"}) == []
+
+    def test_empty_index(self):
+        index = NumpyVectorIndex.from_records([])
+        assert len(index) == 0
+        assert index.search([0.1, 0.2], top_k=5) == []
+
+    def test_invalid_dtype(self):
+        with pytest.raises(ValueError):
+            NumpyVectorIndex.from_records(_records(), dtype="int8")
+
+    def test_save_load_roundtrip_mmap(self, tmp_path):
+        records = _records()
+        index = NumpyVectorIndex.from_records(records, dtype="float16")
+        index.save(tmp_path / "idx")
+
+        loaded = NumpyVectorIndex.load(tmp_path / "idx")
+
+        assert isinstance(loaded.vectors, np.memmap)
+        assert loaded.vectors.dtype == np.float16
+        assert len(loaded) == 50
+        assert loaded.payloads[3]["citation_id"] == "uu_3_2020_pasal_1"
+        query = records[11][1]
+        assert [h.id for h in loaded.search(query, 5)] == [h.id for h in index.search(query, 5)]
+
+    def test_uuid_ids_kept_through_save_load(self, tmp_path):
+        records = _records(n=4)
+        uuid = "0b7f2c1e-5a43-4d8e-9a51-3c8f6e2d1a90"
+        records[2] = (uuid, *records[2][1:])
+        index = NumpyVectorIndex.from_records(records)
+        index.save(tmp_path / "idx")
+
+        loaded = NumpyVectorIndex.load(tmp_path / "idx")
+
+        assert loaded.point_ids() == [100, 101, uuid, 103]
+        assert loaded.search(records[2][1], 1)[0].id == uuid
+        assert loaded.search(records[1][1], 1)[0].id == 101
+
+    def test_load_missing_directory(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            NumpyVectorIndex.load(tmp_path / "missing")
+
+    def test_from_qdrant_named_vectors(self):
+        point = MagicMock()
+        point.id = 1
+        point.vector = {"full": [1.0, 0.0, 0.0], "coarse": [1.0]}
+        point.payload = {"text": "a"}
+        client = MagicMock()
+        client.scroll.return_value = ([point], None)
+
+        index = NumpyVectorIndex.from_qdrant(client, "docs")
+
+        assert len(index) == 1
+        assert index.dim == 3
+        assert index.source["collection_name"] == "docs"
+        assert client.scroll.call_args.kwargs["with_vectors"] is True
+
+
+class TestRetrieverNumpyBackend:
+    @pytest.fixture
+    def index_dir(self, tmp_path):
+        NumpyVectorIndex.from_records(_records(dim=1024)).save(tmp_path)
+        return tmp_path
+
+    def test_retriever_uses_embedded_index(self, index_dir):
+        from retriever import HybridRetriever
+
+        with patch("retriever.QdrantClient") as mock_qclient_cls:
+            ret = HybridRetriever(
+                use_reranker=False,
+                vector_backend="numpy",
+                vector_index_path=str(index_dir),
+            )
+            mock_qclient_cls.assert_not_called()
+
+        # BM25 corpus comes from the index payloads
+        assert len(ret._corpus) == 50
+        assert ret._bm25 is not None
+
+        ret.embedder = MagicMock()
+        ret.embedder.embed_query.return_value = _records(dim=1024)[4][1]
+        results = ret.dense_search("perizinan", top_k=3, filter_conditions={"jenis_dokumen": "UU"})
+
+        assert results[0].id == 104
+        assert results[0].citation_id == "uu_4_2020_pasal_1"
+        assert all(r.metadata["jenis_dokumen"] == "UU" for r in results)
+        assert ret.get_stats()["total_documents"] == 50
+
+    def test_unknown_backend_rejected(self):
+        from retriever import HybridRetriever
+
+        with pytest.raises(ValueError):
+            HybridRetriever(use_reranker=False, vector_backend="faiss")